@@ -18,7 +18,6 @@ static const auto float_dtype = py::format_descriptor<float>::format();
 
 
 static void verify_setting(const py::dict& settings, const std::string& name);
-typedef void* (*PopulateFunc)(AudioFeatureGeneratorWrapper *self, const struct FrontendOutput& frontend_output, void* output);
 static void* populate_int8_slice(AudioFeatureGeneratorWrapper *self, const struct FrontendOutput& frontend_output, void* output);
 static void* populate_uint16_slice(AudioFeatureGeneratorWrapper *self, const struct FrontendOutput& frontend_output, void* output);
 static void* populate_float_slice(AudioFeatureGeneratorWrapper *self, const struct FrontendOutput& frontend_output, void* output);
@@ -105,8 +104,6 @@ void AudioFeatureGeneratorWrapper::process_sample(const py::array_t<int16_t>& in
   const auto input_buf = input.request();
   auto output_buf = output.request();
   const auto shape = output_buf.shape;
-  const auto dtype = output_buf.format;
-  PopulateFunc populate_func;
 
   if(input_buf.ndim != 1)
   {
@@ -125,10 +122,177 @@ void AudioFeatureGeneratorWrapper::process_sample(const py::array_t<int16_t>& in
     throw std::invalid_argument("Output must have shape" + std::to_string(_n_features) + "x" + std::to_string(_n_channels));
   }
 
-  auto audio_ptr = static_cast<int16_t*>(input_buf.ptr);
+  bool use_quantize_tmp_buffer;
+  const auto populate_func = get_populate_func(output_buf.format, use_quantize_tmp_buffer);
+  const auto audio_ptr = static_cast<const int16_t*>(input_buf.ptr);
   void* output_ptr = output_buf.ptr;
-  void* quantize_tmp_buffer = nullptr;
 
+  // Release the Python Global Interpreter Lock (GIL)
+  // While generating the spectrogram
+  // This way, other Python threads may execute concurrently
+  py::gil_scoped_release release;
+
+  uint16_t* quantize_tmp_buffer = nullptr;
+  if(use_quantize_tmp_buffer)
+  {
+    quantize_tmp_buffer = (uint16_t*)malloc(sizeof(uint16_t) * _n_features * _n_channels);
+  }
+
+  generate_spectrogram(audio_ptr, output_ptr, populate_func, quantize_tmp_buffer);
+
+  free(quantize_tmp_buffer);
+}
+
+/*************************************************************************************************/
+void AudioFeatureGeneratorWrapper::process_batch(
+  const py::array_t<int16_t, py::array::c_style | py::array::forcecast>& input, 
+  py::array& output
+)
+{
+  const auto input_buf = input.request();
+  auto output_buf = output.request();
+  const auto shape = output_buf.shape;
+
+  if(input_buf.ndim != 2)
+  {
+    throw std::invalid_argument("Input batch must be 2D array");
+  }
+  if(input_buf.shape[1] != _sample_length)
+  {
+    throw std::invalid_argument("Input batch samples must contain " + std::to_string(_sample_length) + " elements");
+  }
+  if(output_buf.ndim != 3)
+  {
+    throw std::invalid_argument("Output must be 3D array");
+  }
+  if(shape[0] != input_buf.shape[0] || shape[1] != _n_features || shape[2] != _n_channels)
+  {
+    throw std::invalid_argument(
+      "Output must have shape " + std::to_string(input_buf.shape[0]) + "x" + 
+      std::to_string(_n_features) + "x" + std::to_string(_n_channels)
+    );
+  }
+  if(!(output.flags() & py::array::c_style))
+  {
+    throw std::invalid_argument("Output must be C-contiguous");
+  }
+
+  bool use_quantize_tmp_buffer;
+  const auto populate_func = get_populate_func(output_buf.format, use_quantize_tmp_buffer);
+  const auto n_samples = input_buf.shape[0];
+  const auto output_stride = _n_features * _n_channels * output_buf.itemsize;
+  const auto audio_ptr = static_cast<const int16_t*>(input_buf.ptr);
+  auto output_ptr = static_cast<uint8_t*>(output_buf.ptr);
+
+  // Release the Python Global Interpreter Lock (GIL)
+  // While generating the spectrograms
+  // This way, other Python threads may execute concurrently
+  py::gil_scoped_release release;
+
+  uint16_t* quantize_tmp_buffer = nullptr;
+  if(use_quantize_tmp_buffer)
+  {
+    quantize_tmp_buffer = (uint16_t*)malloc(sizeof(uint16_t) * _n_features * _n_channels);
+  }
+
+  for(ssize_t i = 0; i < n_samples; ++i)
+  {
+    generate_spectrogram(
+      audio_ptr + i * _sample_length, 
+      output_ptr + i * output_stride, 
+      populate_func, 
+      quantize_tmp_buffer
+    );
+  }
+
+  free(quantize_tmp_buffer);
+}
+
+/*************************************************************************************************/
+int AudioFeatureGeneratorWrapper::process_stream(
+  const py::array_t<int16_t, py::array::c_style | py::array::forcecast>& input, 
+  py::array& output
+)
+{
+  const auto input_buf = input.request();
+  auto output_buf = output.request();
+  const auto shape = output_buf.shape;
+
+  if(input_buf.ndim != 1)
+  {
+    throw std::invalid_argument("Input chunk must be 1D array");
+  }
+  if(output_buf.ndim != 2 || shape[1] != _n_channels)
+  {
+    throw std::invalid_argument("Output must have shape <max slices>x" + std::to_string(_n_channels));
+  }
+  if(!(output.flags() & py::array::c_style))
+  {
+    throw std::invalid_argument("Output must be C-contiguous");
+  }
+
+  bool use_quantize_tmp_buffer;
+  const auto populate_func = get_populate_func(output_buf.format, use_quantize_tmp_buffer);
+  if(use_quantize_tmp_buffer)
+  {
+    throw std::invalid_argument("int8 output with dynamic quantization is not supported in streaming mode, use uint16 or float32");
+  }
+
+  const auto max_slices = shape[0];
+  auto audio_ptr = static_cast<const int16_t*>(input_buf.ptr);
+  size_t remaining = input_buf.size;
+  void* output_ptr = output_buf.ptr;
+  int n_slices = 0;
+
+  // Release the Python Global Interpreter Lock (GIL)
+  // While generating the spectrogram slices
+  py::gil_scoped_release release;
+
+  // NOTE: The frontend state (i.e. window, noise reduction, PCAN, etc.)
+  //       is NOT reset, so the chunk is processed as a continuation of the previous chunks
+  while(remaining > 0)
+  {
+    size_t num_samples_read;
+    const auto frontend_output = FrontendProcessSamples(
+      &_frontend_state, 
+      audio_ptr, 
+      remaining, 
+      &num_samples_read
+    );
+    remaining -= num_samples_read;
+    audio_ptr += num_samples_read;
+
+    if(frontend_output.values != nullptr)
+    {
+      if(n_slices >= max_slices)
+      {
+        throw std::invalid_argument("Output does not have enough rows for the generated slices");
+      }
+      output_ptr = populate_func(this, frontend_output, output_ptr);
+      ++n_slices;
+    }
+    else if(num_samples_read == 0)
+    {
+      break;
+    }
+  }
+
+  return n_slices;
+}
+
+/*************************************************************************************************/
+void AudioFeatureGeneratorWrapper::reset()
+{
+  FrontendReset(&_frontend_state);
+}
+
+/*************************************************************************************************/
+AudioFeatureGeneratorWrapper::PopulateFunc AudioFeatureGeneratorWrapper::get_populate_func(
+  const std::string& dtype, 
+  bool& use_quantize_tmp_buffer
+)
+{
+  use_quantize_tmp_buffer = false;
 
   if(dtype == int8_dtype)
   {
@@ -136,32 +300,37 @@ void AudioFeatureGeneratorWrapper::process_sample(const py::array_t<int16_t>& in
     // then populated each slice as uint16 and at the end do the quantization
     if(_dynamic_quantize_range > 0)
     {
-      populate_func = &populate_uint16_slice;
-      output_ptr = quantize_tmp_buffer = malloc(sizeof(uint16_t) * _n_features * _n_channels);
+      use_quantize_tmp_buffer = true;
+      return &populate_uint16_slice;
     }
     else 
     {
-      populate_func = &populate_int8_slice;
+      return &populate_int8_slice;
     }
-    
   }
   else if(dtype == uint16_dtype)
   {
-    populate_func = &populate_uint16_slice;
+    return &populate_uint16_slice;
   }
   else if(dtype == float_dtype)
   {
-    populate_func = &populate_float_slice;
+    return &populate_float_slice;
   }
   else
   {
     throw std::invalid_argument("Output data type must be a int8, uint16, or float32");
   }
+}
 
-  // Release the Python Global Interpreter Lock (GIL)
-  // While generating the spectrogram
-  // This way, other Python threads may execute concurrently
-  py::gil_scoped_release release;
+/*************************************************************************************************/
+void AudioFeatureGeneratorWrapper::generate_spectrogram(
+  const int16_t* audio_ptr, 
+  void* output_ptr, 
+  PopulateFunc populate_func, 
+  uint16_t* quantize_tmp_buffer
+)
+{
+  void* slice_ptr = (quantize_tmp_buffer != nullptr) ? quantize_tmp_buffer : output_ptr;
 
   FrontendReset(&_frontend_state);
 
@@ -177,7 +346,7 @@ void AudioFeatureGeneratorWrapper::process_sample(const py::array_t<int16_t>& in
     );
     samples_processed += num_samples_read;
     audio_ptr += num_samples_read;
-    output_ptr = populate_func(this, frontend_output, output_ptr);
+    slice_ptr = populate_func(this, frontend_output, slice_ptr);
   }
 
   // If we're using dynamic quantization,
@@ -186,14 +355,12 @@ void AudioFeatureGeneratorWrapper::process_sample(const py::array_t<int16_t>& in
   if(quantize_tmp_buffer != nullptr)
   {
     dynamic_scale_int8_spectrogram(
-      (const uint16_t*)quantize_tmp_buffer, 
-      (int8_t*)output_buf.ptr, 
+      quantize_tmp_buffer, 
+      (int8_t*)output_ptr, 
       _n_features * _n_channels, 
       this->_dynamic_quantize_range
     );
-    free(quantize_tmp_buffer);
   }
-
 }
 
 /*************************************************************************************************/
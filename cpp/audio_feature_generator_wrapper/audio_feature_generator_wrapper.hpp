@@ -17,6 +17,9 @@ public:
     AudioFeatureGeneratorWrapper(const py::dict& settings);
     ~AudioFeatureGeneratorWrapper();
     void process_sample(const py::array_t<int16_t>& input, py::array& output);
+    void process_batch(const py::array_t<int16_t, py::array::c_style | py::array::forcecast>& input, py::array& output);
+    int process_stream(const py::array_t<int16_t, py::array::c_style | py::array::forcecast>& input, py::array& output);
+    void reset();
     bool activity_was_detected();
 
     FrontendState _frontend_state;
@@ -26,6 +29,11 @@ public:
     int _window_step;
     int _window_size;
     int _dynamic_quantize_range;
+
+private:
+    typedef void* (*PopulateFunc)(AudioFeatureGeneratorWrapper *self, const struct FrontendOutput& frontend_output, void* output);
+    PopulateFunc get_populate_func(const std::string& dtype, bool& use_quantize_tmp_buffer);
+    void generate_spectrogram(const int16_t* audio_ptr, void* output_ptr, PopulateFunc populate_func, uint16_t* quantize_tmp_buffer);
 };
 
 
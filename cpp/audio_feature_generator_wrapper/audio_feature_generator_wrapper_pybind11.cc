@@ -31,6 +31,9 @@ PYBIND11_MODULE(MODULE_NAME, m)
     py::class_<mltk::AudioFeatureGeneratorWrapper>(m, "AudioFeatureGeneratorWrapper")
     .def(py::init<const py::dict&>())
     .def("process_sample", &mltk::AudioFeatureGeneratorWrapper::process_sample)
+    .def("process_batch", &mltk::AudioFeatureGeneratorWrapper::process_batch)
+    .def("process_stream", &mltk::AudioFeatureGeneratorWrapper::process_stream)
+    .def("reset", &mltk::AudioFeatureGeneratorWrapper::reset)
     .def("activity_was_detected", &mltk::AudioFeatureGeneratorWrapper::activity_was_detected)
     ;
 }
\ No newline at end of file
@@ -15,7 +15,13 @@ extern "C" TfliteMicroAccelerator* mltk_tflite_micro_register_accelerator()
 #endif
 
 #ifndef MLTK_DLL_IMPORT
+#ifdef TFLITE_MICRO_SIMULATOR_ENABLED
+// The simulator (i.e. Python wrapper) may invoke multiple models concurrently,
+// each from its own thread, so the accelerator is registered per thread
+static thread_local TfliteMicroAccelerator* _registered_accelerator = nullptr;
+#else
 static TfliteMicroAccelerator* _registered_accelerator = nullptr;
+#endif
 extern "C" TfliteMicroAccelerator* mltk_tflite_micro_set_accelerator(TfliteMicroAccelerator* accelerator)
 {
     _registered_accelerator = accelerator;
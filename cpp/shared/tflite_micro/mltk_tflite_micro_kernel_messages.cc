@@ -15,6 +15,12 @@ namespace mltk
 
 TfliteMicroKernelMessages& TfliteMicroKernelMessages::instance()
 {
+#ifdef TFLITE_MICRO_SIMULATOR_ENABLED
+    // The simulator (i.e. Python wrapper) may load and invoke multiple models concurrently, each from its own thread.
+    // So the messages and flush callback are per thread, this way they are attributed to the model executing in the thread
+    static thread_local TfliteMicroKernelMessages thread_instance;
+    return thread_instance;
+#else
     static uint8_t instance_buffer[sizeof(TfliteMicroKernelMessages)];
     static TfliteMicroKernelMessages* instance_ptr = nullptr;
 
@@ -24,6 +30,7 @@ TfliteMicroKernelMessages& TfliteMicroKernelMessages::instance()
     }
 
     return *instance_ptr;
+#endif
 }
 
 
@@ -117,6 +124,16 @@ void TfliteMicroKernelMessages::set_flush_callback(FlushCallback callback, void*
     self._flush_callback_arg = arg;
 }
 
+void TfliteMicroKernelMessages::clear_flush_callback(void* arg)
+{
+    auto& self = instance();
+    if(self._flush_callback_arg == arg)
+    {
+        self._flush_callback = nullptr;
+        self._flush_callback_arg = nullptr;
+    }
+}
+
 } // namespace mltk 
 
 #endif // MLTK_DLL_IMPORT
\ No newline at end of file
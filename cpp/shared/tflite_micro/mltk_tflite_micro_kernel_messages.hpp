@@ -30,6 +30,7 @@ public:
     static bool unknown_layers_detected();
     static void set_unknown_layers_detected(bool detected);
     static void set_flush_callback(FlushCallback callback, void *arg = nullptr);
+    static void clear_flush_callback(void *arg);
 
 private:
     std::string _unsupported_msg;
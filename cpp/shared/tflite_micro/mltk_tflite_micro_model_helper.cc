@@ -152,7 +152,13 @@ void TfliteMicroModelHelper::invoke_processing_callback(TfLiteContext* context)
     }
 }
 
+#ifdef TFLITE_MICRO_SIMULATOR_ENABLED
+// The simulator (i.e. Python wrapper) may invoke multiple models concurrently,
+// each from its own thread
+static thread_local TfLiteContext* _active_tflite_context = nullptr;
+#else
 static TfLiteContext* _active_tflite_context = nullptr;
+#endif
 TfLiteContext* TfliteMicroModelHelper::active_tflite_context()
 {
     return _active_tflite_context;
@@ -1,5 +1,11 @@
 #include <exception>
+#include <mutex>
+#include <memory>
+#include <shared_mutex>
+#include <stdexcept>
+#include <cstring>
 
+#include "cpputils/std_formatted_string.hpp"
 #include "tensorflow/lite/micro/memory_helpers.h"
 #include "all_ops_resolver.h"
 #include "tflite_micro_model_wrapper.hpp"
@@ -16,6 +22,136 @@ namespace mltk
 
 static tflite::AllOpsResolver reference_ops_resolver;
 
+// Guards the state that is shared by all the models loaded in this process,
+// i.e. the profiler, the recorders, and the accelerator simulators.
+//
+// - Loading/unloading a model, and invoking a model that uses the global state, locks it exclusively
+// - Invoking a model that only uses the reference kernels locks it shared,
+//   so these models may be invoked concurrently from different threads.
+//   However, while a model that uses the global state is loaded, they also lock it exclusively
+//   (and the profiler and recorders are disabled while they execute)
+//
+// NOTE: The kernel messages, active TfLiteContext, and registered accelerator are per thread
+static std::shared_mutex global_state_mutex;
+// The number of loaded models that use the global state, only modified while exclusively locked
+static int global_state_model_count = 0;
+// The lock is not recursive, so track if the current thread already holds it
+// (e.g. a layer callback that retrieves the profiling results)
+static thread_local int global_state_lock_depth = 0;
+
+
+class GlobalStateLock
+{
+public:
+    explicit GlobalStateLock(bool exclusive)
+    {
+        if(global_state_lock_depth++ > 0)
+        {
+            return;
+        }
+
+        if(!exclusive)
+        {
+            global_state_mutex.lock_shared();
+            if(global_state_model_count == 0)
+            {
+                _locked_shared = true;
+                return;
+            }
+            global_state_mutex.unlock_shared();
+        }
+
+        global_state_mutex.lock();
+        _locked_exclusive = true;
+    }
+
+    ~GlobalStateLock()
+    {
+        --global_state_lock_depth;
+        if(_locked_shared)
+        {
+            global_state_mutex.unlock_shared();
+        }
+        else if(_locked_exclusive)
+        {
+            global_state_mutex.unlock();
+        }
+    }
+
+private:
+    bool _locked_shared = false;
+    bool _locked_exclusive = false;
+};
+
+
+// Disable the profiler and recorders while a model that does not use them is loaded or invoked.
+// This must only be used while the global state is exclusively locked
+class GlobalStateDisabler
+{
+public:
+    explicit GlobalStateDisabler(bool disable) : _disabled(disable)
+    {
+        if(!_disabled)
+        {
+            return;
+        }
+        _profiler_enabled = TfliteMicroProfiler::is_enabled();
+        _recorder_enabled = TfliteMicroRecorder::is_enabled();
+        _tensor_recorder_enabled = TfliteMicroRecorder::is_tensor_data_recording_enabled();
+        TfliteMicroProfiler::set_enabled(false);
+        TfliteMicroRecorder::set_tensor_data_recording_enabled(false);
+        TfliteMicroRecorder::set_enabled(false);
+    }
+
+    ~GlobalStateDisabler()
+    {
+        if(!_disabled)
+        {
+            return;
+        }
+        TfliteMicroProfiler::set_enabled(_profiler_enabled);
+        TfliteMicroRecorder::set_enabled(_recorder_enabled);
+        TfliteMicroRecorder::set_tensor_data_recording_enabled(_tensor_recorder_enabled);
+    }
+
+private:
+    bool _disabled;
+    bool _profiler_enabled = false;
+    bool _recorder_enabled = false;
+    bool _tensor_recorder_enabled = false;
+};
+
+
+/*************************************************************************************************/
+// The accelerator is registered per thread,
+// so restore the calling thread's previously registered accelerator once a model is done with it.
+// Otherwise loading, invoking or unloading a model would clobber the accelerator used by another model on this thread
+class AcceleratorRestorer
+{
+public:
+    AcceleratorRestorer() : _previous_accelerator(mltk_tflite_micro_get_registered_accelerator())
+    {
+    }
+
+    ~AcceleratorRestorer()
+    {
+        mltk_tflite_micro_set_accelerator(_previous_accelerator);
+    }
+
+private:
+    TfliteMicroAccelerator* _previous_accelerator;
+};
+
+
+/*************************************************************************************************/
+// Release the GIL while waiting for the lock,
+// otherwise this would deadlock with a thread that holds the lock and needs the GIL (e.g. to log a message)
+static std::unique_ptr<GlobalStateLock> lock_global_state(bool exclusive = true)
+{
+    py::gil_scoped_release release;
+    return std::unique_ptr<GlobalStateLock>(new GlobalStateLock(exclusive));
+}
+
 /*************************************************************************************************/
 TfliteMicroModelWrapper::~TfliteMicroModelWrapper()
 {
@@ -39,6 +175,21 @@ bool TfliteMicroModelWrapper::load(
         return false;
     }
 
+    auto lock = lock_global_state();
+
+    this->_uses_global_state = accelerator != nullptr || enable_profiler || enable_recorder || enable_tensor_recorder;
+    if(this->_uses_global_state)
+    {
+        ++global_state_model_count;
+    }
+    this->_profiler_enabled = enable_profiler;
+    this->_recorder_enabled = enable_recorder || enable_tensor_recorder;
+    this->_tensor_recorder_enabled = enable_tensor_recorder;
+
+    // Ensure this model does not use the profiler or recorders enabled by another loaded model
+    GlobalStateDisabler disabler(!this->_uses_global_state);
+    AcceleratorRestorer accelerator_restorer;
+
     TfliteMicroKernelMessages::set_flush_callback(kernel_message_callback, this);
 
     get_logger().debug("Loading model ...");
@@ -68,6 +219,9 @@ bool TfliteMicroModelWrapper::load(
     if(accelerator == nullptr)
     {
         op_resolver = &reference_ops_resolver;
+        // Ensure an accelerator previously loaded by this thread is not used by this model
+        // (the previous accelerator is restored once the model is loaded)
+        mltk_tflite_micro_set_accelerator(nullptr);
     }
     else
     {
@@ -114,9 +268,26 @@ bool TfliteMicroModelWrapper::load(
 /*************************************************************************************************/
 void TfliteMicroModelWrapper::unload()
 {
-    TfliteMicroModel::unload();
-    mltk_tflite_micro_set_accelerator(nullptr);
-    TfliteMicroKernelMessages::set_flush_callback(nullptr);
+    auto lock = lock_global_state();
+
+    {
+        GlobalStateDisabler disabler(!this->_uses_global_state);
+        // Ensure the accelerator that this model was loaded with is the one that is de-initialized
+        AcceleratorRestorer accelerator_restorer;
+        set_model_accelerator();
+        TfliteMicroModel::unload();
+    }
+    this->_accelerator_wrapper = nullptr;
+
+    if(this->_uses_global_state)
+    {
+        this->_uses_global_state = false;
+        --global_state_model_count;
+    }
+    this->_profiler_enabled = false;
+    this->_recorder_enabled = false;
+    this->_tensor_recorder_enabled = false;
+    TfliteMicroKernelMessages::clear_flush_callback(this);
     for(auto buffer : _runtime_buffers)
     {
         delete buffer;
@@ -128,18 +299,180 @@ void TfliteMicroModelWrapper::unload()
 
 /*************************************************************************************************/
 bool TfliteMicroModelWrapper::invoke() const
+{
+    // The model's input/output tensors are only accessed by the Python thread that invokes the model,
+    // so the GIL is released while the model executes.
+    // This allows for invoking other models concurrently from other Python threads
+    py::gil_scoped_release release;
+
+    GlobalStateLock lock(this->_uses_global_state);
+    return invoke_model();
+}
+
+/*************************************************************************************************/
+bool TfliteMicroModelWrapper::predict(
+    const std::vector<py::array>& x,
+    const std::vector<py::array>& y
+)
+{
+    const int n_inputs = this->input_size();
+    const int n_outputs = this->output_size();
+
+    if((int)x.size() != n_inputs)
+    {
+        throw std::invalid_argument(cpputils::format("Model has %d inputs but %d were given", n_inputs, (int)x.size()));
+    }
+    if((int)y.size() != n_outputs)
+    {
+        throw std::invalid_argument(cpputils::format("Model has %d outputs but %d were given", n_outputs, (int)y.size()));
+    }
+    if(n_inputs == 0 || x[0].ndim() == 0)
+    {
+        throw std::invalid_argument("Input must have the batch dimension");
+    }
+
+    const ssize_t n_samples = x[0].shape(0);
+    std::vector<const uint8_t*> input_buffers;
+    std::vector<uint8_t*> output_buffers;
+    std::vector<bool> dequantize_outputs;
+
+    // Validate the given arrays while the GIL is held
+    for(int i = 0; i < n_inputs; ++i)
+    {
+        const auto tensor = this->input(i);
+        const auto& x_i = x[i];
+        if(!(x_i.flags() & py::array::c_style))
+        {
+            throw std::invalid_argument(cpputils::format("Input %d must be C-contiguous", i));
+        }
+        if(x_i.ndim() == 0 || x_i.shape(0) != n_samples)
+        {
+            throw std::invalid_argument("All the inputs must have the same number of samples");
+        }
+        if(x_i.itemsize() != tensor->element_size() || x_i.nbytes() != (ssize_t)(n_samples * tensor->bytes))
+        {
+            throw std::invalid_argument(cpputils::format("Input %d does not have the same data type and sample size as the model input", i));
+        }
+        input_buffers.push_back((const uint8_t*)x_i.data());
+    }
+
+    for(int i = 0; i < n_outputs; ++i)
+    {
+        const auto tensor = this->output(i);
+        const auto& y_i = y[i];
+        if(!(y_i.flags() & py::array::c_style) || !y_i.writeable())
+        {
+            throw std::invalid_argument(cpputils::format("Output %d must be writable and C-contiguous", i));
+        }
+        if(y_i.ndim() == 0 || y_i.shape(0) != n_samples)
+        {
+            throw std::invalid_argument("The outputs must have the same number of samples as the inputs");
+        }
+
+        const ssize_t n_elements = tensor->bytes / tensor->element_size();
+        const bool dequantize = tensor->type != kTfLiteFloat32 &&
+            py::dtype::of<float>().is(y_i.dtype()) &&
+            y_i.size() == n_samples * n_elements;
+
+        if(dequantize)
+        {
+            if(tensor->type != kTfLiteInt8 && tensor->type != kTfLiteUInt8 && tensor->type != kTfLiteInt16)
+            {
+                throw std::invalid_argument(cpputils::format("Output %d data type: %s cannot be dequantized", i, to_str(tensor->type)));
+            }
+        }
+        else if(y_i.itemsize() != tensor->element_size() || y_i.nbytes() != (ssize_t)(n_samples * tensor->bytes))
+        {
+            throw std::invalid_argument(cpputils::format("Output %d does not have the same data type and sample size as the model output", i));
+        }
+
+        output_buffers.push_back((uint8_t*)y_i.mutable_data());
+        dequantize_outputs.push_back(dequantize);
+    }
+
+    // Invoke the model for each sample without returning to Python
+    py::gil_scoped_release release;
+
+    GlobalStateLock lock(this->_uses_global_state);
+
+    for(ssize_t sample_index = 0; sample_index < n_samples; ++sample_index)
+    {
+        for(int i = 0; i < n_inputs; ++i)
+        {
+            const auto tensor = this->input(i);
+            memcpy(tensor->data.raw, input_buffers[i] + sample_index*tensor->bytes, tensor->bytes);
+        }
+
+        if(!invoke_model())
+        {
+            return false;
+        }
+
+        for(int i = 0; i < n_outputs; ++i)
+        {
+            const auto tensor = this->output(i);
+            if(!dequantize_outputs[i])
+            {
+                memcpy(output_buffers[i] + sample_index*tensor->bytes, tensor->data.raw_const, tensor->bytes);
+                continue;
+            }
+
+            const int n_elements = tensor->bytes / tensor->element_size();
+            float* dst = (float*)output_buffers[i] + sample_index*n_elements;
+            for(int j = 0; j < n_elements; ++j)
+            {
+                if(tensor->type == kTfLiteInt8)
+                {
+                    dst[j] = dequantized_value(tensor->params, tensor->data.int8[j]);
+                }
+                else if(tensor->type == kTfLiteUInt8)
+                {
+                    dst[j] = dequantized_value(tensor->params, tensor->data.uint8[j]);
+                }
+                else
+                {
+                    dst[j] = dequantized_value(tensor->params, tensor->data.i16[j]);
+                }
+            }
+        }
+    }
+
+    return true;
+}
+
+/*************************************************************************************************/
+bool TfliteMicroModelWrapper::invoke_model() const
+{
+    // NOTE: If this model does not use the global state,
+    //       and a model that does is loaded, then the global state is exclusively locked.
+    //       So the profiler and recorders may be safely disabled while this model executes
+    GlobalStateDisabler disabler(!this->_uses_global_state && global_state_model_count > 0);
+
+    // The kernel messages are per thread, so ensure they are attributed to this model
+    TfliteMicroKernelMessages::set_flush_callback(kernel_message_callback, const_cast<TfliteMicroModelWrapper*>(this));
+
+    AcceleratorRestorer accelerator_restorer;
+    set_model_accelerator();
+
+    return TfliteMicroModel::invoke();
+}
+
+/*************************************************************************************************/
+void TfliteMicroModelWrapper::set_model_accelerator() const
 {
     if(this->_accelerator_wrapper != nullptr)
     {
-        // Technically, this should not be required as the accelerator should have already
-        // been set by the accelerator wrapper when calling mltk_tflite_micro_register_accelerator() in the load()
-        // However, for some reason the pointer is being cleared on Linux in some instances.
-        // So, as a failsafe we set the accelerator pointer again before invoking the simulator.
+        // The accelerator registered by the accelerator wrapper in load() is only used while the model is loaded,
+        // afterwards the thread's previous accelerator is restored. So set this model's accelerator while it is used.
+        // NOTE: The accelerator pointer is thread-local, so this also ensures it is set
+        //       if the model is used from a different thread than the one that loaded it
         auto accelerator_wrapper = (const TfliteMicroAcceleratorWrapper*)this->_accelerator_wrapper;
         mltk_tflite_micro_set_accelerator(accelerator_wrapper->accelerator);
     }
-
-    return TfliteMicroModel::invoke();
+    else
+    {
+        mltk_tflite_micro_set_accelerator(nullptr);
+    }
 }
 
 /*************************************************************************************************/
@@ -199,6 +532,7 @@ py::array TfliteMicroModelWrapper::get_output(int index)
 /*************************************************************************************************/
 py::list TfliteMicroModelWrapper::get_profiling_results() const
 {
+    auto lock = lock_global_state();
     py::list results;
 
     const auto model_profiler = this->profiler();
@@ -245,6 +579,7 @@ py::object TfliteMicroModelWrapper::get_recorded_data()
     const uint8_t* data;
     uint32_t length;
 
+    auto lock = lock_global_state();
     if(this->recorded_data(&data, &length))
     {
         std::string buf((const char*)data, length);
@@ -295,6 +630,9 @@ TfLiteStatus TfliteMicroModelWrapper::layer_callback_handler(
 {
     auto& self = *reinterpret_cast<TfliteMicroModelWrapper*>(arg);
 
+    // The GIL is released while the model is invoked
+    py::gil_scoped_acquire acquire;
+
     py::dict callback_arg;
     py::list outputs;
     callback_arg["index"] = index;
@@ -33,6 +33,10 @@ public:
     void unload();
 
     bool invoke() const;
+    bool predict(
+        const std::vector<py::array>& x,
+        const std::vector<py::array>& y
+    );
     py::dict get_details() const;
     py::array get_input(int index);
     py::array get_output(int index);
@@ -40,14 +44,25 @@ public:
     py::object get_recorded_data();
     py::list get_layer_msgs() const;
     void set_layer_callback(std::function<bool(py::dict)> callback);
+    bool uses_global_state() const { return _uses_global_state; }
+    bool is_profiler_enabled() const { return _profiler_enabled; }
+    bool is_recorder_enabled() const { return _recorder_enabled; }
+    bool is_tensor_recorder_enabled() const { return _tensor_recorder_enabled; }
 
 private:
-    const void* _accelerator_wrapper;
+    const void* _accelerator_wrapper = nullptr;
+    bool _uses_global_state = false;
+    bool _profiler_enabled = false;
+    bool _recorder_enabled = false;
+    bool _tensor_recorder_enabled = false;
     std::string _flatbuffer_data;
     std::vector<std::string*> _runtime_buffers;
     std::function<bool(py::dict)> _layer_callback;
     std::vector<std::string> _layer_msgs;
 
+    bool invoke_model() const;
+    void set_model_accelerator() const;
+
     static TfLiteStatus layer_callback_handler(
         int index,
         TfLiteContext& context,
@@ -22,7 +22,8 @@ void init_tflite_micro_model(py::module &m)
     .def("get_output_size", &TfliteMicroModelWrapper::output_size)
     .def("get_output", &TfliteMicroModelWrapper::get_output)
     .def("invoke", &TfliteMicroModelWrapper::invoke)
-    .def("is_profiler_enabled", &TfliteMicroModelWrapper::profiler_is_enabled)
+    .def("predict", &TfliteMicroModelWrapper::predict)
+    .def("is_profiler_enabled", &TfliteMicroModelWrapper::is_profiler_enabled)
     .def("get_profiling_results", &TfliteMicroModelWrapper::get_profiling_results)
     .def("is_recorder_enabled", &TfliteMicroModelWrapper::is_recorder_enabled)
     .def("is_tensor_recorder_enabled", &TfliteMicroModelWrapper::is_tensor_recorder_enabled)
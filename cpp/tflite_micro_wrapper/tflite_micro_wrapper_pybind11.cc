@@ -40,6 +40,17 @@ PYBIND11_MODULE(MODULE_NAME, m)
         return MLTK_GIT_HASH;
     });
 
+    /*************************************************************************************************
+     * Return if multiple models may be loaded and invoked concurrently
+     *
+     * The GIL is released while a model is invoked.
+     * Models that use an accelerator, profiler, or recorder are still invoked one at a time.
+     */
+    m.def("concurrent_models_supported", []() -> bool
+    {
+        return true;
+    });
+
     /*************************************************************************************************
      * Set MLTK logging level: debug, info, warn, error
      */
@@ -0,0 +1,78 @@
+
+import typer
+
+from mltk import cli
+
+
+@cli.root_cli.command('cache_spectrograms')
+def cache_spectrograms_command(
+    model: str = typer.Argument(...,
+        help='''Name of MLTK model or path to model's python script''',
+        metavar='<model>'
+    ),
+    subsets: str = typer.Option('evaluation', '--subsets', '-s',
+        help='''\b
+Comma-separated list of dataset subsets to process, e.g.: evaluation,validation
+NOTE: Only samples processed without data augmentations are cached''',
+        metavar='<subsets>'
+    ),
+    max_samples_per_class: int = typer.Option(-1, '--count', '-c',
+        help='''\b
+By default, all samples are processed.
+This option places an upper limit on the number of samples per class that are processed''',
+        metavar='<value>'
+    ),
+    verbose: bool = typer.Option(False, '--verbose', '-v',
+        help='Enable verbose console logs'
+    ),
+    test: bool = typer.Option(False,
+        help='Use the model created by the test training. This does the same thing as: mltk cache_spectrograms my_model-test'
+    ),
+):
+    """Pre-populate a model's spectrogram cache
+
+    This processes every sample of the given dataset subsets with the
+    model's ParallelAudioDataGenerator and stores the generated spectrograms to the on-disk cache.
+    Subsequent training epochs and evaluations then read the spectrograms directly from the cache.
+    \b
+    The model's ParallelAudioDataGenerator must have spectrogram_cache_enabled=True.
+    \b
+    ----------
+     Examples
+    ----------
+    \b
+    # Cache the spectrograms used for model evaluation
+    mltk cache_spectrograms keyword_spotting_on_off_v3
+    \b
+    # Cache the spectrograms used for evaluation and the validation subset during training
+    mltk cache_spectrograms keyword_spotting_on_off_v3 --subsets evaluation,validation
+    """
+
+    # Import all required packages here instead of at top
+    # to help improve the CLI's responsiveness
+    from mltk.core import load_mltk_model
+    from mltk.core.preprocess.audio.parallel_generator import warm_spectrogram_cache
+
+
+    logger = cli.get_logger(verbose=verbose)
+
+    try:
+        mltk_model = load_mltk_model(
+            model,
+            test=test,
+            print_not_found_err=True
+        )
+    except Exception as e:
+        cli.handle_exception('Failed to load model', e)
+
+    try:
+        n_batches = warm_spectrogram_cache(
+            mltk_model,
+            subsets=[x.strip() for x in subsets.split(',')],
+            max_samples_per_class=max_samples_per_class,
+            logger=logger
+        )
+    except Exception as e:
+        cli.handle_exception('Failed to cache spectrograms', e)
+
+    cli.print_info(f'Processed {n_batches} batches')
@@ -65,6 +65,11 @@ In this case, ONLY the .tflite will be programmed and the existing model_profile
 ''',
         metavar='<path>'
     ),
+    no_cache: bool = typer.Option(False, '--no-cache',
+        help='''\b
+By default, simulator profiling results are cached and re-used if the same .tflite, accelerator, and simulator are profiled again.
+Use this option to always run the simulator'''
+    ),
 ):
     """Profile a model to determine how efficiently is may run on hardware
 
@@ -119,7 +124,8 @@ In this case, ONLY the .tflite will be programmed and the existing model_profile
             port=port,
             build=build,
             return_estimates=estimates,
-            post_process=post_process
+            post_process=post_process,
+            use_cache=not no_cache
         )
     except Exception as e:
         cli.handle_exception('Failed to profile model', e)
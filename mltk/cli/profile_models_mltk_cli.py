@@ -0,0 +1,93 @@
+
+import typer
+
+from mltk import cli
+
+
+@cli.root_cli.command('profile_models')
+def profile_models_command(
+    models: str = typer.Argument(...,
+        help='''\b
+Comma-separated list of any of the following:
+- Path to .tflite model file
+- Directory, all .tflite files in the directory and its sub-directories are profiled
+- Glob pattern, e.g. sweep/**/*.tflite (use quotes to prevent the shell from expanding the pattern)''',
+        metavar='<models>'
+    ),
+    output: str = typer.Option(..., '-o', '--output',
+        help='''\b
+Path to the .csv or .json file to write the results.
+The results of each model are written as soon as the model is profiled''',
+        metavar='<path>'
+    ),
+    accelerator: str = typer.Option(None, '--accelerator', '-a',
+        help='''\b
+Name of accelerator for which to profile the models.
+If omitted, then use the reference kernels''',
+        metavar='<name>'
+    ),
+    estimates: bool = typer.Option(False,
+        help='Estimate additional metrics such as CPU cycles and energy. Disabling this option can reduce profiling time'
+    ),
+    n_jobs: int = typer.Option(-1, '--jobs', '-j',
+        help='Number of models to profile in parallel. By default, one model per CPU core is profiled',
+        metavar='<count>'
+    ),
+    no_cache: bool = typer.Option(False, '--no-cache',
+        help='By default, cached profiling results are re-used. Use this option to always run the simulator'
+    ),
+    verbose: bool = typer.Option(False, '--verbose', '-v',
+        help='Enable verbose console logs'
+    ),
+):
+    """Profile many .tflite models in the simulator
+
+    \b
+    The models are profiled in parallel and the results
+    of each model are written to a combined .csv or .json file.
+    A model that fails to be profiled does not stop the remaining models from being profiled.
+    \b
+    ----------
+     Examples
+    ----------
+    \b
+    # Profile all the .tflite models in a directory for the MVP accelerator
+    mltk profile_models ~/workspace/sweep --accelerator MVP --estimates -o sweep_results.csv
+    \b
+    # Profile the .tflite models that match the glob pattern
+    mltk profile_models "~/workspace/sweep/**/*_v2.tflite" -o sweep_results.json
+    """
+
+    # Import all required packages here instead of at top
+    # to help improve the CLI's responsiveness
+    from mltk.core import profile_models
+
+    logger = cli.get_logger(verbose=verbose)
+
+    accelerator = cli.parse_accelerator_option(accelerator)
+
+    n_failed = 0
+    def _on_model_profiled(model_path:str, results, err_msg:str):
+        nonlocal n_failed
+        if results is None:
+            n_failed += 1
+        else:
+            logger.info(f'Profiled {model_path}')
+
+    try:
+        profile_models(
+            [x.strip() for x in models.split(',')],
+            accelerator=accelerator,
+            return_estimates=estimates,
+            output_path=output,
+            n_jobs=n_jobs,
+            use_cache=not no_cache,
+            callback=_on_model_profiled,
+            return_results=False,
+            logger=logger
+        )
+    except Exception as e:
+        cli.handle_exception('Failed to profile models', e)
+
+    if n_failed > 0:
+        cli.abort(msg=f'Failed to profile {n_failed} model(s), see {output} for more details')
@@ -0,0 +1,85 @@
+"""Measure the cold-start time of the CLI commands
+
+Each command's imports are executed in a new Python interpreter.
+The commands that only operate on .tflite flatbuffers must not import Tensorflow or matplotlib.
+
+Run this file directly to print the cold-start time of each command:
+
+    python -m mltk.cli.tests.test_import_time
+"""
+import os
+import sys
+import json
+import time
+import subprocess
+
+import pytest
+
+
+# <command>: (<imports executed by the command>, <command requires Tensorflow>)
+CLI_COMMAND_IMPORTS = {
+    'summarize': ('from mltk.core import summarize_model', False),
+    'profile': ('from mltk.core import profile_model; from mltk.core.tflite_micro import TfliteMicro', False),
+    'profile_models': ('from mltk.core import profile_models', False),
+    'view': ('from mltk.core import view_model', False),
+    'compile': ('from mltk.core import compile_model, load_tflite_model', False),
+    'update_params': ('from mltk.core import TfliteModel, TfliteModelParameters, load_mltk_model, update_model_parameters', False),
+    'commander': ('from mltk.core import load_tflite_model', False),
+    'quantize': ('from mltk.core import quantize_model, summarize_model, load_mltk_model', True),
+    'evaluate': ('from mltk.core import evaluate_model, load_mltk_model', True),
+    'train': ('from mltk.core import train_model, evaluate_model, load_mltk_model, EvaluateMixin', True),
+}
+
+# Modules that should only be imported by the commands that require Tensorflow
+HEAVY_MODULES = ('tensorflow', 'tf_keras', 'matplotlib')
+
+
+_MEASURE_SCRIPT = '''
+import sys
+import time
+import json
+t = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - t
+print(json.dumps(dict(import_time=elapsed, heavy_modules=[x for x in {heavy_modules!r} if x in sys.modules])))
+'''
+
+
+def measure_command_import_time(command:str) -> dict:
+    """Return the time to import the given command's modules in a new Python interpreter
+
+    Returns:
+        dict(import_time=<seconds to execute the imports>, process_time=<seconds to start the interpreter and execute the imports>, heavy_modules=<imported HEAVY_MODULES>)
+    """
+    imports, _ = CLI_COMMAND_IMPORTS[command]
+    env = os.environ.copy()
+    env.pop('MLTK_DISABLE_TF', None)
+    env['PYTHONPATH'] = os.pathsep.join(x for x in sys.path if x)
+
+    t = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, '-c', _MEASURE_SCRIPT.format(imports=imports, heavy_modules=HEAVY_MODULES)],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+        text=True
+    )
+    process_time = time.perf_counter() - t
+
+    results = json.loads(proc.stdout.strip().splitlines()[-1])
+    results['process_time'] = process_time
+    return results
+
+
+@pytest.mark.parametrize('command', [k for k, v in CLI_COMMAND_IMPORTS.items() if not v[1]])
+def test_flatbuffer_command_import_time(command:str):
+    results = measure_command_import_time(command)
+    assert not results['heavy_modules'], f'The "{command}" command should not import: {", ".join(results["heavy_modules"])}'
+
+
+if __name__ == '__main__':
+    print(f'{"Command":<16}{"Import (s)":>12}{"Process (s)":>13}  Heavy modules')
+    for cmd in CLI_COMMAND_IMPORTS:
+        r = measure_command_import_time(cmd)
+        print(f'{cmd:<16}{r["import_time"]:>12.2f}{r["process_time"]:>13.2f}  {", ".join(r["heavy_modules"])}')
@@ -0,0 +1,53 @@
+import os
+import csv
+import json
+import shutil
+
+from mltk.utils.test_helper import run_mltk_command
+from mltk.utils.test_helper.data import (
+    IMAGE_EXAMPLE1_TFLITE_PATH,
+    IMAGE_CLASSIFICATION_TFLITE_PATH,
+    TFLITE_MICRO_SPEECH_TFLITE_PATH
+)
+from mltk.utils.path import create_tempdir, remove_directory
+
+
+def _create_models_dir() -> str:
+    models_dir = create_tempdir('tests/profile_models')
+    remove_directory(models_dir)
+    os.makedirs(f'{models_dir}/sub', exist_ok=True)
+    shutil.copy(IMAGE_EXAMPLE1_TFLITE_PATH, f'{models_dir}/image_example1.tflite')
+    shutil.copy(IMAGE_CLASSIFICATION_TFLITE_PATH, f'{models_dir}/sub/image_classification.tflite')
+    shutil.copy(TFLITE_MICRO_SPEECH_TFLITE_PATH, f'{models_dir}/sub/tflite_micro_speech.tflite')
+    return models_dir
+
+
+def test_profile_models_help():
+    run_mltk_command('profile_models', '--help')
+
+
+def test_profile_models_csv():
+    models_dir = _create_models_dir()
+    output_path = f'{models_dir}/results.csv'
+    run_mltk_command('profile_models', models_dir, '--output', output_path, '--jobs', '2')
+    with open(output_path, 'r') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+    assert all(not row['error'] for row in rows)
+    remove_directory(models_dir)
+
+
+def test_profile_models_json_mvp():
+    models_dir = _create_models_dir()
+    output_path = f'{models_dir}/results.json'
+    run_mltk_command(
+        'profile_models', f'{models_dir}/sub/*.tflite,{models_dir}/image_example1.tflite',
+        '--output', output_path,
+        '--accelerator', 'mvp',
+        '--estimates'
+    )
+    with open(output_path, 'r') as f:
+        results = json.load(f)
+    assert len(results) == 3
+    assert all(len(x['layers']) > 0 for x in results)
+    remove_directory(models_dir)
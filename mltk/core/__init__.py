@@ -1,20 +1,104 @@
+"""MLTK core APIs
+
+The public APIs are imported on first access (see PEP 562).
+This way, e.g. ``from mltk.core import TfliteModel`` does not import Tensorflow, Keras and matplotlib
+which are only required by the model training and evaluation APIs.
+"""
+from typing import TYPE_CHECKING
+import sys
+import types
+import importlib
 
 from .utils import (
     get_mltk_logger,
     set_mltk_logger
 )
 
-from .tflite_model import *
-from .tflite_model_parameters import *
-from .model import *
-from .train_model import (train_model, TrainingResults)
-from .quantize_model import quantize_model
-from .summarize_model import summarize_model
-from .view_model import view_model
-from .evaluate_classifier import (evaluate_classifier, ClassifierEvaluationResults)
-from .evaluate_autoencoder import (evaluate_autoencoder, AutoEncoderEvaluationResults)
-from .evaluate_model import (evaluate_model, EvaluationResults)
-from .profile_model import (profile_model, ProfilingModelResults)
-from .update_model_parameters import update_model_parameters
-from .compile_model import compile_model
 
+# <public name>: <submodule that defines it>
+_LAZY_ATTRIBUTES = {}
+def _register_lazy_attributes(module_name:str, names:str):
+    for name in names.split():
+        _LAZY_ATTRIBUTES[name] = module_name
+
+_register_lazy_attributes('.tflite_model', '''
+    TfliteModel TfliteOpCode TfliteInferenceEngine
+    TfliteLayer TfliteLayerOptions TfliteAddLayer TfliteAddLayerOptions
+    TfliteConv2dLayer TfliteConv2DLayerOptions TfliteTransposeConvLayer TfliteTransposeConvLayerOptions
+    TfliteTransposeConvParams TfliteFullyConnectedLayer TfliteFullyConnectedLayerOptions
+    TfliteDepthwiseConv2dLayer TfliteDepthwiseConv2DLayerOptions TflitePooling2dLayer TflitePool2DLayerOptions
+    TfliteReshapeLayer TfliteQuantizeLayer TfliteDequantizeLayer TfliteMulLayer TfliteMulLayerOptions
+    TfliteUnidirectionalLstmLayer TfliteUnidirectionalLstmLayerOptions
+    TfliteTensor TfliteQuantization TfliteShape
+    TfliteActivation TflitePadding TfliteFullyConnectedParams TfliteConvParams TfliteDepthwiseConvParams TflitePoolParams
+''')
+_register_lazy_attributes('.tflite_model_parameters', 'TfliteModelParameters TFLITE_METADATA_TAG')
+_register_lazy_attributes('.model', '''
+    MltkModel MltkModelEvent MltkDataset
+    AudioDatasetMixin DataGeneratorDatasetMixin DatasetMixin EvaluateMixin EvaluateAutoEncoderMixin
+    EvaluateClassifierMixin ImageDatasetMixin SshMixin WeightsAndBiasesMixin TrainMixin
+    load_mltk_model load_mltk_model_with_path list_mltk_models load_tflite_or_keras_model load_tflite_model KerasModel
+''')
+_register_lazy_attributes('.train_model', 'train_model TrainingResults')
+_register_lazy_attributes('.quantize_model', 'quantize_model')
+_register_lazy_attributes('.summarize_model', 'summarize_model')
+_register_lazy_attributes('.view_model', 'view_model')
+_register_lazy_attributes('.evaluate_classifier', 'evaluate_classifier ClassifierEvaluationResults ClassifierMetrics')
+_register_lazy_attributes('.evaluate_autoencoder', 'evaluate_autoencoder AutoEncoderEvaluationResults')
+_register_lazy_attributes('.evaluate_model', 'evaluate_model EvaluationResults')
+_register_lazy_attributes('.profile_model', 'profile_model ProfilingModelResults')
+_register_lazy_attributes('.profile_models', 'profile_models')
+_register_lazy_attributes('.update_model_parameters', 'update_model_parameters')
+_register_lazy_attributes('.compile_model', 'compile_model')
+
+__all__ = ['get_mltk_logger', 'set_mltk_logger'] + list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name:str):
+    module_name = _LAZY_ATTRIBUTES.get(name, None)
+    if module_name is None:
+        # Allow for accessing the sub-packages as attributes, e.g. mltk.core.tflite_micro
+        try:
+            return importlib.import_module(f'{__name__}.{name}')
+        except ModuleNotFoundError as e:
+            if e.name != f'{__name__}.{name}':
+                raise
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+class _LazyModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it to this package, e.g.: import mltk.core.train_model
+        # So ensure the submodule does not shadow the public API with the same name,
+        # e.g. mltk.core.train_model should always be the train_model() function
+        if isinstance(value, types.ModuleType) and name in _LAZY_ATTRIBUTES \
+            and value.__name__ == f'{__name__}{_LAZY_ATTRIBUTES[name]}':
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = _LazyModule
+
+
+if TYPE_CHECKING:
+    from .tflite_model import *
+    from .tflite_model_parameters import *
+    from .model import *
+    from .train_model import (train_model, TrainingResults)
+    from .quantize_model import quantize_model
+    from .summarize_model import summarize_model
+    from .view_model import view_model
+    from .evaluate_classifier import (evaluate_classifier, ClassifierEvaluationResults, ClassifierMetrics)
+    from .evaluate_autoencoder import (evaluate_autoencoder, AutoEncoderEvaluationResults)
+    from .evaluate_model import (evaluate_model, EvaluationResults)
+    from .profile_model import (profile_model, ProfilingModelResults)
+    from .profile_models import profile_models
+    from .update_model_parameters import update_model_parameters
+    from .compile_model import compile_model
@@ -1,7 +1,9 @@
 
+from __future__ import annotations
 from typing import List, Tuple
 import logging
 import os
+import collections
 import json
 
 import numpy as np
@@ -13,12 +15,13 @@ from mltk.utils import gpu
 from mltk.utils.python import prepend_exception_msg
 from .model import (
     MltkModel,
-    KerasModel,
     TrainMixin,
     DatasetMixin,
     EvaluateAutoEncoderMixin,
     load_tflite_or_keras_model
 )
+from .keras import KerasModel
+from .tflite_model import TfliteInferenceEngine
 from .utils import get_mltk_logger
 from .summarize_model import summarize_model
 from .evaluation_results import EvaluationResults
@@ -155,7 +158,9 @@ def evaluate_autoencoder(
     verbose: bool=None,
     show: bool=False,
     callbacks:list=None,
-    update_archive:bool=True
+    update_archive:bool=True,
+    streaming:bool=False,
+    n_jobs:int=1
 ) -> AutoEncoderEvaluationResults:
     """Evaluate a trained auto-encoder model
 
@@ -170,6 +175,11 @@ def evaluate_autoencoder(
         show: Show the evaluation results diagrams
         callbacks: Optional callbacks to invoke while evaluating
         update_archive: Update the model archive with the eval results
+        streaming: If true, then generate the predictions and scores batch-by-batch
+            rather than loading each classes' entire dataset into memory.
+            This allows for evaluating large datasets in constant memory
+        n_jobs: If tflite=True, the number of interpreters used to evaluate the .tflite model in parallel,
+            see :py:class:`mltk.core.tflite_model.TfliteInferenceEngine`. By default the model is evaluated serially
 
     Returns:
         Dictionary containing evaluation results
@@ -191,7 +201,7 @@ def evaluate_autoencoder(
     if update_archive:
         update_archive = mltk_model.check_archive_file_is_writable()
 
-    scoring_function = mltk_model.get_scoring_function()
+    batch_scoring_function = mltk_model.get_batch_scoring_function()
     classes = classes or mltk_model.eval_classes
 
     # Build the MLTK model's corresponding as a Keras model or .tflite
@@ -235,33 +245,17 @@ def evaluate_autoencoder(
             prepend_exception_msg(e, 'Failed to load model evaluation dataset' )
             raise
 
-        eval_data = _retrieve_data(mltk_model.x)
-
         logger.info(f'Generating model predictions for {class_label} class ...')
-        if isinstance(built_model, KerasModel):
-            y_pred = built_model.predict(
-                x = eval_data,
-                callbacks=callbacks,
-                verbose=1 if verbose else 0,
-            )
-        else:
-            y_pred = built_model.predict(x = eval_data, y_dtype=np.float32)
-
-        # loop over all original images and their corresponding reconstructions
-        class_scores = np.empty((len(eval_data),), dtype=np.float32)
-        dump_count = 0
-        for i, (orig, decoded) in enumerate(zip(eval_data, y_pred)):
-            try:
-                class_scores[i] = scoring_function(orig, decoded)
-            except Exception as e:
-                prepend_exception_msg(e, 'Error executing scoring function')
-                raise
-
-            if dump and dump_count < 200: # Don't dump more than 200 samples
-                dump_count += 1
-                dump_path = f'{dump_dir}/{class_label}/{i}.png'
-                _save_decoded_image(dump_path, orig, decoded, class_scores[i])
-
+        class_scores = _generate_class_scores(
+            x=mltk_model.x,
+            built_model=built_model,
+            batch_scoring_function=batch_scoring_function,
+            streaming=streaming,
+            callbacks=callbacks,
+            verbose=verbose,
+            dumper=_SampleDumper(f'{dump_dir}/{class_label}') if dump else None,
+            n_jobs=n_jobs
+        )
         all_scores.append(class_scores)
 
     mltk_model.unload_dataset()
@@ -269,12 +263,7 @@ def evaluate_autoencoder(
     if dump:
         logger.info(f'Decoded comparisons available at {dump_dir}')
 
-
-    normal_pred = all_scores[0]
-    for i in range(1, len(all_scores)):
-        abnormal_scores = all_scores[i]
-        y_pred = np.append(normal_pred, abnormal_scores)
-        y_true = np.append(np.zeros_like(normal_pred), np.ones_like(abnormal_scores))
+    y_true, y_pred = _get_overall_scores(all_scores)
 
     results = AutoEncoderEvaluationResults(
         name= mltk_model.name,
@@ -359,16 +348,13 @@ def calculate_overall_accuracy(y_pred, y_true) -> float:
     y_true are the correct answers (0.0 for normal, 1.0 for anomaly)
     """
     thresholds = np.amin(y_pred) + np.arange(0.0, 1.0, .01)*(np.amax(y_pred)-np.amin(y_pred))
-    accuracy = 0.0
 
-    for threshold in thresholds:
-        y_pred_binary = (y_pred > threshold).astype(int)
-        correct = np.sum(y_pred_binary == y_true)
-        accuracy_tmp = correct / len(y_pred_binary)
-        if accuracy_tmp > accuracy:
-            accuracy = accuracy_tmp
+    true_positives, false_positives, _, n_normal = _count_above_thresholds(thresholds, y_pred, y_true)
+    # correct = abnormal samples > threshold + normal samples <= threshold
+    correct = true_positives + (n_normal - false_positives)
+    accuracy = np.max(correct) / len(y_pred)
 
-    return accuracy
+    return max(float(accuracy), 0.0)
 
 
 def calculate_overall_pr_accuracy(thresholds, y_pred, y_true) -> Tuple[List[float], List[float], float]:
@@ -377,31 +363,14 @@ def calculate_overall_pr_accuracy(thresholds, y_pred, y_true) -> Tuple[List[floa
     y_true are the correct answers (0.0 for normal, 1.0 for anomaly)
     this is the function that should be used for accuracy calculations
     """
-    # initialize all arrays
-    accuracy = 0
-    n_normal = np.sum(y_true == 0)
-    precision = [0.0 for _ in range(len(thresholds))]
-    recall = [0.0 for _ in range(len(thresholds))]
-
-    # Loop on all the threshold values
-    for threshold_item in range(len(thresholds)):
-        threshold = thresholds[threshold_item]
-        # Binarize the result
-        y_pred_binary = (y_pred > threshold).astype(int)
-        # Build matrix of TP, TN, FP and FN
-        #true_negative = np.sum((y_pred_binary[0:n_normal] == 0))
-        false_positive = np.sum((y_pred_binary[0:n_normal] == 1))
-        true_positive = np.sum((y_pred_binary[n_normal:] == 1))
-        false_negative = np.sum((y_pred_binary[n_normal:] == 0))
-        # Calculate and store precision and recall
-        precision[threshold_item] = true_positive / max(true_positive+false_positive, 1e-9)
-        recall[threshold_item] = true_positive / max(true_positive+false_negative, 1e-9)
-        # See if the accuracy has improved
-        accuracy_tmp = (precision[threshold_item]+recall[threshold_item]) / 2
-        if accuracy_tmp > accuracy:
-            accuracy = accuracy_tmp
-
-    return precision, recall, accuracy
+    true_positives, false_positives, n_abnormal, _ = _count_above_thresholds(thresholds, y_pred, y_true)
+    false_negatives = n_abnormal - true_positives
+
+    precision = true_positives / np.maximum(true_positives + false_positives, 1e-9)
+    recall = true_positives / np.maximum(true_positives + false_negatives, 1e-9)
+    accuracy = np.max((precision + recall) / 2, initial=0)
+
+    return precision.tolist(), recall.tolist(), float(accuracy)
 
 
 def calculate_overall_roc_auc(thresholds, y_pred, y_true) -> Tuple[List[float], List[float], float]:
@@ -410,31 +379,21 @@ def calculate_overall_roc_auc(thresholds, y_pred, y_true) -> Tuple[List[float],
     y_true are the correct answers (0.0 for normal, 1.0 for anomaly)
     this is the function that should be used for accuracy calculations
     """
-    # initialize all arrays
-    roc_auc = 0
-
-    n_normal = np.sum(y_true == 0)
-    tpr = [0.0 for _ in range(len(thresholds))]
-    fpr = [0.0 for _ in range(len(thresholds))]
-
-    # Loop on all the threshold values
-    for threshold_item in range(1,len(thresholds)):
-        threshold = thresholds[threshold_item]
-        # Binarize the result
-        y_pred_binary = (y_pred > threshold).astype(int)
-        # Build TP and FP
-        tpr[threshold_item] = np.sum((y_pred_binary[n_normal:] == 1))/float(len(y_true)-n_normal)
-        fpr[threshold_item] = np.sum((y_pred_binary[0:n_normal] == 1))/float(n_normal)
-
-        # Force boundary condition
-        fpr[0] = 1
+    true_positives, false_positives, n_abnormal, n_normal = _count_above_thresholds(thresholds, y_pred, y_true)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tpr = true_positives / float(n_abnormal)
+        fpr = false_positives / float(n_normal)
+
+    # Force boundary condition
+    if len(tpr) > 0:
         tpr[0] = 1
+        fpr[0] = 1
 
     # Integrate
-    for threshold_item in range(len(thresholds)-1):
-        roc_auc += .5*(tpr[threshold_item]+tpr[threshold_item+1])*(fpr[threshold_item]-fpr[threshold_item+1])
+    roc_auc = np.sum(.5*(tpr[:-1] + tpr[1:]) * (fpr[:-1] - fpr[1:]))
 
-    return tpr, fpr, roc_auc
+    return tpr.tolist(), fpr.tolist(), float(roc_auc)
 
 
 def calculate_class_stats(all_scores, classes) -> dict:
@@ -447,8 +406,8 @@ def calculate_class_stats(all_scores, classes) -> dict:
     for i in range(1, len(all_scores)):
         abnormal_scores = all_scores[i]
         total_scores += len(abnormal_scores)
-        y_pred = np.append(normal_pred, abnormal_scores)
-        y_true = np.append(np.zeros_like(normal_pred), np.ones_like(abnormal_scores))
+        y_pred = np.concatenate((normal_pred, abnormal_scores))
+        y_true = np.concatenate((np.zeros_like(normal_pred), np.ones_like(abnormal_scores)))
 
         fpr, tpr, thr = roc_curve(y_true, y_pred)
         roc_auc = auc(fpr, tpr)
@@ -660,6 +619,168 @@ def plot_class_roc(results:dict, output_dir:str, show, logger: logging.Logger):
 
 
 
+def _count_above_thresholds(thresholds, y_pred, y_true) -> Tuple[np.ndarray, np.ndarray, int, int]:
+    """Return the number of abnormal and normal samples with a score > each threshold
+
+    Returns:
+        (true positives, false positives, number of abnormal samples, number of normal samples)
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    is_abnormal = np.asarray(y_true) == 1
+
+    abnormal_scores = np.sort(y_pred[is_abnormal])
+    normal_scores = np.sort(y_pred[~is_abnormal])
+    # searchsorted(side='right') returns the number of scores <= threshold
+    true_positives = len(abnormal_scores) - np.searchsorted(abnormal_scores, thresholds, side='right')
+    false_positives = len(normal_scores) - np.searchsorted(normal_scores, thresholds, side='right')
+
+    return true_positives, false_positives, len(abnormal_scores), len(normal_scores)
+
+
+def _get_overall_scores(all_scores:List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the expected labels and the scores of all the classes' samples
+
+    The first class is "normal" and all other classes are "abnormal"
+
+    Returns:
+        (y_true, y_pred)
+    """
+    y_pred = np.concatenate(all_scores)
+    y_true = np.ones_like(y_pred)
+    y_true[:len(all_scores[0])] = 0
+    return y_true, y_pred
+
+
+def _generate_class_scores(
+    x,
+    built_model,
+    batch_scoring_function,
+    streaming:bool=False,
+    callbacks:list=None,
+    verbose:bool=None,
+    dumper:_SampleDumper=None,
+    n_jobs:int=1
+) -> np.ndarray:
+    """Generate the predictions of the given class's samples and return their scores"""
+    if streaming:
+        return _score_batches(
+            x=x,
+            built_model=built_model,
+            batch_scoring_function=batch_scoring_function,
+            callbacks=callbacks,
+            dumper=dumper,
+            n_jobs=n_jobs
+        )
+
+    eval_data = _retrieve_data(x)
+    if isinstance(built_model, KerasModel):
+        y_pred = built_model.predict(
+            x = eval_data,
+            callbacks=callbacks,
+            verbose=1 if verbose else 0,
+        )
+    elif n_jobs == 1:
+        y_pred = built_model.predict(x = eval_data, y_dtype=np.float32)
+    else:
+        with TfliteInferenceEngine(built_model, n_jobs=n_jobs) as engine:
+            y_pred = engine.predict(x = eval_data, y_dtype=np.float32)
+
+    class_scores = _score_batch(batch_scoring_function, eval_data, y_pred)
+    if dumper is not None:
+        dumper.dump(eval_data, y_pred, class_scores)
+
+    return class_scores
+
+
+def _score_batch(batch_scoring_function, x:np.ndarray, y_pred:np.ndarray) -> np.ndarray:
+    try:
+        scores = batch_scoring_function(x, y_pred)
+    except Exception as e:
+        prepend_exception_msg(e, 'Error executing scoring function')
+        raise
+    return np.reshape(np.asarray(scores, dtype=np.float32), (len(x),))
+
+
+def _score_batches(
+    x,
+    built_model,
+    batch_scoring_function,
+    callbacks:list=None,
+    dumper:_SampleDumper=None,
+    n_jobs:int=1
+) -> np.ndarray:
+    """Generate the predictions and scores batch-by-batch and return the scores of all the samples"""
+    if isinstance(x, tf.Tensor):
+        x = x.numpy()
+
+    if isinstance(x, np.ndarray):
+        max_samples = len(x)
+        batches = (x[i:i+32] for i in range(0, len(x), 32))
+    else:
+        if hasattr(x, 'max_samples') and x.max_samples > 0:
+            max_samples = x.max_samples
+        elif hasattr(x, 'samples') and x.samples > 0:
+            max_samples = x.samples
+        else:
+            max_samples = 10000
+        batches = (batch[0] if isinstance(batch, tuple) else batch for batch in x)
+
+    scores = np.empty((max_samples,), dtype=np.float32)
+    n_samples = 0
+
+    def _add_batch(batch_x, batch_pred):
+        nonlocal n_samples
+        n = min(len(batch_x), max_samples - n_samples)
+        batch_x = batch_x[:n]
+        batch_pred = batch_pred[:n]
+        batch_scores = _score_batch(batch_scoring_function, batch_x, batch_pred)
+        scores[n_samples:n_samples+n] = batch_scores
+        if dumper is not None:
+            dumper.dump(batch_x, batch_pred, batch_scores, offset=n_samples)
+        n_samples += n
+
+    if isinstance(built_model, KerasModel):
+        for batch_x in batches:
+            if n_samples >= max_samples:
+                break
+            _add_batch(batch_x, built_model.predict(batch_x, callbacks=callbacks, verbose=0))
+
+    else:
+        # The engine returns the results in order, so the inputs are queued
+        # until their corresponding predictions are returned
+        batch_inputs = collections.deque()
+        def _iterate_batch_x():
+            for batch_x in batches:
+                if n_samples + sum(len(b) for b in batch_inputs) >= max_samples:
+                    break
+                batch_inputs.append(batch_x)
+                yield batch_x
+
+        with TfliteInferenceEngine(built_model, n_jobs=n_jobs) as engine:
+            for batch_pred in engine.predict_iter(_iterate_batch_x(), y_dtype=np.float32):
+                _add_batch(batch_inputs.popleft(), batch_pred)
+
+    try:
+        x.reset()
+    except:
+        pass
+
+    return scores[:n_samples]
+
+
+class _SampleDumper:
+    """Save a side-by-side comparison of the first samples and their model outputs"""
+    MAX_SAMPLES = 200 # Don't dump more than 200 samples
+
+    def __init__(self, out_dir:str):
+        self.out_dir = out_dir
+
+    def dump(self, x:np.ndarray, y_pred:np.ndarray, scores:np.ndarray, offset=0):
+        for i in range(min(len(x), self.MAX_SAMPLES - offset)):
+            _save_decoded_image(f'{self.out_dir}/{offset + i}.png', x[i], y_pred[i], scores[i])
+
+
 def _retrieve_data(x):
     if isinstance(x, np.ndarray):
         return x
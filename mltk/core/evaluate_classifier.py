@@ -1,5 +1,7 @@
-from typing import List, Tuple,Union
+from __future__ import annotations
+from typing import List, Tuple, Union, Iterator
 import logging
+import collections
 import json
 
 import tqdm
@@ -14,14 +16,14 @@ from .model import (
     model_utils,
     MltkModel,
     MltkModelEvent,
-    KerasModel,
     TrainMixin,
     DatasetMixin,
     EvaluateClassifierMixin,
     load_tflite_or_keras_model,
 
 )
-from .tflite_model import TfliteModel
+from .keras import KerasModel
+from .tflite_model import TfliteModel, TfliteInferenceEngine
 from .utils import get_mltk_logger
 from .summarize_model import summarize_model
 from .evaluation_results import EvaluationResults
@@ -126,12 +128,7 @@ class ClassifierEvaluationResults(EvaluationResults):
 
         if len(y_pred.shape) == 1:
             n_classes = 2
-            n_samples = len(y_pred)
-            y_pred_orig = y_pred
-            y_pred = np.zeros((n_samples, n_classes), dtype=np.float32)
-            for i, pred in enumerate(y_pred_orig):
-                class_id = 0 if pred < 0.5 else 1
-                y_pred[i][class_id] = pred
+            y_pred = _binary_to_categorical(y_pred)
         else:
             n_classes = y_pred.shape[1]
 
@@ -152,6 +149,38 @@ class ClassifierEvaluationResults(EvaluationResults):
         self['confusion_matrix'] = calculate_confusion_matrix(y_pred, y)
 
 
+    def calculate_from_metrics(self, metrics:ClassifierMetrics):
+        """Calculate the evaluation results from the given accumulated metrics
+
+        This is similar to :py:meth:`~calculate` except the results are calculated
+        from the metric state accumulated batch-by-batch by :py:class:`~ClassifierMetrics`.
+        So the predictions do not need to be stored.
+
+        .. note:: The precision and recall are calculated at the ROC thresholds
+           rather than at every unique prediction value
+
+        Args:
+            metrics: The accumulated metrics
+        """
+        if metrics.n_samples == 0:
+            raise ValueError('No samples have been added to the metrics')
+
+        if 'classes' not in self or not self['classes']:
+            self['classes'] = [str(x) for x in range(metrics.n_classes)]
+
+        self['overall_accuracy'] = metrics.n_correct / metrics.n_samples
+        self['class_accuracies'] = _divide_or_zero(metrics.class_correct, metrics.class_counts).tolist()
+        fpr, tpr, roc_auc = _calculate_roc(metrics.positive_counts, metrics.negative_counts)
+        self['fpr'], self['tpr'], self['roc_auc'] = fpr.tolist(), tpr.tolist(), roc_auc.tolist()
+        self['roc_thresholds'] = metrics.thresholds.tolist()
+        self['roc_auc_avg'] = sum(self['roc_auc']) / metrics.n_classes
+        self['precision'], self['recall'] = _calculate_threshold_precision_recall(
+            metrics.positive_counts,
+            metrics.negative_counts
+        )
+        self['confusion_matrix'] = metrics.confusion_matrix.tolist()
+
+
     def generate_summary(self) -> str:
         """Generate and return a summary of the results as a string"""
         s = super().generate_summary(include_all=False)
@@ -180,6 +209,61 @@ class ClassifierEvaluationResults(EvaluationResults):
 
 
 
+class ClassifierMetrics:
+    """Accumulates the classifier evaluation metrics batch-by-batch
+
+    Rather than storing the predictions of every evaluation sample,
+    this updates the counts required to calculate the evaluation results for each batch of predictions.
+    Use :py:meth:`ClassifierEvaluationResults.calculate_from_metrics` to calculate the results.
+
+    Args:
+        n_classes: The number of classes
+        threshold: The step size between the ROC thresholds
+    """
+    def __init__(self, n_classes:int, threshold=.01):
+        self.n_classes = n_classes
+        self.thresholds = np.arange(0.0, 1.01, threshold)
+        self.n_samples = 0
+        self.n_correct = 0
+        self.class_counts = np.zeros((n_classes,), dtype=np.int64)
+        self.class_correct = np.zeros((n_classes,), dtype=np.int64)
+        # [n_classes, 1 + n_thresholds] number of positive/negative samples,
+        # column 0 is the total and column i+1 is the number with a prediction > thresholds[i]
+        self.positive_counts = np.zeros((n_classes, len(self.thresholds)+1), dtype=np.int64)
+        self.negative_counts = np.zeros((n_classes, len(self.thresholds)+1), dtype=np.int64)
+        self.confusion_matrix = np.zeros((n_classes, n_classes), dtype=np.int64)
+
+
+    def update(self, y_pred:np.ndarray, y_label:np.ndarray):
+        """Add a batch of predictions to the metrics
+
+        Args:
+            y_pred: Model predictions as [n_samples, n_classes] or [n_samples] for binary
+            y_label: The corresponding class id of each sample as [n_samples] or one-hot encoded [n_samples, n_classes]
+        """
+        y_pred = np.asarray(y_pred)
+        y_label = np.asarray(y_label)
+        if len(y_pred.shape) == 2 and y_pred.shape[1] == 1:
+            y_pred = np.squeeze(y_pred, -1)
+        if len(y_pred.shape) == 1:
+            y_pred = _binary_to_categorical(y_pred)
+        if len(y_label.shape) == 2:
+            y_label = np.squeeze(y_label, -1) if y_label.shape[1] == 1 else np.argmax(y_label, -1)
+        y_label = y_label.astype(np.int64)
+
+        y_pred_label = np.argmax(y_pred, axis=1)
+        correct = y_pred_label == y_label
+        self.n_samples += len(y_label)
+        self.n_correct += int(np.sum(correct))
+        self.class_counts += np.bincount(y_label, minlength=self.n_classes)[:self.n_classes]
+        self.class_correct += np.bincount(y_label[correct], minlength=self.n_classes)[:self.n_classes]
+        positive_counts, negative_counts = _count_above_thresholds(y_pred, y_label, self.thresholds)
+        self.positive_counts += positive_counts
+        self.negative_counts += negative_counts
+        np.add.at(self.confusion_matrix, (y_label, y_pred_label), 1)
+
+
+
 def evaluate_classifier(
     mltk_model:MltkModel,
     tflite:bool=False,
@@ -189,6 +273,9 @@ def evaluate_classifier(
     verbose:bool=False,
     show:bool=False,
     update_archive:bool=True,
+    accumulate_metrics:bool=False,
+    tflite_micro:bool=False,
+    n_jobs:int=1,
     **kwargs
 ) -> ClassifierEvaluationResults:
     """Evaluate a trained classification model
@@ -202,6 +289,12 @@ def evaluate_classifier(
         verbose: Enable progress bar
         show: Show the evaluation results diagrams
         update_archive: Update the model archive with the eval results
+        accumulate_metrics: Accumulate the evaluation metrics batch-by-batch rather than storing all of the predictions,
+            see :py:class:`~ClassifierMetrics`. This is useful for large datasets
+        tflite_micro: If true and tflite=True, then evaluate the .tflite model in the TF-Lite Micro interpreter
+            (i.e. the results are bit-exact with the model running on an embedded device)
+        n_jobs: If tflite=True, the number of interpreters used to evaluate the .tflite model in parallel,
+            see :py:class:`mltk.core.tflite_model.TfliteInferenceEngine`. By default the model is evaluated serially
 
     Returns:
         Dictionary containing evaluation results
@@ -259,6 +352,9 @@ def evaluate_classifier(
             show=show,
             logger=logger,
             update_archive=update_archive,
+            accumulate_metrics=accumulate_metrics,
+            tflite_micro=tflite_micro,
+            n_jobs=n_jobs,
         )
 
     finally:
@@ -274,6 +370,9 @@ def evaluate_classifier_with_built_model(
     show:bool=False,
     logger:logging.Logger = None,
     update_archive:bool=True,
+    accumulate_metrics:bool=False,
+    tflite_micro:bool=False,
+    n_jobs:int=1,
 ) -> ClassifierEvaluationResults:
     """Evaluate a trained classification model with built model
 
@@ -284,6 +383,10 @@ def evaluate_classifier_with_built_model(
         show: Show the evaluation results diagrams
         update_archive: Update the model archive with the eval results
         logger: Optional python logger
+        accumulate_metrics: Accumulate the evaluation metrics batch-by-batch rather than storing all of the predictions,
+            see :py:class:`~ClassifierMetrics`
+        tflite_micro: Evaluate the TfliteModel in the TF-Lite Micro interpreter
+        n_jobs: The number of interpreters used to evaluate the TfliteModel in parallel
 
     Returns:
         Dictionary containing evaluation results
@@ -298,21 +401,34 @@ def evaluate_classifier_with_built_model(
 
     gpu.initialize(logger=logger)
 
-    y_label, y_pred = generate_predictions(
-        mltk_model=mltk_model,
-        built_model=built_model,
-        verbose=verbose
-    )
-
     results = ClassifierEvaluationResults(
         name=mltk_model.name,
         classes=getattr(mltk_model, 'classes', None)
     )
 
-    results.calculate(
-        y=y_label,
-        y_pred=y_pred,
-    )
+    if accumulate_metrics:
+        metrics = None
+        for batch_y, pred in _iterate_predictions(mltk_model, built_model, verbose=verbose, tflite_micro=tflite_micro, n_jobs=n_jobs):
+            if metrics is None:
+                metrics = ClassifierMetrics(n_classes=max(pred.shape[-1], 2) if len(pred.shape) > 1 else 2)
+            metrics.update(y_pred=pred, y_label=batch_y)
+        if metrics is None:
+            raise RuntimeError('No evaluation samples were generated')
+        results.calculate_from_metrics(metrics)
+
+    else:
+        y_label, y_pred = generate_predictions(
+            mltk_model=mltk_model,
+            built_model=built_model,
+            verbose=verbose,
+            tflite_micro=tflite_micro,
+            n_jobs=n_jobs
+        )
+
+        results.calculate(
+            y=y_label,
+            y_pred=y_pred,
+        )
 
     eval_results_path = f'{eval_dir}/eval-results.json'
     with open(eval_results_path, 'w') as f:
@@ -346,7 +462,9 @@ def evaluate_classifier_with_built_model(
 def generate_predictions(
     mltk_model: MltkModel,
     built_model:Union[KerasModel, TfliteModel],
-    verbose:bool=None
+    verbose:bool=None,
+    tflite_micro:bool=False,
+    n_jobs:int=1
 ) -> Tuple[np.ndarray, np.ndarray]:
     """Generate predictions using evaluation data
 
@@ -354,6 +472,8 @@ def generate_predictions(
         mltk_model: MltkModel instance
         built_model: Built/trained Keras or TfliteModel
         verbose: Enable progress bar
+        tflite_micro: Generate the TfliteModel predictions with the TF-Lite Micro interpreter
+        n_jobs: The number of interpreters used to generate the TfliteModel predictions in parallel
 
     Returns:
         (y_label, y_pred) The evaluation sample labels and corresponding model predictions
@@ -361,20 +481,12 @@ def generate_predictions(
     y_pred = []
     y_label = []
 
-    with get_progbar(mltk_model, verbose) as progbar:
-        for batch_x, batch_y in iterate_evaluation_data(mltk_model):
-            if isinstance(built_model, KerasModel):
-                pred = built_model.predict(batch_x, verbose=0)
-            else:
-                pred = built_model.predict(batch_x, y_dtype=np.float32)
-
-            progbar.update(len(pred))
-
-            y_pred.extend(pred)
-            if batch_y.shape[-1] == 1 or len(batch_y.shape) == 1:
-                y_label.extend(batch_y)
-            else:
-                y_label.extend(np.argmax(batch_y, -1))
+    for batch_y, pred in _iterate_predictions(mltk_model, built_model, verbose=verbose, tflite_micro=tflite_micro, n_jobs=n_jobs):
+        y_pred.extend(pred)
+        if batch_y.shape[-1] == 1 or len(batch_y.shape) == 1:
+            y_label.extend(batch_y)
+        else:
+            y_label.extend(np.argmax(batch_y, -1))
 
     y_pred = list_to_numpy_array(y_pred)
     y_label = np.asarray(y_label, dtype=np.int32)
@@ -382,6 +494,43 @@ def generate_predictions(
     return y_label, y_pred
 
 
+def _iterate_predictions(
+    mltk_model: MltkModel,
+    built_model:Union[KerasModel, TfliteModel],
+    verbose:bool=None,
+    tflite_micro:bool=False,
+    n_jobs:int=1
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Iterate the evaluation data and yield the (batch_y, predictions) of each batch"""
+    with get_progbar(mltk_model, verbose) as progbar:
+        if isinstance(built_model, KerasModel):
+            for batch_x, batch_y in iterate_evaluation_data(mltk_model):
+                pred = built_model.predict(batch_x, verbose=0)
+                progbar.update(len(pred))
+                yield batch_y, pred
+
+        elif n_jobs == 1 and not tflite_micro:
+            for batch_x, batch_y in iterate_evaluation_data(mltk_model):
+                pred = built_model.predict(batch_x, y_dtype=np.float32)
+                progbar.update(len(pred))
+                yield batch_y, pred
+
+        else:
+            # Shard the batches across multiple TF-Lite interpreters.
+            # The results are returned in order, so the labels are
+            # queued as each batch is given to the engine
+            batch_labels = collections.deque()
+            def _iterate_batch_x():
+                for batch_x, batch_y in iterate_evaluation_data(mltk_model):
+                    batch_labels.append(batch_y)
+                    yield batch_x
+
+            with TfliteInferenceEngine(built_model, n_jobs=n_jobs, tflite_micro=tflite_micro) as engine:
+                for pred in engine.predict_iter(_iterate_batch_x(), y_dtype=np.float32):
+                    progbar.update(len(pred))
+                    yield batch_labels.popleft(), pred
+
+
 def plot_results(
     results:ClassifierEvaluationResults,
     show=True,
@@ -443,27 +592,14 @@ def calculate_per_class_accuracies(y_pred:np.ndarray, y_label:np.ndarray) -> Lis
     Return list of each classes' accuracy
     """
 
-    n_samples, n_classes = y_pred.shape
+    n_classes = y_pred.shape[1]
+    y_label = np.asarray(y_label).astype(np.int64)
 
-    # Initialize array of accuracies
-    accuracies = np.zeros(n_classes)
+    correct = np.argmax(y_pred, axis=1) == y_label
+    class_counts = np.bincount(y_label, minlength=n_classes)[:n_classes]
+    class_correct = np.bincount(y_label[correct], minlength=n_classes)[:n_classes]
 
-    # Loop on classes
-    for class_id in range(n_classes):
-        true_positives = 0
-        # Loop on all predictions
-        for i in range(n_samples):
-            # Check if it matches the class that we are working on
-            if y_label[i] == class_id:
-                # Get prediction label
-                y_pred_label = np.argmax(y_pred[i,:])
-                # Check if the prediction is correct
-                if y_pred_label == class_id:
-                    true_positives += 1
-
-        accuracies[class_id] = _safe_divide(true_positives, np.sum(y_label == class_id))
-
-    return accuracies.tolist()
+    return _divide_or_zero(class_correct, class_counts).tolist()
 
 
 def calculate_auc(y_pred:np.ndarray, y_label:np.ndarray, threshold=.01) -> Tuple[float, float, List[float], List[float]]:
@@ -476,51 +612,15 @@ def calculate_auc(y_pred:np.ndarray, y_label:np.ndarray, threshold=.01) -> Tuple
     Return tuple:
     false positive rate, true positive rate, list ROC AUC for each class, list of thresholds
     """
-    n_samples, n_classes = y_pred.shape
-
     # thresholds, linear range
     thresholds = np.arange(0.0, 1.01, threshold)
 
-    n_thresholds = len(thresholds)
-
-    # false positive rate
-    fpr = np.zeros((n_classes, n_thresholds))
-    # true positive rate
-    tpr = np.zeros((n_classes, n_thresholds))
-    # area under curve
-    roc_auc = np.zeros(n_classes)
-
-    # get number of positive and negative examples in the dataset
-    for class_item in range(n_classes):
-        # Sum of all true positive answers
-        all_positives = sum(y_label == class_item)
-        # Sum of all true negative answers
-        all_negatives = len(y_label) - all_positives
-
-        # iterate through all thresholds and determine fraction of true positives
-        # and false positives found at this threshold
-        for threshold_item in range(1, n_thresholds):
-            threshold = thresholds[threshold_item]
-            false_positives = 0
-            true_positives = 0
-            for i in range(n_samples):
-                # Check prediction for this threshold
-                if (y_pred[i, class_item] > threshold):
-                    if y_label[i] == class_item:
-                        true_positives += 1
-                    else:
-                        false_positives += 1
-            fpr[class_item, threshold_item] = _safe_divide(false_positives, float(all_negatives))
-            tpr[class_item, threshold_item] = _safe_divide(true_positives, float(all_positives))
-
-            # Force boundary condition
-            fpr[class_item,0] = 1
-            tpr[class_item,0] = 1
-
-        # calculate area under curve, trapezoid integration
-        for threshold_item in range(len(thresholds)-1):
-            roc_auc[class_item] += .5*(tpr[class_item,threshold_item]+tpr[class_item,threshold_item+1])*(fpr[class_item,threshold_item]-fpr[class_item,threshold_item+1])
-
+    positive_counts, negative_counts = _count_above_thresholds(
+        y_pred,
+        np.asarray(y_label).astype(np.int64),
+        thresholds
+    )
+    fpr, tpr, roc_auc = _calculate_roc(positive_counts, negative_counts)
 
     return fpr.tolist(), tpr.tolist(), roc_auc.tolist(), thresholds.tolist()
 
@@ -816,6 +916,85 @@ def _safe_divide(num, dem):
         return num / dem
 
 
+def _divide_or_zero(num:np.ndarray, dem:np.ndarray) -> np.ndarray:
+    """Element-wise division but where the denominator is 0 then return 0"""
+    num = np.asarray(num, dtype=np.float64)
+    dem = np.asarray(dem, dtype=np.float64)
+    retval = np.zeros(np.broadcast(num, dem).shape, dtype=np.float64)
+    np.divide(num, dem, out=retval, where=dem != 0)
+    return retval
+
+
+def _binary_to_categorical(y_pred:np.ndarray) -> np.ndarray:
+    """Convert [n_samples] binary predictions to [n_samples, 2]
+    where < 0.5 maps to class 0 and >= 0.5 maps to class 1"""
+    n_samples = len(y_pred)
+    retval = np.zeros((n_samples, 2), dtype=np.float32)
+    retval[np.arange(n_samples), (y_pred >= 0.5).astype(np.int64)] = y_pred
+    return retval
+
+
+def _count_above_thresholds(
+    y_pred:np.ndarray,
+    y_label:np.ndarray,
+    thresholds:np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Count the positive and negative samples of each class with a prediction > each threshold
+
+    Returns:
+        Tuple of [n_classes, 1 + n_thresholds] arrays: (positive counts, negative counts)
+        where column 0 is the total number of samples and column i+1 is the number of samples with a prediction > thresholds[i]
+    """
+    n_classes = y_pred.shape[1]
+    n_thresholds = len(thresholds)
+    positive_counts = np.zeros((n_classes, n_thresholds+1), dtype=np.int64)
+    negative_counts = np.zeros((n_classes, n_thresholds+1), dtype=np.int64)
+
+    for class_id in range(n_classes):
+        is_positive = y_label == class_id
+        # The index of each prediction is the number of thresholds that are < the prediction
+        indices = np.searchsorted(thresholds, y_pred[:, class_id].astype(np.float64), side='left')
+        # So the number of predictions > thresholds[i] is the number of indices >= i+1
+        for counts, mask in ((positive_counts, is_positive), (negative_counts, ~is_positive)):
+            hist = np.bincount(indices[mask], minlength=n_thresholds+1)
+            counts[class_id] = np.cumsum(hist[::-1])[::-1]
+
+    return positive_counts, negative_counts
+
+
+def _calculate_roc(
+    positive_counts:np.ndarray,
+    negative_counts:np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate the false positive rate, true positive rate, and area under curve of each class
+    from the counts returned by _count_above_thresholds()"""
+    fpr = _divide_or_zero(negative_counts[:, 1:], negative_counts[:, :1])
+    tpr = _divide_or_zero(positive_counts[:, 1:], positive_counts[:, :1])
+
+    # Force boundary condition
+    fpr[:, 0] = 1
+    tpr[:, 0] = 1
+
+    # calculate area under curve, trapezoid integration
+    roc_auc = np.sum(.5*(tpr[:, :-1] + tpr[:, 1:]) * (fpr[:, :-1] - fpr[:, 1:]), axis=1)
+
+    return fpr, tpr, roc_auc
+
+
+def _calculate_threshold_precision_recall(
+    positive_counts:np.ndarray,
+    negative_counts:np.ndarray
+) -> Tuple[List[List[float]], List[List[float]]]:
+    """Calculate each classes' precision and recall at each threshold
+    from the counts returned by _count_above_thresholds()"""
+    true_positives = positive_counts[:, 1:]
+    predicted_positives = true_positives + negative_counts[:, 1:]
+    # Where no samples are predicted as positive, the precision is 1 (the same as sklearn's precision_recall_curve)
+    precision = np.where(predicted_positives > 0, _divide_or_zero(true_positives, predicted_positives), 1.0)
+    recall = _divide_or_zero(true_positives, positive_counts[:, :1])
+    return precision.tolist(), recall.tolist()
+
+
 def _label_binarize(y_label):
     """This calls label_binarize() but ensures the return value
     always has the shape: [n_samples, n_classes]"""
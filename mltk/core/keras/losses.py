@@ -99,6 +99,14 @@ if _have_tfp:
 else:
     corr_loss_func = None
 
+# These return the score of each sample in the given batch, i.e. [n_samples]
+mse_batch_loss_func = lambda y_true, y_pred: np.mean(np.reshape((y_true - y_pred) ** 2, (len(y_true), -1)), axis=-1)
+mae_batch_loss_func = lambda y_true, y_pred: np.mean(np.reshape(np.abs(y_pred - y_true), (len(y_true), -1)), axis=-1)
+if _have_tfp:
+    corr_batch_loss_func = lambda y_true, y_pred: -np.asarray(tfp.stats.correlation(y_true, y_pred, sample_axis=(-1,-2,-3), event_axis=None))
+else:
+    corr_batch_loss_func = None
+
 
 def ssim_loss_func(y_true, y_pred):
     # https://www.tensorflow.org/api_docs/python/tf/image/ssim
@@ -1,3 +1,4 @@
+from typing import TYPE_CHECKING
 from .model import MltkModel, MltkModelEvent
 from .mixins.audio_dataset_mixin import AudioDatasetMixin
 from .mixins.data_generator_dataset_mixin import DataGeneratorDatasetMixin
@@ -15,6 +16,17 @@ from .model_utils import (
     list_mltk_models,
     load_tflite_or_keras_model,
     load_tflite_model,
-    KerasModel,
 )
 
+if TYPE_CHECKING:
+    from ..keras import KerasModel
+
+
+def __getattr__(name:str):
+    # KerasModel is imported on first access
+    # so that importing this package does not import Tensorflow
+    if name == 'KerasModel':
+        from .model_utils import KerasModel # pylint: disable=import-outside-toplevel
+        return KerasModel
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
@@ -1,14 +1,19 @@
 from typing import Union
 import logging
 
-from tensorflow.keras.layers import Layer as KerasLayer
-from tensorflow.keras.models import Model as KerasModel 
-
 from mltk.core import (TfliteLayer, TfliteModel)
 from mltk.utils.logger import DummyLogger
 
 from .layers import load_layers, parse_layer
-from .layers.layer import LayerMetrics
+from .layers.layer import LayerMetrics, LazyKerasType, KerasLayer
+
+
+class KerasModel(metaclass=LazyKerasType):
+    """Placeholder for tensorflow.keras.models.Model"""
+    @staticmethod
+    def get_type():
+        from tensorflow.keras.models import Model # pylint: disable=import-outside-toplevel
+        return Model
 
 
 def calculate_model_metrics(
@@ -3,10 +3,9 @@ import copy
 from typing import Union
 
 
-from tensorflow.keras.layers import Layer as KerasLayer
 from mltk.core import TfliteLayer
 
-from .layer import Layer, SUPPORTED_LAYERS
+from .layer import Layer, KerasLayer, SUPPORTED_LAYERS
 
 
 def parse_layer(model_layer: Union[TfliteLayer, KerasLayer]) -> Layer:
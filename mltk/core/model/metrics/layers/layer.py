@@ -1,9 +1,29 @@
 from typing import Union
+import sys
 from abc import ABC, abstractmethod
 from collections import namedtuple
 
 from mltk.core import TfliteLayer
-from tensorflow.keras.layers import Layer as KerasLayer
+
+
+class LazyKerasType(type):
+    """Metaclass of a placeholder for a Keras type
+
+    isinstance() checks against the placeholder do not import Tensorflow.
+    If Tensorflow has not been imported yet, then the object cannot be a Keras object.
+    """
+    def __instancecheck__(cls, obj):
+        if 'tensorflow' not in sys.modules:
+            return False
+        return isinstance(obj, cls.get_type())
+
+
+class KerasLayer(metaclass=LazyKerasType):
+    """Placeholder for tensorflow.keras.layers.Layer"""
+    @staticmethod
+    def get_type():
+        from tensorflow.keras.layers import Layer # pylint: disable=import-outside-toplevel
+        return Layer
 
 
 SUPPORTED_LAYERS = []
@@ -1,6 +1,11 @@
 
+from typing import Dict
 import os 
+import sys
+import copy
+import struct
 import zipfile
+import contextlib
 
 import mltk
 from mltk.utils.path import (create_tempdir, remove_directory, fullpath)
@@ -12,10 +17,18 @@ from ..model_attributes import MltkModelAttributesDecorator
 ARCHIVE_EXTENSION = '.mltk.zip'
 TEST_ARCHIVE_EXTENSION = '-test.mltk.zip'
 
+# Files with these extensions are already compressed,
+# so they are stored in the archive as-is instead of being compressed again
+PRECOMPRESSED_EXTENSIONS = (
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z',
+    '.png', '.jpg', '.jpeg', '.gif', '.mp3', '.mp4',
+)
+
 
 @MltkModelAttributesDecorator()
 class ArchiveMixin(BaseMixin):
-    
+    _archive_transaction: '_ArchiveTransaction' = None
+
     @property 
     def archive_path(self):
         """Return path to model archive file (.mdk.zip)"""
@@ -112,11 +125,10 @@ class ArchiveMixin(BaseMixin):
 
         if not os.path.exists(file_path):
             raise FileNotFoundError(f'File not found: {file_path}')
-      
-        zip_fp = self._create_archive(exclude=[arcname])
+
         get_mltk_logger().debug(f'Archiving {file_path} -> {arcname}')
-        zip_fp.write(file_path, arcname=arcname)
-        zip_fp.close()
+        with self.archive_transaction() as txn:
+            txn.add(file_path, arcname=arcname)
  
 
     def add_archive_dir(self, base_dir, create_new=False, recursive=False):
@@ -124,48 +136,74 @@ class ArchiveMixin(BaseMixin):
 
         search_dir = f'{self.log_dir}/{base_dir}'
 
-        src_paths = []
-        arcnames = []
-        for root, _, files in os.walk(search_dir):
-            for fn in files:
-                src_path = f'{root}/{fn}'.replace('\\', '/')
-                arcname = os.path.relpath(src_path, self.log_dir).replace('\\', '/')
-                src_paths.append(src_path)
-                arcnames.append(arcname)
-            
-            if not recursive:
-                break
-
-        zip_fp = self._create_archive(create_new=create_new, exclude=arcnames)
-        for i, src_path in enumerate(src_paths):
-            zip_fp.write(src_path, arcname=arcnames[i])
-        zip_fp.close()
-    
+        with self.archive_transaction() as txn:
+            if create_new:
+                txn.clear()
 
-    def _create_archive(self, create_new=False, exclude=None):
-        if exclude is None:
-            exclude = []
-        
-        if not create_new and os.path.exists(self.archive_path):
-            tmp_dir = create_tempdir(f'tmp_archives/{self.name}')
-            remove_directory(tmp_dir)
-            with zipfile.ZipFile(self.archive_path, 'r') as zip_fp:
-                members = [x for x in zip_fp.namelist() if x not in exclude]
-                zip_fp.extractall(tmp_dir, members=members)
-            
-            zip_fp = zipfile.ZipFile(self.archive_path, 'w', zipfile.ZIP_DEFLATED)
-            for root, _, files in os.walk(tmp_dir):
+            for root, _, files in os.walk(search_dir):
                 for fn in files:
-                    src_path = f'{root}/{fn}'
-                    arcname = os.path.relpath(src_path, tmp_dir).replace('\\', '/')
-                    zip_fp.write(src_path, arcname=arcname)
+                    src_path = f'{root}/{fn}'.replace('\\', '/')
+                    arcname = os.path.relpath(src_path, self.log_dir).replace('\\', '/')
+                    txn.add(src_path, arcname=arcname)
+                
+                if not recursive:
+                    break
+
+
+    @contextlib.contextmanager
+    def archive_transaction(self):
+        """Batch multiple updates to the model archive into a single update
+
+        The :py:meth:`~add_archive_file` and :py:meth:`~add_archive_dir` calls made
+        within the context are staged and the archive is only updated once when the context exits.
+        Nested transactions are merged into the outermost transaction.
+        If an exception is raised within the context then the archive is not modified.
+
+        .. highlight:: python
+        .. code-block:: python
+
+            with my_model.archive_transaction():
+                my_model.add_archive_file('__mltk_model_spec__')
+                my_model.add_archive_file(tflite_path)
+                my_model.add_archive_dir('eval')
+
+        See :py:func:`~add_files_to_archive` for how the archive is updated.
+        """
+        if self._archive_transaction is not None:
+            yield self._archive_transaction
+            return
+
+        txn = _ArchiveTransaction()
+        self._archive_transaction = txn
+        try:
+            yield txn
+        finally:
+            self._archive_transaction = None
 
-            remove_directory(tmp_dir)
-        else:
-            zip_fp = zipfile.ZipFile(self.archive_path, 'w', zipfile.ZIP_DEFLATED)
+        txn.commit(self.archive_path)
+
+
+
+class _ArchiveTransaction:
+    """The files staged to be added to a model archive"""
+    def __init__(self):
+        self.create_new = False
+        self.files:Dict[str,str] = {}
+
+    def add(self, file_path:str, arcname:str):
+        # Re-adding an arcname replaces the previously staged file
+        self.files.pop(arcname, None)
+        self.files[arcname] = file_path
 
-        return zip_fp
+    def clear(self):
+        """Discard the existing archive and the staged files"""
+        self.create_new = True
+        self.files.clear()
 
+    def commit(self, archive_path:str):
+        if not self.files and not self.create_new:
+            return
+        add_files_to_archive(archive_path, self.files, create_new=self.create_new)
 
 
 
@@ -235,3 +273,142 @@ def extract_dir(archive_path: str, name: str, dest_dir: str=None) -> str:
                 dst.write(fp.read(fn.filename))
 
     return f'{dest_dir}/{name}'
+
+
+
+def add_files_to_archive(
+    archive_path:str,
+    files:Dict[str,str],
+    create_new:bool=False
+):
+    """Add the given files to a .zip archive
+
+    The archive is updated with the least amount of I/O:
+
+    - If ``create_new=True`` or the archive does not exist, then a new archive is created
+    - If none of the files are in the archive, then the files are appended to the archive in-place,
+      only the archive's central directory is re-written
+    - Otherwise, the archive is re-written. The existing members that are not replaced are copied
+      as-is without being decompressed and re-compressed
+
+    Files with an extension in ``PRECOMPRESSED_EXTENSIONS`` are stored without compression.
+
+    Args:
+        archive_path: Path to the .zip archive
+        files: Dictionary of <name in archive>: <path to file>
+        create_new: Discard all the existing members of the archive
+    """
+    archive_path = fullpath(archive_path)
+
+    if create_new or not os.path.exists(archive_path):
+        with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+            _write_files(dst, files)
+        return
+
+    with zipfile.ZipFile(archive_path, 'r') as src:
+        existing_members = src.infolist()
+
+    if not any(x.filename in files for x in existing_members):
+        with zipfile.ZipFile(archive_path, 'a', zipfile.ZIP_DEFLATED) as dst:
+            _write_files(dst, files)
+        return
+
+    tmp_path = f'{archive_path}.{os.getpid()}.tmp'
+    try:
+        with zipfile.ZipFile(archive_path, 'r') as src, \
+            zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                if info.filename not in files:
+                    _copy_member(src, dst, info)
+            _write_files(dst, files)
+        os.replace(tmp_path, archive_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_files(zip_fp:zipfile.ZipFile, files:Dict[str,str]):
+    for arcname, file_path in files.items():
+        if os.path.splitext(file_path)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+            compress_type = zipfile.ZIP_STORED
+        else:
+            compress_type = zipfile.ZIP_DEFLATED
+        zip_fp.write(file_path, arcname=arcname, compress_type=compress_type)
+
+
+
+# Local file header, see section 4.3.7 of the .ZIP File Format Specification
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_LOCAL_HEADER_SIGNATURE = b'PK\003\004'
+_DATA_DESCRIPTOR_FLAG = 0x08
+_ZIP64_EXTRA_ID = 0x0001
+_COPY_CHUNK_SIZE = 4*1024*1024
+# Copying the compressed data as-is relies on ZipFile internals (start_dir, filelist, NameToInfo, _didModify),
+# so it is only used with the Python versions supported by the MLTK, see python_requires in setup.py
+_RAW_COPY_SUPPORTED = sys.version_info < (3, 13)
+
+
+def _copy_member(src:zipfile.ZipFile, dst:zipfile.ZipFile, info:zipfile.ZipInfo):
+    """Copy the given member from the src archive to the dst archive"""
+    if _RAW_COPY_SUPPORTED and _has_zipfile_internals(dst):
+        _copy_member_raw(src, dst, info)
+    else:
+        # Fallback to the public API which decompresses the member and compresses it again
+        dst_info = copy.copy(info)
+        dst_info.extra = _strip_extra_field(info.extra, _ZIP64_EXTRA_ID)
+        dst.writestr(dst_info, src.read(info), compress_type=info.compress_type)
+
+
+def _has_zipfile_internals(zip_fp:zipfile.ZipFile) -> bool:
+    return all(hasattr(zip_fp, x) for x in ('fp', 'start_dir', 'filelist', 'NameToInfo', '_didModify'))
+
+
+def _copy_member_raw(src:zipfile.ZipFile, dst:zipfile.ZipFile, info:zipfile.ZipInfo):
+    """Copy the compressed data of the given member from the src archive to the dst archive
+
+    The ZipFile API only supports copying a member by decompressing it and compressing it again.
+    This copies the compressed bytes as-is and registers the member in the dst's central directory
+    the same way ZipFile.write() does.
+    """
+    src.fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(src.fp.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f'Bad local file header for {info.filename}')
+    filename_length, extra_length = header[10], header[11]
+    src.fp.seek(filename_length + extra_length, os.SEEK_CUR)
+
+    dst_info = copy.copy(info)
+    # The CRC and sizes are known, so they're written in the local header instead of a trailing data descriptor
+    dst_info.flag_bits &= ~_DATA_DESCRIPTOR_FLAG
+    # FileHeader() adds the ZIP64 extra field if necessary
+    dst_info.extra = _strip_extra_field(info.extra, _ZIP64_EXTRA_ID)
+
+    dst.fp.seek(dst.start_dir)
+    dst_info.header_offset = dst.fp.tell()
+    dst.fp.write(dst_info.FileHeader())
+
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = src.fp.read(min(remaining, _COPY_CHUNK_SIZE))
+        if not chunk:
+            raise zipfile.BadZipFile(f'Truncated data for {info.filename}')
+        dst.fp.write(chunk)
+        remaining -= len(chunk)
+
+    # pylint: disable=protected-access
+    dst.start_dir = dst.fp.tell()
+    dst.filelist.append(dst_info)
+    dst.NameToInfo[dst_info.filename] = dst_info
+    dst._didModify = True
+
+
+def _strip_extra_field(extra:bytes, field_id:int) -> bytes:
+    retval = b''
+    offset = 0
+    while offset + 4 <= len(extra):
+        xid, xlen = struct.unpack('<HH', extra[offset:offset+4])
+        end = offset + 4 + xlen
+        if xid != field_id:
+            retval += extra[offset:end]
+        offset = end
+    return retval
@@ -1,6 +1,8 @@
 
 from typing import Callable, List
 
+import numpy as np
+
 
 from .evaluate_classifier_mixin import EvaluateClassifierMixin
 from ..model_attributes import MltkModelAttributesDecorator, CallableType
@@ -31,6 +33,24 @@ class EvaluateAutoEncoderMixin(EvaluateClassifierMixin):
         self._attributes['eval_autoencoder.scoring_function'] = v
 
 
+    @property
+    def batch_scoring_function(self) -> Callable:
+        """The auto-encoder scoring function used by the streaming evaluation
+
+        This is similar to :py:attr:`~scoring_function` except it is given a batch of
+        input samples and corresponding model outputs and must return a 1D array with the score of each sample.
+
+        If `None` and :py:attr:`~scoring_function` is set, then :py:attr:`~scoring_function` is invoked on each sample of the batch.
+        Otherwise, use the `mltk_model.loss` function
+
+        Default: `None`
+        """
+        return self._attributes.get_value('eval_autoencoder.batch_scoring_function', default=None)
+    @batch_scoring_function.setter
+    def batch_scoring_function(self, v: Callable):
+        self._attributes['eval_autoencoder.batch_scoring_function'] = v
+
+
     @property
     def eval_classes(self) -> List[str]:
         """List if classes to use for evaluation.
@@ -75,6 +95,43 @@ class EvaluateAutoEncoderMixin(EvaluateClassifierMixin):
             )
 
 
+    def get_batch_scoring_function(self) -> Callable:
+        """Return the scoring function used to score a batch of samples during evaluation"""
+        from mltk.core.keras.losses import (
+            Correlation,
+            MeanSquaredError,
+            MeanAbsoluteError,
+            mse_batch_loss_func,
+            corr_batch_loss_func,
+            mae_batch_loss_func
+        )
+
+        if self.batch_scoring_function is not None:
+            return self.batch_scoring_function
+
+        if self.scoring_function is not None:
+            scoring_function = self.scoring_function
+            def _score_each_sample(y_true, y_pred):
+                return np.asarray([scoring_function(orig, decoded) for orig, decoded in zip(y_true, y_pred)])
+            return _score_each_sample
+
+        loss = self.loss
+        if loss in ('mse', 'mean_squared_error') or isinstance(loss, MeanSquaredError):
+            return mse_batch_loss_func
+        elif loss in ('mae', 'mean_absolute_error') or isinstance(loss, MeanAbsoluteError):
+            return mae_batch_loss_func
+        elif loss in ('corr', 'correlation') or isinstance(loss, Correlation):
+            if not corr_batch_loss_func:
+                raise RuntimeError('Failed to get correlation loss function, ensure the Tensorflow-Probability package is properly installed')
+            return corr_batch_loss_func
+        else:
+            raise RuntimeError(
+                'Only model loss functions: "mse", "mae", "corr" are supported by default.\n'
+                'You must specify mltk_model.batch_scoring_function or mltk_model.scoring_function for your model'
+            )
+
+
     def _register_attributes(self):
         self._attributes.register('eval_autoencoder.scoring_function', dtype=CallableType)
+        self._attributes.register('eval_autoencoder.batch_scoring_function', dtype=CallableType)
         self._attributes.register('eval_autoencoder.classes', dtype=(list,tuple))
\ No newline at end of file
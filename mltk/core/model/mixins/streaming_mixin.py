@@ -83,16 +83,17 @@ class StreamingMixin(BaseMixin):
             f.write(tflite_flatbuffer_dict['value'])
 
         if update_archive:
-            self.add_archive_file(non_streaming_tflite_path)
-
-            try:
-                summary_path = f'{non_streaming_tflite_path}.summary.txt'
-                with open(summary_path, 'w') as fp:
-                    tflite_model = load_tflite_model(non_streaming_tflite_path)
-                    fp.write(summarize_model(tflite_model))
-                self.add_archive_file(summary_path)
-            except:
-                pass
+            with self.archive_transaction():
+                self.add_archive_file(non_streaming_tflite_path)
+
+                try:
+                    summary_path = f'{non_streaming_tflite_path}.summary.txt'
+                    with open(summary_path, 'w') as fp:
+                        tflite_model = load_tflite_model(non_streaming_tflite_path)
+                        fp.write(summarize_model(tflite_model))
+                    self.add_archive_file(summary_path)
+                except:
+                    pass
 
         logger.info(f'Generating streaming: {output_tflite_path} ...')
 
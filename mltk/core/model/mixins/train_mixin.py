@@ -1,5 +1,6 @@
 
-from typing import Union, Callable, List
+from __future__ import annotations
+from typing import Union, Callable, List, TYPE_CHECKING
 import re
 import os
 import logging
@@ -9,7 +10,9 @@ from mltk.utils.python import DefaultDict
 from mltk.core.training_results import TrainingResults
 from .base_mixin import BaseMixin
 from ..model_attributes import MltkModelAttributesDecorator, CallableType, DictType
-from ..model_utils import KerasModel
+
+if TYPE_CHECKING:
+    from mltk.core.keras import KerasModel
 
 
 @MltkModelAttributesDecorator()
@@ -561,6 +564,10 @@ class TrainMixin(BaseMixin):
 
                representative_dataset_max_samples = 1000               # The maximum number of samples to use when representative_dataset == 'generate'
 
+               representative_dataset_cache = True                     # If representative_dataset == 'generate', then save the generated samples to the model log directory.
+                                                                       # Subsequent quantizations replay the saved samples rather than re-loading the validation dataset.
+                                                                       # The saved samples are invalidated when the model specification changes
+
                allow_custom_ops = False,                               # Boolean indicating whether to allow custom operations. When False, any unknown operation is an error.
                                                                        # When True, custom ops are created for any op that is unknown. The developer needs to provide these to the
                                                                        # TensorFlow Lite runtime with a custom resolver. (default False)
@@ -605,6 +612,7 @@ class TrainMixin(BaseMixin):
                 inference_output_type = 'float32',
                 representative_dataset = 'generate',
                 representative_dataset_max_samples = 1000,
+                representative_dataset_cache = True,
                 allow_custom_ops = False,
                 experimental_new_converter = True,
                 experimental_new_quantizer = True,
@@ -0,0 +1,303 @@
+"""Persistent index of the MLTK models found in the model search directories
+
+Finding a model by name requires walking every model search directory,
+and listing the models requires reading every Python file in the search directories.
+This can take a while for large model directories, especially on network storage.
+
+The :py:class:`ModelRegistry` caches the contents of each search directory to ``<user dir>/model_registry.json``.
+Each directory's entry is re-used as long as the directory's modification time has not changed,
+so only the directories that have changed since the last lookup are re-scanned.
+Likewise, a Python file is only re-scanned for ``@mltk_model`` if its size or modification time changed.
+"""
+from typing import List, Dict, Tuple, Iterator
+import os
+import re
+import json
+import time
+import logging
+import threading
+
+from mltk.utils.path import create_user_dir
+from mltk.core.utils import get_mltk_logger
+from .mixins.archive_mixin import ARCHIVE_EXTENSION, TEST_ARCHIVE_EXTENSION
+
+
+# Increment this if the format of the cache file changes
+CACHE_VERSION = 1
+# Some file systems (e.g. network storage) have a coarse modification time resolution.
+# So a directory that was modified within this many nanoseconds of being indexed
+# is re-scanned on the next lookup
+MTIME_RESOLUTION_NS = 2*1000*1000*1000
+
+
+_MLTK_MODEL_RE = re.compile(r'.*\s@mltk_model\s.*')
+_UTEST_DISABLED_RE = re.compile(r'.*\s@mltk_utest_disabled\s.*')
+_registry_lock = threading.Lock()
+_registry:'ModelRegistry' = None
+
+
+
+def get_model_registry() -> 'ModelRegistry':
+    """Return the model registry shared by this Python session"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
+
+
+
+class ModelRegistry:
+    """Index of the model specifications and archives found in the model search directories
+
+    Args:
+        cache_path: Path to the JSON file used to persist the index, defaults to ``<user dir>/model_registry.json``
+    """
+    def __init__(self, cache_path:str=None):
+        self._cache_path = cache_path or f'{create_user_dir()}/model_registry.json'
+        self._lock = threading.RLock()
+        self._is_modified = False
+        self._dirs:Dict[str,dict] = {}
+        self._py_files:Dict[str,dict] = {}
+        self._load()
+
+
+    def find_model(
+        self,
+        search_dirs:List[str],
+        model_name:str,
+        archive_ext:str,
+        model_subdir:str='',
+        recurse_dirs:List[str]=None,
+    ) -> Tuple[str,str]:
+        """Return the path to the given model's specification and archive
+
+        Args:
+            search_dirs: The directories to search, in priority order
+            model_name: The name of the model (without an extension)
+            archive_ext: The model archive extension, e.g. .mltk.zip
+            model_subdir: Optional sub-directory, with a trailing slash, the model must be in
+            recurse_dirs: The search directories that should be searched recursively.
+                If omitted, then all of the search directories are searched recursively
+
+        Returns:
+            (path to the model specification, path to the model archive),
+            either is None if not found
+        """
+        py_suffix = f'/{model_subdir}{model_name}.py'
+        archive_suffix = f'/{model_subdir}{model_name}{archive_ext}'
+        py_path = None
+        archive_path = None
+
+        with self._lock:
+            for search_dir in search_dirs:
+                max_depth = None if recurse_dirs is None or search_dir in recurse_dirs else 0
+                for root, _, files in self._walk(search_dir, max_depth=max_depth):
+                    for fn in files:
+                        file_path = f'{root}/{fn}'
+                        if py_path is None and file_path.endswith(py_suffix):
+                            py_path = file_path
+                        if archive_path is None and file_path.endswith(archive_suffix):
+                            archive_path = file_path
+
+                if py_path is not None:
+                    break
+
+            self.save()
+
+        return py_path, archive_path
+
+
+    def list_models(
+        self,
+        search_dirs:List[str],
+        test:bool=False,
+        for_utests:bool=False,
+        depth:int=5,
+        logger:logging.Logger=None
+    ) -> List[str]:
+        """Return the sorted names of all the models found in the given search directories
+
+        A model is found if a Python file contains ``@mltk_model`` or if there is a model archive.
+
+        Args:
+            search_dirs: The directories to search
+            test: Return the names of the models that have a "test" model archive
+            for_utests: Exclude the Python files that contain ``@mltk_utest_disabled``
+            depth: The maximum directory depth to search
+            logger: Optional logger
+        """
+        found_models = set()
+
+        with self._lock:
+            for search_dir in search_dirs:
+                for root, _, files in self._walk(search_dir, max_depth=depth):
+                    for fn in files:
+                        if fn.endswith('.py'):
+                            p = f'{root}/{fn}'
+                            try:
+                                info = self._get_python_file_info(p)
+                            except Exception as e:
+                                if logger is not None:
+                                    logger.warning(f'Failed to process Python file: {p}, err: {e}')
+                                continue
+                            if info['is_model'] and not (for_utests and info['utest_disabled']):
+                                found_models.add(fn[:-len('.py')])
+
+                        elif test:
+                            if fn.endswith(TEST_ARCHIVE_EXTENSION):
+                                found_models.add(fn[:-len(TEST_ARCHIVE_EXTENSION)])
+                        elif fn.endswith(ARCHIVE_EXTENSION) and not fn.endswith(TEST_ARCHIVE_EXTENSION):
+                            found_models.add(fn[:-len(ARCHIVE_EXTENSION)])
+
+            self.save()
+
+        return sorted(found_models)
+
+
+    def clear(self):
+        """Clear the index, all directories are re-scanned on the next lookup"""
+        with self._lock:
+            self._dirs.clear()
+            self._py_files.clear()
+            self._is_modified = True
+            self.save()
+
+
+    def save(self):
+        """Save the index to the cache file if it was modified
+
+        This does nothing if the MLTK_READONLY environment variable is set.
+        """
+        if not self._is_modified or os.environ.get('MLTK_READONLY'):
+            return
+        self._is_modified = False
+
+        # Drop the Python files that are no longer in the index
+        for p in list(self._py_files.keys()):
+            root, fn = p.rsplit('/', maxsplit=1)
+            entry = self._dirs.get(root, None)
+            if entry is None or fn not in entry['files']:
+                del self._py_files[p]
+
+        tmp_path = f'{self._cache_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(dict(version=CACHE_VERSION, dirs=self._dirs, py_files=self._py_files), f)
+            os.replace(tmp_path, self._cache_path)
+        except Exception as e:
+            get_mltk_logger().debug(f'Failed to save model registry: {self._cache_path}, err: {e}')
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+    def _load(self):
+        try:
+            with open(self._cache_path, 'r') as f:
+                cache = json.load(f)
+            if isinstance(cache, dict) and cache.get('version', None) == CACHE_VERSION:
+                self._dirs = cache['dirs']
+                self._py_files = cache['py_files']
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            get_mltk_logger().debug(f'Failed to load model registry: {self._cache_path}, err: {e}')
+
+
+    def _walk(self, base_dir:str, max_depth:int=None) -> Iterator[Tuple[str,List[str],List[str]]]:
+        """Walk the given directory top-down, similar to os.walk() with followlinks=True
+
+        This yields: root, sub-directory names, model file names
+        """
+        base_dir = base_dir.replace('\\', '/').rstrip('/')
+        stack = [(base_dir, 0)]
+        while stack:
+            root, depth = stack.pop()
+            entry = self._get_dir_entry(root)
+            if entry is None:
+                continue
+
+            yield root, entry['subdirs'], entry['files']
+
+            if max_depth is None or depth < max_depth:
+                for subdir in reversed(entry['subdirs']):
+                    stack.append((f'{root}/{subdir}', depth + 1))
+
+
+    def _get_dir_entry(self, dir_path:str) -> dict:
+        """Return the cached contents of the given directory, re-scan the directory if it changed"""
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            self._remove_dir_entries(dir_path)
+            return None
+
+        entry = self._dirs.get(dir_path, None)
+        if entry is not None and entry['mtime_ns'] == mtime_ns \
+            and entry['indexed_ns'] - mtime_ns > MTIME_RESOLUTION_NS:
+            return entry
+
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(dir_path) as it:
+                for e in it:
+                    try:
+                        if e.is_dir():
+                            subdirs.append(e.name)
+                        elif e.name.endswith(('.py', ARCHIVE_EXTENSION)):
+                            files.append(e.name)
+                    except OSError:
+                        pass
+        except OSError:
+            self._remove_dir_entries(dir_path)
+            return None
+
+        if entry is not None:
+            for subdir in set(entry['subdirs']) - set(subdirs):
+                self._remove_dir_entries(f'{dir_path}/{subdir}')
+
+        entry = dict(
+            mtime_ns=mtime_ns,
+            indexed_ns=time.time_ns(),
+            subdirs=sorted(subdirs),
+            files=sorted(files)
+        )
+        self._dirs[dir_path] = entry
+        self._is_modified = True
+        return entry
+
+
+    def _remove_dir_entries(self, dir_path:str):
+        """Remove the given directory and all its sub-directories from the index"""
+        prefix = f'{dir_path}/'
+        for p in [x for x in self._dirs if x == dir_path or x.startswith(prefix)]:
+            del self._dirs[p]
+            self._is_modified = True
+
+
+    def _get_python_file_info(self, py_path:str) -> dict:
+        """Return if the given Python file defines a model, re-scan the file if it changed"""
+        st = os.stat(py_path)
+        file_id = [st.st_size, st.st_mtime_ns]
+        info = self._py_files.get(py_path, None)
+        if info is not None and info['id'] == file_id:
+            return info
+
+        is_model = False
+        utest_disabled = False
+        with open(py_path, 'r') as f:
+            for line in f:
+                if not is_model and _MLTK_MODEL_RE.match(line):
+                    is_model = True
+                if not utest_disabled and _UTEST_DISABLED_RE.match(line):
+                    utest_disabled = True
+                if is_model and utest_disabled:
+                    break
+
+        info = dict(id=file_id, is_model=is_model, utest_disabled=utest_disabled)
+        self._py_files[py_path] = info
+        self._is_modified = True
+        return info
@@ -1,4 +1,5 @@
-from typing import List, Union
+from __future__ import annotations
+from typing import List, Union, TYPE_CHECKING
 import os
 import logging
 import re
@@ -10,11 +11,12 @@ from mltk import __version__ as mltk_version_str
 from mltk import MLTK_ROOT_DIR
 from mltk import models as mltk_models
 from mltk.core.utils import get_mltk_logger
-from mltk.utils.path import (fullpath, walk_with_depth, create_tempdir, get_user_setting)
+from mltk.utils.path import (fullpath, create_tempdir, get_user_setting)
 from mltk.utils.python import as_list, import_module_at_path, prepend_exception_msg
 from mltk.utils import gpu
 
 from .model import MltkModel, MltkModelEvent
+from .model_registry import get_model_registry
 from .mixins.archive_mixin import (
     ARCHIVE_EXTENSION,
     TEST_ARCHIVE_EXTENSION,
@@ -22,7 +24,9 @@ from .mixins.archive_mixin import (
     extract_file
 )
 from ..tflite_model import TfliteModel
-from ..keras import (KerasModel, load_keras_model)
+
+if TYPE_CHECKING:
+    from ..keras import KerasModel
 
 
 
@@ -182,6 +186,7 @@ def load_tflite_or_keras_model(
     """
 
     from .mixins.train_mixin import TrainMixin
+    from ..keras import (KerasModel, load_keras_model)
 
     logger = logger or get_mltk_logger()
 
@@ -424,57 +429,21 @@ def list_mltk_models(
     for_utests=False,
     logger:logging.Logger=None
 ) -> List[str]:
-    """Return a list of all found MLTK model names"""
-
-    logger = logger or get_mltk_logger()
-
-    found_models = []
-    search_dirs = _get_model_search_dirs()
-    archive_ext = get_archive_extension(test=False)
-    test_archive_ext = get_archive_extension(test=True)
-
-    mltk_model_re = re.compile(r'.*\s@mltk_model\s.*')
-    utest_disable_re = re.compile(r'.*\s@mltk_utest_disabled\s.*')
-
-    def _process_python_file(py_path):
-        retval = False
-        with open(py_path, 'r') as f:
-            for line in f:
-                if for_utests and utest_disable_re.match(line):
-                    return False
-
-                if mltk_model_re.match(line):
-                    retval = True
-                    if not for_utests:
-                        break
-
-        return retval
-
-
-    for search_dir in search_dirs:
-        for root, _, files in walk_with_depth(search_dir, depth=5, followlinks=True):
-            for fn in files:
-                if fn.endswith('.py'):
-                    try:
-                        p = f'{root}/{fn}'.replace('\\', '/')
-                        if _process_python_file(p):
-                            found_models.append(fn[:-len('.py')])
-                    except Exception as e:
-                        logger.warning(f'Failed to process Python file: {p}, err: {e}')
+    """Return a list of all found MLTK model names
 
-                if test:
-                    if fn.endswith(test_archive_ext):
-                        found_models.append(fn.replace(test_archive_ext, ''))
-                else:
-                    if fn.endswith(archive_ext) and not fn.endswith(test_archive_ext):
-                        found_models.append(fn.replace(archive_ext, ''))
-
-            # Do NOT recurse into the CWD
-            if search_dir == os.curdir:
-                break
+    The contents of the model search directories are cached by the :py:class:`mltk.core.model.model_registry.ModelRegistry`,
+    so only the directories and Python files that changed since the previous call are re-scanned.
+    """
 
+    logger = logger or get_mltk_logger()
 
-    return sorted(set(found_models))
+    return get_model_registry().list_models(
+        _get_model_search_dirs(),
+        test=test,
+        for_utests=for_utests,
+        depth=5,
+        logger=logger
+    )
 
 
 def find_model_specification_file(
@@ -485,6 +454,9 @@ def find_model_specification_file(
 ) -> str:
     """Given the model name, attempt to find its corresponding python specification file.
     The specification file could be in a model archive.
+
+    The contents of the model search directories are cached by the :py:class:`mltk.core.model.model_registry.ModelRegistry`,
+    so only the directories that changed since the previous call are re-scanned.
     """
     logger = logger or get_mltk_logger()
     search_dirs = _get_model_search_dirs()
@@ -499,35 +471,18 @@ def find_model_specification_file(
     model_subdir = os.path.dirname(model)
     model_name, _ = os.path.splitext(os.path.basename(model))
 
-    py_path = None
-    archive_path = None
     if model_subdir:
         model_subdir = f'{model_subdir}/'
 
-    archive_ext = get_archive_extension(test=test)
-    model_path = f'/{model_subdir}{model_name}.py'
-    model_arc_path = f'{model_subdir}/{model_name}{archive_ext}'
-
     logger.debug(f'Model search path(s): {",".join(search_dirs)}')
-    for search_dir in search_dirs:
-        if py_path is not None:
-            break
-        for root, _, files in os.walk(search_dir, followlinks=True):
-            root = root.replace('\\', '/')
-            for fn in files:
-                file_path = f'{root}/{fn}'
-
-                if file_path.endswith(model_path):
-                    py_path = file_path
-                if file_path.endswith(model_arc_path):
-                    archive_path = file_path
-
-            # If the spec was found then break out of the loop
-            if py_path is not None:
-                break
-            # Do NOT recurse into the CWD
-            if search_dir == cwd:
-                break
+    py_path, archive_path = get_model_registry().find_model(
+        search_dirs,
+        model_name=model_name,
+        archive_ext=get_archive_extension(test=test),
+        model_subdir=model_subdir,
+        # Do NOT recurse into the CWD
+        recurse_dirs=[x for x in search_dirs if x != cwd]
+    )
 
     if py_path is None and archive_path is not None:
         logger.info(f'Extracting {model_name}.py from {archive_path}')
@@ -605,4 +560,13 @@ def _parse_version(version):
     major = 0 if len(toks) < 1 else int(toks[0])
     minor = 0 if len(toks) < 2 else int(toks[1])
     patch = 0 if len(toks) < 3 else int(toks[2])
-    return _Version(major, minor, patch)
\ No newline at end of file
+    return _Version(major, minor, patch)
+
+
+def __getattr__(name:str):
+    # KerasModel is imported on first access
+    # so that importing this module does not import Tensorflow
+    if name == 'KerasModel':
+        from ..keras import KerasModel # pylint: disable=import-outside-toplevel,redefined-outer-name
+        return KerasModel
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
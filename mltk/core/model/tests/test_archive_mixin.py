@@ -0,0 +1,165 @@
+import os
+import zipfile
+import pytest
+
+from mltk.core.model.mixins import archive_mixin
+from mltk.core.model.mixins.archive_mixin import ArchiveMixin, add_files_to_archive
+from mltk.utils.path import create_tempdir, remove_directory
+
+
+def _create_files(tmp_dir:str, names:list) -> dict:
+    retval = {}
+    for name in names:
+        path = f'{tmp_dir}/files/{name}'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fp:
+            fp.write(os.urandom(1024) + name.encode() * 1000)
+        retval[name] = path
+    return retval
+
+
+def _read_archive(archive_path:str) -> dict:
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        assert zf.testzip() is None
+        return {x: zf.read(x) for x in zf.namelist()}
+
+
+def _read_files(files:dict) -> dict:
+    retval = {}
+    for name, path in files.items():
+        with open(path, 'rb') as fp:
+            retval[name] = fp.read()
+    return retval
+
+
+class _Model(ArchiveMixin):
+    """Minimal model with a log directory and archive"""
+    def __init__(self, tmp_dir:str):
+        self._tmp_dir = tmp_dir
+
+    @property
+    def archive_path(self):
+        return f'{self._tmp_dir}/model.mltk.zip'
+
+    @property
+    def log_dir(self):
+        return f'{self._tmp_dir}/files'
+
+
+def _create_model(name:str) -> _Model:
+    tmp_dir = create_tempdir(f'tests/archive_mixin/{name}')
+    remove_directory(tmp_dir)
+    return _Model(create_tempdir(f'tests/archive_mixin/{name}'))
+
+
+def _count_archive_updates(monkeypatch) -> list:
+    updates = []
+    def _add_files_to_archive(archive_path, files, create_new=False):
+        updates.append(sorted(files))
+        add_files_to_archive(archive_path, files, create_new=create_new)
+    monkeypatch.setattr(archive_mixin, 'add_files_to_archive', _add_files_to_archive)
+    return updates
+
+
+@pytest.mark.parametrize('raw_copy', [True, False])
+def test_add_files_to_archive(monkeypatch, raw_copy):
+    # Also test the public ZipFile API fallback used if the ZipFile internals are not available
+    monkeypatch.setattr(archive_mixin, '_RAW_COPY_SUPPORTED', raw_copy)
+    tmp_dir = create_tempdir(f'tests/archive_mixin/raw_copy_{raw_copy}')
+    remove_directory(tmp_dir)
+    archive_path = f'{tmp_dir}/model.mltk.zip'
+
+    files = _create_files(tmp_dir, ['model.h5', 'train/log.txt', 'images.png'])
+    add_files_to_archive(archive_path, files)
+    expected = _read_files(files)
+    assert _read_archive(archive_path) == expected
+
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        assert zf.getinfo('images.png').compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo('model.h5').compress_type == zipfile.ZIP_DEFLATED
+        h5_info = zf.getinfo('model.h5')
+
+    # New members are appended in-place
+    new_files = _create_files(tmp_dir, ['model.tflite'])
+    add_files_to_archive(archive_path, new_files)
+    expected.update(_read_files(new_files))
+    assert _read_archive(archive_path) == expected
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        assert zf.getinfo('model.h5').header_offset == h5_info.header_offset
+
+    # Replacing a member copies the other members as-is
+    replaced_files = _create_files(tmp_dir, ['train/log.txt'])
+    with open(replaced_files['train/log.txt'], 'ab') as fp:
+        fp.write(b'updated')
+    add_files_to_archive(archive_path, replaced_files)
+    expected.update(_read_files(replaced_files))
+    assert _read_archive(archive_path) == expected
+    with zipfile.ZipFile(archive_path, 'r') as zf:
+        assert len(zf.namelist()) == len(expected)
+        info = zf.getinfo('model.h5')
+        assert info.compress_size == h5_info.compress_size
+        assert info.CRC == h5_info.CRC
+
+    add_files_to_archive(archive_path, new_files, create_new=True)
+    assert _read_archive(archive_path) == _read_files(new_files)
+
+
+def test_archive_transaction(monkeypatch):
+    model = _create_model('transaction')
+    files = _create_files(model._tmp_dir, ['model.h5', 'eval/summary.txt', 'eval/roc.png']) # pylint: disable=protected-access
+    updates = _count_archive_updates(monkeypatch)
+
+    # Multiple additions are batched into a single update
+    with model.archive_transaction():
+        model.add_archive_file(files['model.h5'])
+        model.add_archive_dir('eval')
+        assert not os.path.exists(model.archive_path)
+    assert updates == [['eval/roc.png', 'eval/summary.txt', 'model.h5']]
+    assert _read_archive(model.archive_path) == _read_files({
+        'model.h5': files['model.h5'],
+        'eval/summary.txt': files['eval/summary.txt'],
+        'eval/roc.png': files['eval/roc.png'],
+    })
+
+    # Without a transaction, each call updates the archive
+    model.add_archive_file(files['model.h5'])
+    model.add_archive_dir('eval')
+    assert len(updates) == 3
+
+
+def test_archive_transaction_nested(monkeypatch):
+    model = _create_model('transaction_nested')
+    files = _create_files(model._tmp_dir, ['model.h5', 'model.tflite']) # pylint: disable=protected-access
+    updates = _count_archive_updates(monkeypatch)
+
+    # Nested transactions are merged into the outermost transaction
+    with model.archive_transaction() as outer_txn:
+        model.add_archive_file(files['model.h5'])
+        with model.archive_transaction() as inner_txn:
+            assert inner_txn is outer_txn
+            model.add_archive_file(files['model.tflite'])
+        assert updates == []
+    assert updates == [['model.h5', 'model.tflite']]
+    assert sorted(_read_archive(model.archive_path)) == ['model.h5', 'model.tflite']
+
+
+def test_archive_transaction_rollback(monkeypatch):
+    model = _create_model('transaction_rollback')
+    files = _create_files(model._tmp_dir, ['model.h5', 'model.tflite']) # pylint: disable=protected-access
+    model.add_archive_file(files['model.h5'])
+    expected = _read_archive(model.archive_path)
+    updates = _count_archive_updates(monkeypatch)
+
+    # If an exception is raised, then the archive is not modified
+    with pytest.raises(RuntimeError):
+        with model.archive_transaction():
+            model.add_archive_file(files['model.tflite'])
+            raise RuntimeError('Failed')
+    assert updates == []
+    assert _read_archive(model.archive_path) == expected
+
+    # The failed transaction's files are discarded
+    with model.archive_transaction():
+        pass
+    assert updates == []
+    assert _read_archive(model.archive_path) == expected
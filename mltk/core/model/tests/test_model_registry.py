@@ -0,0 +1,54 @@
+import os
+
+from mltk.core.model import model_registry
+from mltk.core.model.model_registry import ModelRegistry
+from mltk.utils.path import create_tempdir, remove_directory
+
+
+def _write_file(path:str, data:str=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as fp:
+        fp.write(data)
+
+
+def test_model_registry(monkeypatch):
+    # Always re-use the cached directory contents if the modification time has not changed
+    monkeypatch.setattr(model_registry, 'MTIME_RESOLUTION_NS', -2**62)
+
+    tmp_dir = create_tempdir('tests/model_registry')
+    remove_directory(tmp_dir)
+    models_dir = f'{tmp_dir}/models'
+    cache_path = f'{tmp_dir}/model_registry.json'
+
+    _write_file(f'{models_dir}/a/model_a.py', '# @mltk_model \n')
+    _write_file(f'{models_dir}/a/b/model_b.py', '# @mltk_model \n# @mltk_utest_disabled \n')
+    _write_file(f'{models_dir}/a/b/helper.py', 'x = 1\n')
+    _write_file(f'{models_dir}/c/model_c.mltk.zip')
+    _write_file(f'{models_dir}/c/model_d-test.mltk.zip')
+    # Like os.walk(), hidden directories are also searched
+    _write_file(f'{models_dir}/.hidden/model_f.py', '# @mltk_model \n')
+
+    registry = ModelRegistry(cache_path=cache_path)
+    assert registry.list_models([models_dir]) == ['model_a', 'model_b', 'model_c', 'model_f']
+    assert registry.list_models([models_dir], for_utests=True) == ['model_a', 'model_c', 'model_f']
+    assert registry.list_models([models_dir], test=True) == ['model_a', 'model_b', 'model_d', 'model_f']
+    assert registry.find_model([models_dir], 'model_f', '.mltk.zip') == (f'{models_dir}/.hidden/model_f.py', None)
+    assert registry.find_model([models_dir], 'model_b', '.mltk.zip') == (f'{models_dir}/a/b/model_b.py', None)
+    assert registry.find_model([models_dir], 'model_c', '.mltk.zip') == (None, f'{models_dir}/c/model_c.mltk.zip')
+    assert registry.find_model([models_dir], 'model_b', '.mltk.zip', recurse_dirs=[]) == (None, None)
+    assert os.path.exists(cache_path)
+
+    # The index is loaded from the cache file
+    registry = ModelRegistry(cache_path=cache_path)
+    assert registry.find_model([models_dir], 'model_a', '.mltk.zip') == (f'{models_dir}/a/model_a.py', None)
+
+    # New, modified, and removed files are detected
+    _write_file(f'{models_dir}/a/b/e/model_e.py', '# @mltk_model \n')
+    _write_file(f'{models_dir}/a/b/helper.py', '# @mltk_model \n')
+    os.remove(f'{models_dir}/c/model_c.mltk.zip')
+    os.utime(f'{models_dir}/c', ns=(0, 1))
+    assert registry.list_models([models_dir]) == ['helper', 'model_a', 'model_b', 'model_e', 'model_f']
+    assert registry.find_model([models_dir], 'model_c', '.mltk.zip') == (None, None)
+
+    remove_directory(f'{models_dir}/a/b')
+    assert registry.list_models([models_dir]) == ['model_a', 'model_f']
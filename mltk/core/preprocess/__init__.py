@@ -10,3 +10,18 @@ The following data generators are available:
 - `image.ParallelImageDataGenerator` - Generate image training data
 
 """
+import importlib
+
+
+# The sub-packages are imported on first access, e.g. mltk.core.preprocess.audio
+_SUBPACKAGES = ('audio', 'image', 'utils')
+
+
+def __getattr__(name:str):
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBPACKAGES))
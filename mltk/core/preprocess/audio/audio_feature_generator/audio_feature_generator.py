@@ -94,6 +94,7 @@ class AudioFeatureGenerator:
                             'This likely means you need to re-build the AudioFeatureGenerator wrapper package\n\n') from e
 
         self._spectrogram_shape = settings.spectrogram_shape
+        self._window_step = int(settings.window_step_ms * settings.sample_rate_hz / 1000)
         self._wrapper = wrapper_module.AudioFeatureGeneratorWrapper(settings)
 
 
@@ -130,6 +131,81 @@ class AudioFeatureGenerator:
         return spectrogram
 
 
+    def process_batch(self, samples: np.ndarray, dtype=np.float32, out:np.ndarray=None) -> np.ndarray:
+        """Convert a batch of 1D audio samples to 2D spectrograms using the AudioFeatureGenerator
+
+        This is the same as calling :py:meth:`~process_sample` for each sample in the batch,
+        except the entire batch is processed in a single call to the C++ library
+        and the spectrograms are written directly into the output array.
+
+        .. note::
+           The Python Global Interpreter Lock (GIL) is released while the batch is processed.
+           So multiple Python threads may process batches concurrently,
+           however, each thread must use its own AudioFeatureGenerator instance.
+
+        Args:
+            samples: [n_samples, sample_length] int16 audio samples
+            dtype: Output data type, must be int8, uint16, or float32. This is ignored if ``out`` is given
+            out: Optional, pre-allocated C-contiguous [n_samples, n_features, n_channels] output array.
+                This allows for re-using the output buffer across calls
+
+        Returns:
+            [n_samples, n_features, n_channels] int8, uint16, or float32 spectrograms
+        """
+        if out is None:
+            out = np.empty((len(samples),) + tuple(self._spectrogram_shape), dtype=dtype)
+
+        if hasattr(self._wrapper, 'process_batch'):
+            self._wrapper.process_batch(samples, out)
+        else:
+            # Fallback for older builds of the C++ wrapper
+            for i, sample in enumerate(samples):
+                self._wrapper.process_sample(sample, out[i])
+
+        return out
+
+
+    def process_stream(self, chunk: np.ndarray, dtype=np.float32) -> np.ndarray:
+        """Process the next chunk of a continuous audio stream and return the newly generated spectrogram slices
+
+        Unlike :py:meth:`~process_sample`, the internal state of the AudioFeatureGenerator
+        (i.e. the window buffer, noise reduction, PCAN, etc.) is retained between calls.
+        So the given chunk is processed as a continuation of the previous chunks
+        and only the spectrogram slices (i.e. rows) that were completed by this chunk are returned.
+        This allows for processing arbitrarily long audio recordings, in chunks of any length,
+        without re-computing the overlapping windows.
+
+        The generated slices are identical to the device's AudioFeatureGenerator which also processes
+        the microphone audio as a stream.
+
+        .. note::
+           - :py:meth:`~process_sample` and :py:meth:`~process_batch` reset the internal state,
+             so a separate AudioFeatureGenerator instance should be used for streaming
+           - int8 output is not supported if ``quantize_dynamic_scale_enable=True``
+             as the dynamic quantization requires the entire spectrogram.
+             In this case, use uint16 and quantize the spectrogram after the required slices are generated
+
+        Args:
+            chunk: 1D int16 audio samples of any length
+            dtype: Output data type, must be int8, uint16, or float32
+
+        Returns:
+            [n_new_slices, n_channels] spectrogram slices, n_new_slices may be zero
+        """
+        max_slices = len(chunk) // self._window_step + 1
+        out = np.empty((max_slices, self._spectrogram_shape[1]), dtype=dtype)
+        n_slices = self._wrapper.process_stream(chunk, out)
+        return out[:n_slices]
+
+
+    def reset(self):
+        """Reset the internal state of the AudioFeatureGenerator
+
+        This should be called before processing a new, unrelated audio stream with :py:meth:`~process_stream`
+        """
+        self._wrapper.reset()
+
+
     def activity_was_detected(self) -> bool:
         """Return if activity was detected in the previously processed sample"""
         return self._wrapper.activity_was_detected()
\ No newline at end of file
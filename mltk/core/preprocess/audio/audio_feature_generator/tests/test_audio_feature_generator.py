@@ -31,3 +31,45 @@ def test_no_samples():
 
     assert np.allclose(calculated, expected)
 
+
+
+def test_process_batch():
+    settings = DEFAULT_SETTINGS
+    mfe = AudioFeatureGenerator(settings)
+    samples = np.stack([
+        np.asarray(YES_INPUT_AUDIO, dtype=np.int16),
+        np.asarray(NO_INPUT_AUDIO, dtype=np.int16)
+    ])
+    expected = np.stack([
+        np.reshape(np.array(YES_OUTPUT_FEATURES_INT8, dtype=np.int8), settings.spectrogram_shape),
+        np.reshape(np.array(NO_OUTPUT_FEATURES_INT8, dtype=np.int8), settings.spectrogram_shape)
+    ])
+
+    calculated = mfe.process_batch(samples, dtype=np.int8)
+    assert calculated.shape == expected.shape
+    assert np.allclose(calculated, expected)
+
+    # Re-use the output buffer
+    out = np.zeros_like(expected)
+    retval = mfe.process_batch(samples, out=out)
+    assert retval is out
+    assert np.allclose(out, expected)
+
+
+def test_process_stream():
+    settings = DEFAULT_SETTINGS
+    sample = np.asarray(YES_INPUT_AUDIO, dtype=np.int16)
+    expected = AudioFeatureGenerator(settings).process_sample(sample, dtype=np.uint16)
+
+    mfe = AudioFeatureGenerator(settings)
+    slices = []
+    for i in range(0, len(sample), 1234):
+        slices.append(mfe.process_stream(sample[i:i+1234], dtype=np.uint16))
+    calculated = np.concatenate(slices)
+
+    assert calculated.shape == expected.shape
+    assert np.allclose(calculated, expected)
+
+    # Processing the same stream again after a reset should generate the same slices
+    mfe.reset()
+    assert np.allclose(mfe.process_stream(sample, dtype=np.uint16), expected)
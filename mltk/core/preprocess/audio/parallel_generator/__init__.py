@@ -1,3 +1,4 @@
 
 from .parallel_generator import ParallelAudioDataGenerator
-from .iterator import ParallelProcessParams
\ No newline at end of file
+from .iterator import ParallelProcessParams
+from .spectrogram_cache import SpectrogramCache, warm_spectrogram_cache
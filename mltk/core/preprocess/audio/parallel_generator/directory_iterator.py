@@ -49,7 +49,9 @@ class ParallelDirectoryIterator(ParallelIterator):
         frontend_enabled=True,
         disable_gpu_in_subprocesses=True,
         add_channel_dimension=True,
-        class_counts:Dict[str,int]=None
+        class_counts:Dict[str,int]=None,
+        shared_memory_transport=False,
+        reuse_workers=False
     ):
 
         self.directory = directory
@@ -58,6 +60,8 @@ class ParallelDirectoryIterator(ParallelIterator):
         self.cores = cores
         self.debug = debug
         self.disable_gpu_in_subprocesses = disable_gpu_in_subprocesses
+        self.shared_memory_transport = shared_memory_transport
+        self.reuse_workers = reuse_workers
 
         
         if class_mode not in self.allowed_class_modes:
@@ -14,6 +14,7 @@ from mltk.core import get_mltk_logger
 from mltk.core.keras import DataSequence
 from mltk.core.preprocess.utils import audio as audio_utils
 from mltk.utils.process_pool import ProcessPool, calculate_n_jobs
+from .spectrogram_cache import SpectrogramCache
 
 
 
@@ -46,13 +47,32 @@ class ParallelIterator(DataSequence):
         if process_params.validation_split and process_params.subset == 'validation':
             n_jobs = max(int(n_jobs*.5), 1)
 
+        shared_memory_size = None
+        if getattr(self, 'shared_memory_transport', False):
+            # Each slab must hold a batch's samples and labels.
+            # NOTE: With class_mode=input, the labels are a copy of the samples
+            dtype = np.dtype(process_params.dtype)
+            x_size = batch_size * int(np.prod(process_params.sample_shape)) * dtype.itemsize
+            y_size = batch_size * max(len(process_params.class_indices), 1) * dtype.itemsize
+            shared_memory_size = 2*x_size + y_size + 1024
+
+        # Delete the least recently used cache entries if the cache is too large.
+        # This is only done once per session and never by the worker subprocesses
+        if process_params.spectrogram_cache is not None:
+            process_params.spectrogram_cache.trim(once_per_session=True)
+
         self.pool = ProcessPool(
             name=self.process_params.subset,
             entry_point=get_batch_function,
             n_jobs=n_jobs,
             debug=self.debug,
             disable_gpu_in_subprocesses=self.disable_gpu_in_subprocesses,
-            logger=get_mltk_logger()
+            logger=get_mltk_logger(),
+            shared_memory_size=shared_memory_size,
+            # Slabs are held by the pending batches as well as the batches being processed
+            shared_memory_slabs=n_jobs + self.max_batches_pending + 2,
+            # Optionally share the subprocesses between the subsets and the commands run in this Python session
+            reuse_workers=getattr(self, 'reuse_workers', False),
         )
 
         self.batch_generation_started = threading.Event()
@@ -317,6 +337,18 @@ class ParallelProcessParams():
         self.split = split
         self.subset = subset
 
+        # Data augmentations are only applied if this is true
+        self.augmentation_enabled = \
+            (subset != 'validation' or audio_data_generator.validation_augmentation_enabled) and \
+            not audio_data_generator.disable_random_transforms
+
+        # Only cache the generated spectrograms if the processing pipeline is deterministic
+        self.spectrogram_cache = None
+        if not self.augmentation_enabled and \
+            noaug_preprocessing_function is None and \
+            preprocessing_function is None:
+            self.spectrogram_cache = SpectrogramCache.create(audio_data_generator)
+
 
 
 def get_batches_of_transformed_samples(
@@ -345,59 +377,56 @@ def get_batches_of_transformed_samples(
         random.seed(batch_index + int(time.time()))
         np.random.seed(batch_index + int(time.time()))
 
+    # First, retrieve and augment each audio sample
+    # (or retrieve the previously generated spectrogram from the cache)
+    samples = []
+    filepaths = []
+    frontend_indices = []
     for i, filename in enumerate(filenames):
         class_id = classes[i]
 
-        if filename:
-            filepath = os.path.join(params.directory, filename)
-            x, orignal_sr = audio_utils.read_audio_file(filepath, return_sample_rate=True, return_numpy=True)
-            
-        else:
-            orignal_sr = 16000
-            x = np.zeros((orignal_sr,), dtype='float32')
+        filepath = os.path.join(params.directory, filename) if filename else None
+        filepaths.append(filepath)
 
-        # At this point, 
-        # x = [sample_length] dtype=float32
+        # If the spectrogram cache is available (i.e. augmentations are disabled)
+        # then try to retrieve the previously generated spectrogram
+        x = None
+        if filepath and params.spectrogram_cache is not None:
+            x = params.spectrogram_cache.get(filepath)
 
-        if params.noaug_preprocessing_function is not None:
-            kwargs = _add_optional_callback_arguments( 
-                params.noaug_preprocessing_function,
-                batch_index=i,
-                class_id=class_id,
-                filename=filename,
-                batch_class_ids=classes,
-                batch_filenames=filenames
-            )
-            x = params.noaug_preprocessing_function(params, x, **kwargs)
-            
-        if params.subset != 'validation' or params.audio_data_generator.validation_augmentation_enabled:
-            transform_params = params.audio_data_generator.get_random_transform()
-        else:
-            transform_params = params.audio_data_generator.default_transform 
-        
-        # Apply any audio augmentations
-        # NOTE: If transform_params =  default_transform
-        #       Then the audio sample is simply cropped/padded to fit the expected sample length
-        x = params.audio_data_generator.apply_transform(x, orignal_sr, transform_params)
-
-        if params.preprocessing_function is not None:
-            kwargs = _add_optional_callback_arguments( 
-                params.preprocessing_function,
-                batch_index=i,
-                class_id=class_id,
-                filename=filename,
-                batch_class_ids=classes,
-                batch_filenames=filenames
-            )
-            x = params.preprocessing_function(params, x, **kwargs)
+        if x is None:
+            if filename:
+                x, orignal_sr = audio_utils.read_audio_file(filepath, return_sample_rate=True, return_numpy=True)
+            else:
+                orignal_sr = 16000
+                x = np.zeros((orignal_sr,), dtype='float32')
+
+            x = _augment_sample(params, x, orignal_sr, i, class_id, filename, classes, filenames)
+            if params.frontend_enabled:
+                frontend_indices.append(i)
+
+        samples.append(x)
+
+    # Next, pass all of the augmented audio samples through the frontend
+    # with a single call to the AudioFeatureGenerator
+    if frontend_indices:
+        # If a frontend dtype was specified use that,
+        # otherwise just use the output dtype
+        frontend_dtype = params.frontend_dtype or params.dtype
+        # After point through the frontend, 
+        # spectrograms = [n_samples, height, width] dtype=frontend_dtype
+        spectrograms = params.audio_data_generator.apply_frontend(
+            np.stack([samples[i] for i in frontend_indices]), 
+            dtype=frontend_dtype
+        )
+        for spectrogram, i in zip(spectrograms, frontend_indices):
+            samples[i] = spectrogram
+            if filepaths[i] and params.spectrogram_cache is not None:
+                params.spectrogram_cache.put(filepaths[i], spectrogram)
 
-        if params.frontend_enabled:
-            # If a frontend dtype was specified use that,
-            # otherwise just use the output dtype
-            frontend_dtype = params.frontend_dtype or params.dtype
-            # After point through the frontend, 
-            # x = [height, width] dtype=frontend_dtype
-            x = params.audio_data_generator.apply_frontend(x, dtype=frontend_dtype)
+    for i, filename in enumerate(filenames):
+        class_id = classes[i]
+        x = samples[i]
 
         # Perform any post processing as necessary
         if params.postprocessing_function is not None:
@@ -447,6 +476,57 @@ def get_batches_of_transformed_samples(
 
 
 
+def _augment_sample(
+    params:ParallelProcessParams,
+    x:np.ndarray,
+    orignal_sr:int,
+    i:int,
+    class_id:int,
+    filename:str,
+    classes:List[int],
+    filenames:List[str]
+) -> np.ndarray:
+    """Apply the preprocessing functions and augmentations to the given audio sample"""
+    # At this point, 
+    # x = [sample_length] dtype=float32
+
+    if params.noaug_preprocessing_function is not None:
+        kwargs = _add_optional_callback_arguments( 
+            params.noaug_preprocessing_function,
+            batch_index=i,
+            class_id=class_id,
+            filename=filename,
+            batch_class_ids=classes,
+            batch_filenames=filenames
+        )
+        x = params.noaug_preprocessing_function(params, x, **kwargs)
+        
+    if params.subset != 'validation' or params.audio_data_generator.validation_augmentation_enabled:
+        transform_params = params.audio_data_generator.get_random_transform()
+    else:
+        transform_params = params.audio_data_generator.default_transform 
+    
+    # Apply any audio augmentations
+    # NOTE: If transform_params =  default_transform
+    #       Then the audio sample is simply cropped/padded to fit the expected sample length
+    x = params.audio_data_generator.apply_transform(x, orignal_sr, transform_params)
+
+    if params.preprocessing_function is not None:
+        kwargs = _add_optional_callback_arguments( 
+            params.preprocessing_function,
+            batch_index=i,
+            class_id=class_id,
+            filename=filename,
+            batch_class_ids=classes,
+            batch_filenames=filenames
+        )
+        x = params.preprocessing_function(params, x, **kwargs)
+
+    return x
+
+
+
+
 class BatchData:
     
     def __init__(
@@ -250,6 +250,28 @@ class ParallelAudioDataGenerator:
         add_channel_dimension: If true and ``frontend_enabled=True``, then automatically convert 
             generated sample shape from [height, width] to [height, width, 1]. 
             If false, then generated sample shape is [height, width].
+
+        shared_memory_transport: If true, then the processed batches are returned from the subprocesses
+            via shared memory rather than pickled through a pipe. This reduces the number of times
+            large batches are copied. See :py:class:`mltk.utils.process_pool.ProcessPool` for more details.
+
+        spectrogram_cache_enabled: If true, then spectrograms generated without data augmentations
+            (e.g. the validation subset with ``validation_augmentation_enabled=False``, or ``disable_random_transforms=True``)
+            are stored to an on-disk cache the first time they are generated. Subsequent epochs and evaluations then read the
+            spectrograms directly from the cache. This is only used if ``frontend_enabled=True`` and no ``noaug_preprocessing_function``
+            or ``preprocessing_function`` is given.
+            See :py:class:`mltk.core.preprocess.audio.parallel_generator.SpectrogramCache` for more details.
+
+        spectrogram_cache_dir: Directory of the spectrogram cache. If omitted, ``~/.mltk/spectrogram_cache`` is used
+
+        spectrogram_cache_max_size_mb: Maximum size of the spectrogram cache in megabytes.
+            The least recently used entries are deleted when the cache exceeds this size.
+
+        reuse_workers: If true, then the processing subprocesses are kept alive when the generator is shutdown
+            and reused by the next generator (e.g. the validation subset or the next command run in the same Python session).
+            This avoids the time required to start the subprocesses.
+            The idle subprocesses are terminated by :py:func:`mltk.utils.process_pool.shutdown_idle_workers` or when Python exits.
+            See :py:class:`mltk.utils.process_pool.ProcessPool` for more details.
     
     '''
     def __init__(
@@ -286,7 +308,12 @@ class ParallelAudioDataGenerator:
         frontend_enabled = True,
         sample_shape=None,
         disable_gpu_in_subprocesses=True,
-        add_channel_dimension=True
+        add_channel_dimension=True,
+        shared_memory_transport=False,
+        spectrogram_cache_enabled=False,
+        spectrogram_cache_dir:str=None,
+        spectrogram_cache_max_size_mb:float=4096,
+        reuse_workers=False
     ):
 
         self.cores = cores
@@ -325,6 +352,11 @@ class ParallelAudioDataGenerator:
         self._sample_shape = sample_shape
         self.disable_gpu_in_subprocesses = disable_gpu_in_subprocesses
         self.add_channel_dimension = add_channel_dimension
+        self.shared_memory_transport = shared_memory_transport
+        self.spectrogram_cache_enabled = spectrogram_cache_enabled
+        self.spectrogram_cache_dir = spectrogram_cache_dir
+        self.spectrogram_cache_max_size_mb = spectrogram_cache_max_size_mb
+        self.reuse_workers = reuse_workers
 
         
         self.NOISE_COLORS =  ('white', 'brown', 'blue', 'pink', 'violet')
@@ -514,7 +546,9 @@ class ParallelAudioDataGenerator:
             frontend_enabled=self.frontend_enabled,
             disable_gpu_in_subprocesses=self.disable_gpu_in_subprocesses,
             add_channel_dimension=self.add_channel_dimension,
-            class_counts=class_counts
+            class_counts=class_counts,
+            shared_memory_transport=self.shared_memory_transport,
+            reuse_workers=self.reuse_workers
         )
     
     
@@ -651,12 +685,17 @@ class ParallelAudioDataGenerator:
         return sample
 
 
-    def apply_frontend(self, sample, dtype=np.float32) -> np.ndarray:
-        """Send the audio sample through the AudioFeatureGenerator and return the generated spectrogram"""
+    def apply_frontend(self, sample, dtype=np.float32, out=None) -> np.ndarray:
+        """Send the audio sample through the AudioFeatureGenerator and return the generated spectrogram
+
+        If a batch of samples, i.e. [n_samples, sample_length], is given then the entire batch
+        is processed with a single call to the AudioFeatureGenerator and [n_samples, height, width] is returned
+        """
         return audio_utils.apply_frontend(
             sample=sample,
             settings=self.frontend_settings,
-            dtype=dtype
+            dtype=dtype,
+            out=out
         )
 
     
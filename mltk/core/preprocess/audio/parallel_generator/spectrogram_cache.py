@@ -0,0 +1,237 @@
+"""On-disk cache of the spectrograms generated by the ParallelAudioDataGenerator
+
+Refer to `SpectrogramCache` for more details
+"""
+from __future__ import annotations
+from typing import List, Union, TYPE_CHECKING
+import os
+import uuid
+import logging
+
+import numpy as np
+
+from mltk.utils.hasher import generate_hash
+from mltk.utils.path import create_user_dir, fullpath
+
+if TYPE_CHECKING:
+    from mltk.core import MltkModel
+    from .parallel_generator import ParallelAudioDataGenerator
+
+
+# The cache directories trimmed by this Python session, see SpectrogramCache.trim()
+_trimmed_cache_dirs = set()
+
+
+class SpectrogramCache:
+    """On-disk cache of generated spectrograms
+
+    When data augmentations are disabled (e.g. the validation subset with ``validation_augmentation_enabled=False``,
+    or ``disable_random_transforms=True``), the spectrogram generated for a given audio file is always the same.
+    In this case, the ParallelAudioDataGenerator stores the spectrogram in this cache the first time the audio file is processed
+    and subsequent epochs (and evaluations) memory-map the spectrogram from the cache
+    rather than re-reading, re-sampling, and passing the audio through the AudioFeatureGenerator.
+
+    Each cache entry is keyed by the audio file's path, size, and modification time,
+    and entries are stored in a sub-directory named by the hash of the AudioFeatureGeneratorSettings
+    and the sample rate/length the audio is cropped/padded to.
+    Thus, changing the frontend settings automatically invalidates the cache.
+
+    The cache's size is limited by ``max_size_mb``. The cache is trimmed once per Python session,
+    by the process that creates the data iterator, by deleting the least recently used entries.
+    NOTE: The worker subprocesses never trim the cache, so the cache may temporarily exceed ``max_size_mb``
+    by the size of the spectrograms generated during the current session.
+
+    Args:
+        cache_dir: Base directory of the cache. If omitted then ``~/.mltk/spectrogram_cache`` is used
+        config: Object used to generate the cache's key, e.g. the frontend settings and transform parameters
+        max_size_mb: The maximum size of the cache's base directory in megabytes
+    """
+    def __init__(
+        self,
+        cache_dir:str=None,
+        config:object=None,
+        max_size_mb:float=4096,
+    ):
+        if not cache_dir:
+            cache_dir = create_user_dir('spectrogram_cache')
+        self.cache_dir = fullpath(cache_dir)
+        self.config_key = generate_hash(config)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+
+
+    @staticmethod
+    def create(datagen:ParallelAudioDataGenerator) -> Union[SpectrogramCache,None]:
+        """Create a cache for the given ParallelAudioDataGenerator
+
+        Returns:
+            The cache or None if the datagen's spectrogram cache is disabled
+        """
+        if not datagen.spectrogram_cache_enabled or not datagen.frontend_enabled:
+            return None
+
+        config = dict(
+            frontend_settings=sorted(datagen.frontend_settings.items()),
+            frontend_dtype=np.dtype(datagen.frontend_dtype or datagen.dtype).str,
+            # Without augmentations, the audio is only resampled and cropped/padded to the sample length
+            sample_rate_hz=datagen.sample_rate_hz,
+            sample_length=datagen.sample_length,
+            trim_threshold_db=datagen.trim_threshold_db,
+        )
+
+        return SpectrogramCache(
+            cache_dir=datagen.spectrogram_cache_dir,
+            config=config,
+            max_size_mb=datagen.spectrogram_cache_max_size_mb
+        )
+
+
+    def get(self, filepath:str) -> Union[np.ndarray,None]:
+        """Return the cached spectrogram for the given audio file, or None if it is not cached
+
+        NOTE: The returned array is memory-mapped as copy-on-write
+        """
+        path = self._get_entry_path(filepath)
+        if path is None:
+            return None
+
+        try:
+            spectrogram = np.load(path, mmap_mode='c', allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            # Update the entry's timestamp for the LRU
+            os.utime(path)
+        except OSError:
+            pass
+
+        return spectrogram
+
+
+    def put(self, filepath:str, spectrogram:np.ndarray):
+        """Add the given spectrogram to the cache"""
+        path = self._get_entry_path(filepath)
+        if path is None:
+            return
+
+        # Write to a temp file and then rename
+        # so that other processes never see a partially written entry
+        tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.save(f, spectrogram, allow_pickle=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+
+    def trim(self, once_per_session:bool=False) -> int:
+        """Delete the least recently used entries until the cache is smaller than ``max_size_mb``
+
+        NOTE: This walks the entire cache directory, so it should only be called by the parent process
+
+        Args:
+            once_per_session: If true and the cache directory was already trimmed by this Python session, then do nothing
+
+        Returns:
+            The number of deleted entries
+        """
+        if once_per_session:
+            if self.cache_dir in _trimmed_cache_dirs:
+                return 0
+            _trimmed_cache_dirs.add(self.cache_dir)
+
+        entries = []
+        total_size = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for fn in files:
+                path = os.path.join(root, fn)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total_size += st.st_size
+
+        if total_size <= self.max_size_bytes:
+            return 0
+
+        # Delete the oldest entries until the cache is at 90% of its max size
+        # This way, the cache is not trimmed on every write
+        n_deleted = 0
+        target_size = int(self.max_size_bytes * 0.9)
+        for _, size, path in sorted(entries):
+            if total_size <= target_size:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+                n_deleted += 1
+            except OSError:
+                pass
+
+        return n_deleted
+
+
+    def _get_entry_path(self, filepath:str) -> Union[str,None]:
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return None
+        key = generate_hash(os.path.abspath(filepath), st.st_size, st.st_mtime_ns)
+        return f'{self.cache_dir}/{self.config_key}/{key[:2]}/{key}.npy'
+
+
+
+def warm_spectrogram_cache(
+    mltk_model:MltkModel,
+    subsets:List[str]=('evaluation',),
+    max_samples_per_class:int=-1,
+    logger:logging.Logger=None,
+) -> int:
+    """Populate the spectrogram cache by processing every batch of the given dataset subsets
+
+    The model's ParallelAudioDataGenerator must have ``spectrogram_cache_enabled=True``.
+    NOTE: Only samples processed without data augmentations are cached.
+
+    Args:
+        mltk_model: The MltkModel which uses the ParallelAudioDataGenerator
+        subsets: The dataset subsets to process, e.g.: training, validation, evaluation
+        max_samples_per_class: The maximum number of samples per class to process, -1 to process all samples
+        logger: Optional logger
+
+    Returns:
+        The number of processed batches
+    """
+    from mltk.core.preprocess.audio.parallel_generator import ParallelAudioDataGenerator
+
+    logger = logger or logging.getLogger()
+
+    datagens = [mltk_model.datagen, getattr(mltk_model, 'validation_datagen', None)]
+    if not any(isinstance(x, ParallelAudioDataGenerator) and x.spectrogram_cache_enabled for x in datagens):
+        raise ValueError(
+            f'{mltk_model.name} does not use a ParallelAudioDataGenerator with spectrogram_cache_enabled=True'
+        )
+
+    n_batches = 0
+    for subset in subsets:
+        logger.info(f'Processing the {subset} subset of {mltk_model.name} ...')
+        mltk_model.load_dataset(subset=subset, max_samples_per_class=max_samples_per_class)
+        try:
+            for data in (mltk_model.x, mltk_model.validation_data):
+                if data is None:
+                    continue
+                for i in range(len(data)):
+                    # The batch itself is discarded,
+                    # generating it is what stores its spectrograms in the cache
+                    _ = data[i]
+                    n_batches += 1
+        finally:
+            mltk_model.unload_dataset()
+
+    return n_batches
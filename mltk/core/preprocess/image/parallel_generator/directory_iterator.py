@@ -95,6 +95,7 @@ class ParallelDirectoryIterator(ParallelIterator):
         max_samples_per_class=-1,
         disable_gpu_in_subprocesses=True,
         class_counts:Dict[str,int]=None,
+        reuse_workers=False,
     ):
 
         self.directory = directory
@@ -103,6 +104,7 @@ class ParallelDirectoryIterator(ParallelIterator):
         self.debug = debug
         self.max_batches_pending = max_batches_pending
         self.disable_gpu_in_subprocesses = disable_gpu_in_subprocesses
+        self.reuse_workers = reuse_workers
 
         
         if class_mode not in self.allowed_class_modes:
@@ -55,7 +55,9 @@ class ParallelIterator(DataSequence):
             n_jobs=n_jobs,
             debug=self.debug,
             disable_gpu_in_subprocesses=self.disable_gpu_in_subprocesses,
-            logger=get_mltk_logger()
+            logger=get_mltk_logger(),
+            # Optionally share the subprocesses between the subsets and the commands run in this Python session
+            reuse_workers=getattr(self, 'reuse_workers', False),
         )
 
         self.batch_generation_started = threading.Event()
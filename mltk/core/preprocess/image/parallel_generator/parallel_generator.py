@@ -211,6 +211,10 @@ class ParallelImageDataGenerator(ImageDataGenerator):
 
         batch_size: Generated batch size. This overrides the value given to flow_from_directory()
              Set to ``-1`` to set the batch size to be the number of samples
+
+        reuse_workers: If true, then the processing subprocesses are kept alive when the generator is shutdown
+            and reused by the next generator (e.g. the validation subset or the next command run in the same Python session).
+            The idle subprocesses are terminated by :py:func:`mltk.utils.process_pool.shutdown_idle_workers` or when Python exits
         
 
     '''
@@ -232,6 +236,7 @@ class ParallelImageDataGenerator(ImageDataGenerator):
         save_prefix=None,
         save_format=None,
         batch_size=None,
+        reuse_workers=False,
         **kwargs
     ):
         ImageDataGenerator.__init__(self, **_remove_preprocessing_function_arg(kwargs))
@@ -252,6 +257,7 @@ class ParallelImageDataGenerator(ImageDataGenerator):
         self.save_prefix = save_prefix
         self.save_format = save_format
         self.batch_size = batch_size
+        self.reuse_workers = reuse_workers
 
 
     def flow_from_directory(
@@ -402,7 +408,8 @@ class ParallelImageDataGenerator(ImageDataGenerator):
             list_valid_filenames_in_directory_function=list_valid_filenames_in_directory_function,
             max_samples_per_class=self.max_samples_per_class,
             disable_gpu_in_subprocesses=self.disable_gpu_in_subprocesses,
-            class_counts=class_counts
+            class_counts=class_counts,
+            reuse_workers=self.reuse_workers
         )
         
     def flow(
@@ -2,6 +2,7 @@ from .list_directory import list_dataset_directory
 from .list_directory import list_valid_filenames_in_directory
 from .list_directory import split_file_list
 from .list_directory import shuffle_file_list_by_group
+from .dataset_index import DatasetFileIndex
 
 from .normalize import normalize
 
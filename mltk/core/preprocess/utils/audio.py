@@ -1,6 +1,7 @@
 """Utilities for processing audio data"""
 
 import os
+import threading
 from typing import Union
 import numpy as np
 import tensorflow as tf
@@ -186,12 +187,18 @@ def adjust_length(
 def apply_frontend(
     sample:np.ndarray,
     settings:AudioFeatureGeneratorSettings,
-    dtype=np.float32
+    dtype=np.float32,
+    out:np.ndarray=None
 ) -> np.ndarray:
     """Send the audio sample through the AudioFeatureGenerator and return the generated spectrogram
 
+    This also accepts a batch of audio samples, in which case the entire batch
+    is processed with a single call to :py:meth:`AudioFeatureGenerator.process_batch`.
+
     Args:
-        sample: The audio sample to process in the AudioFeatureGenerator
+        sample: The audio sample to process in the AudioFeatureGenerator.
+            This may be a single sample with shape [sample_length] or [sample_length, 1],
+            or a batch of samples with shape [n_samples, sample_length] or [n_samples, sample_length, 1]
         settings: The settings to use in the AudioFeatureGenerator
         dtype: The expected audio output data type, support types are:
             
@@ -199,9 +206,11 @@ def apply_frontend(
             * **float32**: This is the uint16 value directly casted to a float32
             * **int8**: This is the int8 value generated by the TFLM "micro features" library.
                 Refer to the following for the magic that happens here: `micro_features_generator.cc#L84 <https://github.com/tensorflow/tflite-micro/blob/main/tensorflow/lite/micro/examples/micro_speech/micro_features/micro_features_generator.cc#L84>`_
+        out: Optional, pre-allocated [n_samples, n_features, n_channels] output array.
+            This is only used if a batch of samples is given
 
     Returns:
-        Generated spectrogram of audio
+        Generated spectrogram of audio, or [n_samples, n_features, n_channels] spectrograms if a batch was given
     """
 
     if np.issubdtype(sample.dtype, np.floating):
@@ -211,8 +220,35 @@ def apply_frontend(
         sample = sample * 32768
         sample = sample.astype(np.int16)
 
-    if len(sample.shape) == 2:
+    if sample.shape[-1] == 1 and len(sample.shape) > 1:
         sample = np.squeeze(sample, axis=-1)
 
-    frontend = AudioFeatureGenerator(settings)
+    frontend = _get_audio_feature_generator(settings)
+    if len(sample.shape) == 2:
+        return frontend.process_batch(sample, dtype=dtype, out=out)
+
     return frontend.process_sample(sample, dtype=dtype)
+
+
+def _get_audio_feature_generator(settings:AudioFeatureGeneratorSettings) -> AudioFeatureGenerator:
+    """Return an AudioFeatureGenerator for the given settings
+
+    The AudioFeatureGenerator is cached per thread as it is not thread-safe
+    and re-creating it for each sample is expensive.
+    """
+    key = tuple(sorted(settings.items()))
+    cache = getattr(_frontend_cache, 'generators', None)
+    if cache is None:
+        cache = _frontend_cache.generators = {}
+
+    frontend = cache.get(key, None)
+    if frontend is None:
+        if len(cache) >= 8:
+            cache.clear()
+        frontend = AudioFeatureGenerator(settings)
+        cache[key] = frontend
+
+    return frontend
+
+
+_frontend_cache = threading.local()
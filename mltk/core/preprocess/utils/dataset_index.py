@@ -0,0 +1,259 @@
+"""Persistent index of the files in a dataset directory"""
+
+import os
+import time
+import sqlite3
+import threading
+import contextlib
+from typing import List, Tuple, Dict, Iterator
+
+
+
+class DatasetFileIndex:
+    """Persistent index of the files in a dataset directory
+
+    This stores the relative path, size, and modification time of every file
+    in the dataset directory to an SQLite database.
+
+    The index is incrementally updated using the directories' modification times:
+    a directory's modification time changes when an entry is added, removed, or renamed in it.
+    So if a directory's modification time has not changed since it was last scanned,
+    then its files are retrieved from the index rather than listing the directory.
+    This greatly reduces the time required to list large datasets, particularly on network storage.
+
+    Args:
+        base_directory: The dataset's base directory
+        index_path: Path to the index database file.
+            If omitted then the index is stored at: ``<base_directory>/.index/files.sqlite``
+        follow_links: If true then follow symbolic links when searching the dataset directory
+    """
+
+    # Directories modified within this many seconds of being scanned are always re-scanned
+    # as they may be modified again within the filesystem's timestamp granularity
+    MTIME_GUARD_SECONDS = 2.0
+
+    _locks:Dict[str,threading.Lock] = {}
+    _locks_lock = threading.Lock()
+
+    def __init__(
+        self,
+        base_directory:str,
+        index_path:str=None,
+        follow_links:bool=False
+    ):
+        self.base_directory = base_directory.replace('\\', '/').rstrip('/')
+        self.index_path = (index_path or f'{self.base_directory}/.index/files.sqlite').replace('\\', '/')
+        self.follow_links = follow_links
+
+        with DatasetFileIndex._locks_lock:
+            if self.index_path not in DatasetFileIndex._locks:
+                DatasetFileIndex._locks[self.index_path] = threading.Lock()
+            self._lock = DatasetFileIndex._locks[self.index_path]
+
+
+    def refresh(self, subdir:str='') -> List[Tuple[str,int,int]]:
+        """Update the index for the given sub-directory and return its files
+
+        Only directories that have changed since the previous refresh are scanned.
+
+        Args:
+            subdir: The sub-directory, relative to the base directory, to refresh.
+                If omitted then the entire base directory is refreshed
+        Returns:
+            List of tuples: (relative path, size, mtime_ns) for each file in the sub-directory
+        """
+        subdir = subdir.replace('\\', '/').strip('/')
+
+        with self._lock, self._connect() as conn:
+            cached_dirs = {
+                path: (mtime_ns, subdirs.split('/') if subdirs else [])
+                for path, mtime_ns, subdirs in conn.execute(
+                    'SELECT path, mtime_ns, subdirs FROM dirs WHERE ' + _subtree_where('path'),
+                    _subtree_args(subdir)
+                )
+            }
+
+            now = time.time()
+            found_dirs = set()
+            dir_stack = [subdir]
+            while dir_stack:
+                rel_dir = dir_stack.pop()
+                abs_dir = f'{self.base_directory}/{rel_dir}' if rel_dir else self.base_directory
+                try:
+                    dir_mtime_ns = os.stat(abs_dir).st_mtime_ns
+                except OSError:
+                    continue
+
+                found_dirs.add(rel_dir)
+                cached = cached_dirs.get(rel_dir, None)
+                if cached is not None and cached[0] == dir_mtime_ns:
+                    dir_stack.extend(_join(rel_dir, x) for x in cached[1])
+                    continue
+
+                subdirs, files = self._scan_directory(abs_dir)
+                if dir_mtime_ns / 1e9 > now - self.MTIME_GUARD_SECONDS:
+                    dir_mtime_ns = -1
+
+                conn.execute('DELETE FROM files WHERE dir = ?', (rel_dir,))
+                conn.executemany(
+                    'INSERT INTO files (dir, name, size, mtime_ns) VALUES (?, ?, ?, ?)',
+                    [(rel_dir, name, size, mtime_ns) for name, size, mtime_ns in files]
+                )
+                conn.execute(
+                    'INSERT OR REPLACE INTO dirs (path, mtime_ns, subdirs) VALUES (?, ?, ?)',
+                    (rel_dir, dir_mtime_ns, '/'.join(subdirs))
+                )
+                dir_stack.extend(_join(rel_dir, x) for x in subdirs)
+
+            # Remove any directories that no longer exist
+            removed_dirs = [(x,) for x in cached_dirs if x not in found_dirs]
+            if removed_dirs:
+                conn.executemany('DELETE FROM dirs WHERE path = ?', removed_dirs)
+                conn.executemany('DELETE FROM files WHERE dir = ?', removed_dirs)
+
+            return [
+                (_join(rel_dir, name), size, mtime_ns)
+                for rel_dir, name, size, mtime_ns in conn.execute(
+                    'SELECT dir, name, size, mtime_ns FROM files WHERE ' + _subtree_where('dir'),
+                    _subtree_args(subdir)
+                )
+            ]
+
+
+    def list_files(
+        self,
+        subdir:str='',
+        white_list_formats:Tuple[str]=None
+    ) -> List[str]:
+        """Refresh the index and return the relative paths of the files in the given sub-directory
+
+        Args:
+            subdir: The sub-directory, relative to the base directory, to list.
+                If omitted then the entire base directory is listed
+            white_list_formats: List of file extensions to include
+        Returns:
+            List of file paths relative to the base directory
+        """
+        if isinstance(white_list_formats, list):
+            white_list_formats = tuple(white_list_formats)
+
+        retval = []
+        for path, _, _ in self.refresh(subdir):
+            if white_list_formats and not path.lower().endswith(white_list_formats):
+                continue
+            retval.append(path)
+
+        return retval
+
+
+    def list_files_by_class(
+        self,
+        white_list_formats:Tuple[str]=None
+    ) -> Dict[str,List[str]]:
+        """Refresh the entire index with a single walk and return the relative paths of the files grouped by class
+
+        The class of a file is the top-level sub-directory of the base directory that contains it.
+        Files directly in the base directory are ignored.
+
+        Args:
+            white_list_formats: List of file extensions to include
+        Returns:
+            Dictionary: <class name>: [<file paths relative to the base directory>]
+        """
+        retval = {}
+        for path in self.list_files(white_list_formats=white_list_formats):
+            class_name, sep, _ = path.partition('/')
+            if sep:
+                retval.setdefault(class_name, []).append(path)
+
+        return retval
+
+
+    def get_modified_ns(self, subdir:str='') -> int:
+        """Return the latest modification time of the given sub-directory and its nested directories
+
+        This uses the directory modification times stored by the previous refresh,
+        i.e. the file system is not accessed.
+
+        Args:
+            subdir: The sub-directory, relative to the base directory.
+                If omitted then the entire base directory is used
+        Returns:
+            The latest modification time in nanoseconds, or -1 if it is not known,
+            i.e. the sub-directory is not indexed or a directory was modified too recently to be reliable
+        """
+        subdir = subdir.replace('\\', '/').strip('/')
+
+        with self._lock, self._connect() as conn:
+            n_dirs, min_mtime_ns, max_mtime_ns = conn.execute(
+                'SELECT COUNT(*), MIN(mtime_ns), MAX(mtime_ns) FROM dirs WHERE ' + _subtree_where('path'),
+                _subtree_args(subdir)
+            ).fetchone()
+
+        if n_dirs == 0 or min_mtime_ns < 0:
+            return -1
+        return max_mtime_ns
+
+
+    def clear(self):
+        """Remove all entries from the index"""
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM files')
+            conn.execute('DELETE FROM dirs')
+
+
+    def _scan_directory(self, abs_dir:str) -> Tuple[List[str], List[Tuple[str,int,int]]]:
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(abs_dir) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir():
+                            # Do not index the index directory
+                            if entry.name == '.index':
+                                continue
+                            if self.follow_links or not entry.is_symlink():
+                                subdirs.append(entry.name)
+                        else:
+                            st = entry.stat(follow_symlinks=True)
+                            files.append((entry.name, st.st_size, st.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        return subdirs, files
+
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        conn = sqlite3.connect(self.index_path, timeout=60)
+        try:
+            with conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS dirs ('
+                    'path TEXT PRIMARY KEY, mtime_ns INTEGER, subdirs TEXT)'
+                )
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS files ('
+                    'dir TEXT, name TEXT, size INTEGER, mtime_ns INTEGER, PRIMARY KEY (dir, name)) WITHOUT ROWID'
+                )
+                yield conn
+        finally:
+            conn.close()
+
+
+
+def _join(rel_dir:str, name:str) -> str:
+    return f'{rel_dir}/{name}' if rel_dir else name
+
+
+def _subtree_where(column:str) -> str:
+    # NOTE: '0' is the character after '/', so this selects all paths starting with '<subdir>/'
+    return f'({column} = ? OR ({column} >= ? AND {column} < ?) OR ? = \'\')'
+
+
+def _subtree_args(subdir:str) -> tuple:
+    return (subdir, subdir + '/', subdir + '0', subdir)
@@ -6,11 +6,13 @@ import copy
 import random
 import math
 import multiprocessing
+import multiprocessing.pool
 import numpy as np
 from numpy.random import RandomState
 
 from mltk.core import get_mltk_logger
 from mltk.utils.python import prepend_exception_msg
+from .dataset_index import DatasetFileIndex
 
 
 
@@ -145,6 +147,29 @@ def list_dataset_directory(
             raise Exception(f"Failed to find 'unknown' classes in {directory}")
 
 
+    # If the default listing function is used,
+    # then refresh the persistent index of all the classes with a single walk of the dataset directory
+    files_by_class = None
+    if list_valid_filenames_in_directory_function is list_valid_filenames_in_directory:
+        files_by_class = _get_file_index(
+            base_directory=directory,
+            shuffle_index_directory=shuffle_index_directory,
+            follow_links=follow_links
+        ).list_files_by_class(white_list_formats=white_list_formats)
+
+    def _list_class_kwargs(clazz:str) -> dict:
+        kwargs = dict(
+            base_directory=directory,
+            search_class=clazz,
+            white_list_formats=white_list_formats,
+            split=split,
+            shuffle_index_directory=shuffle_index_directory,
+            follow_links=follow_links,
+        )
+        if files_by_class is not None:
+            kwargs['available_files'] = files_by_class.get(clazz, [])
+        return kwargs
+
     thread_count = min(multiprocessing.cpu_count(), len(classes))
     pool = multiprocessing.pool.ThreadPool(processes=thread_count)
 
@@ -156,14 +181,8 @@ def list_dataset_directory(
             continue
         results.append(
         pool.apply_async(list_valid_filenames_in_directory_function,
-            kwds=dict(
-                base_directory=directory,
-                search_class=clazz,
-                white_list_formats=white_list_formats,
-                split=split,
-                shuffle_index_directory=shuffle_index_directory,
-                follow_links=follow_links,
-        )))
+            kwds=_list_class_kwargs(clazz)
+        ))
 
 
     for res in results:
@@ -191,14 +210,8 @@ def list_dataset_directory(
         for clazz in unknown_classes:
             results.append(
             pool.apply_async(list_valid_filenames_in_directory_function,
-                kwds=dict(
-                    base_directory=directory,
-                    search_class=clazz,
-                    white_list_formats=white_list_formats,
-                    split=split,
-                    shuffle_index_directory=shuffle_index_directory,
-                    follow_links=follow_links,
-            )))
+                kwds=_list_class_kwargs(clazz)
+            ))
 
         all_unknown_filenames = {}
         for res in results:
@@ -290,10 +303,15 @@ def list_valid_filenames_in_directory(
     white_list_formats:List[str]=None,
     split:Tuple[float,float]=None,
     follow_links:bool=False,
-    shuffle_index_directory:str=None
+    shuffle_index_directory:str=None,
+    available_files:List[str]=None,
 ) -> Tuple[str, List[str]]:
     """File all files in the search directory for the specified class
 
+    The files are found using a persistent :py:class:`~DatasetFileIndex`
+    which is incrementally updated based on the directories' modification times.
+    An existing list file is reused as-is if none of the class's directories were modified since it was written.
+
     if shuffle_index_directory is None:
         then sort the filenames alphabetically and save to the list file:
         <base_directory>/.index/<search_class>.txt
@@ -310,6 +328,8 @@ def list_valid_filenames_in_directory(
             If omitted then return the entire dataset
         follow_links: If true then follow symbolic links when recursively searching the given dataset directory
         shuffle_index_directory: Path to directory to hold generated index of the dataset
+        available_files: The class's files, relative to the ``base_directory``, as returned by :py:meth:`~DatasetFileIndex.list_files_by_class`.
+            If omitted, then the class's directory is refreshed in the persistent index
     Returns:
         (search_class, list(relative paths),
         a tuple of the given ``search_class`` and list of file paths relative to the ``base_directory``
@@ -322,48 +342,46 @@ def list_valid_filenames_in_directory(
     else:
         index_path = f'{shuffle_index_directory}/.index/{search_class}.txt'
 
-    if isinstance(white_list_formats, list):
-        white_list_formats = tuple(white_list_formats)
+    # Incrementally update the persistent index of the class's files.
+    # Only the class directories that have changed since the previous call are listed.
+    # NOTE: The dataset directory structure should be:
+    # <dataset base dir>/<class1>/
+    # <dataset base dir>/<class1>/sample1.jpg
+    # <dataset base dir>/<class1>/sample2.jpg
+    # <dataset base dir>/<class1>/subfolder1/sample3.jpg
+    # <dataset base dir>/<class1>/subfolder2/sample4.jpg
+    # <dataset base dir>/<class2>/...
+    # <dataset base dir>/<class3>/...
+    file_index = _get_file_index(
+        base_directory=base_directory,
+        shuffle_index_directory=shuffle_index_directory,
+        follow_links=follow_links
+    )
+    if available_files is None:
+        available_files = file_index.list_files(
+            subdir=search_class,
+            white_list_formats=white_list_formats
+        )
 
     # If the index file exists, then read it
     if os.path.exists(index_path):
         with open(index_path, 'r') as f:
             for line in f:
-                filename = line.strip()
-                filepath = f'{base_directory}/{filename}'
-                if not os.path.exists(filepath):
-                    get_mltk_logger().warning(f'File {filepath} not found in existing index, re-generating index')
-                    file_list = []
-                    break
-                file_list.append(filename)
+                file_list.append(line.strip())
+
+        # A directory's modification time changes when a file is added, removed, or renamed in it.
+        # So if none of the class's directories were modified since the index file was written,
+        # then the index file is still valid. Otherwise, ensure it lists exactly the class's current files
+        modified_ns = file_index.get_modified_ns(search_class)
+        if modified_ns == -1 or modified_ns >= os.stat(index_path).st_mtime_ns:
+            if set(file_list) != set(available_files):
+                get_mltk_logger().warning(f'Files in {base_directory}/{search_class} changed, re-generating index')
+                file_list = []
 
 
     if len(file_list) == 0:
         get_mltk_logger().info(f'Generating index: {index_path} ...')
-        # Else find all files for the given class in the search directory
-        # NOTE: The dataset directory structure should be:
-        # <dataset base dir>/<class1>/
-        # <dataset base dir>/<class1>/sample1.jpg
-        # <dataset base dir>/<class1>/sample2.jpg
-        # <dataset base dir>/<class1>/subfolder1/sample3.jpg
-        # <dataset base dir>/<class1>/subfolder2/sample4.jpg
-        # <dataset base dir>/<class2>/...
-        # <dataset base dir>/<class3>/...
-        #
-        # This will recursively return all sample files under <dataset base dir>/<class x>
-        class_base_dir = f'{base_directory}/{search_class}/'
-        for root, _, files in os.walk(base_directory, followlinks=follow_links):
-            root = root.replace('\\', '/') + '/'
-            if not root.startswith(class_base_dir):
-                continue
-
-            for fname in files:
-                if white_list_formats and not fname.lower().endswith(white_list_formats):
-                    continue
-                abs_path = os.path.join(root, fname)
-                rel_path = os.path.relpath(abs_path, base_directory)
-                file_list.append(rel_path.replace('\\', '/'))
-
+        file_list = available_files
 
         # Randomly shuffle the list if necessary
         if shuffle_index_directory is not None:
@@ -387,6 +405,20 @@ def list_valid_filenames_in_directory(
     return search_class, filenames
 
 
+def _get_file_index(
+    base_directory:str,
+    shuffle_index_directory:str,
+    follow_links:bool
+) -> DatasetFileIndex:
+    base_directory = base_directory.replace('\\', '/')
+    index_dir = f'{shuffle_index_directory or base_directory}/.index'
+    return DatasetFileIndex(
+        base_directory=base_directory,
+        index_path=f'{index_dir}/files.sqlite',
+        follow_links=follow_links
+    )
+
+
 def split_file_list(
     paths:List[str],
     split:Tuple[float,float]=None
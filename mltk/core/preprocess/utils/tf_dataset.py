@@ -332,6 +332,7 @@ def parallel_process(
     name='ParallelProcess',
     env:Dict[str,str]=None,
     disable_gpu_in_subprocesses=True,
+    n_chunks_per_job:int=2,
 ) -> Tuple[tf.data.Dataset, ProcessPool]:
     """Parallel process the dataset
 
@@ -356,6 +357,9 @@ def parallel_process(
         name: The prefix to use in the model graph
         env: Optional OS environment variables to export in the parallel subprocesses
         disable_gpu_in_subprocesses: By default the GPU is disabled in the parallel subprocesses
+        n_chunks_per_job: Each batch is split into n_jobs*n_chunks_per_job chunks.
+            The samples of a chunk are sent to a subprocess in a single request (see :py:meth:`ProcessPool.process_chunk`)
+            and up to n_chunks_per_job chunks may be queued to each subprocess.
 
     Returns:
         (tf.data.Dataset, ProcessPool),
@@ -371,21 +375,20 @@ def parallel_process(
         name=name,
         env=env,
         disable_gpu_in_subprocesses=disable_gpu_in_subprocesses,
-        logger=get_mltk_logger()
+        logger=get_mltk_logger(),
+        max_in_flight=n_chunks_per_job,
     )
 
     def _np_parallel_process(*args):
         pool_batch = process_pool.create_batch(len(args[0]))
 
-        if len(args) == 1:
-            for x in args[0]:
-                process_pool(x, pool_batch=pool_batch)
-        else:
-            for i in range(pool_batch.size):
-                batch_x = []
-                for a in args:
-                    batch_x.append(a[i])
-                process_pool(*batch_x, pool_batch=pool_batch)
+        # Split the batch into chunks
+        # so that multiple samples are processed per subprocess request
+        samples = list(zip(*args))
+        n_chunks = max(min(len(samples), process_pool.n_jobs * max(n_chunks_per_job, 1)), 1)
+        chunk_size = max((len(samples) + n_chunks - 1) // n_chunks, 1)
+        for i in range(0, len(samples), chunk_size):
+            process_pool.process_chunk(samples[i:i+chunk_size], pool_batch=pool_batch)
 
         results = pool_batch.wait()
         if isinstance(dtype, (list,tuple)):
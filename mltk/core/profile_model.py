@@ -60,6 +60,8 @@ def profile_model(
         post_process: This allows for post-processing the profiling results (e.g. uploading to a cloud) if supported by the given MltkModel
         return_estimates: If profiling in the simulator, this will estimate additional metrics such as CPU cycles and energy.
             Disabling this option can reduce profiling time
+        kwargs: Additional arguments given to :py:meth:`mltk.core.tflite_micro.TfliteMicro.profile_model` when profiling in the simulator,
+            e.g. use_cache=False to always run the simulator instead of returning cached results
     Returns:
         The results of model profiling
     """
@@ -0,0 +1,326 @@
+"""Profile many .tflite models in parallel
+
+See the source code on Github: `mltk/core/profile_models.py <https://github.com/siliconlabs/mltk/blob/master/mltk/core/profile_models.py>`_
+"""
+from typing import Union, List, Dict, Callable, Tuple
+import os
+import glob
+import json
+import csv
+import queue
+import logging
+import collections
+
+from mltk.utils.path import fullpath
+from mltk.utils.process_pool import ProcessPool, calculate_n_jobs
+
+from .profiling_results import ProfilingModelResults
+from .utils import get_mltk_logger
+from .tflite_micro import TfliteMicro
+
+
+# The number of times a model is re-profiled if the subprocess profiling it crashed.
+# NOTE: All the models being profiled when a subprocess crashes are re-profiled one at a time,
+#       as it is unknown which model caused the crash
+MAX_CRASH_RETRIES = 1
+
+
+def profile_models(
+    models:Union[str,List[str]],
+    accelerator:str=None,
+    return_estimates=False,
+    runtime_buffer_size=-1,
+    output_path:str=None,
+    n_jobs:Union[int,float]=-1,
+    use_cache=True,
+    callback:Callable[[str,ProfilingModelResults,str],None]=None,
+    return_results=True,
+    logger:logging.Logger=None,
+) -> Dict[str,ProfilingModelResults]:
+    """Profile many .tflite models in the simulator
+
+    The models are profiled in parallel by a :py:class:`mltk.utils.process_pool.ProcessPool`.
+    Each subprocess loads the TF-Lite Micro wrapper (and the estimators) once and re-uses it for every model it profiles.
+
+    The results of each model are written to ``output_path`` as soon as the model completes.
+    A model that fails to be profiled does not stop the other models from being profiled,
+    the error is logged and written to the output file.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        from mltk.core import profile_models
+
+        results = profile_models(
+            'sweep/**/*.tflite',
+            accelerator='mvp',
+            return_estimates=True,
+            output_path='sweep_results.csv'
+        )
+        for model_path, model_results in results.items():
+            if model_results is not None:
+                print(f'{model_path}: {model_results.time}s')
+
+    Args:
+        models: One or more of the following:
+
+            - Path to a .tflite model file
+            - Directory, all .tflite files in the directory and its sub-directories are profiled
+            - Glob pattern, e.g. ``sweep/**/*.tflite``
+
+        accelerator: The name of the hardware accelerator to profile for. If omitted, then use reference kernels
+        return_estimates: Estimate additional metrics such as CPU cycles and energy
+        runtime_buffer_size: The size of the tensor arena, see :py:func:`mltk.core.profile_model`
+        output_path: Optional path to a .csv or .json file.
+            If a .csv is given, then the summary of each model is written as a row.
+            If a .json is given, then the file contains a list with the full results (summary and layers) of each model.
+        n_jobs: The number of subprocesses to use, see :py:class:`mltk.utils.process_pool.ProcessPool`
+        use_cache: Use the cached profiling results if available, see :py:meth:`mltk.core.tflite_micro.TfliteMicro.profile_model`
+        callback: Optional callback invoked as each model completes as: callback(model_path, results, error_msg).
+            results is None if the model failed to be profiled
+        return_results: If false then return an empty dict. This reduces the memory usage
+            when many models are profiled and the results are only written to ``output_path``
+        logger: Optional Python logger
+
+    Returns:
+        Dictionary of <model path>: ProfilingModelResults,
+        the results are None for the models that failed to be profiled
+    """
+    logger = logger or get_mltk_logger()
+    model_paths = find_tflite_models(models)
+    if len(model_paths) == 0:
+        raise ValueError(f'No .tflite models found in: {models}')
+
+    if accelerator is not None:
+        norm_accelerator = TfliteMicro.normalize_accelerator_name(accelerator)
+        if norm_accelerator is None:
+            raise ValueError(f'Unknown accelerator: {accelerator}. Known accelerators are: {", ".join(TfliteMicro.get_supported_accelerators())}')
+        accelerator = norm_accelerator
+
+    logger.info(f'Profiling {len(model_paths)} models ...')
+
+    profiling_kwargs = dict(
+        accelerator=accelerator,
+        return_estimates=return_estimates,
+        runtime_buffer_size=runtime_buffer_size,
+        use_cache=use_cache,
+    )
+
+    retval:Dict[str,ProfilingModelResults] = {}
+    n_failed = 0
+    writer = _ResultsWriter(output_path) if output_path else None
+    try:
+        for model_path, results, err_msg in _profile_models_in_pool(
+            model_paths,
+            n_jobs=n_jobs,
+            profiling_kwargs=profiling_kwargs,
+            logger=logger
+        ):
+            if results is not None:
+                # pylint: disable=protected-access
+                results._model_name = os.path.basename(model_path)[:-len('.tflite')]
+                logger.debug(f'Profiled {model_path}')
+            else:
+                n_failed += 1
+                logger.warning(f'Failed to profile {model_path}, err: {err_msg}')
+
+            if writer is not None:
+                writer.write(model_path, results, err_msg)
+            if callback is not None:
+                callback(model_path, results, err_msg)
+            if return_results:
+                retval[model_path] = results
+    finally:
+        if writer is not None:
+            writer.close()
+
+    logger.info(f'Profiled {len(model_paths) - n_failed} of {len(model_paths)} models')
+    if writer is not None:
+        logger.info(f'Profiling results written to {output_path}')
+
+    return retval
+
+
+def find_tflite_models(models:Union[str,List[str]]) -> List[str]:
+    """Return the sorted, unique paths of the .tflite files specified by the given
+    file paths, directories, and glob patterns
+    """
+    if isinstance(models, str):
+        models = [models]
+
+    retval = []
+    found = set()
+    for model in models:
+        model = fullpath(model)
+        if os.path.isdir(model):
+            paths = glob.glob(f'{model}/**/*.tflite', recursive=True)
+        elif os.path.isfile(model):
+            paths = [model]
+        else:
+            paths = glob.glob(model, recursive=True)
+
+        for p in sorted(paths):
+            p = fullpath(p)
+            if p.endswith('.tflite') and p not in found:
+                found.add(p)
+                retval.append(p)
+
+    return retval
+
+
+def _profile_models_in_pool(
+    model_paths:List[str],
+    n_jobs:Union[int,float],
+    profiling_kwargs:dict,
+    logger:logging.Logger,
+):
+    """Yield model_path, results, err_msg as each model completes
+
+    If a subprocess crashes, then the pool is restarted and the models it was profiling are re-queued
+    """
+    pending = collections.deque(enumerate(model_paths))
+    in_flight:Dict[int,str] = {}
+    crash_count:Dict[int,int] = collections.defaultdict(int)
+    done_q = queue.Queue()
+    pool:ProcessPool = None
+
+    try:
+        while pending or in_flight:
+            if pool is None or not pool.is_running:
+                if pool is not None:
+                    pool.shutdown()
+                    logger.warning('Profiling subprocess terminated unexpectedly, restarting the pool')
+                    # Return the results of the models that completed before the pool was shutdown
+                    while not done_q.empty():
+                        index, results, err_msg = done_q.get_nowait()
+                        model_path = in_flight.pop(index, None)
+                        if model_path is not None:
+                            yield model_path, results, err_msg
+                    # Re-queue only the models that did not complete
+                    for index, model_path in sorted(in_flight.items(), reverse=True):
+                        crash_count[index] += 1
+                        if crash_count[index] > MAX_CRASH_RETRIES:
+                            yield model_path, None, 'Profiling subprocess terminated unexpectedly'
+                        else:
+                            pending.appendleft((index, model_path))
+                    in_flight.clear()
+                    if not pending:
+                        break
+
+                pool = ProcessPool(
+                    entry_point=_profile_model_in_subprocess,
+                    n_jobs=min(calculate_n_jobs(n_jobs), len(pending)),
+                    name='ProfileModels',
+                    logger=logger,
+                )
+
+            try:
+                while pending and len(in_flight) < pool.n_jobs:
+                    # Models that were being profiled when a subprocess crashed are re-profiled by themselves.
+                    # This way, if the subprocess crashes again then the model that caused the crash is known
+                    if any(crash_count[i] > 0 for i in in_flight):
+                        break
+                    index, model_path = pending[0]
+                    if crash_count[index] > 0 and in_flight:
+                        break
+                    pool(index, model_path, pool_callback=done_q.put, **profiling_kwargs)
+                    pending.popleft()
+                    in_flight[index] = model_path
+            except RuntimeError:
+                # The pool was shutdown, it is restarted above
+                continue
+
+            try:
+                index, results, err_msg = done_q.get(timeout=0.100)
+            except queue.Empty:
+                continue
+
+            model_path = in_flight.pop(index, None)
+            if model_path is not None:
+                yield model_path, results, err_msg
+
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _profile_model_in_subprocess(
+    index:int,
+    model_path:str,
+    **kwargs
+) -> Tuple[int,ProfilingModelResults,str]:
+    """Profile the given model, this executes in a ProcessPool subprocess
+
+    NOTE: The TfliteMicro wrapper is only loaded by the first model profiled by the subprocess
+    """
+    try:
+        results = TfliteMicro.profile_model(model_path, **kwargs)
+    except Exception as e:
+        return index, None, f'{e}'
+    return index, results, None
+
+
+
+class _ResultsWriter:
+    """Write the results of each model to a .csv or .json file as they become available"""
+    def __init__(self, output_path:str):
+        output_path = fullpath(output_path)
+        self.is_json = output_path.endswith('.json')
+        if not self.is_json and not output_path.endswith('.csv'):
+            raise ValueError('The output path must have a .csv or .json extension')
+
+        out_dir = os.path.dirname(output_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+        self._fp = open(output_path, 'w', newline='' if not self.is_json else None)
+        self._n_entries = 0
+        self._csv_writer:csv.DictWriter = None
+        self._csv_pending_rows = []
+        if self.is_json:
+            self._fp.write('[\n')
+
+
+    def write(self, model_path:str, results:ProfilingModelResults, err_msg:str):
+        if self.is_json:
+            entry = dict(model=model_path, error=err_msg)
+            if results is not None:
+                entry.update(results.to_dict(format_units=False))
+            if self._n_entries > 0:
+                self._fp.write(',\n')
+            self._fp.write(json.dumps(entry, indent=2))
+        else:
+            row = dict(model=model_path)
+            if results is not None:
+                row.update(results.get_summary(format_units=False, exclude_null=False))
+            row['error'] = err_msg or ''
+
+            if self._csv_writer is None:
+                # The CSV columns are not known until the first model is successfully profiled
+                if results is None:
+                    self._csv_pending_rows.append(row)
+                    return
+                self._create_csv_writer(list(row.keys()))
+            self._csv_writer.writerow(row)
+
+        self._n_entries += 1
+        self._fp.flush()
+
+
+    def close(self):
+        if self._fp is None:
+            return
+        if self.is_json:
+            self._fp.write('\n]\n')
+        elif self._csv_writer is None:
+            self._create_csv_writer(['model', 'error'])
+        self._fp.close()
+        self._fp = None
+
+
+    def _create_csv_writer(self, fieldnames:List[str]):
+        self._csv_writer = csv.DictWriter(self._fp, fieldnames=fieldnames, extrasaction='ignore')
+        self._csv_writer.writeheader()
+        for row in self._csv_pending_rows:
+            self._csv_writer.writerow(row)
+        self._csv_pending_rows = []
@@ -38,6 +38,11 @@ class ProfilingLayerResult(defaultdict):
         self['energy'] = energy
         self['error_msg'] = error_msg
 
+    def __reduce__(self):
+        # The default_factory is a lambda which cannot be pickled,
+        # so re-create the result from its items instead
+        return (ProfilingLayerResult, (self.tflite_layer,), None, None, iter(self.items()))
+
 
     @property
     def is_accelerated(self) -> bool:
@@ -3,7 +3,12 @@ import pprint
 import logging
 import csv
 import copy
-from typing import Union, Tuple
+import os
+import re
+import uuid
+import types
+import shutil
+from typing import Union, Tuple, Callable, List
 
 import numpy as np
 import tensorflow as tf
@@ -16,13 +21,14 @@ from mltk.utils.python import (
     append_exception_msg
 )
 from mltk.utils.logger import DummyLogger
+from mltk.utils.hasher import generate_hash, hash_file
 from .model import (
     MltkModel,
     MltkModelEvent,
-    KerasModel,
     load_mltk_model,
     load_tflite_or_keras_model,
 )
+from .keras import KerasModel
 from .tflite_model import TfliteModel
 from .utils import get_mltk_logger
 from .summarize_model import summarize_model
@@ -200,21 +206,48 @@ def quantize_model(
     converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
     populate_converter_options(converter, tflite_converter_settings)
 
-    try:
-        mltk_model.load_dataset(subset='validation', test=mltk_model.test_mode_enabled)
-    except Exception as e:
-        prepend_exception_msg(e, 'Failed to load validation dataset')
-        raise
+    # If enabled, the representative dataset is replayed from a snapshot
+    # of the calibration samples taken by a previous quantization of this model.
+    # In this case, the validation dataset does not need to be loaded
+    snapshot_dir = None
+    representative_dataset_is_replayable = False
+    if tflite_converter_settings['representative_dataset'] == 'generate':
+        max_samples = 3 if mltk_model.test_mode_enabled else tflite_converter_settings.get('representative_dataset_max_samples', 1000)
+        if tflite_converter_settings.get('representative_dataset_cache', True):
+            snapshot_dir = get_representative_dataset_snapshot_dir(mltk_model, max_samples=max_samples)
 
+    if snapshot_dir and os.path.exists(snapshot_dir):
+        logger.info(f'Using cached representative dataset: {snapshot_dir}')
+        converter.representative_dataset = load_representative_dataset_snapshot(snapshot_dir)
+        representative_dataset_is_replayable = True
 
-    if tflite_converter_settings['representative_dataset'] == 'generate':
-        converter.representative_dataset = create_representative_dataset_generator(
-            mltk_model,
-            max_samples=3 if mltk_model.test_mode_enabled else tflite_converter_settings.get('representative_dataset_max_samples', 1000),
-            logger=logger
-        )
     else:
-        converter.representative_dataset = tflite_converter_settings['representative_dataset']
+        try:
+            mltk_model.load_dataset(subset='validation', test=mltk_model.test_mode_enabled)
+        except Exception as e:
+            prepend_exception_msg(e, 'Failed to load validation dataset')
+            raise
+
+        if tflite_converter_settings['representative_dataset'] == 'generate':
+            converter.representative_dataset = create_representative_dataset_generator(
+                mltk_model,
+                max_samples=max_samples,
+                logger=logger
+            )
+            if snapshot_dir:
+                logger.info(f'Saving representative dataset to {snapshot_dir}')
+                try:
+                    save_representative_dataset_snapshot(
+                        converter.representative_dataset,
+                        snapshot_dir,
+                        max_samples=max_samples
+                    )
+                    converter.representative_dataset = load_representative_dataset_snapshot(snapshot_dir)
+                    representative_dataset_is_replayable = True
+                except Exception as e:
+                    logger.warning(f'Failed to save representative dataset snapshot, err: {e}')
+        else:
+            converter.representative_dataset = tflite_converter_settings['representative_dataset']
 
 
 
@@ -229,15 +262,20 @@ def quantize_model(
 
     try:
         if tflite_converter_settings.get('generate_quantization_report', False) and not mltk_model.test_mode_enabled:
-            ds = []
-            for x in converter.representative_dataset():
-                ds.append(x)
+            # The dataset is used multiple times,
+            # so buffer it if it cannot be replayed from the snapshot
+            if representative_dataset_is_replayable:
+                _dataset_gen = converter.representative_dataset
+            else:
+                ds = []
+                for x in converter.representative_dataset():
+                    ds.append(x)
 
-            def _dataset_gen():
-                for x in ds:
-                    yield x
+                def _dataset_gen():
+                    for x in ds:
+                        yield x
 
-            converter.representative_dataset = _dataset_gen
+                converter.representative_dataset = _dataset_gen
 
             try:
                 report_converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
@@ -295,19 +333,20 @@ def quantize_model(
 
     if update_archive:
         logger.info(f'Updating {mltk_model.archive_path}')
-        try:
-            summary_path = f'{mltk_model.log_dir}/{mltk_model.name}.tflite.summary.txt'
-            with open(summary_path, 'w') as fp:
-                fp.write(summarize_model(tflite_model))
-            mltk_model.add_archive_file(summary_path)
-        except:
-            pass
-        mltk_model.add_archive_file('__mltk_model_spec__')
-        mltk_model.add_archive_file(retval)
-        if float32_tflite_path:
-            mltk_model.add_archive_file(float32_tflite_path)
-        if quantization_report_path:
-            mltk_model.add_archive_file(quantization_report_path)
+        with mltk_model.archive_transaction():
+            try:
+                summary_path = f'{mltk_model.log_dir}/{mltk_model.name}.tflite.summary.txt'
+                with open(summary_path, 'w') as fp:
+                    fp.write(summarize_model(tflite_model))
+                mltk_model.add_archive_file(summary_path)
+            except:
+                pass
+            mltk_model.add_archive_file('__mltk_model_spec__')
+            mltk_model.add_archive_file(retval)
+            if float32_tflite_path:
+                mltk_model.add_archive_file(float32_tflite_path)
+            if quantization_report_path:
+                mltk_model.add_archive_file(quantization_report_path)
 
 
     mltk_model.trigger_event(
@@ -379,6 +418,210 @@ def create_representative_dataset_generator(
 
 
 
+# Increment this if the snapshot format or the way the samples are generated changes
+REPRESENTATIVE_DATASET_SNAPSHOT_VERSION = 2
+
+
+def get_representative_dataset_snapshot_dir(
+    mltk_model: MltkModel,
+    max_samples:int=1000
+) -> Union[str,None]:
+    """Return the path to the model's representative dataset snapshot directory
+
+    The directory name is a hash of:
+
+    - The model specification script
+    - The dataset configuration and data generator settings
+    - The modification times of the dataset directory and its class directories
+      (or the dataset module's source file)
+
+    Thus, the snapshot is automatically invalidated when the model specification or dataset changes.
+
+    Returns:
+        Path to snapshot directory (which may not exist) or None if the model specification script is not available
+    """
+    spec_path = mltk_model.model_specification_path
+    if not spec_path or not os.path.exists(spec_path):
+        return None
+
+    dataset_config = dict(
+        version=REPRESENTATIVE_DATASET_SNAPSHOT_VERSION,
+        max_samples=max_samples,
+        test=mltk_model.test_mode_enabled,
+    )
+    dataset = None
+    for key in ('dataset', 'class_mode', 'classes', 'input_shape'):
+        try:
+            value = getattr(mltk_model, key, None)
+        except:
+            value = None
+        if key == 'dataset':
+            dataset = value
+        # Only include values that consistently convert to a string
+        if value is None or isinstance(value, (str,int,float,list,tuple,dict)):
+            dataset_config[key] = value
+        elif key == 'dataset':
+            dataset_config[key] = _get_settings_value(value)
+
+    try:
+        datagen = getattr(mltk_model, 'datagen', None)
+    except:
+        datagen = None
+    if datagen is not None:
+        dataset_config['datagen'] = _get_settings_value(datagen, max_depth=2)
+
+    dataset_config['dataset_state'] = _get_dataset_state(dataset)
+
+    key = generate_hash(hash_file(spec_path), dataset_config)
+    return f'{mltk_model.log_dir}/representative_dataset/{key}'
+
+
+def save_representative_dataset_snapshot(
+    dataset_gen:Callable,
+    snapshot_dir:str,
+    max_samples:int=1000
+) -> int:
+    """Save the samples of the given representative dataset generator to the snapshot directory
+
+    The samples of each model input are stored as a .npy file in the snapshot directory.
+    Each file is preallocated for ``max_samples`` and memory-mapped,
+    so the samples are written directly to the file as they are generated.
+    Any previous snapshots in the parent directory are removed.
+
+    Returns:
+        The number of saved samples
+    """
+    parent_dir = os.path.dirname(snapshot_dir)
+    tmp_dir = f'{snapshot_dir}.{uuid.uuid4().hex}.tmp'
+    os.makedirs(tmp_dir)
+    try:
+        n_samples = _write_representative_dataset_samples(dataset_gen, tmp_dir, max_samples=max_samples)
+
+        # Only keep the latest snapshot
+        for fn in os.listdir(parent_dir):
+            path = f'{parent_dir}/{fn}'
+            if path != tmp_dir:
+                shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_dir, snapshot_dir)
+    except:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return n_samples
+
+
+def _write_representative_dataset_samples(
+    dataset_gen:Callable,
+    out_dir:str,
+    max_samples:int
+) -> int:
+    inputs:List[np.memmap] = None
+    n_samples = 0
+    for sample in dataset_gen():
+        sample = [np.asarray(x) for x in sample]
+        if inputs is None:
+            inputs = [
+                np.lib.format.open_memmap(
+                    f'{out_dir}/input_{i}.npy',
+                    mode='w+',
+                    dtype=x.dtype,
+                    shape=(max_samples, *x.shape[1:])
+                ) for i, x in enumerate(sample)
+            ]
+
+        n = min(len(sample[0]), max_samples - n_samples)
+        for input_samples, x in zip(inputs, sample):
+            input_samples[n_samples:n_samples+n] = x[:n]
+        n_samples += n
+        if n_samples >= max_samples:
+            break
+
+    if inputs is None:
+        raise RuntimeError('The representative dataset generator did not return any samples')
+
+    for i, input_samples in enumerate(inputs):
+        input_samples.flush()
+        if n_samples < max_samples:
+            # Fewer samples than expected were generated, so shrink the file
+            path = f'{out_dir}/input_{i}.npy'
+            with open(f'{path}.tmp', 'wb') as f:
+                np.save(f, input_samples[:n_samples], allow_pickle=False)
+            inputs[i] = input_samples = None
+            os.replace(f'{path}.tmp', path)
+
+    return n_samples
+
+
+def _get_settings_value(value, max_depth:int=1):
+    """Return the given setting as a value that consistently converts to a string"""
+    if value is None or isinstance(value, (str,int,float,bool)):
+        return value
+    if isinstance(value, np.ndarray):
+        return generate_hash(value.tobytes())
+    if isinstance(value, types.ModuleType):
+        return value.__name__
+    if callable(value) and hasattr(value, '__qualname__'):
+        return f'{getattr(value, "__module__", "")}.{value.__qualname__}'
+    if max_depth <= 0:
+        # Do not include values whose string may contain a memory address
+        return type(value).__name__
+    if isinstance(value, (list,tuple)):
+        return [_get_settings_value(x, max_depth=max_depth-1) for x in value]
+    if isinstance(value, dict):
+        return {f'{k}': _get_settings_value(v, max_depth=max_depth-1) for k, v in value.items()}
+    if hasattr(value, '__dict__'):
+        return {
+            k: _get_settings_value(v, max_depth=max_depth-1)
+            for k, v in sorted(vars(value).items()) if not k.startswith('_')
+        }
+    return type(value).__name__
+
+
+def _get_dataset_state(dataset) -> list:
+    """Return the modification times of the dataset directory and its sub-directories (i.e. classes)
+
+    A directory's modification time changes when a file is added to or removed from it.
+    If the dataset is a Python module, then return its source file's hash instead.
+    """
+    if isinstance(dataset, str) and os.path.isdir(dataset):
+        state = [('', os.stat(dataset).st_mtime_ns)]
+        with os.scandir(dataset) as it:
+            for entry in it:
+                if entry.is_dir() and not entry.name.startswith('.'):
+                    state.append((entry.name, entry.stat().st_mtime_ns))
+        return sorted(state)
+
+    module_path = getattr(dataset, '__file__', None) if isinstance(dataset, types.ModuleType) else None
+    if module_path and os.path.exists(module_path):
+        return [hash_file(module_path)]
+
+    return []
+
+
+def load_representative_dataset_snapshot(snapshot_dir:str) -> Callable:
+    """Return a representative dataset generator function that replays the given snapshot
+
+    The snapshot's .npy files are memory-mapped so only the samples
+    actively used by the TF-Lite converter are loaded into RAM.
+    """
+    input_paths = {}
+    for fn in os.listdir(snapshot_dir):
+        match = re.match(r'input_(\d+)\.npy', fn)
+        if match:
+            input_paths[int(match.group(1))] = f'{snapshot_dir}/{fn}'
+    if not input_paths:
+        raise FileNotFoundError(f'Invalid representative dataset snapshot: {snapshot_dir}')
+
+    inputs = [np.load(input_paths[i], mmap_mode='r', allow_pickle=False) for i in sorted(input_paths)]
+
+    def _representative_dataset_generator():
+        # The TF-Lite converter expects 1 sample batches
+        for i in range(len(inputs[0])):
+            yield [np.array(x[i:i+1]) for x in inputs]
+
+    return _representative_dataset_generator
+
+
 def save_flatbuffer_file(
     mltk_model:MltkModel,
     tflite_flatbuffer:bytes,
@@ -1,8 +1,9 @@
 
+from __future__ import annotations
 import os
 import io
 import logging
-from typing import Union
+from typing import Union, TYPE_CHECKING
 
 
 
@@ -13,7 +14,6 @@ from mltk.utils.python import append_exception_msg
 from .model import (
     MltkModel,
     MltkModelEvent,
-    KerasModel,
     load_mltk_model,
     load_tflite_or_keras_model
 )
@@ -23,6 +23,9 @@ from .utils import ArchiveFileNotFoundError, get_mltk_logger
 from .model.metrics import calculate_model_metrics
 from .tflite_model import TfliteModel
 
+if TYPE_CHECKING:
+    from .keras import KerasModel
+
 def summarize_model(
     model: Union[str, MltkModel, KerasModel, TfliteModel],
     tflite:bool=False,
@@ -94,14 +97,14 @@ def summarize_model(
     model_metrics = calculate_model_metrics(built_model, logger=logger)
 
     summary = ''
-    if isinstance(built_model, KerasModel):
+    if isinstance(built_model, TfliteModel):
+        summary += built_model.summary()
+    else:
         string_buffer = io.StringIO()
         def _writeln(s):
             string_buffer.write(s + '\n')
         built_model.summary(print_fn=_writeln)
         summary += string_buffer.getvalue()
-    else:
-        summary += built_model.summary()
 
     summary += '\n'
     summary += f'Total MACs: {format_units(model_metrics["total_macs"])}\n'
@@ -146,16 +149,16 @@ def _load_or_build_model(
     if isinstance(model, MltkModel):
         mltk_model = model
 
-    # Elif if a KerasModel instance was given
-    elif isinstance(model, KerasModel):
-        built_model = model
-
-     # Elif if a KerasModel instance was given
+     # Elif if a TfliteModel instance was given
     elif isinstance(model, TfliteModel):
         built_model = model
 
     elif not isinstance(model, str):
-        raise Exception('model argument must be a string or MltkModel,KerasModel,TfliteModel instance')
+        # NOTE: Tensorflow is only imported if a KerasModel instance may have been given
+        from .keras import KerasModel # pylint: disable=import-outside-toplevel,redefined-outer-name
+        if not isinstance(model, KerasModel):
+            raise Exception('model argument must be a string or MltkModel,KerasModel,TfliteModel instance')
+        built_model = model
 
     # Else if the path to a .h5 or .tflite was given
     elif model.endswith(('.tflite', '.h5')):
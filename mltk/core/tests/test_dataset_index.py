@@ -0,0 +1,117 @@
+import os
+import time
+
+from mltk.utils.path import create_tempdir, remove_directory
+from mltk.core.preprocess.utils.dataset_index import DatasetFileIndex
+from mltk.core.preprocess.utils.list_directory import list_dataset_directory
+
+
+def _create_dataset(name:str) -> str:
+    remove_directory(create_tempdir(f'tests/dataset_index/{name}'))
+    dataset_dir = create_tempdir(f'tests/dataset_index/{name}')
+    for class_name, n_samples in (('cat', 3), ('dog', 2)):
+        os.makedirs(f'{dataset_dir}/{class_name}/subdir')
+        for i in range(n_samples):
+            _write_file(f'{dataset_dir}/{class_name}/sample{i}.wav')
+        _write_file(f'{dataset_dir}/{class_name}/subdir/nested.wav')
+        _write_file(f'{dataset_dir}/{class_name}/README.txt')
+    _write_file(f'{dataset_dir}/LICENSE.txt')
+    # Creating the index directory modifies the base directory, so create it before the mtimes are set
+    os.makedirs(f'{dataset_dir}/.index')
+
+    # Set the directories' modification times to the past
+    # so that they are not always re-scanned, see DatasetFileIndex.MTIME_GUARD_SECONDS
+    _set_dir_mtimes(dataset_dir, time.time() - 60)
+    return dataset_dir
+
+
+def _write_file(path:str):
+    with open(path, 'w') as f:
+        f.write(path)
+
+
+def _set_dir_mtimes(dataset_dir:str, timestamp:float):
+    for root, dirs, _ in os.walk(dataset_dir):
+        for d in dirs:
+            os.utime(f'{root}/{d}', (timestamp, timestamp))
+    os.utime(dataset_dir, (timestamp, timestamp))
+
+
+def test_list_files_by_class():
+    dataset_dir = _create_dataset('by_class')
+    file_index = DatasetFileIndex(dataset_dir)
+
+    files_by_class = file_index.list_files_by_class(white_list_formats=('.wav',))
+    assert sorted(files_by_class) == ['cat', 'dog']
+    assert sorted(files_by_class['cat']) == ['cat/sample0.wav', 'cat/sample1.wav', 'cat/sample2.wav', 'cat/subdir/nested.wav']
+    assert sorted(files_by_class['dog']) == ['dog/sample0.wav', 'dog/sample1.wav', 'dog/subdir/nested.wav']
+    assert os.path.exists(f'{dataset_dir}/.index/files.sqlite')
+
+    # The index directory itself is never indexed
+    assert '.index' not in file_index.list_files_by_class()
+
+
+def test_reuse_and_invalidation():
+    dataset_dir = _create_dataset('invalidation')
+    file_index = DatasetFileIndex(dataset_dir)
+    file_index.list_files()
+    modified_ns = file_index.get_modified_ns('cat')
+    assert modified_ns == max(os.stat(f'{dataset_dir}/{x}').st_mtime_ns for x in ('cat', 'cat/subdir'))
+
+    # Directories that have not changed are retrieved from the index rather than scanned
+    scanned_dirs = []
+    scan_directory = file_index._scan_directory # pylint: disable=protected-access
+    def _scan_directory(abs_dir):
+        scanned_dirs.append(abs_dir)
+        return scan_directory(abs_dir)
+    file_index._scan_directory = _scan_directory # pylint: disable=protected-access
+
+    assert len(file_index.list_files(white_list_formats=('.wav',))) == 7
+    assert scanned_dirs == []
+
+    # Adding a file modifies its directory so only that directory is re-scanned
+    _write_file(f'{dataset_dir}/cat/subdir/new.wav')
+    os.utime(f'{dataset_dir}/cat/subdir', (time.time() - 30, time.time() - 30))
+    files = file_index.list_files(subdir='cat', white_list_formats=('.wav',))
+    assert 'cat/subdir/new.wav' in files
+    assert scanned_dirs == [f'{dataset_dir}/cat/subdir']
+    assert file_index.get_modified_ns('cat') > modified_ns
+    assert file_index.get_modified_ns('dog') <= modified_ns
+
+    # Recently modified directories have an unknown modification time
+    _write_file(f'{dataset_dir}/dog/new.wav')
+    file_index.list_files()
+    assert file_index.get_modified_ns('dog') == -1
+    assert file_index.get_modified_ns('unknown_class') == -1
+
+
+def test_list_dataset_directory():
+    dataset_dir = _create_dataset('list_dataset')
+
+    paths, class_ids = list_dataset_directory(dataset_dir, classes=['cat', 'dog'], white_list_formats=['.wav'])
+    assert sorted(zip(paths, class_ids)) == [
+        ('cat/sample0.wav', 0), ('cat/sample1.wav', 0), ('cat/sample2.wav', 0), ('cat/subdir/nested.wav', 0),
+        ('dog/sample0.wav', 1), ('dog/sample1.wav', 1), ('dog/subdir/nested.wav', 1)
+    ]
+    cat_index_path = f'{dataset_dir}/.index/cat.txt'
+    assert os.path.exists(cat_index_path)
+
+    # The existing class list files are reused
+    cat_index_mtime = os.stat(cat_index_path).st_mtime_ns
+    paths, _ = list_dataset_directory(dataset_dir, classes=['cat', 'dog'], white_list_formats=['.wav'])
+    assert len(paths) == 7
+    assert os.stat(cat_index_path).st_mtime_ns == cat_index_mtime
+
+    # Adding a file re-generates the class's list file
+    _write_file(f'{dataset_dir}/cat/new.wav')
+    paths, _ = list_dataset_directory(dataset_dir, classes=['cat', 'dog'], white_list_formats=['.wav'])
+    assert len(paths) == 8
+    assert 'cat/new.wav' in paths
+    with open(cat_index_path, 'r') as f:
+        assert 'cat/new.wav' in f.read().splitlines()
+
+    # Removing a file re-generates the class's list file
+    os.remove(f'{dataset_dir}/dog/sample0.wav')
+    paths, _ = list_dataset_directory(dataset_dir, classes=['cat', 'dog'], white_list_formats=['.wav'])
+    assert len(paths) == 7
+    assert 'dog/sample0.wav' not in paths
@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from mltk.core import TfliteModel
+from mltk.core.evaluate_autoencoder import AutoEncoderEvaluationResults
+from mltk.core.evaluate_autoencoder import _generate_class_scores, _get_overall_scores # pylint: disable=protected-access
+from mltk.utils.test_helper.data import IMAGE_CLASSIFICATION_TFLITE_PATH
+
+
+class _BatchIterator:
+    """Minimal data iterator that returns (batch_x, batch_y) tuples like the MLTK data generators"""
+    def __init__(self, x:np.ndarray, batch_size:int=16):
+        self.x = x
+        self.batch_size = batch_size
+        self.samples = len(x)
+
+    def __iter__(self):
+        for i in range(0, len(self.x), self.batch_size):
+            batch_x = self.x[i:i+self.batch_size]
+            yield batch_x, batch_x
+
+    def reset(self):
+        pass
+
+
+def _batch_scoring_function(x:np.ndarray, y_pred:np.ndarray) -> np.ndarray:
+    return np.mean(np.abs(y_pred), axis=-1) + np.mean(x.reshape(len(x), -1), axis=-1)
+
+
+def _create_dataset(sample_shape:tuple) -> list:
+    # NOTE: The number of samples is not a multiple of the batch size
+    rng = np.random.RandomState(42)
+    return [
+        rng.uniform(offset, offset + 1, (n_samples,) + sample_shape).astype(np.float32)
+        for offset, n_samples in ((0.0, 45), (0.5, 37), (0.75, 20))
+    ]
+
+
+def _create_keras_model(n_features:int):
+    import tensorflow as tf
+    tf.random.set_seed(42)
+    return tf.keras.Sequential([
+        tf.keras.layers.Input((n_features,)),
+        tf.keras.layers.Dense(4, activation='relu'),
+        tf.keras.layers.Dense(n_features),
+    ])
+
+
+@pytest.mark.parametrize('model_type', ['keras', 'tflite'])
+def test_streaming_matches_batch(model_type):
+    if model_type == 'keras':
+        built_model = _create_keras_model(n_features=8)
+        sample_shape = (8,)
+    else:
+        built_model = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH)
+        sample_shape = built_model.inputs[0].shape[1:]
+
+    all_batch_scores = []
+    all_streaming_scores = []
+    for class_x in _create_dataset(sample_shape):
+        for x in (class_x, _BatchIterator(class_x)):
+            batch_scores = _generate_class_scores(
+                x=x,
+                built_model=built_model,
+                batch_scoring_function=_batch_scoring_function,
+                streaming=False,
+            )
+            streaming_scores = _generate_class_scores(
+                x=x,
+                built_model=built_model,
+                batch_scoring_function=_batch_scoring_function,
+                streaming=True,
+            )
+            assert batch_scores.shape == (len(class_x),)
+            assert np.allclose(streaming_scores, batch_scores, atol=1e-5)
+
+        all_batch_scores.append(batch_scores)
+        all_streaming_scores.append(streaming_scores)
+
+    results = []
+    for all_scores in (all_batch_scores, all_streaming_scores):
+        y_true, y_pred = _get_overall_scores(all_scores)
+        result = AutoEncoderEvaluationResults(name='test', classes=['normal', 'abnormal1', 'abnormal2'])
+        result.calculate(y=y_true, y_pred=y_pred, all_scores=all_scores)
+        results.append(result)
+
+    batch_results, streaming_results = results
+    assert streaming_results.overall_accuracy == pytest.approx(batch_results.overall_accuracy, abs=1e-4)
+    assert streaming_results.overall_roc_auc == pytest.approx(batch_results.overall_roc_auc, abs=1e-4)
+    assert streaming_results.overall_pr_accuracy == pytest.approx(batch_results.overall_pr_accuracy, abs=1e-4)
+    for class_name in ('abnormal1', 'abnormal2', 'all'):
+        assert streaming_results.class_stats[class_name]['auc'] == pytest.approx(
+            batch_results.class_stats[class_name]['auc'], abs=1e-4
+        )
+
+
+def test_overall_scores_include_all_abnormal_classes():
+    all_scores = [
+        np.array([0.1, 0.2, 0.3], dtype=np.float32),
+        np.array([0.6, 0.7], dtype=np.float32),
+        np.array([0.25, 0.9, 0.95, 0.8], dtype=np.float32),
+    ]
+    y_true, y_pred = _get_overall_scores(all_scores)
+    assert y_true.tolist() == [0]*3 + [1]*6
+    assert np.array_equal(y_pred, np.concatenate(all_scores))
+
+    results = AutoEncoderEvaluationResults(name='test', classes=['normal', 'abnormal1', 'abnormal2'])
+    results.calculate(y=y_true, y_pred=y_pred, all_scores=all_scores)
+
+    # The TPR includes the samples of both abnormal classes,
+    # e.g. with the threshold 0.253: 5 of the 6 abnormal samples and 1 of the 3 normal samples are above it
+    threshold_index = 18
+    assert results['thresholds'][threshold_index] == pytest.approx(0.253)
+    assert results.overall_tpr[threshold_index] == pytest.approx(5 / 6)
+    assert results.overall_fpr[threshold_index] == pytest.approx(1 / 3)
+
+    # The sample of abnormal2 that scores below a normal sample lowers the best accuracy
+    assert results.overall_accuracy == pytest.approx(8 / 9)
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from mltk.core.evaluate_classifier import (
+    ClassifierEvaluationResults,
+    ClassifierMetrics,
+    calculate_auc,
+    calculate_per_class_accuracies,
+    calculate_overall_accuracy,
+)
+
+
+def _baseline_calculate_per_class_accuracies(y_pred:np.ndarray, y_label:np.ndarray) -> list:
+    """The original, loop-based per class accuracy implementation"""
+    n_samples, n_classes = y_pred.shape
+    accuracies = np.zeros(n_classes)
+    for class_id in range(n_classes):
+        true_positives = 0
+        for i in range(n_samples):
+            if y_label[i] == class_id and np.argmax(y_pred[i,:]) == class_id:
+                true_positives += 1
+        n_positives = np.sum(y_label == class_id)
+        accuracies[class_id] = 0 if n_positives == 0 else true_positives / n_positives
+    return accuracies.tolist()
+
+
+def _baseline_calculate_auc(y_pred:np.ndarray, y_label:np.ndarray, threshold=.01) -> tuple:
+    """The original, loop-based ROC AUC implementation"""
+    n_samples, n_classes = y_pred.shape
+    thresholds = np.arange(0.0, 1.01, threshold)
+    n_thresholds = len(thresholds)
+    fpr = np.zeros((n_classes, n_thresholds))
+    tpr = np.zeros((n_classes, n_thresholds))
+    roc_auc = np.zeros(n_classes)
+
+    for class_item in range(n_classes):
+        all_positives = sum(y_label == class_item)
+        all_negatives = len(y_label) - all_positives
+        for threshold_item in range(1, n_thresholds):
+            false_positives = 0
+            true_positives = 0
+            for i in range(n_samples):
+                if y_pred[i, class_item] > thresholds[threshold_item]:
+                    if y_label[i] == class_item:
+                        true_positives += 1
+                    else:
+                        false_positives += 1
+            fpr[class_item, threshold_item] = 0 if all_negatives == 0 else false_positives / float(all_negatives)
+            tpr[class_item, threshold_item] = 0 if all_positives == 0 else true_positives / float(all_positives)
+            fpr[class_item,0] = 1
+            tpr[class_item,0] = 1
+
+        for threshold_item in range(n_thresholds-1):
+            roc_auc[class_item] += .5*(tpr[class_item,threshold_item]+tpr[class_item,threshold_item+1]) * \
+                (fpr[class_item,threshold_item]-fpr[class_item,threshold_item+1])
+
+    return fpr.tolist(), tpr.tolist(), roc_auc.tolist(), thresholds.tolist()
+
+
+def _create_predictions(n_samples:int, n_classes:int, seed:int=42) -> tuple:
+    rng = np.random.RandomState(seed)
+    y_label = rng.randint(0, n_classes, (n_samples,))
+    logits = rng.normal(size=(n_samples, n_classes)) + 2*np.eye(n_classes)[y_label]
+    y_pred = np.exp(logits) / np.sum(np.exp(logits), axis=1, keepdims=True)
+    # Round some of the predictions so that they are exactly equal to a threshold
+    y_pred[::7] = np.round(y_pred[::7], 2)
+    return y_pred.astype(np.float32), y_label
+
+
+@pytest.mark.parametrize('n_classes', [2, 4])
+def test_auc_matches_baseline(n_classes):
+    y_pred, y_label = _create_predictions(200, n_classes)
+
+    fpr, tpr, roc_auc, thresholds = calculate_auc(y_pred, y_label)
+    baseline_fpr, baseline_tpr, baseline_roc_auc, baseline_thresholds = _baseline_calculate_auc(y_pred, y_label)
+
+    assert np.allclose(thresholds, baseline_thresholds)
+    assert np.allclose(fpr, baseline_fpr)
+    assert np.allclose(tpr, baseline_tpr)
+    assert np.allclose(roc_auc, baseline_roc_auc)
+
+
+def test_auc_matches_baseline_missing_class():
+    # None of the samples are labeled as the last class
+    y_pred, y_label = _create_predictions(100, 3)
+    y_label[y_label == 2] = 0
+
+    _, _, roc_auc, _ = calculate_auc(y_pred, y_label)
+    _, _, baseline_roc_auc, _ = _baseline_calculate_auc(y_pred, y_label)
+    assert np.allclose(roc_auc, baseline_roc_auc)
+
+
+def test_accuracies_match_baseline():
+    y_pred, y_label = _create_predictions(300, 5)
+
+    assert np.allclose(
+        calculate_per_class_accuracies(y_pred, y_label),
+        _baseline_calculate_per_class_accuracies(y_pred, y_label)
+    )
+    assert calculate_overall_accuracy(y_pred, y_label) == pytest.approx(
+        np.mean(np.argmax(y_pred, axis=1) == y_label)
+    )
+
+
+@pytest.mark.parametrize('binary', [False, True])
+def test_metrics_accumulation_matches_calculate(binary):
+    y_pred, y_label = _create_predictions(250, 2 if binary else 4)
+    if binary:
+        # Binary models output the probability of class 1
+        y_pred = y_pred[:, 1]
+
+    results = ClassifierEvaluationResults(name='test')
+    results.calculate(y_label, y_pred)
+
+    metrics = ClassifierMetrics(n_classes=2 if binary else 4)
+    for i in range(0, len(y_label), 32):
+        # NOTE: The last batch is smaller than the others
+        metrics.update(y_pred[i:i+32], y_label[i:i+32])
+    accumulated_results = ClassifierEvaluationResults(name='test')
+    accumulated_results.calculate_from_metrics(metrics)
+
+    assert accumulated_results.overall_accuracy == pytest.approx(results.overall_accuracy)
+    assert np.allclose(accumulated_results.class_accuracies, results.class_accuracies)
+    assert np.allclose(accumulated_results.fpr, results.fpr)
+    assert np.allclose(accumulated_results.tpr, results.tpr)
+    assert np.allclose(accumulated_results.roc_auc, results.roc_auc)
+    assert accumulated_results.roc_auc_avg == pytest.approx(results.roc_auc_avg)
+    assert accumulated_results.confusion_matrix == results.confusion_matrix
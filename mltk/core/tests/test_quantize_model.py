@@ -0,0 +1,78 @@
+import os
+import types
+import numpy as np
+
+from mltk.core.quantize_model import (
+    get_representative_dataset_snapshot_dir,
+    save_representative_dataset_snapshot,
+    load_representative_dataset_snapshot
+)
+from mltk.utils.path import create_tempdir, remove_directory
+
+
+def _create_model(tmp_dir:str):
+    spec_path = f'{tmp_dir}/my_model.py'
+    with open(spec_path, 'w') as f:
+        f.write('# my model\n')
+
+    dataset_dir = f'{tmp_dir}/dataset'
+    for class_name in ('cat', 'dog'):
+        os.makedirs(f'{dataset_dir}/{class_name}', exist_ok=True)
+        with open(f'{dataset_dir}/{class_name}/sample0.jpg', 'wb') as f:
+            f.write(b'0')
+
+    return types.SimpleNamespace(
+        model_specification_path=spec_path,
+        log_dir=f'{tmp_dir}/log',
+        test_mode_enabled=False,
+        dataset=dataset_dir,
+        classes=['cat', 'dog'],
+        datagen=types.SimpleNamespace(rotation_range=10, frontend_settings=dict(sample_rate_hz=16000)),
+    )
+
+
+def test_snapshot_dir_invalidation():
+    remove_directory(create_tempdir('tests/quantize_model/snapshot_dir'))
+    tmp_dir = create_tempdir('tests/quantize_model/snapshot_dir')
+    mltk_model = _create_model(tmp_dir)
+
+    snapshot_dir = get_representative_dataset_snapshot_dir(mltk_model)
+    assert snapshot_dir.startswith(f'{tmp_dir}/log/representative_dataset/')
+    assert get_representative_dataset_snapshot_dir(mltk_model) == snapshot_dir
+    assert get_representative_dataset_snapshot_dir(mltk_model, max_samples=10) != snapshot_dir
+
+    # Changing a datagen setting invalidates the snapshot
+    mltk_model.datagen.frontend_settings['sample_rate_hz'] = 8000
+    datagen_snapshot_dir = get_representative_dataset_snapshot_dir(mltk_model)
+    assert datagen_snapshot_dir != snapshot_dir
+
+    # Adding a sample to the dataset invalidates the snapshot
+    with open(f'{mltk_model.dataset}/dog/sample1.jpg', 'wb') as f:
+        f.write(b'1')
+    os.utime(f'{mltk_model.dataset}/dog', ns=(0, 1))
+    assert get_representative_dataset_snapshot_dir(mltk_model) != datagen_snapshot_dir
+
+
+def test_snapshot_save_and_load():
+    remove_directory(create_tempdir('tests/quantize_model/snapshot'))
+    tmp_dir = create_tempdir('tests/quantize_model/snapshot')
+    samples = np.random.uniform(size=(5, 4, 3)).astype(np.float32)
+
+    def _dataset_gen():
+        for x in samples:
+            yield [np.expand_dims(x, axis=0), np.ones((1, 2), dtype=np.float32)]
+
+    # Fewer samples than max_samples are generated
+    snapshot_dir = f'{tmp_dir}/representative_dataset/abc'
+    assert save_representative_dataset_snapshot(_dataset_gen, snapshot_dir, max_samples=8) == 5
+    assert np.load(f'{snapshot_dir}/input_0.npy').shape == (5, 4, 3)
+    replayed = list(load_representative_dataset_snapshot(snapshot_dir)())
+    assert len(replayed) == 5
+    assert np.array_equal(np.concatenate([x[0] for x in replayed]), samples)
+    assert all(x[1].shape == (1, 2) for x in replayed)
+
+    # Only max_samples are saved and previous snapshots are removed
+    snapshot_dir2 = f'{tmp_dir}/representative_dataset/def'
+    assert save_representative_dataset_snapshot(_dataset_gen, snapshot_dir2, max_samples=3) == 3
+    assert np.array_equal(np.load(f'{snapshot_dir2}/input_0.npy'), samples[:3])
+    assert os.listdir(f'{tmp_dir}/representative_dataset') == ['def']
@@ -0,0 +1,103 @@
+import os
+import numpy as np
+import pytest
+
+from mltk.utils.path import create_tempdir, remove_directory
+
+
+pytest.importorskip('librosa')
+
+from mltk.core.preprocess.audio.parallel_generator.spectrogram_cache import SpectrogramCache
+from mltk.core.preprocess.audio.parallel_generator import spectrogram_cache as spectrogram_cache_module
+
+
+def _create_audio_file(out_dir:str, name:str) -> str:
+    path = f'{out_dir}/{name}.wav'
+    with open(path, 'wb') as f:
+        f.write(os.urandom(64))
+    return path
+
+
+def _create_cache_dir(name:str) -> str:
+    remove_directory(create_tempdir(f'tests/spectrogram_cache/{name}'))
+    return create_tempdir(f'tests/spectrogram_cache/{name}')
+
+
+def test_get_put():
+    tmp_dir = _create_cache_dir('get_put')
+    audio_path = _create_audio_file(tmp_dir, 'sample')
+    cache = SpectrogramCache(cache_dir=f'{tmp_dir}/cache', config=dict(window_size_ms=30))
+
+    assert cache.get(audio_path) is None
+
+    spectrogram = np.arange(12, dtype=np.int8).reshape(3, 4)
+    cache.put(audio_path, spectrogram)
+    cached = cache.get(audio_path)
+    assert cached.dtype == np.int8
+    assert np.array_equal(cached, spectrogram)
+
+    # A new cache instance with the same config uses the same entries
+    cache = SpectrogramCache(cache_dir=f'{tmp_dir}/cache', config=dict(window_size_ms=30))
+    assert np.array_equal(cache.get(audio_path), spectrogram)
+
+    # Audio files that do not exist are never cached
+    cache.put(f'{tmp_dir}/missing.wav', spectrogram)
+    assert cache.get(f'{tmp_dir}/missing.wav') is None
+
+
+def test_invalidation():
+    tmp_dir = _create_cache_dir('invalidation')
+    audio_path = _create_audio_file(tmp_dir, 'sample')
+    cache = SpectrogramCache(cache_dir=f'{tmp_dir}/cache', config=dict(window_size_ms=30))
+    cache.put(audio_path, np.ones((3, 4), dtype=np.float32))
+
+    # Changing the config uses a different set of entries
+    other_cache = SpectrogramCache(cache_dir=f'{tmp_dir}/cache', config=dict(window_size_ms=20))
+    assert other_cache.get(audio_path) is None
+
+    # Modifying the audio file invalidates its entry
+    stat = os.stat(audio_path)
+    os.utime(audio_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    assert cache.get(audio_path) is None
+
+
+def test_trim():
+    tmp_dir = _create_cache_dir('trim')
+    spectrogram = np.zeros((256, 256), dtype=np.uint8) # 64kB per entry
+    cache = SpectrogramCache(cache_dir=f'{tmp_dir}/cache', config='trim', max_size_mb=0.2)
+
+    audio_paths = [_create_audio_file(tmp_dir, f'sample{i}') for i in range(4)]
+    for i, audio_path in enumerate(audio_paths):
+        cache.put(audio_path, spectrogram)
+        entry_path = cache._get_entry_path(audio_path) # pylint: disable=protected-access
+        os.utime(entry_path, (1000 + i, 1000 + i))
+
+    # Writing entries never trims the cache, even if it exceeds its max size
+    assert all(cache.get(x) is not None for x in audio_paths)
+
+    # The get() calls above updated the timestamps so set them back to their write order
+    for i, audio_path in enumerate(audio_paths):
+        os.utime(cache._get_entry_path(audio_path), (1000 + i, 1000 + i)) # pylint: disable=protected-access
+
+    # The least recently used entries are deleted until the cache is at 90% of its max size
+    assert cache.trim() == 2
+    assert cache.get(audio_paths[0]) is None
+    assert cache.get(audio_paths[1]) is None
+    assert cache.get(audio_paths[2]) is not None
+    assert cache.get(audio_paths[3]) is not None
+    assert cache.trim() == 0
+
+
+def test_trim_once_per_session(monkeypatch):
+    tmp_dir = _create_cache_dir('trim_once')
+    monkeypatch.setattr(spectrogram_cache_module, '_trimmed_cache_dirs', set())
+    cache = SpectrogramCache(cache_dir=f'{tmp_dir}/cache', config='trim', max_size_mb=0.05)
+
+    audio_path = _create_audio_file(tmp_dir, 'sample')
+    cache.put(audio_path, np.zeros((256, 256), dtype=np.uint8))
+    assert cache.trim(once_per_session=True) == 1
+
+    # The cache directory was already trimmed by this session, so it is not walked again
+    cache.put(audio_path, np.zeros((256, 256), dtype=np.uint8))
+    assert cache.trim(once_per_session=True) == 0
+    assert cache.get(audio_path) is not None
@@ -10,4 +10,5 @@ from .tflite_micro_memory_plan import (
     TfliteMicroMemoryPlanBuffer,
     TfliteMicroMemoryPlanner
 )
-from .tflite_micro_model_details import TfliteMicroModelDetails
\ No newline at end of file
+from .tflite_micro_model_details import TfliteMicroModelDetails
+from .tflite_micro_model_pool import TfliteMicroModelPool
@@ -1 +1 @@
-from .get_estimates import get_estimates
\ No newline at end of file
+from .get_estimates import get_estimates, get_batch_estimates
\ No newline at end of file
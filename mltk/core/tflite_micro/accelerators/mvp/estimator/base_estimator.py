@@ -1,6 +1,7 @@
 import abc
 
-from typing import Union
+from typing import Union, List, Tuple
+import numpy as np
 
 from mltk.utils.python import prepend_exception_msg
 from mltk.core.tflite_model import TfliteLayer
@@ -70,6 +71,57 @@ class BaseEstimator(abc.ABC):
         )
 
 
+    def predict_batch(
+        self,
+        layers: List[ProfilingLayerResult],
+        cpu_clock_rates: List[int]
+    ):
+        """Update the given layers with the estimators' predictions
+
+        This does the same as :py:meth:`~predict` except the features of all the given layers
+        are extracted into a single matrix and each estimator model is executed once on the entire matrix.
+        The layers may be from multiple ProfilingModelResults.
+
+        Layers whose features could not be extracted are logged and not updated.
+
+        Args:
+            layers: The layers to update, all of the layers must use this estimator
+            cpu_clock_rates: The CPU clock rate of each layer's model
+        """
+        self.load_models()
+
+        layers = list(layers)
+        cpu_clock_rates = np.asarray(cpu_clock_rates, dtype=np.float64)
+
+        if self.cpu_cycles_model is not None:
+            X, valid = extract_batch_parameters(
+                self.cpu_cycles_model,
+                layers,
+                accelerator_cycles=[x.accelerator_cycles for x in layers],
+            )
+            layers, cpu_clock_rates = _select(layers, cpu_clock_rates, valid)
+            for layer, value in zip(layers, self.cpu_cycles_model.predict_batch(X)):
+                layer['cpu_cycles'] = float(value)
+
+        if self.energy_model is not None:
+            X, valid = extract_batch_parameters(
+                self.energy_model,
+                layers,
+                accelerator_cycles=[x.accelerator_cycles for x in layers],
+                cpu_cycles=[x.cpu_cycles for x in layers],
+            )
+            layers, cpu_clock_rates = _select(layers, cpu_clock_rates, valid)
+            for layer, value in zip(layers, self.energy_model.predict_batch(X)):
+                layer['energy'] = float(value)
+
+        accelerator_cycles = np.asarray([x.accelerator_cycles for x in layers], dtype=np.float64)
+        cpu_cycles = np.asarray([x.cpu_cycles for x in layers], dtype=np.float64)
+        # See predict_time()
+        times = np.maximum(accelerator_cycles, cpu_cycles) / cpu_clock_rates
+        for layer, value in zip(layers, times):
+            layer['time'] = float(value)
+
+
     def predict_time(
         self,
         accelerator_cycles:int,
@@ -126,6 +178,52 @@ def predict_layer_value(
     return model.predict(**params)
 
 
+def extract_batch_parameters(
+    model,
+    layers: List[Union[ProfilingLayerResult,TfliteLayer]],
+    accelerator_cycles:List[int]=None,
+    cpu_cycles:List[int]=None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract the given model's features from each layer into a single matrix
+
+    Each row of the returned matrix contains a layer's features ordered by the sorted feature names
+    (which is the column order expected by the estimator models).
+    Layers whose features could not be extracted are logged and omitted from the matrix.
+
+    Returns:
+        Tuple(X, valid) where X has the shape [n_valid_layers, n_features]
+        and valid is a boolean vector indicating which of the given layers have a row in X
+    """
+    n_layers = len(layers)
+    rows = []
+    valid = np.zeros((n_layers,), dtype=bool)
+
+    for i, layer in enumerate(layers):
+        try:
+            params = extract_model_parameters(
+                model,
+                layer,
+                accelerator_cycles=None if accelerator_cycles is None else accelerator_cycles[i],
+                cpu_cycles=None if cpu_cycles is None else cpu_cycles[i]
+            )
+        except Exception as e:
+            get_mltk_logger().warning(f'Failed to get profiling estimates for layer: {layer.name}, err: {e}')
+            continue
+
+        rows.append([params[key] for key in sorted(params)])
+        valid[i] = True
+
+    n_features = len(model if isinstance(model, list) else model.feature_names)
+    X = np.asarray(rows, dtype=np.int64).reshape((len(rows), n_features))
+    return X, valid
+
+
+def _select(layers:list, cpu_clock_rates:np.ndarray, valid:np.ndarray):
+    if np.all(valid):
+        return layers, cpu_clock_rates
+    return [x for x, v in zip(layers, valid) if v], cpu_clock_rates[valid]
+
+
 def extract_model_parameters(
     model,
     layer: Union[ProfilingLayerResult,TfliteLayer],
@@ -1,6 +1,7 @@
 
+from typing import Union, List, Dict, Tuple
 from mltk.core.tflite_model import TfliteOpCode
-from mltk.core.profiling_results import ProfilingLayerResult
+from mltk.core.profiling_results import ProfilingLayerResult, ProfilingModelResults
 
 
 from .base_estimator import BaseEstimator
@@ -78,3 +79,43 @@ def get_estimates(
             layer=layer,
             cpu_clock_rate=cpu_clock_rate
         )
+
+
+def get_batch_estimates(
+    results:Union[ProfilingModelResults, List[ProfilingModelResults]],
+    **kwargs
+):
+    """Update the layers of the given profiling results with the estimators' predictions
+
+    This does the same as calling :py:func:`~get_estimates` for each layer,
+    except the layers that use the same estimator (i.e. the same opcode and accelerator)
+    are grouped across all of the given results and each estimator model is executed once per group.
+    This is much faster when estimating many models, e.g. during a model architecture search.
+
+    Args:
+        results: One or more ProfilingModelResults to update.
+            Each result's cpu_clock_rate must be non-zero
+    """
+    if isinstance(results, ProfilingModelResults):
+        results = [results]
+
+    groups:Dict[int, Tuple[BaseEstimator, List[ProfilingLayerResult], List[int]]] = {}
+    for model_results in results:
+        for layer in model_results.layers:
+            estimator = get_estimator(
+                accelerator=model_results.accelerator,
+                layer=layer,
+                **kwargs
+            )
+            if estimator is None:
+                continue
+
+            _, layers, cpu_clock_rates = groups.setdefault(id(estimator), (estimator, [], []))
+            layers.append(layer)
+            cpu_clock_rates.append(model_results.cpu_clock_rate)
+
+    for estimator, layers, cpu_clock_rates in groups.values():
+        estimator.predict_batch(
+            layers=layers,
+            cpu_clock_rates=cpu_clock_rates
+        )
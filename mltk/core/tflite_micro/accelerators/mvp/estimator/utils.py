@@ -2,6 +2,9 @@
 import gzip
 import os
 import io
+import sys
+import pickle
+from typing import List
 import numpy as np
 from urllib.parse import urlparse
 import yaml
@@ -11,6 +14,8 @@ import onnxruntime.backend as backend
 
 from mltk.core.utils import get_mltk_logger
 from mltk.utils.archive_downloader import download_verify_extract
+from mltk.utils.path import create_user_dir
+from mltk.utils.hasher import generate_hash
 
 
 onnxruntime.set_default_logger_severity(3)
@@ -35,17 +40,75 @@ class _DataList(list):
 
 
 class MetricBaseEstimator(object):
+    """Estimates a layer metric (e.g. cpu_cycles, energy) using an ONNX model
+
+    The ONNX model's input is a matrix with one row per layer and one column per feature.
+    The columns are ordered by the sorted feature names.
+
+    This object may be pickled. Only the serialized ONNX model and feature names are pickled,
+    so loading a pickled estimator avoids decompressing and parsing the model with the onnx package.
+    """
     def __init__(self, onnx_model_file):
         onnx_model = onnx.load(onnx_model_file)
-        self.onnx_model_backend = backend.prepare(onnx_model, 'CPU')
         meta = onnx_model.metadata_props[0]
-        self.feature_names = meta.value.split(',')
+        self._init(
+            model_bytes=onnx_model.SerializeToString(),
+            feature_names=meta.value.split(',')
+        )
+
+
+    def _init(self, model_bytes:bytes, feature_names:List[str]):
+        self._model_bytes = model_bytes
+        self.feature_names = feature_names
+        self.input_names = sorted(feature_names)
+        self.onnx_model_backend = backend.prepare(model_bytes, 'CPU')
+
+
+    def __getstate__(self):
+        return dict(
+            model_bytes=self._model_bytes,
+            feature_names=self.feature_names
+        )
+
+
+    def __setstate__(self, state):
+        self._init(**state)
 
 
     def predict(self, **kwargs):
         X = _DataList(kwargs)
-        y = self.onnx_model_backend.run(X.tonumpy())
-        return float(y[0])
+        return float(self.predict_batch(X.tonumpy())[0])
+
+
+    def predict_batch(self, X:np.ndarray) -> np.ndarray:
+        """Return the estimated metric for each row of the given feature matrix
+
+        Args:
+            X: Matrix with shape [n_layers, n_features],
+                the columns must be ordered by :py:attr:`~input_names`
+        Returns:
+            Vector with the estimated metric of each row as float64
+        """
+        X = np.asarray(X, dtype=np.int64)
+        if len(X) == 0:
+            return np.zeros((0,), dtype=np.float64)
+
+        try:
+            y = self.onnx_model_backend.run(X)
+            y = np.asarray(y[0], dtype=np.float64).reshape(-1)
+        except Exception as e:
+            get_mltk_logger().debug(f'Failed to run estimator on a batch of {len(X)} rows, running each row separately, err: {e}')
+        else:
+            if len(y) == len(X):
+                return y
+            get_mltk_logger().debug(f'Estimator returned {len(y)} values for {len(X)} rows, running each row separately')
+
+        # Fallback to running each row separately
+        # if the ONNX model does not support a dynamic batch size
+        return np.asarray(
+            [np.asarray(self.onnx_model_backend.run(X[i:i+1])[0]).reshape(-1)[0] for i in range(len(X))],
+            dtype=np.float64
+        )
 
 
 
@@ -101,10 +164,7 @@ def load_model(name:str, accelerator:str, metric:str) -> MetricBaseEstimator:
 
     try:
         if os.path.exists(estimator_path):
-            with gzip.open(estimator_path, 'rb') as fp:
-                data = fp.read()
-
-            return MetricBaseEstimator(io.BytesIO(data))
+            return _load_cached_model(estimator_path)
 
     except Exception as e:
         logger.warning(f'Failed to load profiling estimator: {estimator_path}, err: {e}')
@@ -112,6 +172,72 @@ def load_model(name:str, accelerator:str, metric:str) -> MetricBaseEstimator:
     return None
 
 
+# Increment this if the pickled format of MetricBaseEstimator changes
+_CACHE_VERSION = 1
+
+
+def _get_cache_path(estimator_path:str) -> str:
+    """Return the path of the given estimator's pickle in the user cache directory
+
+    The directory is specific to the Python and onnxruntime versions
+    as the pickle is only valid for the versions that created it.
+    """
+    py_version = f'{sys.version_info.major}.{sys.version_info.minor}'
+    cache_dir = create_user_dir(
+        f'accelerators/mvp/estimator_cache/py{py_version}-onnxruntime{onnxruntime.__version__}'
+    )
+    path_hash = generate_hash(os.path.abspath(estimator_path))[:8]
+    return f'{cache_dir}/{os.path.basename(estimator_path)}.{path_hash}.pkl'
+
+
+def _load_cached_model(estimator_path:str) -> MetricBaseEstimator:
+    """Load the given .onnx.gz estimator
+
+    The first time an estimator is loaded, it is pickled to the user cache directory,
+    see :py:func:`~_get_cache_path`.
+    Subsequent loads unpickle the estimator which is much faster than
+    decompressing and parsing the ONNX model.
+    The pickled estimator is re-generated if the .onnx.gz file changes.
+    """
+    logger = get_mltk_logger()
+    cache_path = _get_cache_path(estimator_path)
+    source_stat = os.stat(estimator_path)
+    source_key = (source_stat.st_size, source_stat.st_mtime_ns)
+
+    try:
+        with open(cache_path, 'rb') as fp:
+            cached = pickle.load(fp)
+        if cached['version'] == _CACHE_VERSION and tuple(cached['source']) == source_key:
+            return cached['estimator']
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f'Failed to load cached profiling estimator: {cache_path}, err: {e}')
+
+    with gzip.open(estimator_path, 'rb') as fp:
+        data = fp.read()
+
+    estimator = MetricBaseEstimator(io.BytesIO(data))
+
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as fp:
+            pickle.dump(
+                dict(version=_CACHE_VERSION, source=source_key, estimator=estimator),
+                fp,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.debug(f'Failed to cache profiling estimator: {cache_path}, err: {e}')
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    return estimator
+
+
 def activation_to_int(activation:str) -> int:
     activation = activation.lower()
     if activation == 'none':
@@ -0,0 +1,191 @@
+import os
+import io
+import gzip
+import types
+import importlib
+import numpy as np
+import pytest
+
+from mltk.utils.path import create_tempdir
+from mltk.utils.test_helper.data import IMAGE_EXAMPLE1_TFLITE_PATH
+
+
+pytest.importorskip('onnx')
+pytest.importorskip('onnxruntime')
+
+from mltk.core import TfliteModel
+from mltk.core.profiling_results import ProfilingLayerResult, ProfilingModelResults
+from mltk.core.tflite_micro.accelerators.mvp import MVPTfliteMicroAccelerator
+from mltk.core.tflite_micro.accelerators.mvp import estimator as mvp_estimator
+from mltk.core.tflite_micro.accelerators.mvp.estimator import utils as estimator_utils
+from mltk.core.tflite_micro.accelerators.mvp.estimator import base_estimator
+# NOTE: The estimator package exports the get_estimates() function which shadows its module
+get_estimates_module = importlib.import_module('mltk.core.tflite_micro.accelerators.mvp.estimator.get_estimates')
+
+
+def _create_estimator_file(out_dir:str, batch_size:int=None) -> str:
+    """Create a .onnx.gz estimator that returns the sum of each row's features"""
+    from onnx import helper, TensorProto
+
+    graph = helper.make_graph(
+        nodes=[
+            helper.make_node('Cast', ['X'], ['X_float'], to=TensorProto.FLOAT),
+            helper.make_node('ReduceSum', ['X_float', 'axes'], ['Y'], keepdims=0),
+        ],
+        name='sum',
+        inputs=[helper.make_tensor_value_info('X', TensorProto.INT64, [batch_size, 2])],
+        outputs=[helper.make_tensor_value_info('Y', TensorProto.FLOAT, [batch_size])],
+        initializer=[helper.make_tensor('axes', TensorProto.INT64, [1], [1])],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8
+    helper.set_model_props(model, {'feature_names': 'units,filters'})
+
+    path = f'{out_dir}/sum.{batch_size or "dynamic"}.cpu_cycles.onnx.gz'
+    with gzip.open(path, 'wb') as fp:
+        fp.write(model.SerializeToString())
+    return path
+
+
+def _create_linear_estimator(feature_names:list, weights:list) -> estimator_utils.MetricBaseEstimator:
+    """Create an estimator that returns the weighted sum of each row's features"""
+    from onnx import helper, TensorProto
+
+    graph = helper.make_graph(
+        nodes=[
+            helper.make_node('Cast', ['X'], ['X_float'], to=TensorProto.FLOAT),
+            helper.make_node('Mul', ['X_float', 'W'], ['X_weighted']),
+            helper.make_node('ReduceSum', ['X_weighted', 'axes'], ['Y'], keepdims=0),
+        ],
+        name='linear',
+        inputs=[helper.make_tensor_value_info('X', TensorProto.INT64, [None, len(feature_names)])],
+        outputs=[helper.make_tensor_value_info('Y', TensorProto.FLOAT, [None])],
+        initializer=[
+            helper.make_tensor('W', TensorProto.FLOAT, [1, len(feature_names)], weights),
+            helper.make_tensor('axes', TensorProto.INT64, [1], [1]),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)])
+    model.ir_version = 8
+    helper.set_model_props(model, {'feature_names': ','.join(feature_names)})
+    return estimator_utils.MetricBaseEstimator(io.BytesIO(model.SerializeToString()))
+
+
+def _load_linear_model(name:str, accelerator:str, metric:str) -> estimator_utils.MetricBaseEstimator:
+    """Return a linear estimator with different weights for each estimator name, accelerator and metric"""
+    feature_names = ['input_size', 'output_size']
+    if accelerator == 'mvp':
+        feature_names.append('accelerator_cycles')
+    if metric == 'energy':
+        feature_names.append('cpu_cycles')
+    seed = sum(ord(c) for c in f'{name}{accelerator}{metric}')
+    weights = np.random.RandomState(seed).uniform(0.5, 2.0, (len(feature_names),))
+    # The columns of the estimator's input are ordered by the sorted feature names
+    return _create_linear_estimator(sorted(feature_names), weights.tolist())
+
+
+def _create_profiling_results(tflite_model, cpu_clock_rate:int) -> ProfilingModelResults:
+    layers = []
+    for i, tflite_layer in enumerate(tflite_model.layers):
+        # Only some of the layers are accelerated, the other layers use the 'none' estimators
+        accelerator_cycles = 1000*(i+1) if i % 2 == 0 else 0
+        layers.append(ProfilingLayerResult(tflite_layer, accelerator_cycles=accelerator_cycles))
+    return ProfilingModelResults(
+        tflite_model,
+        accelerator='mvp',
+        cpu_clock_rate=cpu_clock_rate,
+        layers=layers
+    )
+
+
+def test_batch_estimates_match_estimates(monkeypatch):
+    # Use new estimator instances so the global estimators are not loaded with the linear models
+    estimators = {
+        accelerator: {opcode: base_estimator.BaseEstimator(x.name, x.accelerator) for opcode, x in opcode_estimators.items()}
+        for accelerator, opcode_estimators in get_estimates_module._estimators.items() # pylint: disable=protected-access
+    }
+    monkeypatch.setattr(get_estimates_module, '_estimators', estimators)
+    monkeypatch.setattr(base_estimator, 'load_model', _load_linear_model)
+
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_EXAMPLE1_TFLITE_PATH)
+    # The layers of both models are batched together
+    batch_results = [_create_profiling_results(tflite_model, x) for x in (int(78e6), int(40e6))]
+    layer_results = [_create_profiling_results(tflite_model, x) for x in (int(78e6), int(40e6))]
+
+    get_estimates_module.get_batch_estimates(batch_results)
+    for model_results in layer_results:
+        for layer in model_results.layers:
+            get_estimates_module.get_estimates(
+                accelerator=model_results.accelerator,
+                layer=layer,
+                cpu_clock_rate=model_results.cpu_clock_rate
+            )
+
+    n_estimated = 0
+    for batch_model_results, model_results in zip(batch_results, layer_results):
+        for batch_layer, layer in zip(batch_model_results.layers, model_results.layers):
+            for key in ('cpu_cycles', 'energy', 'time'):
+                assert batch_layer[key] == pytest.approx(layer[key], rel=1e-6), f'{layer.name}: {key}'
+            n_estimated += int(layer['cpu_cycles'] > 0)
+    assert n_estimated == 2*len(tflite_model.layers)
+
+
+def test_estimator_cache(monkeypatch):
+    out_dir = create_tempdir('tests/mvp_estimator/models')
+    cache_dir = create_tempdir('tests/mvp_estimator/cache')
+    monkeypatch.setenv('MLTK_CACHE_DIR', cache_dir)
+
+    estimator_path = _create_estimator_file(out_dir)
+    cache_path = estimator_utils._get_cache_path(estimator_path) # pylint: disable=protected-access
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+    # The first load pickles the estimator to the user cache directory, not the estimator's directory
+    estimator = estimator_utils._load_cached_model(estimator_path) # pylint: disable=protected-access
+    assert os.path.exists(cache_path)
+    assert cache_path.startswith(cache_dir)
+    assert not any(x.endswith('.pkl') for x in os.listdir(out_dir))
+    assert estimator.input_names == ['filters', 'units']
+
+    # The second load uses the pickled estimator
+    cache_mtime = os.stat(cache_path).st_mtime_ns
+    cached_estimator = estimator_utils._load_cached_model(estimator_path) # pylint: disable=protected-access
+    assert os.stat(cache_path).st_mtime_ns == cache_mtime
+
+    X = np.array([[1, 2], [3, 4], [5, 6]], dtype=np.int64)
+    assert np.allclose(cached_estimator.predict_batch(X), [3, 7, 11])
+    assert cached_estimator.predict(units=4, filters=5) == 9.0
+
+
+def test_estimator_predict_batch_fallback():
+    out_dir = create_tempdir('tests/mvp_estimator/models')
+
+    # The model only supports a batch size of 1, so each row is run separately
+    with gzip.open(_create_estimator_file(out_dir, batch_size=1), 'rb') as fp:
+        estimator = estimator_utils.MetricBaseEstimator(io.BytesIO(fp.read()))
+    X = np.array([[1, 2], [3, 4], [5, 6]], dtype=np.int64)
+    assert np.allclose(estimator.predict_batch(X), [3, 7, 11])
+
+
+def test_estimate_profiling_results_fallback(monkeypatch):
+    def _get_batch_estimates(results, **kwargs):
+        raise RuntimeError('Batch failed')
+
+    estimated_layers = []
+    def _get_estimates(layer, **kwargs):
+        if layer.name == 'bad':
+            raise RuntimeError('Layer failed')
+        estimated_layers.append(layer.name)
+
+    monkeypatch.setattr(mvp_estimator, 'get_batch_estimates', _get_batch_estimates)
+    monkeypatch.setattr(mvp_estimator, 'get_estimates', _get_estimates)
+
+    results = types.SimpleNamespace(
+        cpu_clock_rate=0,
+        accelerator='mvp',
+        layers=[types.SimpleNamespace(name=x) for x in ('conv', 'bad', 'dense')]
+    )
+    # The layers after a failed layer are still estimated
+    MVPTfliteMicroAccelerator.estimate_profiling_results(None, [results])
+    assert estimated_layers == ['conv', 'dense']
+    assert results._cpu_clock_rate == int(78e6) # pylint: disable=protected-access
@@ -1,7 +1,9 @@
 
+import concurrent.futures
 import numpy as np
+import pytest
 from mltk.core import TfliteModel
-from mltk.core.tflite_micro import TfliteMicro, TfliteMicroModel
+from mltk.core.tflite_micro import TfliteMicro, TfliteMicroModel, TfliteMicroModelPool
 from mltk.core.tflite_micro.tflite_micro_accelerator import TfliteMicroAccelerator
 from mltk.utils.test_helper.data import (TFLITE_MICRO_SPEECH_TFLITE_PATH, IMAGE_EXAMPLE1_TFLITE_PATH)
 
@@ -92,7 +94,165 @@ def test_profile_model_mvp_unsupported_layer():
     assert results.macs > 0
 
 
+def test_profile_model_cached():
+    results = TfliteMicro.profile_model(IMAGE_EXAMPLE1_TFLITE_PATH, accelerator='mvp', use_cache=False)
+    cached_results = TfliteMicro.profile_model(IMAGE_EXAMPLE1_TFLITE_PATH, accelerator='mvp')
+    assert cached_results.to_dict() == results.to_dict()
+    assert cached_results.runtime_memory_bytes == results.runtime_memory_bytes
+    assert len(cached_results.tflite_micro_model_details.memory_plan) == len(results.tflite_micro_model_details.memory_plan)
+
+
 def test_record_model():
     input_data = np.random.uniform(low=-127, high=128, size=(96,96,1)).astype(np.int8)
     layers = TfliteMicro.record_model(IMAGE_EXAMPLE1_TFLITE_PATH, input_data)
-    assert len(layers) == 8
\ No newline at end of file
+    assert len(layers) == 8
+
+def test_load_multiple_models():
+    if not TfliteMicro.concurrent_models_supported():
+        pytest.skip('The TF-Lite Micro wrapper does not support loading multiple models')
+
+    tflm_model1 = TfliteMicro.load_tflite_model(IMAGE_EXAMPLE1_TFLITE_PATH)
+    tflm_model2 = TfliteMicro.load_tflite_model(IMAGE_EXAMPLE1_TFLITE_PATH)
+    try:
+        x = np.random.randint(-128, 127, size=tflm_model1.input(0).shape, dtype=np.int8)
+        tflm_model1.input(0, value=x)
+        tflm_model1.invoke()
+        tflm_model2.input(0, value=x)
+        tflm_model2.invoke()
+        assert np.array_equal(tflm_model1.output(0), tflm_model2.output(0))
+    finally:
+        TfliteMicro.unload_model(tflm_model1)
+        TfliteMicro.unload_model(tflm_model2)
+
+
+def test_profiled_and_plain_models_concurrently():
+    if not TfliteMicro.concurrent_models_supported():
+        pytest.skip('The TF-Lite Micro wrapper does not support loading multiple models')
+
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_EXAMPLE1_TFLITE_PATH)
+    input_shape = tflite_model.get_input_tensor(0).shape
+    x = np.random.randint(-128, 127, size=(20,) + input_shape[1:], dtype=np.int8)
+
+    def _invoke_samples(tflm_model) -> np.ndarray:
+        y = []
+        for sample in x:
+            tflm_model.input(0, value=sample.reshape(input_shape))
+            tflm_model.invoke()
+            y.append(tflm_model.output(0).copy().reshape(-1))
+        return np.array(y)
+
+    plain_model = TfliteMicro.load_tflite_model(tflite_model)
+    try:
+        expected_y = _invoke_samples(plain_model)
+    finally:
+        TfliteMicro.unload_model(plain_model)
+
+    # Invoke a plain model in a separate thread while a profiled model is invoked in this thread
+    profiled_model = TfliteMicro.load_tflite_model(tflite_model, enable_profiler=True)
+    plain_model = TfliteMicro.load_tflite_model(tflite_model)
+    try:
+        assert profiled_model.is_profiler_enabled
+        assert not plain_model.is_profiler_enabled
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            plain_future = executor.submit(_invoke_samples, plain_model)
+            profiled_y = _invoke_samples(profiled_model)
+            plain_y = plain_future.result()
+
+        assert np.array_equal(plain_y, expected_y)
+        assert np.array_equal(profiled_y, expected_y)
+        assert len(plain_model.layer_errors) == 0
+        # The plain model must not have been profiled
+        assert len(profiled_model.get_profiling_results()) == 8
+    finally:
+        TfliteMicro.unload_model(plain_model)
+        TfliteMicro.unload_model(profiled_model)
+
+
+def test_model_pool_predict():
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_EXAMPLE1_TFLITE_PATH)
+    input_tensor = tflite_model.get_input_tensor(0)
+    x = np.random.randint(-128, 127, size=(10,) + input_tensor.shape[1:], dtype=np.int8)
+
+    # Compare the results of the pool to invoking a single model one sample at a time
+    expected_y = []
+    tflm_model = TfliteMicro.load_tflite_model(tflite_model)
+    try:
+        for sample in x:
+            tflm_model.input(0, value=sample.reshape(input_tensor.shape))
+            tflm_model.invoke()
+            expected_y.append(tflm_model.output(0).copy().reshape(-1))
+    finally:
+        TfliteMicro.unload_model(tflm_model)
+
+    with TfliteMicroModelPool(tflite_model, n_jobs=4) as pool:
+        y = pool.predict(x)
+
+    assert y.shape[0] == len(x)
+    assert np.array_equal(y.reshape(len(x), -1), np.array(expected_y))
+
+
+def test_predict():
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_EXAMPLE1_TFLITE_PATH)
+    input_tensor = tflite_model.get_input_tensor(0)
+    x = np.random.randint(-128, 127, size=(5,) + input_tensor.shape[1:], dtype=np.int8)
+
+    tflm_model = TfliteMicro.load_tflite_model(tflite_model)
+    try:
+        expected_y = []
+        for sample in x:
+            tflm_model.input(0, value=sample.reshape(input_tensor.shape))
+            tflm_model.invoke()
+            expected_y.append(tflm_model.output(0).copy().reshape(-1))
+        expected_y = np.array(expected_y)
+
+        y = tflm_model.predict(x)
+        assert y.dtype == expected_y.dtype
+        assert np.array_equal(y.reshape(len(x), -1), expected_y)
+
+        y_float = np.zeros(y.shape, dtype=np.float32)
+        retval = tflm_model.predict(x, y=y_float)
+        assert retval is y_float
+        assert np.allclose(y_float, tflite_model.dequantize_output_to_float32(y))
+    finally:
+        TfliteMicro.unload_model(tflm_model)
+
+
+@pytest.mark.parametrize('y_dtype', [None, np.float32])
+def test_predict_native_matches_fallback(y_dtype):
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_EXAMPLE1_TFLITE_PATH)
+    input_tensor = tflite_model.get_input_tensor(0)
+    x = np.random.randint(-128, 127, size=(7,) + input_tensor.shape[1:], dtype=np.int8)
+
+    tflm_model = TfliteMicro.load_tflite_model(tflite_model)
+    try:
+        if not hasattr(tflm_model._model_wrapper, 'predict'): # pylint: disable=protected-access
+            pytest.skip('The TF-Lite Micro wrapper does not support the batched predict API')
+
+        y = tflm_model.predict(x, y_dtype=y_dtype)
+        fallback_y = np.zeros_like(y)
+        tflm_model._predict_samples([x], [fallback_y]) # pylint: disable=protected-access
+
+        assert y.dtype == fallback_y.dtype
+        if y_dtype == np.float32:
+            assert np.allclose(y, fallback_y)
+        else:
+            assert np.array_equal(y, fallback_y)
+    finally:
+        TfliteMicro.unload_model(tflm_model)
+
+
+def test_inference_engine_tflite_micro():
+    from mltk.core.tflite_model import TfliteInferenceEngine
+
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_EXAMPLE1_TFLITE_PATH)
+    input_tensor = tflite_model.get_input_tensor(0)
+    x = np.random.randint(-128, 127, size=(10,) + input_tensor.shape[1:], dtype=np.int8)
+
+    with TfliteMicroModelPool(tflite_model, n_jobs=1) as pool:
+        expected_y = pool.predict(x, y_dtype=np.float32)
+
+    # The engine delegates the TF-Lite Micro batches to a TfliteMicroModelPool
+    with TfliteInferenceEngine(tflite_model, n_jobs=2, batch_size=3, tflite_micro=True) as engine:
+        y = engine.predict(x, y_dtype=np.float32)
+
+    assert np.array_equal(y, expected_y)
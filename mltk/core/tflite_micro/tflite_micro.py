@@ -47,6 +47,12 @@ class TfliteMicro:
         wrapper = TfliteMicro._load_wrapper()
         return wrapper.api_version()
 
+    @staticmethod
+    def concurrent_models_supported() -> bool:
+        """Return if the TF-Lite Micro wrapper supports loading and invoking multiple models concurrently"""
+        wrapper = TfliteMicro._load_wrapper()
+        return hasattr(wrapper, 'concurrent_models_supported') and wrapper.concurrent_models_supported()
+
     @staticmethod
     def set_log_level(level: str) -> str:
         """Set the C++ wrapper logging level
@@ -133,7 +139,11 @@ class TfliteMicro:
         """Load the TF-Lite Micro interpreter with the given .tflite model
 
         NOTE:
-        - Only 1 model may be loaded at a time
+        - Multiple models may be loaded at a time, each with its own tensor arena.
+          The GIL is released while a model is invoked, so the models may be invoked concurrently from different threads,
+          see :py:class:`mltk.core.tflite_micro.TfliteMicroModelPool`.
+          However, only 1 model that uses an accelerator, the profiler, or a recorder may be loaded at a time
+          (and the wrappers that do not support concurrent models only allow for 1 model to be loaded at a time)
         - You must call unload_model() when the model is no longer needed
 
         """
@@ -146,7 +156,12 @@ class TfliteMicro:
         else:
             tflm_accelerator = None
 
-        TfliteMicro._model_lock.acquire()
+        # The accelerators, profiler, and recorders use global state,
+        # so only one model that uses them may be loaded at a time
+        use_model_lock = not TfliteMicro.concurrent_models_supported() or \
+            tflm_accelerator is not None or enable_profiler or enable_recorder or enable_tensor_recorder
+        if use_model_lock:
+            TfliteMicro._model_lock.acquire()
 
         try:
             tflite_model = _load_tflite_model(model)
@@ -167,9 +182,11 @@ class TfliteMicro:
             )
         except:
             # Release the model lock if an exception occurred while loading it
-            TfliteMicro._model_lock.release()
+            if use_model_lock:
+                TfliteMicro._model_lock.release()
             raise
 
+        tflm_model._holds_model_lock = use_model_lock # pylint: disable=protected-access
         return tflm_model
 
     @staticmethod
@@ -183,8 +200,11 @@ class TfliteMicro:
         # pylint: disable=protected-access
         if model._model_wrapper:
             model._model_wrapper.unload()
+        holds_model_lock = model._holds_model_lock
+        model._holds_model_lock = False
         del model
-        TfliteMicro._model_lock.release()
+        if holds_model_lock:
+            TfliteMicro._model_lock.release()
 
 
 
@@ -196,103 +216,70 @@ class TfliteMicro:
         disable_simulator_backend=False,
         runtime_buffer_size=-1, # If runtime_buffer_size not given, determine the optimal memory size
         input_data: Union[np.ndarray,List[np.ndarray]]=None,
+        use_cache=True,
         **kwargs
     ): # -> ProfilingModelResults
         """Profile the given model in the simulator and optionally determine metric estimates
 
+        If use_cache=True and no input_data is given, then the raw profiling results are cached to
+        ``<user dir>/profiling_cache``. Subsequent profiling of the same .tflite with the same
+        accelerator, runtime_buffer_size, and TFLM wrapper build returns the cached results
+        without invoking the simulator. See :py:mod:`mltk.core.tflite_micro.tflite_micro_profiling_cache`
         """
-        from mltk.core.profiling_results import ProfilingModelResults, ProfilingLayerResult
-
-        tflite_model = _load_tflite_model(model)
-        tflm_model = TfliteMicro.load_tflite_model(
-            model=tflite_model,
-            accelerator=accelerator,
-            enable_profiler=True,
-            enable_recorder=True,
-            runtime_buffer_size=runtime_buffer_size
+        from mltk.core.profiling_results import ProfilingModelResults
+        from .tflite_micro_profiling_cache import (
+            get_profiling_cache_key,
+            load_profiling_cache_entry,
+            save_profiling_cache_entry
         )
-        try:
-            renable_simulator_backend = False
-            disable_calculate_accelerator_cycles_only = False
-            tflm_accelerator = tflm_model.accelerator
-
-            if disable_simulator_backend and \
-                tflm_accelerator is not None and \
-                hasattr(tflm_accelerator, 'set_simulator_backend_enabled'):
-                renable_simulator_backend = True
-                tflm_accelerator.set_simulator_backend_enabled(False)
-
-            if hasattr(tflm_accelerator, 'set_calculate_accelerator_cycles_only_enabled'):
-                # For profiling, we only need the accelerator cycles
-                # The simulator does not need to actually calculate valid output data
-                # This greatly improves simulation latency
-                disable_calculate_accelerator_cycles_only = True
-                tflm_accelerator.set_calculate_accelerator_cycles_only_enabled(True)
-
-            tflm_model_details = tflm_model.details
-
-            if input_data is not None:
-                if isinstance(input_data, list):
-                    for i, v in enumerate(input_data):
-                        tflm_model.input(index=i, value=v)
-                else:
-                    tflm_model.input(value=input_data)
-            else:
-                for i in range(tflm_model.input_size):
-                    input_tensor = tflm_model.input(i)
-                    empty_tensor = np.zeros_like(input_tensor)
-                    tflm_model.input(i, value=empty_tensor)
-
-            tflm_model.invoke()
-            tflm_results = tflm_model.get_profiling_results()
-            recorded_data = tflm_model.get_recorded_data()
 
-            if renable_simulator_backend:
-                tflm_accelerator.set_simulator_backend_enabled(True)
-            if disable_calculate_accelerator_cycles_only:
-                tflm_accelerator.set_calculate_accelerator_cycles_only_enabled(False)
+        tflite_model = _load_tflite_model(model)
+        wrapper = TfliteMicro._load_wrapper()
+        tflm_accelerator = None
+        if accelerator is not None:
+            tflm_accelerator = TfliteMicro.get_accelerator(accelerator)
 
-            recorded_layers = recorded_data['layers']
-            layer_results = []
-            for layer_index, tflm_layer_result in enumerate(tflm_results):
-                tflite_layer = tflite_model.layers[layer_index]
-                layer_err = tflm_model.get_layer_error(layer_index)
-                layer_err_msg = None if layer_err is None else layer_err.msg
-                del tflm_layer_result['name']
-                layer_result = ProfilingLayerResult(
-                    tflite_layer=tflite_layer,
-                    error_msg=layer_err_msg,
-                    **tflm_layer_result
+        cache_key = None
+        profiling_data = None
+        if use_cache and input_data is None:
+            try:
+                cache_key = get_profiling_cache_key(
+                    tflite_model=tflite_model,
+                    accelerator=tflm_accelerator,
+                    runtime_buffer_size=runtime_buffer_size,
+                    tflm_wrapper=wrapper,
+                    disable_simulator_backend=disable_simulator_backend,
                 )
+                profiling_data = load_profiling_cache_entry(cache_key)
+            except Exception as e:
+                get_mltk_logger().debug(f'Failed to load cached profiling results, err: {e}')
 
-                layer_recorded_data = recorded_layers[layer_index] if layer_index < len(recorded_layers) else {}
-                updated = True 
-                while updated:
-                    updated = False
-                    for key, value in layer_recorded_data.items():
-                        if not isinstance(value, (int,float,str)):
-                            tflite_layer.metadata[key] = value
-                            layer_recorded_data.pop(key)
-                            updated = True 
-                            break 
-
-                layer_result.update(layer_recorded_data)
-                layer_results.append(layer_result)
-
-        finally:
-            TfliteMicro.unload_model(tflm_model)
+        if profiling_data is None:
+            profiling_data = _run_profiler(
+                tflite_model=tflite_model,
+                accelerator=accelerator,
+                disable_simulator_backend=disable_simulator_backend,
+                runtime_buffer_size=runtime_buffer_size,
+                input_data=input_data,
+            )
+            if cache_key is not None:
+                try:
+                    save_profiling_cache_entry(cache_key, profiling_data)
+                except Exception as e:
+                    get_mltk_logger().debug(f'Failed to cache profiling results, err: {e}')
+        else:
+            get_mltk_logger().debug('Using cached profiling results')
 
-        model_details = tflm_model.details
-        _add_memory_plan(
+        # NOTE: The cached data is deep copied as the results are generated from it
+        layer_results, model_details = _create_layer_results(
             tflite_model=tflite_model,
-            recorded_data=recorded_data,
-            model_details=model_details
+            profiling_data=copy.deepcopy(profiling_data)
         )
 
         results = ProfilingModelResults(
             model=tflite_model,
             accelerator=accelerator,
-            runtime_memory_bytes=tflm_model_details.runtime_memory_size,
+            runtime_memory_bytes=model_details.runtime_memory_size,
             layers=layer_results,
             model_details=model_details
         )
@@ -675,6 +662,123 @@ def _load_tflite_model(model:Union[str,TfliteModel]) -> TfliteModel:
         raise RuntimeError('Must provide TfliteModel or path to .tflite file')
 
 
+def _run_profiler(
+    tflite_model:TfliteModel,
+    accelerator:str,
+    disable_simulator_backend:bool,
+    runtime_buffer_size:int,
+    input_data: Union[np.ndarray,List[np.ndarray]],
+) -> dict:
+    """Run one inference in the simulator and return the raw profiling data
+
+    The returned dict only contains plain Python objects so that it may be cached
+    """
+    tflm_model = TfliteMicro.load_tflite_model(
+        model=tflite_model,
+        accelerator=accelerator,
+        enable_profiler=True,
+        enable_recorder=True,
+        runtime_buffer_size=runtime_buffer_size
+    )
+    try:
+        renable_simulator_backend = False
+        disable_calculate_accelerator_cycles_only = False
+        tflm_accelerator = tflm_model.accelerator
+
+        if disable_simulator_backend and \
+            tflm_accelerator is not None and \
+            hasattr(tflm_accelerator, 'set_simulator_backend_enabled'):
+            renable_simulator_backend = True
+            tflm_accelerator.set_simulator_backend_enabled(False)
+
+        if hasattr(tflm_accelerator, 'set_calculate_accelerator_cycles_only_enabled'):
+            # For profiling, we only need the accelerator cycles
+            # The simulator does not need to actually calculate valid output data
+            # This greatly improves simulation latency
+            disable_calculate_accelerator_cycles_only = True
+            tflm_accelerator.set_calculate_accelerator_cycles_only_enabled(True)
+
+        if input_data is not None:
+            if isinstance(input_data, list):
+                for i, v in enumerate(input_data):
+                    tflm_model.input(index=i, value=v)
+            else:
+                tflm_model.input(value=input_data)
+        else:
+            for i in range(tflm_model.input_size):
+                input_tensor = tflm_model.input(i)
+                empty_tensor = np.zeros_like(input_tensor)
+                tflm_model.input(i, value=empty_tensor)
+
+        tflm_model.invoke()
+        tflm_results = tflm_model.get_profiling_results()
+        recorded_data = tflm_model.get_recorded_data()
+        model_details = tflm_model.details.to_dict()
+
+        if renable_simulator_backend:
+            tflm_accelerator.set_simulator_backend_enabled(True)
+        if disable_calculate_accelerator_cycles_only:
+            tflm_accelerator.set_calculate_accelerator_cycles_only_enabled(False)
+
+        layer_errors = []
+        for layer_index in range(len(tflm_results)):
+            layer_err = tflm_model.get_layer_error(layer_index)
+            layer_errors.append(None if layer_err is None else layer_err.msg)
+
+    finally:
+        TfliteMicro.unload_model(tflm_model)
+
+    return dict(
+        model_details=model_details,
+        layer_results=tflm_results,
+        layer_errors=layer_errors,
+        recorded_data=recorded_data,
+    )
+
+
+def _create_layer_results(
+    tflite_model:TfliteModel,
+    profiling_data:dict,
+) -> Tuple[list, TfliteMicroModelDetails]:
+    """Create the ProfilingLayerResults and model details from the raw profiling data"""
+    from mltk.core.profiling_results import ProfilingLayerResult
+
+    recorded_data = profiling_data['recorded_data']
+    recorded_layers = recorded_data['layers']
+    layer_results = []
+    for layer_index, tflm_layer_result in enumerate(profiling_data['layer_results']):
+        tflite_layer = tflite_model.layers[layer_index]
+        tflm_layer_result.pop('name', None)
+        layer_result = ProfilingLayerResult(
+            tflite_layer=tflite_layer,
+            error_msg=profiling_data['layer_errors'][layer_index],
+            **tflm_layer_result
+        )
+
+        layer_recorded_data = recorded_layers[layer_index] if layer_index < len(recorded_layers) else {}
+        updated = True 
+        while updated:
+            updated = False
+            for key, value in layer_recorded_data.items():
+                if not isinstance(value, (int,float,str)):
+                    tflite_layer.metadata[key] = value
+                    layer_recorded_data.pop(key)
+                    updated = True 
+                    break 
+
+        layer_result.update(layer_recorded_data)
+        layer_results.append(layer_result)
+
+    model_details = TfliteMicroModelDetails(profiling_data['model_details'])
+    _add_memory_plan(
+        tflite_model=tflite_model,
+        recorded_data=recorded_data,
+        model_details=model_details
+    )
+
+    return layer_results, model_details
+
+
 def _add_memory_plan(
     tflite_model:TfliteModel,
     recorded_data:List,
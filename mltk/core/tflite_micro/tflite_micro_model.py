@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Union, Tuple
 import re
 from dataclasses import dataclass
 import collections
@@ -94,6 +94,9 @@ class TfliteMicroModel:
         self._layer_callback:Callable[[int,List[bytes]], bool] = None
         self._layer_errors:List[TfliteMicroLayerError] = []
         self._tflm_accelerator = tflm_accelerator
+        self._holds_model_lock = False
+        self._flatbuffer_data = flatbuffer_data
+        self._output_quantization:List[Tuple[float,int]] = None
 
         if not runtime_buffer_sizes:
             runtime_buffer_sizes = [0]
@@ -180,6 +183,104 @@ class TfliteMicroModel:
             raise RuntimeError(f'Failed to invoke model, additional info:\n{TfliteMicro._get_logged_errors_str()}')
 
 
+    def predict(
+        self,
+        x:Union[np.ndarray,List[np.ndarray]],
+        y:Union[np.ndarray,List[np.ndarray]]=None,
+        y_dtype=None
+    ) -> Union[np.ndarray,List[np.ndarray]]:
+        """Invoke the model once for each sample in the given batch and return the results
+
+        The samples are iterated by the TF-Lite Micro wrapper,
+        so there is only one call into the wrapper per batch (rather than one per sample and tensor).
+        The GIL is released while the samples are processed.
+
+        Args:
+            x: The batch of samples as a numpy array with the shape: [n_samples, <model input shape>].
+                If the model has multiple inputs, then a list with one batch per model input.
+                The data type must be the same as the model input's (i.e. the samples are NOT quantized)
+            y: Optional, preallocated output array(s) with the shape: [n_samples, <model output shape>].
+                If the model has multiple outputs, then a list with one array per model output.
+                If given, then the results are written directly to the array(s) and y_dtype is ignored.
+                The data type must either be the model output's, or float32 in which case the results are de-quantized
+            y_dtype: The data type of the returned results if y is not given.
+                If np.float32, then the model outputs are de-quantized using the output tensors' scaler/zeropoint.
+                By default the model outputs are directly returned
+
+        Returns:
+            The model outputs as a numpy array with the shape: [n_samples, <model output shape>].
+            If the model has multiple outputs, then a list with one numpy array per model output.
+        """
+        x = [np.ascontiguousarray(v) for v in (x if isinstance(x, (list,tuple)) else [x])]
+        if len(x) != self.input_size:
+            raise ValueError(f'Model has {self.input_size} inputs, but {len(x)} were given')
+        n_samples = len(x[0])
+        for i, x_i in enumerate(x):
+            input_dtype = self.input(i).dtype
+            if x_i.dtype != input_dtype:
+                raise ValueError(f'Input {i} data type: {x_i.dtype} does not match the model input data type: {input_dtype}')
+
+        if y is None:
+            y = []
+            for i in range(self.output_size):
+                output = self.output(i)
+                dtype = np.float32 if y_dtype == np.float32 else output.dtype
+                y.append(np.empty((n_samples,) + get_sample_shape(output), dtype=dtype))
+            return_list = self.output_size > 1
+        else:
+            return_list = isinstance(y, (list,tuple))
+            y = list(y) if return_list else [y]
+
+        if len(y) != self.output_size:
+            raise ValueError(f'Model has {self.output_size} outputs, but {len(y)} were given')
+
+        # pylint: disable=protected-access
+        from .tflite_micro import TfliteMicro
+
+        TfliteMicro._clear_logged_errors()
+        if hasattr(self._model_wrapper, 'predict'):
+            if not self._model_wrapper.predict(x, y):
+                raise RuntimeError(f'Failed to invoke model, additional info:\n{TfliteMicro._get_logged_errors_str()}')
+        else:
+            # The wrapper was built without the batched API, so iterate the samples here
+            self._predict_samples(x, y)
+
+        return y if return_list else y[0]
+
+
+    def _predict_samples(self, x:List[np.ndarray], y:List[np.ndarray]):
+        """Invoke the model for each sample from Python, used if the wrapper does not support the batched API"""
+        for sample_index in range(len(x[0])):
+            for i, x_i in enumerate(x):
+                input_tensor = self.input(i)
+                np.copyto(input_tensor, x_i[sample_index].reshape(input_tensor.shape))
+            self.invoke()
+            for i, y_i in enumerate(y):
+                y_i[sample_index] = self._get_output_sample(i, y_i.dtype).reshape(y_i.shape[1:])
+
+
+    def _get_output_sample(self, index:int, dtype) -> np.ndarray:
+        output = self.output(index)
+        if dtype == np.float32 and output.dtype != np.float32:
+            scale, zero_point = self._get_output_quantization(index)
+            return (output.astype(np.float32) - zero_point) * scale
+        return output
+
+
+    def _get_output_quantization(self, index:int) -> Tuple[float,int]:
+        if self._output_quantization is None:
+            from mltk.core.tflite_model import TfliteModel
+            tflite_model = TfliteModel(self._flatbuffer_data)
+            self._output_quantization = []
+            for tensor in tflite_model.outputs:
+                q = tensor.quantization
+                self._output_quantization.append((
+                    q.scale[0] if q is not None and len(q.scale) > 0 else 1.0,
+                    q.zeropoint[0] if q is not None and len(q.zeropoint) > 0 else 0
+                ))
+        return self._output_quantization[index]
+
+
     @property
     def is_profiler_enabled(self) -> bool:
         """Return if the profiler is enabled"""
@@ -281,4 +382,10 @@ class TfliteMicroModel:
         )
 
     def __str__(self) -> str:
-        return f'{self.details}'
\ No newline at end of file
+        return f'{self.details}'
+
+
+
+def get_sample_shape(tensor:np.ndarray) -> tuple:
+    """Return the shape of the given model tensor without the batch dimension"""
+    return tensor.shape[1:] if len(tensor.shape) > 1 and tensor.shape[0] == 1 else tensor.shape
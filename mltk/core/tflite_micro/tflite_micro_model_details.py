@@ -49,6 +49,10 @@ class TfliteMicroModelDetails:
         """The generated tensor buffer layout used for this model"""
         return self._memory_plan
 
+    def to_dict(self) -> dict:
+        """Return the model details as returned by the TFLM wrapper"""
+        return dict(self._details)
+
 
     def __str__(self):
         s = ''
@@ -0,0 +1,155 @@
+"""Run bit-exact TF-Lite Micro inference over many samples in parallel
+
+See the source code on Github: `mltk/core/tflite_micro/tflite_micro_model_pool.py <https://github.com/siliconlabs/mltk/blob/master/mltk/core/tflite_micro/tflite_micro_model_pool.py>`_
+"""
+from __future__ import annotations
+from typing import Union, List
+import concurrent.futures
+import numpy as np
+
+from mltk.core.tflite_model import TfliteModel
+from mltk.utils.process_pool import calculate_n_jobs
+from .tflite_micro import TfliteMicro
+from .tflite_micro_model import TfliteMicroModel, get_sample_shape
+
+
+
+class TfliteMicroModelPool:
+    """Pool of TF-Lite Micro interpreters that run inference in parallel
+
+    Each worker thread has its own instance of the model (i.e. its own tensor arena).
+    The TF-Lite Micro wrapper releases the GIL while a model is invoked,
+    so the samples are processed in parallel by the worker threads.
+
+    .. highlight:: python
+    .. code-block:: python
+
+        from mltk.core.tflite_micro import TfliteMicroModelPool
+
+        with TfliteMicroModelPool('my_model.tflite') as pool:
+            y = pool.predict(x)
+
+    NOTE: Only the TFLM reference kernels are supported.
+    If the TF-Lite Micro wrapper does not support concurrent models,
+    then the pool uses a single model instance.
+
+    Args:
+        model: Path to .tflite model file or TfliteModel instance
+        n_jobs: The number of model instances (i.e. threads) to use, see :py:func:`mltk.utils.process_pool.calculate_n_jobs`
+        runtime_buffer_size: The size of the tensor arena, see :py:meth:`TfliteMicro.load_tflite_model`
+    """
+    def __init__(
+        self,
+        model:Union[str,TfliteModel],
+        n_jobs:Union[int,float]=-1,
+        runtime_buffer_size:int=None,
+    ):
+        if isinstance(model, str):
+            model = TfliteModel.load_flatbuffer_file(model)
+
+        n_jobs = calculate_n_jobs(n_jobs)
+        if not TfliteMicro.concurrent_models_supported():
+            n_jobs = 1
+
+        self._models:List[TfliteMicroModel] = []
+        self._executor:concurrent.futures.ThreadPoolExecutor = None
+        try:
+            for _ in range(n_jobs):
+                self._models.append(TfliteMicro.load_tflite_model(
+                    model,
+                    runtime_buffer_size=runtime_buffer_size
+                ))
+        except:
+            self.close()
+            raise
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=n_jobs,
+            thread_name_prefix='TfliteMicroModelPool'
+        )
+
+    @property
+    def n_jobs(self) -> int:
+        """The number of model instances used by the pool"""
+        return len(self._models)
+
+
+    def predict(
+        self,
+        x:Union[np.ndarray,List[np.ndarray]],
+        y_dtype=None
+    ) -> Union[np.ndarray,List[np.ndarray]]:
+        """Run inference on the given samples
+
+        The samples are split evenly between the model instances,
+        see :py:meth:`TfliteMicroModel.predict`.
+
+        Args:
+            x: The batch of samples as a numpy array with the shape: [n_samples, <model input shape>].
+                If the model has multiple inputs, then a list with one batch per model input.
+                The data type must be the same as the model input's (i.e. the samples are NOT quantized)
+            y_dtype: If np.float32, then the model outputs are de-quantized.
+                By default the model outputs are directly returned
+
+        Returns:
+            The model outputs as a numpy array with the shape: [n_samples, <model output shape>].
+            If the model has multiple outputs, then a list with one numpy array per model output.
+        """
+        if self._executor is None:
+            raise RuntimeError('Model pool closed')
+
+        model0 = self._models[0]
+        x = [np.ascontiguousarray(v) for v in (x if isinstance(x, (list,tuple)) else [x])]
+        if len(x) != model0.input_size:
+            raise ValueError(f'Model has {model0.input_size} inputs, but {len(x)} were given')
+        n_samples = len(x[0])
+        for i, v in enumerate(x):
+            input_dtype = model0.input(i).dtype
+            if v.dtype != input_dtype:
+                raise ValueError(f'Input {i} data type: {v.dtype} does not match the model input data type: {input_dtype}')
+            if len(v) != n_samples:
+                raise ValueError('All the inputs must have the same number of samples')
+
+        y = []
+        for i in range(model0.output_size):
+            output = model0.output(i)
+            dtype = np.float32 if y_dtype == np.float32 else output.dtype
+            y.append(np.empty((n_samples,) + get_sample_shape(output), dtype=dtype))
+
+        # Each model instance writes its results directly into its slice of the output arrays
+        futures = []
+        for model, indices in zip(self._models, np.array_split(np.arange(n_samples), self.n_jobs)):
+            if len(indices) > 0:
+                start, end = indices[0], indices[-1] + 1
+                futures.append(self._executor.submit(
+                    model.predict,
+                    [x_i[start:end] for x_i in x],
+                    y=[y_i[start:end] for y_i in y]
+                ))
+        for f in futures:
+            f.result()
+
+        return y[0] if len(y) == 1 else y
+
+
+    def close(self):
+        """Shutdown the worker threads and unload the models"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for model in self._models:
+            TfliteMicro.unload_model(model)
+        self._models = []
+
+    def __enter__(self) -> TfliteMicroModelPool:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except:
+            pass
+
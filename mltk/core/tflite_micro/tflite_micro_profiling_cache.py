@@ -0,0 +1,157 @@
+"""Persistent cache of TF-Lite Micro profiling results
+
+Profiling a model in the simulator requires loading the model into the TFLM interpreter
+and running a full inference (which can take a while when the MVP simulator is used).
+This caches the raw profiling data returned by the TFLM wrapper so that subsequent
+profiling of the same model returns immediately.
+
+Each cache entry is keyed by a hash of:
+
+- The .tflite flatbuffer
+- The accelerator and its wrapper's GIT hash
+- The runtime buffer size
+- The TFLM wrapper's GIT hash and API version
+
+The cache is stored in ``<user dir>/profiling_cache``, see :py:func:`mltk.utils.path.create_user_dir`
+"""
+from typing import Union
+import os
+import pickle
+
+from mltk.utils.hasher import generate_hash
+from mltk.utils.path import create_user_dir
+from mltk.core.tflite_model import TfliteModel
+from mltk.core.utils import get_mltk_logger
+
+
+# Increment this if the format of the cached entries changes
+CACHE_VERSION = 1
+# The maximum number of entries to keep in the cache.
+# The least recently used entries are removed first
+MAX_ENTRIES = 512
+
+
+
+def get_profiling_cache_dir() -> str:
+    """Return the directory containing the cached profiling results"""
+    return create_user_dir('profiling_cache')
+
+
+def get_profiling_cache_key(
+    tflite_model:TfliteModel,
+    accelerator,
+    runtime_buffer_size:int,
+    tflm_wrapper,
+    **kwargs
+) -> str:
+    """Return the cache key of the given profiling settings
+
+    Args:
+        tflite_model: The model to profile
+        accelerator: The TfliteMicroAccelerator used for profiling, None if the reference kernels are used
+        runtime_buffer_size: The runtime buffer size argument given to the profiler
+        tflm_wrapper: The TFLM wrapper module
+        kwargs: Any other settings that affect the profiling results
+    """
+    if accelerator is not None:
+        accelerator_id = [accelerator.name, accelerator.git_hash, accelerator.api_version]
+    else:
+        accelerator_id = ['none']
+
+    return generate_hash(
+        CACHE_VERSION,
+        tflite_model.flatbuffer_data,
+        accelerator_id,
+        runtime_buffer_size,
+        tflm_wrapper.git_hash(),
+        tflm_wrapper.api_version(),
+        kwargs
+    )
+
+
+def load_profiling_cache_entry(key:str) -> Union[dict,None]:
+    """Return the cached raw profiling data for the given key, or None if it is not cached"""
+    path = _get_entry_path(key)
+    try:
+        with open(path, 'rb') as fp:
+            entry = pickle.load(fp)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # The entry is corrupt (e.g. another process was writing it), just re-generate it
+        get_mltk_logger().debug(f'Failed to load profiling cache entry: {path}, err: {e}')
+        return None
+
+    if not isinstance(entry, dict) or entry.get('version', None) != CACHE_VERSION:
+        return None
+
+    try:
+        # Update the modification time so the most recently used entries are kept
+        os.utime(path)
+    except OSError as e:
+        get_mltk_logger().debug(f'Failed to update profiling cache entry: {path}, err: {e}')
+
+    return entry['data']
+
+
+def save_profiling_cache_entry(key:str, data:dict):
+    """Save the raw profiling data to the cache
+
+    This does nothing if the MLTK_READONLY environment variable is set.
+    """
+    if os.environ.get('MLTK_READONLY'):
+        return
+
+    path = _get_entry_path(key)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as fp:
+            pickle.dump(
+                dict(version=CACHE_VERSION, data=data),
+                fp,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    _remove_old_entries(os.path.dirname(path))
+
+
+def clear_profiling_cache():
+    """Remove all the cached profiling results"""
+    cache_dir = get_profiling_cache_dir()
+    for fn in os.listdir(cache_dir):
+        if fn.endswith('.pkl'):
+            try:
+                os.remove(f'{cache_dir}/{fn}')
+            except OSError as e:
+                get_mltk_logger().debug(f'Failed to remove profiling cache entry: {cache_dir}/{fn}, err: {e}')
+
+
+def _get_entry_path(key:str) -> str:
+    return f'{get_profiling_cache_dir()}/{key}.pkl'
+
+
+def _remove_old_entries(cache_dir:str):
+    entries = []
+    for fn in os.listdir(cache_dir):
+        if not fn.endswith('.pkl'):
+            continue
+        path = f'{cache_dir}/{fn}'
+        try:
+            entries.append((os.path.getmtime(path), path))
+        except OSError as e:
+            # The entry was removed by another process
+            get_mltk_logger().debug(f'Failed to get profiling cache entry mtime: {path}, err: {e}')
+
+    if len(entries) <= MAX_ENTRIES:
+        return
+
+    entries.sort()
+    for _, path in entries[:len(entries) - MAX_ENTRIES]:
+        try:
+            os.remove(path)
+        except OSError as e:
+            get_mltk_logger().debug(f'Failed to remove old profiling cache entry: {path}, err: {e}')
@@ -3,6 +3,7 @@ from .tflite_model import (
     TfliteModel,
     TfliteOpCode
 )
+from .tflite_inference_engine import TfliteInferenceEngine
 from .tflite_layer import (
     TfliteLayer,
     TfliteLayerOptions,
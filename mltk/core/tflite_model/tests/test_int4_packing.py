@@ -0,0 +1,88 @@
+import time
+import numpy as np
+
+from mltk.core.tflite_model.tflite_tensor import pack_int4, unpack_int4
+
+
+
+def _unpack_int4_loop(data_bytes:bytes, n_elements:int) -> np.ndarray:
+    """Per-nibble reference implementation, based on the original loop
+
+    NOTE: For an odd number of elements, the original loop extracted the final value from the upper nibble,
+    whereas pack_int4() and TF-Lite's UnpackDenseInt4IntoInt8() use the lower nibble.
+    """
+    raw_data_array = np.empty((n_elements,), dtype=np.int8)
+
+    sign_bit_mask = 1 << (4 - 1)
+    def sign_extend_4bits(value):
+        return (value & (sign_bit_mask-1)) - (value & sign_bit_mask)
+
+    for i in range(n_elements // 2):
+        v = data_bytes[i]
+        raw_data_array[i*2 + 0] = sign_extend_4bits(v & 0x0F)
+        raw_data_array[i*2 + 1] = sign_extend_4bits((v & 0xF0) >> 4)
+
+    if n_elements % 2 != 0:
+        v = data_bytes[n_elements//2]
+        raw_data_array[-1] = sign_extend_4bits(v & 0x0F)
+
+    return raw_data_array
+
+
+def _pack_int4_loop(values:np.ndarray) -> bytes:
+    """Per-value reference implementation, based on the original loop"""
+    values = values.reshape(-1)
+    packed_data = bytearray()
+    for i in range(len(values)//2):
+        packed_data.append((int(values[i*2]) & 0x0F) | ((int(values[i*2 + 1]) & 0x0F) << 4))
+    if len(values) % 2 != 0:
+        packed_data.append(int(values[-1]) & 0x0F)
+    return bytes(packed_data)
+
+
+def test_int4_pack_unpack():
+    for n_elements in (1, 2, 7, 16, 1001):
+        values = np.random.randint(-8, 8, size=(n_elements,), dtype=np.int8)
+        packed = pack_int4(values)
+        assert packed.dtype == np.uint8
+        assert packed.tobytes() == _pack_int4_loop(values)
+
+        unpacked = unpack_int4(packed, n_elements)
+        assert unpacked.dtype == np.int8
+        assert np.array_equal(unpacked, values)
+        assert np.array_equal(unpacked, _unpack_int4_loop(packed.tobytes(), n_elements))
+
+
+def test_int4_out_of_range():
+    for values in (
+        np.array([8], dtype=np.int8),
+        np.array([-9], dtype=np.int16),
+        # 250 would wrap around to -6 if converted to int8 before the range check
+        np.array([250, 3], dtype=np.int32),
+    ):
+        try:
+            pack_int4(values)
+            assert False, 'Expected a ValueError'
+        except ValueError:
+            pass
+
+
+def _benchmark(n_elements:int=1_000_000):
+    """Compare the vectorized implementations to the reference loops, this only prints the timings"""
+    values = np.random.randint(-8, 8, size=(n_elements,), dtype=np.int8)
+    packed_bytes = pack_int4(values).tobytes()
+
+    for name, func, args in (
+        ('Unpack (loop)', _unpack_int4_loop, (packed_bytes, n_elements)),
+        ('Unpack (vectorized)', unpack_int4, (packed_bytes, n_elements)),
+        ('Pack (loop)', _pack_int4_loop, (values,)),
+        ('Pack (vectorized)', pack_int4, (values,)),
+    ):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        print(f'{name} {n_elements} int4 values: {elapsed*1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    _benchmark()
@@ -684,4 +684,140 @@ def test_max_pool_params():
         assert calc_params.stride_width == expected_params['stride_width']
         assert calc_params.stride_height == expected_params['stride_height']
         assert calc_params.quantized_activation_min == expected_params['quantized_activation_min']
-        assert calc_params.quantized_activation_max == expected_params['quantized_activation_max']
\ No newline at end of file
+        assert calc_params.quantized_activation_max == expected_params['quantized_activation_max']
+
+def test_predict_pad_batch_size_api():
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH)
+    input_tensor = tflite_model.get_input_tensor()
+    x = np.random.uniform(-1, 1, (3, *input_tensor.shape[1:])).astype(np.float32)
+
+    expected = tflite_model.predict(x, y_dtype=np.float32)
+    assert expected.shape[0] == 3
+
+    # The short batch is padded to 8 samples and the padded results are discarded
+    y = tflite_model.predict(x, y_dtype=np.float32, pad_batch_size=8)
+    assert y.shape == expected.shape
+    assert np.allclose(y, expected, atol=1e-5)
+    assert len(tflite_model._interpreters) == 2 # pylint: disable=protected-access
+
+    # The interpreters are re-used
+    tflite_model.predict(x[0], y_dtype=np.float32, pad_batch_size=8)
+    tflite_model.predict(x, y_dtype=np.float32)
+    assert len(tflite_model._interpreters) == 2 # pylint: disable=protected-access
+
+
+def test_inference_engine_api():
+    from mltk.core.tflite_model import TfliteInferenceEngine
+
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH)
+    input_tensor = tflite_model.get_input_tensor()
+    x = np.random.uniform(-1, 1, (10, *input_tensor.shape[1:])).astype(np.float32)
+    expected = tflite_model.predict(x, y_dtype=np.float32)
+
+    with TfliteInferenceEngine(tflite_model, n_jobs=3, batch_size=4) as engine:
+        y = engine.predict(x, y_dtype=np.float32)
+        assert np.allclose(y, expected, atol=1e-5)
+
+        # The batch results are returned in order
+        batches = [(x[i:i+3], None) for i in range(0, len(x), 3)]
+        batch_results = list(engine.predict_iter(batches, y_dtype=np.float32))
+        assert [len(b) for b in batch_results] == [3, 3, 3, 1]
+        assert np.allclose(np.concatenate(batch_results), expected, atol=1e-5)
+
+    # n_jobs=1 executes the given model in the calling thread
+    with TfliteInferenceEngine(tflite_model, n_jobs=1, batch_size=4) as engine:
+        assert engine._executor is None # pylint: disable=protected-access
+        y = engine.predict(x, y_dtype=np.float32)
+        assert np.allclose(y, expected, atol=1e-5)
+
+    with TfliteInferenceEngine(tflite_model) as engine:
+        assert 1 <= engine.n_jobs <= TfliteInferenceEngine.DEFAULT_MAX_JOBS
+
+
+def test_inference_engine_lazy_model():
+    from mltk.core.tflite_model import TfliteInferenceEngine
+
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH, lazy=True)
+    input_shape = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH).get_input_tensor().shape
+    x = np.random.uniform(-1, 1, (12, *input_shape[1:])).astype(np.float32)
+
+    # The input/output tensors are built before the workers are started
+    with TfliteInferenceEngine(tflite_model, n_jobs=3, batch_size=2) as engine:
+        assert tflite_model._subgraphs[0].tensors[tflite_model._subgraphs[0].inputs[0]] is not None # pylint: disable=protected-access
+        y = engine.predict(x, y_dtype=np.float32)
+
+    assert np.allclose(y, tflite_model.predict(x, y_dtype=np.float32), atol=1e-5)
+
+
+def test_predict_generator_api():
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH)
+    input_tensor = tflite_model.get_input_tensor()
+    x = np.random.uniform(-1, 1, (10, *input_tensor.shape[1:])).astype(np.float32)
+    expected = tflite_model.predict(x, y_dtype=np.float32)
+
+    def _generator():
+        for i in range(0, len(x), 4):
+            yield x[i:i+4], None
+
+    y = tflite_model.predict(_generator(), y_dtype=np.float32)
+    assert y.shape == expected.shape
+    assert np.allclose(y, expected, atol=1e-5)
+    # The results are not a view of a larger buffer
+    assert y.base is None and y.flags.owndata
+
+    batch_results = list(tflite_model.predict(_generator(), y_dtype=np.float32, return_iterator=True))
+    assert [len(b) for b in batch_results] == [4, 4, 2]
+    assert np.allclose(np.concatenate(batch_results), expected, atol=1e-5)
+
+    with pytest.raises(ValueError):
+        tflite_model.predict(x, return_iterator=True)
+
+
+def test_lazy_load_api():
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH)
+    lazy_model = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH, lazy=True)
+
+    assert lazy_model.flatbuffer_size == tflite_model.flatbuffer_size
+    assert lazy_model.description == tflite_model.description
+    assert lazy_model.get_all_metadata() == tflite_model.get_all_metadata()
+    assert lazy_model.n_inputs == tflite_model.n_inputs
+    assert lazy_model.get_input_tensor().shape == tflite_model.get_input_tensor().shape
+    # Only the accessed tensors should be created
+    assert lazy_model._model is None # pylint: disable=protected-access
+    assert lazy_model.summary() == tflite_model.summary()
+    assert len(lazy_model.tensors) == len(tflite_model.tensors)
+    for t1, t2 in zip(lazy_model.tensors, tflite_model.tensors):
+        assert t1.name == t2.name
+        assert np.array_equal(t1.data, t2.data)
+    assert lazy_model._model is None # pylint: disable=protected-access
+
+    # Modifying the model unpacks the entire flatbuffer
+    tmp_path = create_tempdir('tests/tflite_model_apis') + '/lazy_model.tflite'
+    lazy_model.add_metadata('test', b'value')
+    lazy_model.save(tmp_path)
+    saved_model = TfliteModel.load_flatbuffer_file(tmp_path, lazy=True)
+    assert saved_model.get_metadata('test') == b'value'
+    # Saving to the memory-mapped file should not corrupt it
+    saved_model.description = 'updated'
+    saved_model.save()
+    # The mapped file is closed once the model is unpacked
+    assert saved_model._mmap is None # pylint: disable=protected-access
+    assert TfliteModel.load_flatbuffer_file(tmp_path).description == 'updated'
+
+
+def test_lazy_load_close_and_pickle():
+    import pickle
+    tflite_model = TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH)
+
+    with TfliteModel.load_flatbuffer_file(IMAGE_CLASSIFICATION_TFLITE_PATH, lazy=True) as lazy_model:
+        mapped_file = lazy_model._mmap # pylint: disable=protected-access
+        # The constant tensor data is a read-only view into the mapped file
+        assert not any(t.data.flags.writeable for t in lazy_model.tensors if not t.data.flags.owndata)
+
+        unpickled_model = pickle.loads(pickle.dumps(lazy_model))
+        assert unpickled_model.summary() == tflite_model.summary()
+        assert unpickled_model._mmap is None # pylint: disable=protected-access
+
+    assert mapped_file.closed
+    with pytest.raises(RuntimeError):
+        lazy_model.predict(np.zeros(tflite_model.get_input_tensor().shape[1:], dtype=np.float32))
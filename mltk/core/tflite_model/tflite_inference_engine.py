@@ -0,0 +1,236 @@
+from __future__ import annotations
+import os
+import copy
+import queue
+import collections
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Iterator, Iterable, Union, Deque, TYPE_CHECKING
+
+import numpy as np
+
+from .tflite_model import TfliteModel
+
+if TYPE_CHECKING:
+    from mltk.core.tflite_micro import TfliteMicroModelPool
+
+
+
+class TfliteInferenceEngine:
+    """Run TfliteModel inference on multiple batches in parallel
+
+    :py:meth:`TfliteModel.predict` executes a single TF-Lite interpreter serially.
+    This engine shards the batches across ``n_jobs`` interpreters, each executing in a separate thread
+    (the TF-Lite interpreter releases the Python GIL while invoking the model).
+    The flatbuffer is only loaded once and shared by all of the interpreters.
+
+    The results are returned in the same order as the given batches.
+
+    If ``tflite_micro=True``, then the batches are executed by a :py:class:`mltk.core.tflite_micro.TfliteMicroModelPool`
+    (each batch is split between the pool's TF-Lite Micro model instances).
+    This way, the results are bit-exact with the model running on an embedded device.
+
+    .. note:: Only models with a single input are supported
+
+    **Example Usage**
+
+    .. highlight:: python
+    .. code-block:: python
+
+        from mltk.core import TfliteModel
+        from mltk.core.tflite_model import TfliteInferenceEngine
+
+        tflite_model = TfliteModel.load_flatbuffer_file('some/path/my_model.tflite')
+
+        with TfliteInferenceEngine(tflite_model, n_jobs=4) as engine:
+            # Stream the results of each batch as they become available
+            for batch_y in engine.predict_iter(my_data_generator, y_dtype=np.float32):
+                ...
+
+            # Or return the results of all the samples as a single numpy array
+            y = engine.predict(x, y_dtype=np.float32)
+
+    Args:
+        tflite_model: The TfliteModel to execute
+        n_jobs: The number of interpreters to execute in parallel. If omitted then the number of CPU cores is used, up to 4.
+            If 1, then the batches are executed by the given model in the calling thread (i.e. no worker threads are used)
+        batch_size: The number of samples per batch when a numpy array is given to :py:meth:`~predict`
+        max_pending: The maximum number of batches queued for inference. If omitted then 2*n_jobs is used
+        pad_batch_size: Zero-pad short batches to this size, see :py:meth:`TfliteModel.predict`
+        interpreter_kwargs: Optional keyword arguments given to the TF-Lite interpreter
+        tflite_micro: Use the TF-Lite Micro interpreter (with the reference kernels) instead of the TF-Lite interpreter.
+            If the TF-Lite Micro wrapper does not support concurrent models, then only one interpreter is used
+    """
+
+    DEFAULT_MAX_JOBS = 4
+    """The maximum number of interpreters used if ``n_jobs`` is omitted"""
+
+    def __init__(
+        self,
+        tflite_model:TfliteModel,
+        n_jobs:int=None,
+        batch_size:int=32,
+        max_pending:int=None,
+        pad_batch_size:int=None,
+        interpreter_kwargs:dict=None,
+        tflite_micro:bool=False,
+    ):
+        self.tflite_model = tflite_model
+        self.tflite_micro = tflite_micro
+        self.n_jobs = max(n_jobs or min(os.cpu_count() or 1, self.DEFAULT_MAX_JOBS), 1)
+        self.batch_size = batch_size
+        self.max_pending = max(max_pending or 2*self.n_jobs, 1)
+        self.pad_batch_size = pad_batch_size
+        self.interpreter_kwargs = interpreter_kwargs
+        self._workers = queue.SimpleQueue()
+        self._tflm_pool:TfliteMicroModelPool = None
+        self._executor:ThreadPoolExecutor = None
+        if tflite_micro:
+            from mltk.core.tflite_micro import TfliteMicroModelPool
+            self._tflm_pool = TfliteMicroModelPool(tflite_model, n_jobs=self.n_jobs)
+            self.n_jobs = self._tflm_pool.n_jobs
+        elif self.n_jobs > 1:
+            # The workers are shallow copies of the model that share its subgraphs.
+            # Build the lazily loaded input/output tensors now,
+            # so the workers do not concurrently populate the shared subgraphs
+            for i in range(tflite_model.n_inputs):
+                tflite_model.get_input_tensor(i)
+            for i in range(tflite_model.n_outputs):
+                tflite_model.get_output_tensor(i)
+            self._executor = ThreadPoolExecutor(self.n_jobs, thread_name_prefix='TfliteInferenceEngine')
+
+
+    def predict_iter(
+        self,
+        x:Union[np.ndarray, Iterable],
+        y_dtype=None
+    ) -> Iterator[np.ndarray]:
+        """Run inference on each batch and yield the batch results in order
+
+        Args:
+            x: The input samples as a numpy array, which is split into batches of ``batch_size``,
+                or a data generator.
+                If x is a generator, then each iteration must return either batch_x or a tuple: batch_x, batch_y
+                (batch_y is ignored). If the generator has a ``max_samples`` property, then iteration stops
+                once the specified number of samples have been processed.
+            y_dtype: The result data type, see :py:meth:`TfliteModel.predict`
+
+        Returns:
+            Iterator of the results of each batch
+        """
+        if self._tflm_pool is not None:
+            for batch_x in self._iterate_batches(x):
+                batch_x = self.tflite_model.quantize_to_input_dtype(batch_x)
+                yield self._tflm_pool.predict(batch_x, y_dtype=y_dtype)
+            return
+
+        if self._executor is None:
+            for batch_x in self._iterate_batches(x):
+                yield self._predict_with(self.tflite_model, batch_x, y_dtype)
+            return
+
+        pending:Deque[Future] = collections.deque()
+        try:
+            for batch_x in self._iterate_batches(x):
+                pending.append(self._executor.submit(self._predict_batch, batch_x, y_dtype))
+                while len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for f in pending:
+                f.cancel()
+
+
+    def predict(
+        self,
+        x:Union[np.ndarray, Iterable],
+        y_dtype=None
+    ) -> np.ndarray:
+        """Run inference on all the given samples and return the results as a single numpy array
+
+        Refer to :py:meth:`~predict_iter` for more details
+        """
+        batch_results = list(self.predict_iter(x, y_dtype=y_dtype))
+        if len(batch_results) == 0:
+            raise RuntimeError('No batch samples where generated by the data given data generator')
+
+        y = np.concatenate(batch_results, axis=0)
+        if hasattr(x, 'max_samples') and x.max_samples > 0:
+            y = y[:x.max_samples]
+        return y
+
+
+    def shutdown(self):
+        """Shutdown the engine's threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self._tflm_pool is not None:
+            self._tflm_pool.close()
+
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+
+    def _iterate_batches(self, x) -> Iterator[np.ndarray]:
+        if isinstance(x, np.ndarray):
+            input_shape = self.tflite_model.get_input_tensor(0).shape
+            # Add the batch dimension if we were only given a single sample
+            if len(x.shape) == len(input_shape[1:]):
+                x = np.expand_dims(x, axis=0)
+            for i in range(0, len(x), self.batch_size):
+                yield x[i:i+self.batch_size]
+            return
+
+        n_samples = 0
+        for batch in x:
+            batch_x = batch if not isinstance(batch, tuple) else batch[0]
+            yield batch_x
+            n_samples += len(batch_x)
+
+            # If the generator specifies a "max_samples" property
+            # then break out of the loop once the specified number of samples have been processed
+            try:
+                if hasattr(x, 'max_samples') and x.max_samples > 0:
+                    if n_samples >= x.max_samples:
+                        break
+            except (AttributeError, TypeError):
+                pass
+
+
+    def _predict_batch(self, batch_x:np.ndarray, y_dtype) -> np.ndarray:
+        worker = self._acquire_worker()
+        try:
+            return self._predict_with(worker, batch_x, y_dtype)
+        finally:
+            self._workers.put(worker)
+
+
+    def _predict_with(self, tflite_model:TfliteModel, batch_x:np.ndarray, y_dtype) -> np.ndarray:
+        kwargs = {}
+        if self.interpreter_kwargs:
+            kwargs['interpreter_kwargs'] = self.interpreter_kwargs
+        return tflite_model.predict(
+            batch_x,
+            y_dtype=y_dtype,
+            pad_batch_size=self.pad_batch_size,
+            **kwargs
+        )
+
+
+    def _acquire_worker(self) -> TfliteModel:
+        try:
+            return self._workers.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Each worker is a shallow copy of the model with its own interpreters.
+        # The flatbuffer and parsed model are shared (they are read-only during inference)
+        worker = copy.copy(self.tflite_model)
+        worker._interpreter = None # pylint: disable=protected-access
+        worker._interpreters = collections.OrderedDict() # pylint: disable=protected-access
+        return worker
@@ -1,8 +1,11 @@
 from __future__ import annotations
 import os
+import mmap
+import uuid
 import warnings
+import collections
 
-from typing import List, Dict, Union, Iterator
+from typing import List, Dict, Tuple, Union, Iterator
 from prettytable import PrettyTable
 
 import numpy as np
@@ -76,27 +79,63 @@ class TfliteModel:
         # - a numpy array of 1 or more samples
         # - A Python generator that returns (batch_x, batch_y)
         # inference_results = tflite_model.predict(..)
+
+    **Lazy Loading**
+
+    By default, the entire flatbuffer is unpacked into Python objects when the model is loaded.
+    With ``lazy=True``, the .tflite file is memory-mapped and accessed with the read-only flatbuffer API.
+    Tensors and layers are then only created when they are first accessed and
+    the tensor :py:attr:`~TfliteTensor.data` is a read-only view into the mapped file.
+    This greatly reduces the time and memory required to, e.g., print a model's summary or read its metadata.
+    The full object tree is automatically unpacked the first time a modifying API
+    (e.g. :py:meth:`~add_metadata` or :py:meth:`~regenerate_flatbuffer`) or :py:attr:`~flatbuffer_model` is used.
+
+    The mapped file is closed when the full object tree is unpacked, or when :py:meth:`~close` is called
+    (the model may also be used as a context manager).
+
+    .. highlight:: python
+    .. code-block:: python
+
+        with TfliteModel.load_flatbuffer_file('some/path/my_model.tflite', lazy=True) as tflite_model:
+            print(tflite_model.get_all_metadata())
     """
 
+    max_cached_interpreters = 4
+    """The maximum number of allocated TF-Lite interpreters cached by :py:meth:`~predict`, one per batch size"""
+
     @staticmethod
-    def load_flatbuffer_file(path: str, cwd=None) -> TfliteModel:
-        """Load a .tflite flatbuffer file"""
+    def load_flatbuffer_file(path: str, cwd=None, lazy=False) -> TfliteModel:
+        """Load a .tflite flatbuffer file
+
+        Args:
+            path: Path to the .tflite file
+            cwd: Optional directory used to resolve a relative path
+            lazy: If true then memory-map the file and only create the tensors and layers when they are accessed,
+                see the "Lazy Loading" section of :py:class:`~TfliteModel` for more details
+        """
         found_path = _existing_path(path, cwd=cwd)
         if found_path is None:
             raise FileNotFoundError(f'.tflite model file not found: {path}')
 
         with open(found_path, 'rb') as f:
-            flatbuffer_data = f.read()
+            if lazy:
+                flatbuffer_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                flatbuffer_data = f.read()
 
-        return TfliteModel(flatbuffer_data=flatbuffer_data, path=found_path)
+        return TfliteModel(flatbuffer_data=flatbuffer_data, path=found_path, lazy=lazy)
 
 
-    def __init__(self, flatbuffer_data: bytes, path: str=None):
+    def __init__(self, flatbuffer_data: bytes, path: str=None, lazy=False):
         self.path = path
         self._interpreter = None
-        self._interpreter_batch_size = -1
+        self._interpreters:Dict[tuple,object] = collections.OrderedDict()
         self._flatbuffer_data : bytes = flatbuffer_data
+        self._mmap = flatbuffer_data if isinstance(flatbuffer_data, mmap.mmap) else None
+        self._mapped_path:str = None
+        self._lazy = lazy
         self._model:_tflite_schema_fb.ModelT = None
+        self._fb_model:_tflite_schema_fb.Model = None
         self._selected_model_subgraph_index = -1
         self._subgraphs: List[_TfliteSubgraph] = []
         self._load_model()
@@ -141,11 +180,14 @@ class TfliteModel:
 
         .. note:: :py:func:`~save` must be called for changes to persist
         """
-        return '' if self._model is None or not self._model.description else self._model.description.decode('utf-8')
+        if self._model is None and self._fb_model is not None:
+            desc = self._fb_model.Description()
+        else:
+            desc = None if self._model is None else self._model.description
+        return '' if not desc else desc.decode('utf-8')
     @description.setter
     def description(self, desc: str):
-        if self._model is None:
-            raise RuntimeError('Model not loaded')
+        self._load_full_model()
         desc = desc or ''
         self._model.description = desc.encode('utf-8')
         self.regenerate_flatbuffer()
@@ -160,22 +202,30 @@ class TfliteModel:
     @property
     def flatbuffer_size(self) -> int:
         """Size of the model flatbuffer in bytes"""
-        if self.flatbuffer_data is None:
+        if self._flatbuffer_data is None:
             return 0
-        return len(self.flatbuffer_data)
+        return len(self._flatbuffer_data)
 
     def __len__(self) -> int:
         return self.flatbuffer_size
 
     @property
     def flatbuffer_model(self) -> _tflite_schema_fb.ModelT:
-        """Flatbuffer schema Model object"""
+        """Flatbuffer schema Model object
+
+        .. note:: If the model was lazily loaded, then this unpacks the entire flatbuffer
+        """
+        if self._model is None and self._fb_model is not None:
+            self._load_full_model()
         return self._model
 
     @property
     def flatbuffer_subgraph(self) -> _tflite_schema_fb.SubGraphT:
-        """Flatbuffer schema model subgraph"""
-        if self._model is None:
+        """Flatbuffer schema model subgraph
+
+        .. note:: If the model was lazily loaded, then this unpacks the entire flatbuffer
+        """
+        if self.flatbuffer_model is None:
             return None
         return self._model.subgraphs[self._selected_model_subgraph_index]
 
@@ -187,7 +237,7 @@ class TfliteModel:
         return self._selected_model_subgraph_index
     @selected_model_subgraph.setter
     def selected_model_subgraph(self, v: int):
-        if self._model is None:
+        if not self._subgraphs:
             return -1
         if v < 0 or v >= self.n_subgraphs:
             raise ValueError('Invalid model subgraph index')
@@ -196,24 +246,22 @@ class TfliteModel:
     @property
     def n_subgraphs(self) -> int:
         """Return the number of model subgraphs"""
-        if self._model is None:
-            return 0
-        return len(self._model.subgraphs)
+        return len(self._subgraphs)
 
     @property
     def n_inputs(self) -> int:
         """Return the number of model inputs"""
-        if self.flatbuffer_subgraph is None:
+        if self._selected_model_subgraph_index == -1:
             return 0
-        return len(self.flatbuffer_subgraph.inputs)
+        return len(self._get_subgraph_io().inputs)
 
     @property
     def inputs(self) -> List[TfliteTensor]:
         """List of all input tensors"""
-        if self.flatbuffer_subgraph is None:
+        if self._selected_model_subgraph_index == -1:
             return None
         retval = []
-        for index in self.flatbuffer_subgraph.inputs:
+        for index in self._get_subgraph_io().inputs:
             retval.append(self.get_tensor(index))
 
         return retval
@@ -221,17 +269,17 @@ class TfliteModel:
     @property
     def n_outputs(self) -> int:
         """Return the number of model outputs"""
-        if self.flatbuffer_subgraph is None:
+        if self._selected_model_subgraph_index == -1:
             return 0
-        return len(self.flatbuffer_subgraph.outputs)
+        return len(self._get_subgraph_io().outputs)
 
     @property
     def outputs(self) -> List[TfliteTensor]:
         """List of all output tensors"""
-        if self.flatbuffer_subgraph is None:
+        if self._selected_model_subgraph_index == -1:
             return None
         retval = []
-        for index in self.flatbuffer_subgraph.outputs:
+        for index in self._get_subgraph_io().outputs:
             retval.append(self.get_tensor(index))
 
         return retval
@@ -241,14 +289,26 @@ class TfliteModel:
         """List of all model layers for the current subgraph"""
         if self._selected_model_subgraph_index == -1:
             return None
-        return self._subgraphs[self._selected_model_subgraph_index].layers
+        subgraph = self._get_subgraph()
+        if subgraph.layers is None:
+            # Lazily create the layers the first time they're accessed
+            fb_subgraph = self._fb_model.Subgraphs(self._selected_model_subgraph_index)
+            subgraph.layers = []
+            for i in range(fb_subgraph.OperatorsLength()):
+                operator = _tflite_schema_fb.OperatorT.InitFromObj(fb_subgraph.Operators(i))
+                subgraph.layers.append(TfliteLayer.from_flatbuffer(i, self, operator))
+        return subgraph.layers
 
     @property
     def tensors(self) -> List[TfliteTensor]:
         """List of all model tensors for the current subgraph"""
         if self._selected_model_subgraph_index == -1:
             return None
-        return self._subgraphs[self._selected_model_subgraph_index].tensors
+        subgraph = self._get_subgraph()
+        for i, tensor in enumerate(subgraph.tensors):
+            if tensor is None:
+                self.get_tensor(i)
+        return subgraph.tensors
 
 
     def summary(self) -> str:
@@ -285,20 +345,26 @@ class TfliteModel:
 
         If no index is given, then use the selected_model_subgraph
         """
-        if self._model is None:
-            raise RuntimeError('Model not loaded')
+        self._load_full_model()
         index = index or self._selected_model_subgraph_index
         return self._model.subgraphs[index]
 
 
     def get_tensor(self, index : int) -> TfliteTensor:
         """Return a specific model tensor as a TfliteTensor """
-        if self._model is None:
+        if not self._subgraphs:
             raise RuntimeError('Model not loaded')
-        subgraph = self._subgraphs[self._selected_model_subgraph_index]
+        subgraph = self._get_subgraph()
         if index >= len(subgraph.tensors):
             raise IndexError(f'Index overflow ({index} >= {len(subgraph.tensors)})')
-        return subgraph.tensors[index]
+        tensor = subgraph.tensors[index]
+        if tensor is None:
+            # Lazily create the tensor the first time it's accessed
+            fb_subgraph = self._fb_model.Subgraphs(self._selected_model_subgraph_index)
+            fb_tensor = _tflite_schema_fb.TensorT.InitFromObj(fb_subgraph.Tensors(index))
+            tensor = TfliteTensor(index, self, fb_tensor)
+            subgraph.tensors[index] = tensor
+        return tensor
 
 
     def get_tensor_data(self, index : int) -> np.ndarray:
@@ -313,7 +379,7 @@ class TfliteModel:
         """Return a model input tensor as a TfliteTensor"""
         if index >= self.n_inputs:
             raise IndexError(f'Index overflow ({index} >= {self.n_inputs})')
-        tensor_index = self.flatbuffer_subgraph.inputs[index]
+        tensor_index = self._get_subgraph_io().inputs[index]
         return self.get_tensor(tensor_index)
 
 
@@ -321,7 +387,7 @@ class TfliteModel:
         """Return a model input as a np.ndarray"""
         if index >= self.n_inputs:
             raise IndexError(f'Index overflow ({index} >= {self.n_inputs})')
-        tensor_index = self.flatbuffer_subgraph.inputs[index]
+        tensor_index = self._get_subgraph_io().inputs[index]
         return self.get_tensor_data(tensor_index)
 
 
@@ -329,7 +395,7 @@ class TfliteModel:
         """Return a model output tensor as a TfliteTensor"""
         if index >= self.n_outputs:
             raise IndexError(f'Index overflow ({index} >= {self.n_outputs})')
-        tensor_index = self.flatbuffer_subgraph.outputs[index]
+        tensor_index = self._get_subgraph_io().outputs[index]
         return self.get_tensor(tensor_index)
 
 
@@ -337,32 +403,25 @@ class TfliteModel:
         """Return a model output tensor as a np.ndarray"""
         if index >= self.n_outputs:
             raise IndexError(f'Index overflow ({index} >= {self.n_outputs})')
-        tensor_index = self.flatbuffer_subgraph.outputs[index]
+        tensor_index = self._get_subgraph_io().outputs[index]
         return self.get_tensor_data(tensor_index)
 
 
     def get_all_metadata(self) -> Dict[str,bytes]:
         """Return all model metadata as a dictionary"""
-        if self._model is None:
-            raise RuntimeError('Model not loaded')
         retval = {}
-        for metadata in self._model.metadata:
-            name = metadata.name.decode("utf-8")
-            buffer_index = metadata.buffer
-            retval[name] = self._model.buffers[buffer_index].data.tobytes()
+        for name, buffer_index in self._iterate_metadata():
+            retval[name] = self._get_buffer_data(buffer_index).tobytes()
 
         return retval
 
 
     def get_metadata(self, tag : str) -> bytes:
         """Return model metadata with specified tag"""
-        if self._model is None:
-            raise RuntimeError('Model not loaded')
         metadata_value = None
-        for metadata in self._model.metadata:
-            if metadata.name.decode("utf-8") == tag:
-                buffer_index = metadata.buffer
-                metadata_value = self._model.buffers[buffer_index].data.tobytes()
+        for name, buffer_index in self._iterate_metadata():
+            if name == tag:
+                metadata_value = self._get_buffer_data(buffer_index).tobytes()
                 break
 
         return metadata_value
@@ -378,8 +437,7 @@ class TfliteModel:
             tag (str): The key to use to lookup the metadata
             value (bytes): The metadata value as a binary blob to add to the .tflite
         """
-        if self._model is None:
-            raise RuntimeError('Model not loaded')
+        self._load_full_model()
         if not tag or not value:
             raise ValueError('Must provide valid tag and value arguments')
 
@@ -423,8 +481,7 @@ class TfliteModel:
             True if the metadata was found and removed, False else
 
         """
-        if self._model is None:
-            raise RuntimeError('Model not loaded')
+        self._load_full_model()
 
         if not self._model.metadata:
             return False
@@ -459,24 +516,77 @@ class TfliteModel:
         if out_dir:
             os.makedirs(out_dir, exist_ok=True)
 
-        with open(output_path, 'wb') as f:
-            f.write(self._flatbuffer_data)
-    
+        if self._mapped_path and os.path.abspath(output_path) == os.path.abspath(self._mapped_path):
+            # Tensor data views may still reference the previously memory-mapped file,
+            # so write to a new file and replace it rather than truncating the mapped file
+            tmp_path = f'{output_path}.{uuid.uuid4().hex}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(self._flatbuffer_data)
+            os.replace(tmp_path, output_path)
+        else:
+            with open(output_path, 'wb') as f:
+                f.write(self._flatbuffer_data)
+
         if update_path:
             self._path = output_path
 
 
+    def close(self):
+        """Release the model's TF-Lite interpreters and close the memory-mapped .tflite file (if any)
+
+        .. note:: A lazily loaded model may not be used after it is closed
+        """
+        self._clear_interpreters()
+        if self._mmap is not None:
+            self._flatbuffer_data = None
+            self._fb_model = None
+            self._subgraphs = []
+            self._close_mmap()
+
+    def __enter__(self) -> TfliteModel:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __copy__(self) -> TfliteModel:
+        # A shallow copy shares the flatbuffer (and memory-mapped file) with this model
+        model = self.__class__.__new__(self.__class__)
+        model.__dict__.update(self.__dict__)
+        return model
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # The TF-Lite interpreters cannot be pickled
+        state['_interpreter'] = None
+        state['_interpreters'] = collections.OrderedDict()
+        if self._mmap is not None:
+            # Neither can the memory-mapped file nor the lazily loaded objects that reference it.
+            # The lazily loaded objects are re-created when the model is unpickled
+            state['_flatbuffer_data'] = self._mmap[:]
+            state['_mmap'] = None
+            state['_mapped_path'] = None
+            state['_fb_model'] = None
+            state['_subgraphs'] = []
+        return state
+
+    def __setstate__(self, state:dict):
+        self.__dict__.update(state)
+        if self._lazy and self._fb_model is None and self._flatbuffer_data is not None:
+            self._load_model_lazy()
+
+
     def regenerate_flatbuffer(self, reload_model=False):
         """Re-generate the underlying flatbuffer based on  the information cached in the local ModelT instance
 
         .. Note::
             :func:`~tflite_model.TfliteModel.save` must be called for changes to persist
         """
-        if self._model is None:
-            raise RuntimeError('Model not loaded')
+        self._load_full_model()
         b = flatbuffers.Builder(0)
         b.Finish(self._model.Pack(b), TFLITE_FILE_IDENTIFIER)
         self._flatbuffer_data = b.Output()
+        self._clear_interpreters()
 
         if reload_model:
             self._load_model()
@@ -486,8 +596,10 @@ class TfliteModel:
         self,
         x:Union[np.ndarray, Iterator, List[np.ndarray], Dict[int, np.ndarray]],
         y_dtype=None,
+        pad_batch_size:int=None,
+        return_iterator:bool=False,
         **kwargs
-    ) -> np.ndarray:
+    ) -> Union[np.ndarray, Iterator[np.ndarray]]:
         """Invoke the TfLite interpreter with the given input sample and return the results
 
         If the model has a single input and output, the x data can one of:
@@ -521,15 +633,28 @@ class TfliteModel:
             y_dtype: The return value's data type. By default, data type is None in which case the model output is directly returned.
                 If y_dtype=np.float32 then the model output is de-quantized to float32 using the model's output
                 quantization scaler/zeropoint (if necessary)
+            pad_batch_size: If given, batches with fewer samples than this value are zero-padded to this size
+                and the results of the padded samples are discarded.
+                This way, the same allocated interpreter is used for every batch (e.g. the last, short batch of a generator).
+                By default, an interpreter is allocated for each unique batch size.
+                NOTE: Up to ``max_cached_interpreters`` allocated interpreters are cached, one per batch size
+            return_iterator: If true, then return an iterator that yields the results of each batch
+                as they are generated rather than a single numpy array of all of the results.
+                This way, the memory usage is constant regardless of the number of samples.
+                This is only supported if x is a generator, a ValueError is raised otherwise
 
         Returns:
             Output of model inference, y. If x was a single sample, then y is a single result. Otherwise
             y is a vector (i.e. batch) of model results.
             If y_dtype is given, the y if automatically converted/de-quantized to the given dtype.
+            If return_iterator=True and x is a generator, then an iterator of the batch results is returned.
         """
         if self._flatbuffer_data is None:
             raise RuntimeError('Model not loaded')
 
+        if return_iterator and (self.n_inputs > 1 or isinstance(x, (np.ndarray, dict))):
+            raise ValueError('return_iterator=True is only supported if x is a data generator')
+
         input0 = self.get_input_tensor(0)
         input0_shape = input0.shape
 
@@ -552,26 +677,20 @@ class TfliteModel:
                     dictionary of numpy arrays with the keys corresponding to the model input index
                 ''')
 
+            # Check if the input sample has the batch dimension
+            has_batch_dim = len(x[0].shape) != len(input0_shape[1:])
+            n_samples = x[0].shape[0] if has_batch_dim else 1
+            self._allocate_tflite_interpreter(
+                batch_size=_get_padded_batch_size(n_samples, pad_batch_size),
+                interpreter_kwargs=kwargs.get('interpreter_kwargs', None)
+            )
+
             # Set the input tensors
-            has_batch_dim = True
             for input_index, x_i in x.items():
-                if input_index == 0:
-                    # Check if the input sample has the batch dimension
-                    if len(x_i.shape) == len(input0_shape[1:]):
-                        has_batch_dim = False
-                        self._allocate_tflite_interpreter(
-                            batch_size=1,
-                            interpreter_kwargs=kwargs.get('interpreter_kwargs', None)
-                        )
-                    else:
-                        self._allocate_tflite_interpreter(
-                            batch_size=x_i.shape[0],
-                            interpreter_kwargs=kwargs.get('interpreter_kwargs', None)
-                        )
-
                 # Add the batch_size=1 if the input sample doesn't have a batch dim
                 if not has_batch_dim:
                     x_i = np.expand_dims(x_i, axis=0)
+                x_i = _pad_batch(x_i, pad_batch_size)
 
                 # If the input sample isn't the same as the model input dtype,
                 # then we need to manually convert it first
@@ -586,7 +705,7 @@ class TfliteModel:
             # Get the model results
             y = []
             for i, outp in enumerate(self.outputs):
-                y_i = self._interpreter.get_tensor(outp.index)
+                y_i = self._interpreter.get_tensor(outp.index)[:n_samples]
 
                 # If the input doesn't have a batch dim
                 # then remove the dim from the output
@@ -612,15 +731,13 @@ class TfliteModel:
                 is_single_sample = True
                 # Add the batch dimension if we were only given a single sample
                 x = np.expand_dims(x, axis=0)
-                self._allocate_tflite_interpreter(
-                    batch_size=1,
-                    interpreter_kwargs=kwargs.get('interpreter_kwargs', None)
-                )
-            else:
-                self._allocate_tflite_interpreter(
-                    batch_size=x.shape[0],
-                    interpreter_kwargs=kwargs.get('interpreter_kwargs', None)
-                )
+
+            n_samples = x.shape[0]
+            self._allocate_tflite_interpreter(
+                batch_size=_get_padded_batch_size(n_samples, pad_batch_size),
+                interpreter_kwargs=kwargs.get('interpreter_kwargs', None)
+            )
+            x = _pad_batch(x, pad_batch_size)
 
             # If the input sample isn't the same as the model input dtype,
             # then we need to manually convert it first
@@ -640,7 +757,7 @@ class TfliteModel:
             self._interpreter.invoke()
 
             # Get the model results
-            y = self._interpreter.get_tensor(self.get_output_tensor(0).index)
+            y = self._interpreter.get_tensor(self.get_output_tensor(0).index)[:n_samples]
 
             # Convert the output data type to float32 if necessary
             # NOTE: If the model output type is float32 then
@@ -657,66 +774,109 @@ class TfliteModel:
 
         # Else if we were given a data generator
         else:
+            batch_iterator = self._predict_generator(
+                x,
+                y_dtype=y_dtype,
+                pad_batch_size=pad_batch_size,
+                interpreter_kwargs=kwargs.get('interpreter_kwargs', None)
+            )
+            if return_iterator:
+                return batch_iterator
+
+            max_samples = 0
+            try:
+                if hasattr(x, 'max_samples') and x.max_samples > 0:
+                    max_samples = x.max_samples
+            except:
+                pass
+
+            # Write each batch's results directly into the output buffer.
+            # If the total number of samples is known then the buffer is preallocated,
+            # otherwise its capacity is doubled as necessary
+            y = None
             n_samples = 0
-            batch_results = []
-            for batch in x:
-                batch_x = batch if not isinstance(batch, tuple) else batch[0]
+            for batch_y in batch_iterator:
+                if y is None:
+                    capacity = max_samples or max(len(batch_y), 1) * 16
+                    y = np.zeros((capacity, *batch_y.shape[1:]), dtype=batch_y.dtype)
+                elif n_samples + len(batch_y) > len(y):
+                    new_y = np.zeros((max(2*len(y), n_samples + len(batch_y)), *y.shape[1:]), dtype=y.dtype)
+                    new_y[:n_samples] = y[:n_samples]
+                    y = new_y
+
+                y[n_samples:n_samples+len(batch_y)] = batch_y
+                n_samples += len(batch_y)
 
-                self._allocate_tflite_interpreter(batch_size=batch_x.shape[0])
+            if y is None:
+                raise RuntimeError('No batch samples where generated by the data given data generator')
 
-                # If the input sample isn't the same as the model input dtype,
-                # then we need to manually convert it first
-                batch_x = self.quantize_to_input_dtype(batch_x)
+            # Shrink the buffer to the number of samples (or max_samples, zero-padded if fewer were generated)
+            # so the returned array does not reference the unused capacity
+            n_samples = max(n_samples, max_samples)
+            if n_samples != len(y):
+                y.resize((n_samples, *y.shape[1:]), refcheck=False)
+            return y
 
-                # If the last dimension of the model's input shape is 1,
-                # and the batch data is missing this dimension
-                # then automatically expand the dimension
-                if len(input0_shape) != len(batch_x.shape) and input0_shape[-1] == 1:
-                    batch_x = np.expand_dims(batch_x, axis=-1)
 
-                # The set model input tensor
-                self._interpreter.set_tensor(input0.index, batch_x)
-                # Execute the model
-                self._interpreter.invoke()
+    def _predict_generator(
+        self,
+        x:Iterator,
+        y_dtype=None,
+        pad_batch_size:int=None,
+        interpreter_kwargs:dict=None
+    ) -> Iterator[np.ndarray]:
+        """Run inference on each batch of the given generator and yield the results of each batch"""
+        input0 = self.get_input_tensor(0)
+        input0_shape = input0.shape
 
-                # Get the model results
-                batch_y = self._interpreter.get_tensor(self.get_output_tensor(0).index)
+        n_samples = 0
+        for batch in x:
+            batch_x = batch if not isinstance(batch, tuple) else batch[0]
 
-                if y_dtype == np.float32:
-                    # Convert the output data type to float32 if necessary
-                    batch_y = self.dequantize_output_to_float32(batch_y)
+            batch_n_samples = batch_x.shape[0]
+            self._allocate_tflite_interpreter(
+                batch_size=_get_padded_batch_size(batch_n_samples, pad_batch_size),
+                interpreter_kwargs=interpreter_kwargs
+            )
+            batch_x = _pad_batch(batch_x, pad_batch_size)
 
-                batch_results.append(batch_y)
-                n_samples += len(batch_y)
+            # If the input sample isn't the same as the model input dtype,
+            # then we need to manually convert it first
+            batch_x = self.quantize_to_input_dtype(batch_x)
 
-                # If the generator specifies a "max_samples" property
-                # then break out of the loop once the specified number of samples have been processed
-                try:
-                    if hasattr(x, 'max_samples') and x.max_samples > 0:
-                        if n_samples >= x.max_samples:
-                            break
-                except:
-                    pass
+            # If the last dimension of the model's input shape is 1,
+            # and the batch data is missing this dimension
+            # then automatically expand the dimension
+            if len(input0_shape) != len(batch_x.shape) and input0_shape[-1] == 1:
+                batch_x = np.expand_dims(batch_x, axis=-1)
 
-            if len(batch_results) == 0:
-                raise RuntimeError('No batch samples where generated by the data given data generator')
+            # The set model input tensor
+            self._interpreter.set_tensor(input0.index, batch_x)
+            # Execute the model
+            self._interpreter.invoke()
 
-            batch_size = batch_results[0].shape[0]
-            output_shape = batch_results[0].shape[1:]
+            # Get the model results
+            batch_y = self._interpreter.get_tensor(self.get_output_tensor(0).index)[:batch_n_samples]
 
-            if hasattr(x, 'max_samples') and x.max_samples > 0:
-                n_samples = x.max_samples
+            if y_dtype == np.float32:
+                # Convert the output data type to float32 if necessary
+                batch_y = self.dequantize_output_to_float32(batch_y)
 
-            y = np.zeros((n_samples, *output_shape), dtype=batch_y.dtype)
+            # If the generator specifies a "max_samples" property
+            # then break out of the loop once the specified number of samples have been processed
+            max_samples = 0
+            try:
+                if hasattr(x, 'max_samples') and x.max_samples > 0:
+                    max_samples = x.max_samples
+            except:
+                pass
 
-            for batch_index, batch in enumerate(batch_results):
-                for result_index, result in enumerate(batch):
-                    index = batch_index * batch_size + result_index
-                    if index >= n_samples:
-                        break
-                    y[index,:] = result
+            if max_samples > 0 and n_samples + len(batch_y) >= max_samples:
+                yield batch_y[:max_samples - n_samples]
+                break
 
-            return y
+            n_samples += len(batch_y)
+            yield batch_y
 
 
     def quantize_to_input_dtype(self, x:np.ndarray, input_index=0):
@@ -748,35 +908,129 @@ class TfliteModel:
 
 
     def _allocate_tflite_interpreter(self, batch_size=1, interpreter_kwargs=None):
-        if self._interpreter is None or self._interpreter_batch_size != batch_size:
-            try:
-                import tensorflow as tf
-            except ModuleNotFoundError as e:
-                raise ModuleNotFoundError(f'You must first install the "tensorflow" Python package to run inference, err: {e}') # pylint: disable=raise-missing-from
-
-            interpreter_kwargs = interpreter_kwargs or {}
-            self._interpreter_batch_size = batch_size
-            self._interpreter = tf.lite.Interpreter(
-                model_path=self._path,
-                **interpreter_kwargs
-            )
+        interpreter_kwargs = interpreter_kwargs or {}
+        key = (
+            batch_size,
+            tuple((inp.index, tuple(inp.shape[1:])) for inp in self.inputs),
+            tuple(sorted((k, repr(v)) for k, v in interpreter_kwargs.items()))
+        )
+
+        interpreter = self._interpreters.get(key, None)
+        if interpreter is not None:
+            self._interpreters.move_to_end(key)
+            self._interpreter = interpreter
+            return
+
+        try:
+            import tensorflow as tf
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(f'You must first install the "tensorflow" Python package to run inference, err: {e}') # pylint: disable=raise-missing-from
+
+        # NOTE: The interpreter is built from the in-memory flatbuffer
+        # so that it is always consistent with this model (which may not have been saved to model_path)
+        interpreter = tf.lite.Interpreter(
+            model_content=bytes(self._flatbuffer_data),
+            **interpreter_kwargs
+        )
+
+        input_indices = []
+        for inp in self.inputs:
+            input_indices.append(inp.index)
+            new_input_shape = (batch_size, *inp.shape[1:])
+            interpreter.resize_tensor_input(inp.index, new_input_shape)
+
+        for outp in self.outputs:
+            if outp.index in input_indices:
+                continue
+            new_output_shape = (batch_size, *outp.shape[1:])
+            interpreter.resize_tensor_input(outp.index, new_output_shape)
+
+        interpreter.allocate_tensors()
+
+        self._interpreters[key] = interpreter
+        while len(self._interpreters) > max(self.max_cached_interpreters, 1):
+            self._interpreters.popitem(last=False)
+        self._interpreter = interpreter
+
+
+    def _clear_interpreters(self):
+        self._interpreter = None
+        self._interpreters.clear()
+
+
+    def _get_subgraph(self) -> _TfliteSubgraph:
+        return self._subgraphs[self._selected_model_subgraph_index]
 
-            input_indices = []
-            for inp in self.inputs:
-                input_indices.append(inp.index)
-                new_input_shape = (batch_size, *inp.shape[1:])
-                self._interpreter.resize_tensor_input(inp.index, new_input_shape)
 
-            for outp in self.outputs:
-                if outp.index in input_indices:
-                    continue
-                new_output_shape = (batch_size, *outp.shape[1:])
-                self._interpreter.resize_tensor_input(outp.index, new_output_shape)
+    def _get_subgraph_io(self) -> Union[_tflite_schema_fb.SubGraphT, _TfliteSubgraph]:
+        """Return an object with the selected subgraph's input and output tensor indices"""
+        if self._model is not None:
+            return self._model.subgraphs[self._selected_model_subgraph_index]
+        return self._get_subgraph()
+
+
+    def _get_buffer_data(self, index:int) -> np.ndarray:
+        """Return the given flatbuffer buffer's data as a uint8 view into the flatbuffer (or None)"""
+        if self._model is not None:
+            return self._model.buffers[index].data
+        buffer = self._fb_model.Buffers(index)
+        if buffer is None or buffer.DataIsNone():
+            return None
+        return buffer.DataAsNumpy()
+
 
-            self._interpreter.allocate_tensors()
+    def _get_operator_code(self, index:int) -> _tflite_schema_fb.OperatorCodeT:
+        if self._model is not None:
+            return self._model.operatorCodes[index]
+        return _tflite_schema_fb.OperatorCodeT.InitFromObj(self._fb_model.OperatorCodes(index))
+
+
+    def _iterate_metadata(self) -> Iterator[Tuple[str,int]]:
+        """Iterate the model's metadata as tuples: (name, buffer index)"""
+        if self._model is None and self._fb_model is None:
+            raise RuntimeError('Model not loaded')
+        if self._model is not None:
+            for metadata in self._model.metadata or []:
+                yield metadata.name.decode("utf-8"), metadata.buffer
+        else:
+            for i in range(self._fb_model.MetadataLength()):
+                metadata = self._fb_model.Metadata(i)
+                yield metadata.Name().decode("utf-8"), metadata.Buffer()
+
+
+    def _load_full_model(self):
+        """Unpack the entire flatbuffer if the model was lazily loaded"""
+        if self._model is not None:
+            return
+        if self._flatbuffer_data is None:
+            raise RuntimeError('Model not loaded')
+        self._lazy = False
+        if self._mmap is not None:
+            # The unpacked model must not reference the memory-mapped file,
+            # so unpack a copy of the flatbuffer and close the file
+            self._flatbuffer_data = self._mmap[:]
+            self._fb_model = None
+            self._subgraphs = []
+            self._close_mmap()
+        self._load_model()
+
+
+    def _close_mmap(self):
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Tensor data views into the mapped file still exist.
+            # The file is unmapped once they are garbage collected
+            self._mapped_path = self.path
+        self._mmap = None
 
 
     def _load_model(self):
+        self._clear_interpreters()
+        if self._lazy:
+            self._load_model_lazy()
+            return
+
         try:
             self._model = _tflite_schema_fb.ModelT.InitFromObj(_tflite_schema_fb.Model.GetRootAsModel(self._flatbuffer_data, 0))
             subgraph_count = len(self._model.subgraphs)
@@ -794,9 +1048,11 @@ class TfliteModel:
         if self._selected_model_subgraph_index == -1 or self._selected_model_subgraph_index >= subgraph_count:
             self._selected_model_subgraph_index = 0
 
+        self._fb_model = None
         self._subgraphs = []
         for fb_subgraph in self._model.subgraphs:
             subgraph = _TfliteSubgraph()
+            subgraph.layers = []
             self._subgraphs.append(subgraph)
             for i, fb_tensor in enumerate(fb_subgraph.tensors):
                 tensor = TfliteTensor(i, self, fb_tensor)
@@ -807,6 +1063,51 @@ class TfliteModel:
 
 
 
+    def _load_model_lazy(self):
+        try:
+            self._fb_model = _tflite_schema_fb.Model.GetRootAsModel(self._flatbuffer_data, 0)
+            subgraph_count = self._fb_model.SubgraphsLength()
+        except Exception as e:
+            raise RuntimeError( # pylint: disable=raise-missing-from
+                'Failed to load .tflite model flatbuffer.\n'
+                'Ensure you have provided a valid .tflite model (i.e. ensure the binary data has not been corrupted)\n'
+                f'Error details: {e}'
+            )
+
+        if self._fb_model.Version() != 3:
+            raise RuntimeError('TF-Lite schema v3 is only supported')
+
+        if self._selected_model_subgraph_index == -1 or self._selected_model_subgraph_index >= subgraph_count:
+            self._selected_model_subgraph_index = 0
+
+        # The tensors and layers are created the first time they're accessed
+        self._model = None
+        self._subgraphs = []
+        for i in range(subgraph_count):
+            fb_subgraph = self._fb_model.Subgraphs(i)
+            subgraph = _TfliteSubgraph(
+                inputs=[int(x) for x in fb_subgraph.InputsAsNumpy()] if not fb_subgraph.InputsIsNone() else [],
+                outputs=[int(x) for x in fb_subgraph.OutputsAsNumpy()] if not fb_subgraph.OutputsIsNone() else [],
+            )
+            subgraph.tensors = [None] * fb_subgraph.TensorsLength()
+            self._subgraphs.append(subgraph)
+
+
+
+def _get_padded_batch_size(batch_size:int, pad_batch_size:int) -> int:
+    if pad_batch_size and batch_size < pad_batch_size:
+        return pad_batch_size
+    return batch_size
+
+
+def _pad_batch(x:np.ndarray, pad_batch_size:int) -> np.ndarray:
+    """Zero-pad the first (i.e. batch) dimension of x to pad_batch_size"""
+    if not pad_batch_size or x.shape[0] >= pad_batch_size:
+        return x
+    padding = [(0, pad_batch_size - x.shape[0])] + [(0, 0)] * (len(x.shape) - 1)
+    return np.pad(x, padding)
+
+
 def _existing_path(path: str, cwd=None):
     if path is None:
         return None
@@ -822,7 +1123,9 @@ def _existing_path(path: str, cwd=None):
     return None
 
 class _TfliteSubgraph:
-    def __init__(self):
-        self.layers: List[TfliteLayer] = []
+    def __init__(self, inputs:List[int]=None, outputs:List[int]=None):
+        self.inputs: List[int] = inputs or []
+        self.outputs: List[int] = outputs or []
+        self.layers: List[TfliteLayer] = None
         self.tensors: List[TfliteTensor] = []
 
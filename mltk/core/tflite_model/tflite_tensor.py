@@ -33,36 +33,18 @@ class TfliteTensor(_tflite_schema_fb.TensorT):
         self.name =  '' if not self.name else self.name.decode("utf-8")
 
         if model is not None and fb_tensor is not None:
-            buffer = model.flatbuffer_model.buffers[fb_tensor.buffer]
-            if buffer.data is not None:
-                data_bytes = buffer.data.tobytes() if isinstance(buffer.data, np.ndarray) else bytes(buffer.data)
-
+            # NOTE: This is a view into the model's flatbuffer (i.e. it is not copied)
+            buffer_data = model._get_buffer_data(fb_tensor.buffer) # pylint: disable=protected-access
+            if buffer_data is not None:
                 if  hasattr(_tflite_schema_fb.TensorType, 'INT4') and self.type == _tflite_schema_fb.TensorType.INT4:
                     # NumPy does not support int4 so we have to expand to int8
-                    # See https://github.com/tensorflow/tensorflow/blob/master/tensorflow/lite/kernels/internal/portable_tensor_utils.cc
-                    # UnpackDenseInt4IntoInt8()
-                    n_elements = self.shape.flat_size
-                    raw_data_array = np.empty((n_elements,), dtype=np.int8)
-
-                    sign_bit_mask = 1 << (4 - 1)
-                    def sign_extend_4bits(value):
-                        return (value & (sign_bit_mask-1)) - (value & sign_bit_mask)
-
-                    for i in range(n_elements // 2):
-                        v = data_bytes[i]
-                        lower = sign_extend_4bits(v & 0x0F)
-                        upper = sign_extend_4bits((v & 0xF0) >> 4)
-                        raw_data_array[i*2 + 0] = lower
-                        raw_data_array[i*2 + 1] = upper
-
-                    # If the buffer size is odd, extract the final lower nibble.
-                    if n_elements % 2 != 0:
-                        v = data_bytes[n_elements//2]
-                        lower = sign_extend_4bits((v & 0xF0) >> 4)
-                        raw_data_array[-1] = lower
+                    raw_data_array = unpack_int4(buffer_data, self.shape.flat_size)
 
                 else:
-                    raw_data_array = np.frombuffer(data_bytes, dtype=self.dtype)
+                    raw_data_array = np.frombuffer(buffer_data, dtype=self.dtype)
+                    if model._mmap is not None: # pylint: disable=protected-access
+                        # Writing to the memory-mapped .tflite file is not allowed
+                        raw_data_array.flags.writeable = False
 
                 if raw_data_array.size == self.shape.flat_size and len(self.shape) > 1:
                     self._data = raw_data_array.reshape(self.shape)
@@ -144,26 +126,7 @@ class TfliteTensor(_tflite_schema_fb.TensorT):
 
             if hasattr(_tflite_schema_fb.TensorType, 'INT4') and self.type == _tflite_schema_fb.TensorType.INT4 and isinstance(v, np.ndarray):
                 # NumPy does not support int4 so we have to pack the two int8 values into 1 byte
-                # See https://github.com/tensorflow/tensorflow/blob/master/tensorflow/lite/kernels/internal/portable_tensor_utils.cc
-
-                data_bytes_len = len(data_bytes)
-                packed_data = bytearray()
-
-                for i in range(data_bytes_len//2):
-                    lower = data_bytes[i*2 + 0]
-                    upper = data_bytes[i*2 + 1]
-                    assert lower.bit_length() <= 4
-                    assert upper.bit_length() <= 4
-                    packed_value = (lower & 0x0F) | ((upper & 0x0F) << 4)
-                    packed_data.append(packed_value)
-
-                if data_bytes_len % 2 != 0:
-                    lower = data_bytes[-1]
-                    assert lower.bit_length() <= 4
-                    packed_value = (lower & 0x0F)
-                    packed_data.append(packed_value)
-
-                data_bytes = packed_data
+                data_bytes = pack_int4(self._data)
 
             buffer.data = np.frombuffer(data_bytes, dtype=np.uint8)
 
@@ -194,6 +157,53 @@ class TfliteTensor(_tflite_schema_fb.TensorT):
 
 
 
+def unpack_int4(data:Union[np.ndarray,bytes], n_elements:int) -> np.ndarray:
+    """Unpack the given dense int4 buffer into an int8 array
+
+    Each byte contains two sign-extended 4-bit values, the lower nibble being the first element.
+    If n_elements is odd, then the final value is in the lower nibble of the last byte.
+    See UnpackDenseInt4IntoInt8() in:
+    https://github.com/tensorflow/tensorflow/blob/master/tensorflow/lite/kernels/internal/portable_tensor_utils.cc
+
+    Args:
+        data: The packed int4 data
+        n_elements: The number of int4 values in the data
+    Returns:
+        1D int8 array with n_elements
+    """
+    packed = np.frombuffer(data, dtype=np.uint8, count=(n_elements + 1) // 2)
+    # Shifting the nibble to the upper 4 bits and then arithmetic shifting back
+    # sign-extends the 4-bit value
+    unpacked = np.empty((packed.size, 2), dtype=np.int8)
+    unpacked[:, 0] = packed << 4
+    unpacked[:, 1] = packed & 0xF0
+    unpacked >>= 4
+    return unpacked.reshape(-1)[:n_elements]
+
+
+def pack_int4(data:np.ndarray) -> np.ndarray:
+    """Pack the given int8 values into a dense int4 buffer
+
+    This is the inverse of :py:func:`~unpack_int4`.
+
+    Args:
+        data: int8 values, each must be in the range [-8, 7]
+    Returns:
+        1D uint8 array with ceil(data.size / 2) elements
+    """
+    # Check the range before converting to int8 so out-of-range values do not wrap around
+    values = np.asarray(data).reshape(-1)
+    if values.size > 0 and (values.min() < -8 or values.max() > 7):
+        raise ValueError('int4 values must be in the range [-8, 7]')
+    values = values.astype(np.int8, copy=False)
+
+    nibbles = values.view(np.uint8) & 0x0F
+    if nibbles.size % 2 != 0:
+        nibbles = np.append(nibbles, np.uint8(0))
+    return nibbles[0::2] | (nibbles[1::2] << 4)
+
+
+
 class TfliteShape(tuple):
     """Wrapper for tensor shape. This is a tuple of integer values"""
     def __new__ (cls, shape):
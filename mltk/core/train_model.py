@@ -16,11 +16,11 @@ from mltk.utils import gpu
 from .model import (
     MltkModel,
     MltkModelEvent,
-    KerasModel,
     DatasetMixin,
     TrainMixin,
     load_mltk_model,
 )
+from .keras import KerasModel
 from .utils import get_mltk_logger
 from .summarize_model import summarize_model
 from .quantize_model import quantize_model
@@ -654,10 +654,11 @@ def _create_model_archive(
     )
 
     try:
-        mltk_model.add_archive_dir('.', create_new=True)
-        mltk_model.add_archive_file('__mltk_model_spec__')
-        mltk_model.add_archive_dir('train')
-        mltk_model.add_archive_dir('dataset', recursive=True)
+        with mltk_model.archive_transaction():
+            mltk_model.add_archive_dir('.', create_new=True)
+            mltk_model.add_archive_file('__mltk_model_spec__')
+            mltk_model.add_archive_dir('train')
+            mltk_model.add_archive_dir('dataset', recursive=True)
     except Exception as e:
         logger.warning(f'Failed to generate model archive, err: {e}', exc_info=e)
 
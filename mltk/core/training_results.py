@@ -1,5 +1,8 @@
-from typing import Tuple, List
-from .model.model_utils import KerasModel 
+from __future__ import annotations
+from typing import Tuple, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .keras import KerasModel
 
 
 
@@ -183,8 +183,9 @@ def update_model_parameters(
 
     if update_archive:
         logger.info(f'Updating {mltk_model.archive_path}')
-        mltk_model.add_archive_file('__mltk_model_spec__')
-        mltk_model.add_archive_file(retval)
+        with mltk_model.archive_transaction():
+            mltk_model.add_archive_file('__mltk_model_spec__')
+            mltk_model.add_archive_file(retval)
 
     return retval
 
@@ -1,4 +1,5 @@
-from typing import Union 
+from __future__ import annotations
+from typing import Union, TYPE_CHECKING
 import os 
 import time
 
@@ -11,14 +12,15 @@ from mltk.utils.python import append_exception_msg
 
 from .model import (
     MltkModel, 
-    KerasModel,  
     load_mltk_model, 
     load_tflite_or_keras_model
 )
 from .tflite_model import TfliteModel
-from .quantize_model import quantize_model
 from .utils import (get_mltk_logger, ArchiveFileNotFoundError)
 
+if TYPE_CHECKING:
+    from .keras import KerasModel
+
 
 
 DEFAULT_PORT = 8080
@@ -103,11 +105,6 @@ def _load_or_build_model(
     tflite:bool 
 ):
    
-    if isinstance(model, KerasModel):
-        model_path = f'{create_tempdir("tmp_models")}/model.h5'
-        model.save(model_path, save_format='tf')
-        return model_path
-
     if isinstance(model, TfliteModel):
         model_path = f'{create_tempdir("tmp_models")}/model.tflite'
         model.save(model_path)
@@ -130,11 +127,18 @@ def _load_or_build_model(
                 print_not_found_err=True
             )
     else:
-        raise ValueError('Invalid model argument')
+        # NOTE: Tensorflow is only imported if a KerasModel instance may have been given
+        from .keras import KerasModel # pylint: disable=import-outside-toplevel,redefined-outer-name
+        if not isinstance(model, KerasModel):
+            raise ValueError('Invalid model argument')
+        model_path = f'{create_tempdir("tmp_models")}/model.h5'
+        model.save(model_path, save_format='tf')
+        return model_path
 
 
     if build:
         if tflite:
+            from .quantize_model import quantize_model # pylint: disable=import-outside-toplevel
             model_path = create_tempdir("tmp_models") + f'/{mltk_model.name}.tflite'
             quantize_model(
                 model=mltk_model,
@@ -8,7 +8,9 @@ import tarfile
 import gzip
 import struct
 import shutil
-from typing import Callable, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Union, List
+import zipfile
 from patoolib.programs import tar # pylint: disable=unused-import
 import patoolib
 
@@ -182,11 +184,57 @@ def _extractall_patool(archive_path, output_dir, patool_path=None):
         raise
 
 
-def _extractall_zipfile(archive_path, output_dir):
+# Zip archives with fewer members or bytes than these are extracted by a single thread
+PARALLEL_EXTRACT_MIN_MEMBERS = 64
+PARALLEL_EXTRACT_MIN_BYTES = 16*1024*1024
+
+
+def _extractall_zipfile(archive_path, output_dir, n_jobs:int=None):
+    """Extract the zip archive's members across multiple threads
+
+    Each thread opens its own handle to the archive and extracts a subset of the members
+    (zlib decompression and file I/O release the Python GIL so the threads execute in parallel)
+    """
     archive_path = path.fullpath(archive_path)
     output_dir = path.fullpath(output_dir)
     os.makedirs(output_dir, exist_ok=True)
-    ZipFile(archive_path).extractall(output_dir)
+
+    with ZipFile(archive_path) as zf:
+        members = zf.infolist()
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, 8, len(members))
+    total_size = sum(x.file_size for x in members)
+    if n_jobs <= 1 or len(members) < PARALLEL_EXTRACT_MIN_MEMBERS or total_size < PARALLEL_EXTRACT_MIN_BYTES:
+        with ZipFile(archive_path) as zf:
+            zf.extractall(output_dir)
+        return
+
+    # Distribute the members so that each thread extracts about the same number of bytes
+    member_groups:List[List[zipfile.ZipInfo]] = [[] for _ in range(n_jobs)]
+    group_sizes = [0] * n_jobs
+    for member in sorted(members, key=lambda x: x.file_size, reverse=True):
+        index = group_sizes.index(min(group_sizes))
+        member_groups[index].append(member)
+        group_sizes[index] += member.file_size + 512 # Also account for the per-file overhead
+
+    with ThreadPoolExecutor(n_jobs, thread_name_prefix='ExtractZip') as executor:
+        futures = [
+            executor.submit(_extract_zipfile_members, archive_path, output_dir, group)
+            for group in member_groups
+        ]
+        for f in futures:
+            f.result()
+
+
+def _extract_zipfile_members(archive_path:str, output_dir:str, members:List[zipfile.ZipInfo]):
+    with ZipFile(archive_path) as zf:
+        for member in members:
+            try:
+                zf.extract(member, output_dir)
+            except FileExistsError:
+                # Another thread created the member's parent directory
+                # after this thread checked that it did not exist, so just try again
+                zf.extract(member, output_dir)
 
 
 def _extractall_gzfile(archive_path, output_dir):
@@ -4,13 +4,14 @@ See the source code on Github: `mltk/utils/archive_downloader.py <https://github
 """
 
 
-from typing import Union, Tuple
+from typing import Union, Tuple, List, Dict
 import sys
 import os
 import hashlib
 import json
 import shutil
 import logging
+import threading
 import urllib.request
 from urllib.parse import urlsplit
 
@@ -29,6 +30,13 @@ from .python import prepend_exception_msg
 
 MLTK_CHUNK_DELIMITER = '?mltk_chunk_count='
 
+# The number of bytes read from the file per hasher update
+HASH_CHUNK_SIZE = 4*1024*1024
+# The hash algorithm that generates a hex digest of the given length
+# This is used to determine the algorithm when file_hash_algorithm=auto
+_HASH_ALGORITHM_BY_DIGEST_LENGTH = {32: 'md5', 40: 'sha1', 64: 'sha256'}
+_hash_cache_lock = threading.Lock()
+
 
 def download_verify_extract(
     url: str,
@@ -348,42 +356,29 @@ def download_url(
 def verify_file_hash(
     file_path:str,
     file_hash:str,
-    file_hash_algorithm:str
+    file_hash_algorithm:str,
+    use_cache:bool=True,
 ):
-    """Return True if the calculated hash of the file matches the given hash, false else"""
-
-    md5_hasher = hashlib.md5()
-    sha1_hasher = hashlib.sha1()
-    sha256_hasher = hashlib.sha256()
-
-    with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            md5_hasher.update(chunk)
-            sha1_hasher.update(chunk)
-            sha256_hasher.update(chunk)
-
-    calc_md5_hash = md5_hasher.hexdigest().lower()
-    calc_sha1_hash = sha1_hasher.hexdigest().lower()
-    calc_sha256_hash = sha256_hasher.hexdigest().lower()
+    """Return True if the calculated hash of the file matches the given hash, false else
 
+    If file_hash_algorithm=auto, then the algorithm is determined by the length of the given hash.
+    See :py:func:`~calculate_file_hashes` for details about use_cache.
+    """
     file_hash = file_hash.lower()
+    file_hash_algorithm = file_hash_algorithm.lower()
 
-    if file_hash_algorithm in ('auto', 'md5') and calc_md5_hash == file_hash:
-        return True
-    if file_hash_algorithm in ('auto', 'sha1') and calc_sha1_hash == file_hash:
-        return True
-    if file_hash_algorithm in ('auto', 'sha256') and calc_sha256_hash == file_hash:
-        return True
+    if file_hash_algorithm == 'auto':
+        algorithm = _HASH_ALGORITHM_BY_DIGEST_LENGTH.get(len(file_hash), None)
+        algorithms = [algorithm] if algorithm else ['md5', 'sha1', 'sha256']
+    else:
+        algorithms = [file_hash_algorithm]
 
-    return False
+    calc_hashes = calculate_file_hashes(file_path, algorithms=algorithms, use_cache=use_cache)
+    return file_hash in calc_hashes.values()
 
 
 def verify_sha1(file_path, expected_sha1):
-    with open(file_path, 'rb') as f:
-        hasher = hashlib.sha1()
-        for chunk in iter(lambda: f.read(4096), b""):
-            hasher.update(chunk)
-    calc_hash = hasher.hexdigest().lower()
+    calc_hash = calculate_file_hashes(file_path, algorithms=['sha1'])['sha1']
 
     if callable(expected_sha1):
         expected_sha1(calc_hash)
@@ -395,11 +390,7 @@ def verify_sha1(file_path, expected_sha1):
 
 
 def verify_sha256(file_path, expected_sha256):
-    with open(file_path, 'rb') as f:
-        hasher = hashlib.sha256()
-        for chunk in iter(lambda: f.read(4096), b""):
-            hasher.update(chunk)
-    calc_hash = hasher.hexdigest().lower()
+    calc_hash = calculate_file_hashes(file_path, algorithms=['sha256'])['sha256']
 
     if callable(expected_sha256):
         expected_sha256(calc_hash)
@@ -410,6 +401,100 @@ def verify_sha256(file_path, expected_sha256):
         raise Exception(f'Calculated hash ({calc_hash}) does not match expected hash ({expected_sha256})')
 
 
+def calculate_file_hashes(
+    file_path:str,
+    algorithms:List[str],
+    use_cache:bool=True
+) -> Dict[str,str]:
+    """Calculate the hashes of the given file
+
+    The file is read once in large chunks and each chunk is given to all the hashers.
+
+    Args:
+        file_path: Path to the file to hash
+        algorithms: List of hashlib algorithms, e.g. md5, sha1, sha256
+        use_cache: If true, then the calculated hashes are cached to ``<user dir>/file_hash_cache.json``
+            keyed by the file's path, size and modification time.
+            If the file has not changed since its hashes were cached, then the file is not read again
+
+    Returns:
+        Dictionary of <algorithm>: <lowercase hex digest>
+    """
+    file_path = fullpath(file_path)
+    algorithms = [x.lower() for x in algorithms]
+    file_stat = os.stat(file_path)
+    file_id = [file_stat.st_size, file_stat.st_mtime_ns]
+
+    cache = None
+    if use_cache:
+        cache = _load_hash_cache()
+        entry = cache.get(file_path, None)
+        if entry and entry['id'] == file_id and all(x in entry['hashes'] for x in algorithms):
+            return {x: entry['hashes'][x] for x in algorithms}
+
+    hashers = {x: hashlib.new(x) for x in algorithms}
+    buf = bytearray(HASH_CHUNK_SIZE)
+    buf_view = memoryview(buf)
+    with open(file_path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            chunk = buf_view[:n]
+            for hasher in hashers.values():
+                hasher.update(chunk)
+
+    calc_hashes = {x: hasher.hexdigest().lower() for x, hasher in hashers.items()}
+
+    if use_cache:
+        with _hash_cache_lock:
+            # Re-load the cache in case another process updated it while the file was being hashed
+            cache = _load_hash_cache()
+            entry = cache.get(file_path, None)
+            if not entry or entry['id'] != file_id:
+                entry = dict(id=file_id, hashes={})
+            entry['hashes'].update(calc_hashes)
+            cache[file_path] = entry
+            _save_hash_cache(cache)
+
+    return calc_hashes
+
+
+def _get_hash_cache_path() -> str:
+    return f'{create_user_dir()}/file_hash_cache.json'
+
+
+def _load_hash_cache() -> dict:
+    try:
+        with open(_get_hash_cache_path(), 'r') as f:
+            cache = json.load(f)
+        if isinstance(cache, dict):
+            # Remove the entries of files that no longer exist
+            return {k: v for k, v in cache.items() if os.path.exists(k)}
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        get_logger().debug(f'Failed to load file hash cache: {_get_hash_cache_path()}, err: {e}')
+    return {}
+
+
+def _save_hash_cache(cache:dict):
+    if os.environ.get('MLTK_READONLY'):
+        return
+    cache_path = _get_hash_cache_path()
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        get_logger().debug(f'Failed to save file hash cache: {cache_path}, err: {e}')
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 def _check_if_up_to_date(
     details_path:str,
     details:dict
@@ -38,12 +38,17 @@ def hash_file(
     else:
         raise ValueError('"algorithm argument must be the name of a hash algorithm or a hashlib._Hash instance')
 
-    with open(path, 'rb') as f:
+    with open(path, 'rb', buffering=0) as f:
         if include_filename:
             hasher.update(path.encode('utf-8'))
 
-        for chunk in iter(lambda: f.read(4096), b""):
-            hasher.update(chunk)
+        buf = bytearray(1024*1024)
+        buf_view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(buf_view[:n])
 
     return hasher.hexdigest().lower()
 
@@ -1,3 +1,4 @@
 from .pool import ProcessPool, ProcessPoolBatch
 from .pool import calculate_n_jobs
+from .pool import shutdown_idle_workers
 from .pool import get_cpu_count
\ No newline at end of file
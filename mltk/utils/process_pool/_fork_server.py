@@ -0,0 +1,199 @@
+"""Fork-server worker spawning for the ProcessPool
+
+By default, each ProcessPool worker is started as a new Python interpreter
+which must re-import mltk, Tensorflow, and the entry_point's module before it can process any data.
+
+In "forkserver" mode, a single template process (the multiprocessing fork server)
+imports the entry_point's module once and each worker is forked from it.
+Thus, the workers start with all of the heavy modules already imported.
+
+NOTE: The fork server is shared by all of the pools in the Python session.
+It is started with the environment variables of the first pool that uses it,
+so any variables read while importing the preloaded modules (e.g. OMP_NUM_THREADS)
+use the first pool's values.
+"""
+from __future__ import annotations
+from typing import Callable, Dict, List
+import os
+import sys
+import threading
+import traceback
+import multiprocessing
+import multiprocessing.forkserver
+
+
+_start_lock = threading.Lock()
+
+
+def is_fork_server_supported() -> bool:
+    """Return if the current platform supports the fork server"""
+    return 'forkserver' in multiprocessing.get_all_start_methods()
+
+
+class ForkServerProcess:
+    """A ProcessPool worker forked from the fork server
+
+    This provides the subset of the subprocess.Popen API used by the ProcessPool.
+
+    Args:
+        name: The name of the worker
+        entry_point: The function executed by the worker
+        env: Environment variables to export in the worker
+        preload: Additional modules to import in the fork server
+    """
+    def __init__(
+        self,
+        name:str,
+        entry_point:Callable,
+        env:Dict[str,str],
+        preload:List[str]=None,
+    ):
+        ctx = multiprocessing.get_context('forkserver')
+        _ensure_fork_server_running(ctx, entry_point, env, preload)
+
+        stdin_r, stdin_w = ctx.Pipe(duplex=False)
+        stdout_r, stdout_w = ctx.Pipe(duplex=False)
+        stderr_r, stderr_w = ctx.Pipe(duplex=False)
+
+        self._process = ctx.Process(
+            target=_worker_main,
+            name=name,
+            args=(
+                entry_point.__code__.co_filename,
+                entry_point.__name__,
+                name,
+                env,
+                stdin_r,
+                stdout_w,
+                stderr_w
+            ),
+            daemon=True
+        )
+        self._process.start()
+
+        # The worker has its own copies of these ends of the pipes
+        stdin_r.close()
+        stdout_w.close()
+        stderr_w.close()
+
+        self.stdin = _connection_to_file(stdin_w, 'wb')
+        self.stdout = _connection_to_file(stdout_r, 'rb')
+        self.stderr = _connection_to_file(stderr_r, 'rb')
+
+
+    @property
+    def pid(self) -> int:
+        return self._process.pid
+
+
+    def poll(self) -> int:
+        return self._process.exitcode
+
+
+    def wait(self, timeout:float=None) -> int:
+        self._process.join(timeout)
+        return self._process.exitcode
+
+
+    def terminate(self):
+        self._process.terminate()
+
+
+    def kill(self):
+        self._process.kill()
+
+
+
+def _ensure_fork_server_running(
+    ctx,
+    entry_point:Callable,
+    env:Dict[str,str],
+    preload:List[str]
+):
+    preload_modules = ['mltk.utils.process_pool._fork_server']
+    preload_modules.extend(preload or [])
+
+    # Preload the entry_point's module if it can be imported by name
+    module_name = entry_point.__module__
+    module = sys.modules.get(module_name, None)
+    if module_name != '__main__' and getattr(module, '__file__', None) == entry_point.__code__.co_filename:
+        preload_modules.append(module_name)
+
+    with _start_lock:
+        # NOTE: This has no effect if the fork server is already running.
+        #       In that case the worker imports the entry_point's module itself
+        ctx.set_forkserver_preload(preload_modules)
+
+        # The fork server inherits this process's environment when it starts,
+        # so temporarily export the pool's environment variables.
+        # This way, the preloaded modules are imported with the same settings as the workers.
+        # Also export this process's module search paths so that the fork server can import the preloaded modules
+        server_env = dict(env)
+        server_env['PYTHONPATH'] = os.pathsep.join(p for p in sys.path if p)
+        saved_environ = {key: os.environ.get(key, None) for key in server_env}
+        try:
+            os.environ.update(server_env)
+            multiprocessing.forkserver.ensure_running()
+        finally:
+            for key, value in saved_environ.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+
+
+def _connection_to_file(conn, mode:str):
+    """Return a file object for the given multiprocessing Connection's pipe
+
+    The ProcessPool uses its own framing on the pipe so the file object is used instead of the Connection
+    """
+    fd = os.dup(conn.fileno())
+    conn.close()
+    return os.fdopen(fd, mode)
+
+
+
+def _worker_main(
+    module_path:str,
+    function_name:str,
+    pool_name:str,
+    env:Dict[str,str],
+    stdin_conn,
+    stdout_conn,
+    stderr_conn
+):
+    os.environ.update(env)
+
+    # Redirect stdout and stderr to the log pipe,
+    # stdout is only used to return the results to the parent
+    os.dup2(stderr_conn.fileno(), 2)
+    stderr_conn.close()
+    sys.stderr = os.fdopen(2, 'w', buffering=1)
+    sys.stdout = sys.stderr
+    stdin = _connection_to_file(stdin_conn, 'rb')
+    stdout = _connection_to_file(stdout_conn, 'wb')
+
+    from mltk.utils.python import import_module_at_path
+    from mltk.utils.process_pool._utils import serve_requests
+
+    try:
+        module_instance = import_module_at_path(module_path)
+        function_instance = getattr(module_instance, function_name)
+    except KeyboardInterrupt:
+        sys.exit(0)
+    except Exception as e:
+        print(f'{pool_name}: Failed to retrieve {function_name} for {module_path}, err:\n{e}')
+        sys.exit(-1)
+
+    try:
+        serve_requests(stdin, stdout, function_instance)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        traceback.print_exc()
+        print(f'{pool_name}: Exception in main loop, err:\n{e}', file=sys.stderr, flush=True)
+        sys.stderr.flush()
+        sys.exit(-1)
+
+    sys.exit(0)
@@ -0,0 +1,235 @@
+"""Shared memory transport for the ProcessPool
+
+Rather than pickling large numpy arrays through the subprocess's stdout pipe,
+the parent process allocates a pool of reusable shared memory "slabs".
+Each request sent to a subprocess is assigned a free slab.
+The subprocess copies any ndarrays in its result into the slab and
+only sends small descriptors through the pipe.
+The parent then returns numpy views into the slab (i.e. no copy).
+Once all of the views of a result have been garbage collected,
+the slab is automatically returned to the pool.
+
+If no slab is available, or the result does not fit into the slab,
+then the result falls back to being pickled through the pipe.
+"""
+from __future__ import annotations
+from typing import Dict, Tuple, Union
+import collections
+import queue
+import weakref
+import threading
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+ALIGNMENT = 64
+# The maximum number of slabs the subprocess keeps mapped.
+# The subprocess unmaps all of the slabs when its pool is shutdown (see SharedMemoryWriter.close())
+MAX_ATTACHED_SLABS = 256
+
+
+class SharedArrayDescriptor:
+    """Describes an ndarray stored in a shared memory slab"""
+    __slots__ = ('offset', 'shape', 'dtype')
+
+    def __init__(self, offset:int, shape:Tuple[int,...], dtype:str):
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+    def __getstate__(self):
+        return (self.offset, self.shape, self.dtype)
+
+    def __setstate__(self, state):
+        self.offset, self.shape, self.dtype = state
+
+
+
+class SharedMemorySlabPool:
+    """Pool of shared memory slabs, this is used by the parent process
+
+    Args:
+        slab_size: The size of each slab in bytes
+        n_slabs: The number of slabs to allocate
+    """
+    def __init__(self, slab_size:int, n_slabs:int):
+        self.slab_size = slab_size
+        self._lock = threading.Lock()
+        self._is_shutdown = False
+        self._slabs:Dict[str,SharedMemory] = {}
+        self._free_q = queue.Queue()
+
+        for _ in range(max(n_slabs, 1)):
+            shm = SharedMemory(create=True, size=slab_size)
+            self._slabs[shm.name] = shm
+            self._free_q.put(shm.name)
+
+
+    def acquire(self) -> Union[str,None]:
+        """Return the name of a free slab or None if no slabs are available"""
+        if self._is_shutdown:
+            return None
+        try:
+            return self._free_q.get_nowait()
+        except queue.Empty:
+            return None
+
+
+    def release(self, name:str):
+        """Return the given slab to the pool"""
+        with self._lock:
+            if self._is_shutdown:
+                return
+        self._free_q.put(name)
+
+
+    def unpack(self, data, name:str):
+        """Replace the SharedArrayDescriptors in the given data with
+        numpy views into the given slab.
+
+        The slab is released when all of the views are garbage collected.
+        """
+        shm = self._slabs[name]
+        # All views returned to the caller reference this array as their base.
+        # Once it's garbage collected, the slab may be recycled
+        lease = np.frombuffer(shm.buf, dtype=np.uint8)
+        weakref.finalize(lease, self.release, name)
+
+        def _unpack(x):
+            if isinstance(x, SharedArrayDescriptor):
+                dtype = np.dtype(x.dtype)
+                n_bytes = int(np.prod(x.shape, dtype=np.int64)) * dtype.itemsize
+                return lease[x.offset:x.offset + n_bytes].view(dtype).reshape(x.shape)
+            if isinstance(x, list):
+                return [_unpack(v) for v in x]
+            if type(x) is tuple:
+                return tuple(_unpack(v) for v in x)
+            if isinstance(x, dict):
+                return {k: _unpack(v) for k, v in x.items()}
+            return x
+
+        return _unpack(data)
+
+
+    def shutdown(self):
+        """Close and unlink all of the slabs"""
+        with self._lock:
+            if self._is_shutdown:
+                return
+            self._is_shutdown = True
+
+        for shm in self._slabs.values():
+            try:
+                shm.close()
+            except BufferError:
+                # Views of the slab are still in use,
+                # the mapping will be released when they are garbage collected
+                pass
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+
+class SharedMemoryWriter:
+    """Copies result ndarrays into a shared memory slab, this is used by the subprocess"""
+    def __init__(self):
+        self._segments:Dict[str,SharedMemory] = collections.OrderedDict()
+
+
+    def pack(self, data, name:str) -> Tuple[object,bool]:
+        """Copy the ndarrays in the given data into the given slab
+
+        Returns:
+            (data, used) where the ndarrays in data have been replaced with SharedArrayDescriptors.
+            If the arrays do not fit into the slab then the original data is returned and used=False
+        """
+        arrays = []
+        _find_arrays(data, arrays)
+        if not arrays:
+            return data, False
+
+        shm = self._attach(name)
+
+        offsets = {}
+        offset = 0
+        for arr in arrays:
+            if id(arr) in offsets:
+                continue
+            offsets[id(arr)] = offset
+            offset += (arr.nbytes + ALIGNMENT - 1) & ~(ALIGNMENT - 1)
+
+        if offset > shm.size:
+            return data, False
+
+        for arr in arrays:
+            dst = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf, offset=offsets[id(arr)])
+            dst[...] = arr
+            # Release the export of the buffer
+            del dst
+
+        def _pack(x):
+            if isinstance(x, np.ndarray) and id(x) in offsets:
+                return SharedArrayDescriptor(offsets[id(x)], x.shape, x.dtype.str)
+            if isinstance(x, list):
+                return [_pack(v) for v in x]
+            if type(x) is tuple:
+                return tuple(_pack(v) for v in x)
+            if isinstance(x, dict):
+                return {k: _pack(v) for k, v in x.items()}
+            return x
+
+        return _pack(data), True
+
+
+    def close(self):
+        """Unmap all of the attached slabs
+
+        This is called when the pool that owns the slabs is shutdown,
+        e.g. so that a subprocess kept for reuse does not keep the previous pool's slabs mapped.
+        """
+        while self._segments:
+            _, shm = self._segments.popitem(last=False)
+            try:
+                shm.close()
+            except BufferError:
+                pass
+
+
+    def _attach(self, name:str) -> SharedMemory:
+        shm = self._segments.get(name, None)
+        if shm is not None:
+            self._segments.move_to_end(name)
+        else:
+            # Unmap the least recently used slab if necessary
+            if len(self._segments) >= MAX_ATTACHED_SLABS:
+                _, lru_shm = self._segments.popitem(last=False)
+                try:
+                    lru_shm.close()
+                except BufferError:
+                    pass
+
+            try:
+                # Python 3.13+, do not let the resource tracker unlink the parent's segment
+                shm = SharedMemory(name=name, track=False)
+            except TypeError:
+                shm = SharedMemory(name=name)
+                try:
+                    from multiprocessing import resource_tracker
+                    resource_tracker.unregister(shm._name, 'shared_memory') # pylint: disable=protected-access
+                except Exception:
+                    pass
+            self._segments[name] = shm
+        return shm
+
+
+
+def _find_arrays(x, arrays:list):
+    if isinstance(x, np.ndarray):
+        if not x.dtype.hasobject:
+            arrays.append(x)
+    elif isinstance(x, (list, dict)) or type(x) is tuple:
+        for v in (x.values() if isinstance(x, dict) else x):
+            _find_arrays(v, arrays)
@@ -11,7 +11,7 @@ sys.path.append(os.getcwd())
 
 
 from mltk.utils.python import import_module_at_path
-from mltk.utils.process_pool._utils import (read_data, write_data)
+from mltk.utils.process_pool._utils import serve_requests
 
 
 MODULE_PATH = os.environ['MODULE_PATH']
@@ -37,19 +37,7 @@ except Exception as e:
 
 
 def main():
-    while True:
-        args, kwargs = read_data(stdin)
-        if not args and not kwargs:
-            return
-
-        tx_data = function_instance(*args, **kwargs)
-
-        if isinstance(tx_data, (tuple,list)):
-            args = tx_data
-        else:
-            args = (tx_data,)
-
-        write_data(stdout, args, {})
+    serve_requests(stdin, stdout, function_instance)
 
 
 
@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple, Callable
 import io
 import sys
 import struct
@@ -17,13 +17,37 @@ def write_data(
     pipe:io.FileIO,
     args:List[object],
     kwargs:Dict[str,object],
+    shared_memory:str=None,
+    request_id:int=None,
+    chunk:bool=False,
+    release_shared_memory:bool=False,
 ):
+    """Write the data to the given pipe
+
+    Args:
+        pipe: The pipe to write
+        args: The positional arguments, or a list of the positional arguments of each chunk entry if chunk=True
+        kwargs: The keyword arguments
+        shared_memory: The name of the shared memory slab associated with the data
+        request_id: The ID of the request, the response to the request is sent with the same ID
+        chunk: If true, then the entry point is invoked for each entry in args
+        release_shared_memory: If true, then the subprocess unmaps the shared memory slabs it has attached.
+            This request has no args and no response is returned
+    """
     tx_buf = io.BytesIO()
 
     data = dict(
         args=args,
         kwargs=kwargs,
     )
+    if shared_memory:
+        data['shared_memory'] = shared_memory
+    if request_id is not None:
+        data['request_id'] = request_id
+    if chunk:
+        data['chunk'] = True
+    if release_shared_memory:
+        data['release_shared_memory'] = True
 
     pickle.dump(data, tx_buf, protocol=pickle.HIGHEST_PROTOCOL)
 
@@ -40,10 +64,16 @@ def write_data(
     pipe.flush()
 
 
-def read_data(pipe:io.FileIO) -> dict:
+def read_data(pipe:io.FileIO) -> Tuple[List[object],Dict[str,object],Dict[str,object]]:
+    """Read the data from the given pipe
+
+    Returns:
+        (args, kwargs, header) where header is a dictionary containing the optional
+        ``shared_memory``, ``request_id``, ``chunk``, and ``release_shared_memory`` fields given to :py:func:`write_data`
+    """
     rx_length_bytes = pipe.read(4)
     if not rx_length_bytes:
-        return [], {}
+        return [], {}, {}
 
     rx_length = struct.unpack('<L', rx_length_bytes)[0]
     if rx_length > MAX_LENGTH:
@@ -63,15 +93,70 @@ def read_data(pipe:io.FileIO) -> dict:
 
     rx_bytes = pipe.read(rx_length)
     if not rx_bytes:
-        return [], {}
+        return [], {}, {}
 
     rx_buf = io.BytesIO(rx_bytes)
     try:
         rx_data = pickle.load(rx_buf)
     except Exception as e:
         raise RuntimeError(f'Failed to unpick object, err: {e}\n' + "sys.path=\n" + '\n'.join(sys.path))
-    args = rx_data['args']
-    kwargs = rx_data['kwargs']
+    args = rx_data.pop('args')
+    kwargs = rx_data.pop('kwargs')
+
+    return args, kwargs, rx_data
+
 
-    return args, kwargs
 
+
+def serve_requests(
+    stdin:io.FileIO,
+    stdout:io.FileIO,
+    function_instance:Callable
+):
+    """Process the requests read from stdin and write the results to stdout
+
+    This is executed by the subprocess and returns once stdin is closed
+    """
+    shared_memory_writer = None
+
+    def _invoke(*args, **kwargs):
+        tx_data = function_instance(*args, **kwargs)
+
+        if isinstance(tx_data, (tuple,list)):
+            return tx_data
+        return (tx_data,)
+
+    while True:
+        args, kwargs, header = read_data(stdin)
+
+        # The parent's pool was shutdown and this subprocess is kept for reuse by another pool,
+        # so unmap the slabs of the previous pool (which have been unlinked by the parent)
+        if header.get('release_shared_memory', False):
+            if shared_memory_writer is not None:
+                shared_memory_writer.close()
+            continue
+
+        if not args and not kwargs:
+            return
+
+        shared_memory = header.get('shared_memory', None)
+
+        # A "chunk" request contains the args of multiple invocations.
+        # In this case, return a list containing the result of each invocation
+        if header.get('chunk', False):
+            args = [_invoke(*chunk_args, **kwargs) for chunk_args in args]
+        else:
+            args = _invoke(*args, **kwargs)
+
+        # If the parent provided a shared memory slab,
+        # then copy the result's ndarrays into it
+        # and only return their descriptors through the pipe
+        if shared_memory:
+            if shared_memory_writer is None:
+                from mltk.utils.process_pool._shared_memory import SharedMemoryWriter
+                shared_memory_writer = SharedMemoryWriter()
+            args, used = shared_memory_writer.pack(args, shared_memory)
+            if not used:
+                shared_memory = None
+
+        write_data(stdout, args, {}, shared_memory=shared_memory, request_id=header.get('request_id', None))
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Callable, List, Union,  Dict
+from typing import Callable, List, Union,  Dict, Tuple, TYPE_CHECKING
 import sys
 import os
 import atexit
@@ -12,6 +12,9 @@ from  multiprocessing import cpu_count as get_cpu_count
 
 from ._utils import (read_data, write_data)
 
+if TYPE_CHECKING:
+    from ._shared_memory import SharedMemorySlabPool
+
 
 class ProcessPool:
     """Parallel Processing Pool
@@ -70,6 +73,20 @@ class ProcessPool:
         # Main thread waits for the results to complete
         results = batch.wait()
 
+        # ----------------------------
+        # Chunk Driven
+        #
+        # Process multiple entries per subprocess request.
+        # This reduces the inter-process communication overhead
+        # when the processing function executes quickly
+
+        batch = pool.create_batch(1000)
+        for i in range(0, 1000, 100):
+            # Each chunk entry is the tuple of positional args given to the processing function
+            pool.process_chunk([(x,) for x in range(i, i+100)], pool_batch=batch)
+
+        results = batch.wait()
+
         # ----------------------------
         # Wait for each result
         #
@@ -99,6 +116,34 @@ class ProcessPool:
         env: The OS environment variables to export in the subprocesses
         disable_gpu_in_subprocesses: Disables NVidia GPU usage in the subprocesses. This is necessary if the Tensorflow python package is imported in the entry_point's module
         logger: Optional Python logger
+        shared_memory_size: If given, the size in bytes of each shared memory "slab" used to transport the entry_point's results.
+            In this mode, any numpy arrays returned by the entry_point are copied into a slab by the subprocess,
+            and the results returned by the pool are views into the slab (i.e. no pickling or copying by the parent).
+            The slab is automatically recycled once all of the returned views are garbage collected.
+            If no slab is available or the results do not fit into a slab, then the results are pickled as usual.
+            If None then the shared memory transport is disabled.
+        shared_memory_slabs: The number of shared memory slabs to allocate. If None then allocate (max_in_flight+1)*n_jobs.
+            This is only used if ``shared_memory_size`` is given.
+        max_in_flight: The maximum number of requests that may be queued to each subprocess.
+            If greater than 1, then the next request is sent to the subprocess while it is still processing the previous request,
+            so the subprocess does not sit idle while the parent sends the next request and handles the previous result.
+        start_method: How the subprocesses are started:
+
+            - ``subprocess`` - Each subprocess is a new Python interpreter which imports the entry_point's module
+            - ``forkserver`` - The entry_point's module (and ``fork_server_preload``) is imported once by a template process
+              and each subprocess is forked from it. This greatly reduces the start time of the subprocesses
+              when the entry_point's module imports heavy packages such as Tensorflow.
+              This is only supported on Linux and OSX, ``subprocess`` is used on other platforms.
+              NOTE: Like Python's ``multiprocessing`` module, the main script must be guarded with: ``if __name__ == '__main__':``
+
+            If None then use the ``MLTK_PROCESS_POOL_START_METHOD`` environment variable, default: ``subprocess``
+        fork_server_preload: Additional modules to import in the fork server template process when ``start_method=forkserver``
+        reuse_workers: If true, then the subprocesses are not terminated when the pool is shutdown.
+            Instead, they are kept idle and used by the next pool created with the same entry_point and env
+            (and the entry_point's source file has not been modified).
+            e.g. The training and validation data generators of each command run in the Python session share the same subprocesses.
+            Idle subprocesses are terminated when the Python session exits, by calling :py:func:`shutdown_idle_workers`,
+            or by shutting down the pool with ``shutdown(terminate_workers=True)``
     """
     def __init__(
         self,
@@ -109,7 +154,13 @@ class ProcessPool:
         debug=False,
         env:Dict[str,str]=None,
         disable_gpu_in_subprocesses=True,
-        logger:logging.Logger=None
+        logger:logging.Logger=None,
+        shared_memory_size:int=None,
+        shared_memory_slabs:int=None,
+        max_in_flight:int=1,
+        start_method:str=None,
+        fork_server_preload:List[str]=None,
+        reuse_workers:bool=False,
     ):
         if os.environ.get('MLTK_PROCESS_POOL_SUBPROCESS', ''):
             return
@@ -119,14 +170,23 @@ class ProcessPool:
         self._n_jobs = 1 if debug else calculate_n_jobs(n_jobs)
         self._name = name
         self._entry_point = entry_point
+        self._max_in_flight = max(max_in_flight, 1)
         self._running_event = threading.Event()
-        self._ready_q = queue.Queue(maxsize=self._n_jobs)
+        # Each subprocess is in the ready queue once per available request slot
+        self._ready_q = queue.Queue(maxsize=self._n_jobs*self._max_in_flight)
         self._processes:List[_Subprocess] = []
         self._debug = debug
         self._env = copy.deepcopy(env) if env else {}
         self._lock = threading.Lock()
         self._detected_pthread_error = False
         self._detected_subprocess_error:str = None
+        self._shared_memory_size = shared_memory_size
+        self._shared_memory_slabs = shared_memory_slabs or (self._max_in_flight+1)*self._n_jobs
+        self._shared_memory:SharedMemorySlabPool = None
+        self._start_method = _get_start_method(start_method)
+        self._fork_server_preload = fork_server_preload
+        self._reuse_workers = reuse_workers and not debug
+        self._worker_key:tuple = None
 
         self.logger.info(f'{self.name} is using {self.n_jobs} subprocesses')
 
@@ -162,6 +222,11 @@ class ProcessPool:
         """The name of this processing pool instance"""
         return self._name
 
+    @property
+    def max_in_flight(self) -> int:
+        """The maximum number of requests that may be queued to each subprocess"""
+        return self._max_in_flight
+
     @property
     def is_running(self) -> bool:
         """Returns true if the processing pool is actively running"""
@@ -185,25 +250,58 @@ class ProcessPool:
 
         self._running_event.set()
 
-        for i in range(self._n_jobs):
-            subprocess = _Subprocess(
-                name=f'{self._name}-{i}',
-                pool=self,
-                entry_point=self._entry_point,
-                debug=self._debug,
-                env=self._env,
-                logger=self.logger
+        if self._shared_memory_size and not self._debug:
+            from ._shared_memory import SharedMemorySlabPool
+            self._shared_memory = SharedMemorySlabPool(
+                slab_size=self._shared_memory_size,
+                n_slabs=self._shared_memory_slabs
             )
+
+        if self._reuse_workers:
+            # NOTE: The key is determined when the subprocesses are started (i.e. when the entry_point's module is imported)
+            self._worker_key = self._get_worker_key()
+
+        for i in range(self._n_jobs):
+            name = f'{self._name}-{i}'
+            subprocess = None
+            if self._reuse_workers:
+                subprocess = _acquire_idle_worker(self._worker_key, pool=self, name=name)
+            if subprocess is None:
+                subprocess = _Subprocess(
+                    name=name,
+                    pool=self,
+                    entry_point=self._entry_point,
+                    debug=self._debug,
+                    env=self._env,
+                    logger=self.logger,
+                    start_method=self._start_method,
+                    fork_server_preload=self._fork_server_preload,
+                )
             self._processes.append(subprocess)
-            self._ready_q.put(subprocess)
+            for _ in range(self._max_in_flight):
+                self._ready_q.put(subprocess)
 
 
-    def shutdown(self):
-        """Shutdown the processing pool subprocesses immediately"""
+    def shutdown(self, terminate_workers:bool=False):
+        """Shutdown the processing pool subprocesses immediately
+
+        Args:
+            terminate_workers: If true, then terminate the subprocesses even if the pool was created with ``reuse_workers=True``
+        """
         if self.is_running:
             self._running_event.clear()
+            reuse_workers = self._reuse_workers and not terminate_workers
             for subprocess in self._processes:
+                if reuse_workers and self._shared_memory is not None:
+                    # Unmap this pool's shared memory slabs before the subprocess is used by another pool
+                    subprocess.release_shared_memory()
+                # Keep the subprocess for the next pool if it is not processing any requests
+                if reuse_workers and _release_idle_worker(self._worker_key, subprocess):
+                    continue
                 subprocess.shutdown()
+            self._processes = []
+            if self._shared_memory is not None:
+                self._shared_memory.shutdown()
 
             if self._detected_pthread_error:
                 self.logger.warning(
@@ -261,17 +359,55 @@ class ProcessPool:
 
         batch = pool_batch or ProcessPoolBatch(self, pool_callback=pool_callback)
 
-        while True:
+        subprocess = self._get_ready_subprocess()
+        subprocess.invoke(args, kwargs, batch=batch)
+
+        if pool_callback is None and pool_batch is None:
+            results = batch.wait()
             if not self.is_running:
                 raise RuntimeError(f'ProcessPool: {self.name} shutdown')
 
-            try:
-                subprocess:_Subprocess = self._ready_q.get(block=True, timeout=0.100)
-                break
-            except queue.Empty:
-                continue
+            return results
 
-        subprocess.invoke(args, kwargs, batch=batch)
+        return batch
+
+
+    def process_chunk(
+        self,
+        chunk:List[Tuple],
+        pool_callback:Callable=None,
+        pool_batch:ProcessPoolBatch=None,
+        **kwargs
+    ) -> Union[ProcessPoolBatch,List[object]]:
+        """Process each entry of the given chunk in the next available subprocess
+
+        All of the entries are sent to the subprocess in a single request
+        and the results of all the entries are returned in a single response.
+        This reduces the inter-process communication overhead when
+        the entry_point executes quickly.
+
+        Args:
+            chunk: List of entries to process, each entry is the tuple of positional args given to the entry_point
+            pool_callback: Optional callback to invoke with the result of each entry
+            pool_batch: Optional batch to store the result of each entry. Each entry uses one slot of the batch
+            kwargs: Keyword args given to the entry_point for each entry
+
+        Returns:
+            The list of results if no pool_callback or pool_batch is given, otherwise the processing batch
+        """
+        if not self.is_running:
+            raise RuntimeError(f'ProcessPool: {self.name} not started')
+        if len(chunk) == 0:
+            raise ValueError('Chunk must contain at least one entry')
+
+        chunk = [x if isinstance(x, (list,tuple)) else (x,) for x in chunk]
+        if pool_batch is not None:
+            batch = pool_batch
+        else:
+            batch = ProcessPoolBatch(self, pool_callback=pool_callback, size=len(chunk))
+
+        subprocess = self._get_ready_subprocess()
+        subprocess.invoke(chunk, kwargs, batch=batch, chunk=True)
 
         if pool_callback is None and pool_batch is None:
             results = batch.wait()
@@ -283,6 +419,35 @@ class ProcessPool:
         return batch
 
 
+    def _get_worker_key(self) -> tuple:
+        """Subprocesses may only be reused by pools with the same key"""
+        module_path = self._entry_point.__code__.co_filename
+        try:
+            # Do not reuse subprocesses that imported a previous version of the entry_point's module
+            module_stat = os.stat(module_path)
+            module_state = (module_stat.st_size, module_stat.st_mtime_ns)
+        except OSError:
+            module_state = None
+        return (
+            self._start_method,
+            module_path,
+            module_state,
+            self._entry_point.__name__,
+            tuple(sorted(self._env.items()))
+        )
+
+
+    def _get_ready_subprocess(self) -> _Subprocess:
+        while True:
+            if not self.is_running:
+                raise RuntimeError(f'ProcessPool: {self.name} shutdown')
+
+            try:
+                return self._ready_q.get(block=True, timeout=0.100)
+            except queue.Empty:
+                continue
+
+
 
 
 class ProcessPoolBatch:
@@ -351,7 +516,43 @@ class ProcessPoolBatch:
 
 
 
+class _Request:
+    """A request queued to a subprocess"""
+    __slots__ = ('args', 'kwargs', 'batch', 'indices', 'chunk', 'slab_name')
+
+    def __init__(self, args, kwargs, batch:ProcessPoolBatch, indices:List[int], chunk:bool):
+        self.args = args
+        self.kwargs = kwargs
+        self.batch = batch
+        self.indices = indices
+        self.chunk = chunk
+        self.slab_name:str = None
+
+    def add_results(self, result):
+        """Add the subprocess's result to the request's batch"""
+        results = result if self.chunk else [result]
+        for index, r in zip(self.indices, results):
+            if isinstance(r, (tuple,list)) and len(r) == 1:
+                r = r[0]
+            self.batch._add_results(index, r)
+
+    def abort(self):
+        """Notify the request's batch that no result will be returned"""
+        self.batch._add_results(-1, None)
+
+
+# Queued to a subprocess to unmap the shared memory slabs it has attached, see _Subprocess.release_shared_memory()
+_RELEASE_SHARED_MEMORY_REQUEST = object()
+
+
 class _Subprocess(threading.Thread):
+    """Manages a processing subprocess
+
+    Requests are written to the subprocess's stdin by this thread
+    and the results are read from the subprocess's stdout by a separate reader thread.
+    This way, up to ``pool.max_in_flight`` requests may be queued to the subprocess at once.
+    Each request is tagged with a unique ID which is returned with its response.
+    """
     def __init__(
         self,
         name:str,
@@ -359,7 +560,9 @@ class _Subprocess(threading.Thread):
         entry_point:Callable,
         debug:bool,
         env:Dict[str,str],
-        logger:logging
+        logger:logging,
+        start_method:str='subprocess',
+        fork_server_preload:List[str]=None,
     ):
         threading.Thread.__init__(
             self,
@@ -371,78 +574,134 @@ class _Subprocess(threading.Thread):
         self.pool = pool
         self.logger = logger
         self._entry_point = entry_point
-        self._invoke_sem = threading.Semaphore(value=0)
-        self._invoke_args=None
-        self._invoke_kwargs=None
-        self._invoke_batch:ProcessPoolBatch=None
-        self._invoke_batch_index:int=-1
+        self._request_q:queue.Queue[_Request] = queue.Queue()
+        self._pending_lock = threading.Lock()
+        self._pending_requests:Dict[int,_Request] = {}
+        self._next_request_id = 0
+        self._n_active_requests = 0
         self._shutdown_event = threading.Event()
 
-        if not debug:
-            curdir = os.path.dirname(os.path.abspath(__file__)).replace('\\', '/')
-            subprocess_main_path = f'{curdir}/_subprocess_main.py'
-            os_env = os.environ.copy()
-            os_env.update(dict(
-                MODULE_PATH=entry_point.__code__.co_filename,
-                FUNCTION_NAME=entry_point.__name__,
-                PROCESS_POOL_NAME=name,
-            ))
-            os_env.update(env)
-            self._subprocess = subprocess.Popen(
-                [sys.executable, '-u', subprocess_main_path],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=False,
-                env=os_env,
-                close_fds=True,
-                bufsize=-1,
-            )
+        if debug:
+            self._subprocess = None
+            self._reader_thread = None
+            self._process_thread_loop_unsafe = self._debug_thread_loop_unsafe
+
+        else:
+            if start_method == 'forkserver':
+                from ._fork_server import ForkServerProcess
+                self._subprocess = ForkServerProcess(
+                    name=name,
+                    entry_point=entry_point,
+                    env=env,
+                    preload=fork_server_preload
+                )
+            else:
+                self._subprocess = self._start_subprocess(name, entry_point, env)
+
             self._monitor_thread = threading.Thread(
                 name=f'{name}-monitor',
                 target=self._monitor_process_logs,
                 daemon=True
             )
             self._monitor_thread.start()
-
-        else:
-            self._subprocess = None
-            self._process_thread_loop_unsafe = self._debug_thread_loop_unsafe
+            self._reader_thread = threading.Thread(
+                name=f'{name}-reader',
+                target=self._process_thread_loop,
+                args=(self._reader_thread_loop_unsafe,),
+                daemon=True
+            )
+            self._reader_thread.start()
 
         self.start()
 
 
+    @property
+    def is_idle(self) -> bool:
+        """Return true if the subprocess is alive and not processing any requests"""
+        with self._pending_lock:
+            if self._n_active_requests > 0 or self._shutdown_event.is_set():
+                return False
+        if self._subprocess is None or self._subprocess.poll() is not None:
+            return False
+        return self.is_alive() and self._reader_thread.is_alive()
+
+
+    def attach(self, pool:ProcessPool, name:str):
+        """Assign this idle subprocess to the given pool"""
+        self.pool = pool
+        self.logger = pool.logger
+        self.name = name
+
+
+    def _start_subprocess(
+        self,
+        name:str,
+        entry_point:Callable,
+        env:Dict[str,str]
+    ) -> subprocess.Popen:
+        curdir = os.path.dirname(os.path.abspath(__file__)).replace('\\', '/')
+        subprocess_main_path = f'{curdir}/_subprocess_main.py'
+        os_env = os.environ.copy()
+        os_env.update(dict(
+            MODULE_PATH=entry_point.__code__.co_filename,
+            FUNCTION_NAME=entry_point.__name__,
+            PROCESS_POOL_NAME=name,
+        ))
+        os_env.update(env)
+        return subprocess.Popen(
+            [sys.executable, '-u', subprocess_main_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=False,
+            env=os_env,
+            close_fds=True,
+            bufsize=-1,
+        )
+
+
     def invoke(
         self,
         args, kwargs,
-        batch:ProcessPoolBatch
+        batch:ProcessPoolBatch,
+        chunk:bool=False
     ):
-        assert self._invoke_args is None, 'Bad processing Q state'
+        n_entries = len(args) if chunk else 1
+        indices = [batch._next_index() for _ in range(n_entries)]
+        with self._pending_lock:
+            self._n_active_requests += 1
+        self._request_q.put(_Request(args, kwargs, batch=batch, indices=indices, chunk=chunk))
+
 
-        self._invoke_args = args
-        self._invoke_kwargs = kwargs
-        self._invoke_batch = batch
-        self._invoke_batch_index = batch._next_index()
-        self._invoke_sem.release()
+    def release_shared_memory(self):
+        """Request the subprocess to unmap the shared memory slabs it has attached"""
+        self._request_q.put(_RELEASE_SHARED_MEMORY_REQUEST)
 
 
-    def _process_thread_loop(self):
+    def _process_thread_loop(self, loop_func:Callable=None):
         try:
-            self._process_thread_loop_unsafe()
+            if loop_func is None:
+                loop_func = self._process_thread_loop_unsafe
+            loop_func()
         except KeyboardInterrupt:
             pass
         except OSError:
             pass
         except Exception as e:
-            if self.pool.is_running:
+            pool = self.pool
+            if pool is not None and pool.is_running:
                 self.logger.error(f'{self.name}: {e}', exc_info=e)
         finally:
-            self.pool.shutdown()
+            pool = self.pool
+            if pool is not None:
+                pool.shutdown()
 
 
     def _process_thread_loop_unsafe(self):
         while True:
-            self._invoke_sem.acquire()
+            request = self._request_q.get()
+            if request is None or self._shutdown_event.is_set():
+                return
 
             retcode = self._subprocess.poll()
             if retcode is not None:
@@ -450,15 +709,35 @@ class _Subprocess(threading.Thread):
                     raise RuntimeError(f'{self.name} terminated with error code: {retcode}')
                 return
 
+            if request is _RELEASE_SHARED_MEMORY_REQUEST:
+                # No response is returned for this request
+                write_data(self._subprocess.stdin, [], {}, release_shared_memory=True)
+                continue
+
+            shared_memory_pool = self.pool._shared_memory
+            request.slab_name = None if shared_memory_pool is None else shared_memory_pool.acquire()
+
+            request_id = self._next_request_id
+            self._next_request_id += 1
+            with self._pending_lock:
+                self._pending_requests[request_id] = request
+
             write_data(
                 self._subprocess.stdin,
-                self._invoke_args,
-                self._invoke_kwargs,
+                request.args,
+                request.kwargs,
+                shared_memory=request.slab_name,
+                request_id=request_id,
+                chunk=request.chunk
             )
-            self._invoke_args = None
-            self._invoke_kwargs = None
+            request.args = None
+            request.kwargs = None
+            request = None
+
 
-            result, _ = read_data(
+    def _reader_thread_loop_unsafe(self):
+        while True:
+            result, _, header = read_data(
                 self._subprocess.stdout
             )
 
@@ -483,38 +762,65 @@ class _Subprocess(threading.Thread):
                 # So throw an exception
                 raise RuntimeError(f'{self.name} did not return a result')
 
-            if isinstance(result, (tuple,list)) and len(result) == 1:
-                result = result[0]
-
-            self._invoke_batch._add_results(self._invoke_batch_index, result)
-            self._invoke_batch = None
-            self._invoke_batch_index = -1
+            request_id = header.get('request_id', None)
+            with self._pending_lock:
+                request = self._pending_requests.pop(request_id, None)
+            if request is None:
+                raise RuntimeError(f'{self.name} returned a result for an unknown request: {request_id}')
+
+            shared_memory_pool = self.pool._shared_memory
+            if request.slab_name:
+                # If the subprocess used the shared memory slab
+                # then convert the result's descriptors to views into the slab,
+                # otherwise just return the slab to the pool
+                if header.get('shared_memory', None):
+                    result = shared_memory_pool.unpack(result, request.slab_name)
+                else:
+                    shared_memory_pool.release(request.slab_name)
+
+            request.add_results(result)
+            # Do not hold a reference to the result while waiting for the next response
+            # (this allows for the result's shared memory slab to be recycled)
+            result = None
+            request = None
+            with self._pending_lock:
+                self._n_active_requests -= 1
             self.pool._ready_q.put(self)
 
 
     def _debug_thread_loop_unsafe(self):
         while True:
-            self._invoke_sem.acquire()
-            if self._shutdown_event.is_set():
+            request = self._request_q.get()
+            if request is None or self._shutdown_event.is_set():
                 break
 
-            result = self._entry_point(*self._invoke_args, **self._invoke_kwargs)
-            result = result or (None, )
-            self._invoke_args = None
-            self._invoke_kwargs = None
+            with self._pending_lock:
+                self._pending_requests[0] = request
 
-            if len(result) == 0:
-                raise RuntimeError(f'{self.name} did not return a result')
+            # Return the results in the same format as the subprocess, see _subprocess_main.py
+            if request.chunk:
+                result = [self._invoke_entry_point(args, request.kwargs) for args in request.args]
+            else:
+                result = self._invoke_entry_point(request.args, request.kwargs)
 
-            if isinstance(result, (tuple,list)) and len(result) == 1:
-                result = result[0]
+            with self._pending_lock:
+                if self._pending_requests.pop(0, None) is None:
+                    break
 
-            self._invoke_batch._add_results(self._invoke_batch_index, result)
-            self._invoke_batch = None
-            self._invoke_batch_index = -1
+            request.add_results(result)
+            request = None
+            with self._pending_lock:
+                self._n_active_requests -= 1
             self.pool._ready_q.put(self)
 
 
+    def _invoke_entry_point(self, args, kwargs):
+        result = self._entry_point(*args, **kwargs)
+        if isinstance(result, (tuple,list)):
+            return result
+        return (result,)
+
+
 
     def shutdown(self):
         try:
@@ -551,11 +857,25 @@ class _Subprocess(threading.Thread):
             pass
 
         self._shutdown_event.set()
-        self._invoke_sem.release()
-        batch = self._invoke_batch
-        self._invoke_batch = None
-        if batch is not None:
-            batch._add_results(-1, None)
+
+        # Notify the batches of any pending requests
+        # that their results will not be returned
+        with self._pending_lock:
+            pending_requests = list(self._pending_requests.values())
+            self._pending_requests.clear()
+        while True:
+            try:
+                request = self._request_q.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                pending_requests.append(request)
+
+        for request in pending_requests:
+            request.abort()
+
+        # Wakeup the request thread
+        self._request_q.put(None)
 
 
     def _monitor_process_logs(self):
@@ -564,6 +884,9 @@ class _Subprocess(threading.Thread):
                 line = self._subprocess.stderr.readline()
                 if not line:
                     return
+                # Ignore the logs of idle subprocesses that are not assigned to a pool
+                if self.pool is None:
+                    continue
                 if not self.pool.detected_subprocess_error and self._subprocess.poll():
                     self.pool.detected_subprocess_error = self.name
 
@@ -582,6 +905,56 @@ class _Subprocess(threading.Thread):
 
 
 
+_idle_workers_lock = threading.Lock()
+_idle_workers:Dict[tuple,List[_Subprocess]] = {}
+
+
+def shutdown_idle_workers():
+    """Terminate the idle subprocesses kept for reuse by pools created with ``reuse_workers=True``"""
+    with _idle_workers_lock:
+        workers = [w for worker_list in _idle_workers.values() for w in worker_list]
+        _idle_workers.clear()
+
+    for worker in workers:
+        worker.shutdown()
+
+atexit.register(shutdown_idle_workers)
+
+
+def _acquire_idle_worker(key:tuple, pool:ProcessPool, name:str) -> Union[_Subprocess,None]:
+    with _idle_workers_lock:
+        worker_list = _idle_workers.get(key, [])
+        while worker_list:
+            worker = worker_list.pop()
+            if worker.is_idle:
+                worker.attach(pool, name)
+                return worker
+            worker.shutdown()
+    return None
+
+
+def _release_idle_worker(key:tuple, worker:_Subprocess) -> bool:
+    if not worker.is_idle:
+        return False
+    worker.pool = None
+    with _idle_workers_lock:
+        _idle_workers.setdefault(key, []).append(worker)
+    return True
+
+
+def _get_start_method(start_method:str=None) -> str:
+    start_method = start_method or os.environ.get('MLTK_PROCESS_POOL_START_METHOD', 'subprocess')
+    if start_method not in ('subprocess', 'forkserver'):
+        raise ValueError(f'Unsupported process pool start method: {start_method}, must be one of: subprocess, forkserver')
+
+    if start_method == 'forkserver':
+        from ._fork_server import is_fork_server_supported
+        if not is_fork_server_supported():
+            start_method = 'subprocess'
+
+    return start_method
+
+
 def calculate_n_jobs(n_jobs:Union[float,int]=-1) -> int:
     """Calculate the number of subprocesses to use for the processing pool
 
@@ -0,0 +1,63 @@
+import os
+import zipfile
+import hashlib
+
+from mltk.utils import archive
+from mltk.utils.archive_downloader import verify_file_hash, calculate_file_hashes
+from mltk.utils.path import create_tempdir, remove_directory
+
+
+def _create_zipfile(tmp_dir:str) -> str:
+    zip_path = f'{tmp_dir}/test.zip'
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for i in range(200):
+            zf.writestr(f'dir{i % 7}/sub{i % 3}/file{i}.bin', os.urandom(1024*(i % 5 + 1)))
+    return zip_path
+
+
+def test_extract_zipfile_parallel():
+    tmp_dir = create_tempdir('tests/archive')
+    remove_directory(tmp_dir)
+    os.makedirs(tmp_dir)
+    zip_path = _create_zipfile(tmp_dir)
+
+    saved_min_bytes = archive.PARALLEL_EXTRACT_MIN_BYTES
+    archive.PARALLEL_EXTRACT_MIN_BYTES = 0
+    try:
+        archive._extractall_zipfile(zip_path, f'{tmp_dir}/out', n_jobs=4) # pylint: disable=protected-access
+    finally:
+        archive.PARALLEL_EXTRACT_MIN_BYTES = saved_min_bytes
+
+    with zipfile.ZipFile(zip_path) as zf:
+        for member in zf.infolist():
+            with open(f'{tmp_dir}/out/{member.filename}', 'rb') as f:
+                assert f.read() == zf.read(member)
+
+    remove_directory(tmp_dir)
+
+
+def test_verify_file_hash(monkeypatch, tmp_path):
+    # Do not modify the hash cache in the user's MLTK cache directory
+    monkeypatch.setenv('MLTK_CACHE_DIR', str(tmp_path))
+    tmp_dir = create_tempdir('tests/archive_hash')
+    path = f'{tmp_dir}/data.bin'
+    data = os.urandom(1024*1024 + 123)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    for algorithm in ('md5', 'sha1', 'sha256'):
+        file_hash = hashlib.new(algorithm, data).hexdigest()
+        assert verify_file_hash(path, file_hash.upper(), 'auto')
+        assert verify_file_hash(path, file_hash, algorithm)
+        # The cached hash should be returned
+        assert verify_file_hash(path, file_hash, algorithm)
+    assert not verify_file_hash(path, 'bogus', 'auto')
+    assert os.path.exists(f'{tmp_path}/file_hash_cache.json')
+
+    # Modifying the file should invalidate the cached hash
+    data = os.urandom(1024)
+    with open(path, 'wb') as f:
+        f.write(data)
+    assert calculate_file_hashes(path, ['sha256'])['sha256'] == hashlib.sha256(data).hexdigest()
+
+    remove_directory(tmp_dir)
@@ -0,0 +1,208 @@
+import os
+import gc
+import time
+import numpy as np
+import pytest
+
+from mltk.utils.process_pool import ProcessPool, shutdown_idle_workers
+from mltk.utils.python import import_module_at_path
+from mltk.utils.path import create_tempdir
+
+
+def get_pid(x):
+    return os.getpid()
+
+
+def square(x):
+    return x*x
+
+
+def create_array(n, value=1):
+    return np.full((n, 8), value, dtype=np.float32), n
+
+
+def count_mapped_slabs(x):
+    """Return the number of shared memory segments mapped by this subprocess (Linux only)"""
+    with open('/proc/self/maps', 'r') as f:
+        n_slabs = len({line.split()[-1] for line in f if '/dev/shm/' in line})
+    return np.zeros((x,), dtype=np.uint8), n_slabs
+
+
+def raise_error(x):
+    if x < 0:
+        raise ValueError('Negative value')
+    return x
+
+
+def _is_slab_view(x:np.ndarray, slab_size:int) -> bool:
+    """Return if the given array is a view into a shared memory slab, see SharedMemorySlabPool.unpack()"""
+    while isinstance(x.base, np.ndarray):
+        x = x.base
+    return x.dtype == np.uint8 and x.size >= slab_size
+
+
+def _create_entry_point_module() -> str:
+    module_path = f'{create_tempdir("tests/process_pool")}/pool_entry_point.py'
+    with open(module_path, 'w') as f:
+        f.write('import os\n\ndef get_pid(x):\n    return os.getpid()\n')
+    return module_path
+
+
+def test_reuse_workers():
+    shutdown_idle_workers()
+
+    pool = ProcessPool(get_pid, n_jobs=1, reuse_workers=True)
+    pid = pool(0)
+    assert pid != os.getpid()
+    pool.shutdown()
+
+    # The idle subprocess is used by the next pool with the same entry point
+    pool = ProcessPool(get_pid, n_jobs=1, reuse_workers=True)
+    assert pool(0) == pid
+    pool.shutdown(terminate_workers=True)
+
+    # The subprocess was terminated, so a new subprocess is started
+    pool = ProcessPool(get_pid, n_jobs=1, reuse_workers=True)
+    pid = pool(0)
+    pool.shutdown()
+    shutdown_idle_workers()
+
+    pool = ProcessPool(get_pid, n_jobs=1, reuse_workers=True)
+    assert pool(0) != pid
+    pool.shutdown(terminate_workers=True)
+
+    # Subprocesses are not reused by default
+    pool = ProcessPool(get_pid, n_jobs=1)
+    pid = pool(0)
+    pool.shutdown()
+    pool = ProcessPool(get_pid, n_jobs=1)
+    assert pool(0) != pid
+    pool.shutdown()
+
+
+def test_reuse_workers_module_modified():
+    shutdown_idle_workers()
+    module_path = _create_entry_point_module()
+    entry_point = import_module_at_path(module_path).get_pid
+
+    pool = ProcessPool(entry_point, n_jobs=1, reuse_workers=True)
+    pid = pool(0)
+    pool.shutdown()
+
+    # The subprocess imported the previous version of the entry point's module so it is not reused
+    stat = os.stat(module_path)
+    os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+    pool = ProcessPool(entry_point, n_jobs=1, reuse_workers=True)
+    assert pool(0) != pid
+    pool.shutdown()
+    shutdown_idle_workers()
+
+
+def test_fork_server():
+    from mltk.utils.process_pool._fork_server import is_fork_server_supported
+    if not is_fork_server_supported():
+        pytest.skip('Fork server not supported on this platform')
+
+    with ProcessPool(square, n_jobs=2, start_method='forkserver') as pool:
+        batch = pool.create_batch(10)
+        for i in range(10):
+            pool(i, pool_batch=batch)
+        assert batch.wait() == [x*x for x in range(10)]
+
+        assert pool.process_chunk([(x,) for x in range(5)]) == [x*x for x in range(5)]
+
+    with ProcessPool(get_pid, n_jobs=1, start_method='forkserver') as pool:
+        assert pool(0) != os.getpid()
+
+
+def test_process_chunk():
+    with ProcessPool(square, n_jobs=2, max_in_flight=2) as pool:
+        assert pool.process_chunk([(x,) for x in range(10)]) == [x*x for x in range(10)]
+        # Entries that are not tuples are used as the single positional arg
+        assert pool.process_chunk([3, 4]) == [9, 16]
+
+        # Chunks and single requests may share a batch
+        batch = pool.create_batch(6)
+        pool.process_chunk([(x,) for x in range(4)], pool_batch=batch)
+        pool(4, pool_batch=batch)
+        pool(5, pool_batch=batch)
+        assert batch.wait() == [x*x for x in range(6)]
+
+        # The callback is invoked with the result of each entry
+        results = []
+        batch = pool.process_chunk([(x,) for x in range(5)], pool_callback=results.append)
+        timeout = time.time() + 30
+        while len(results) < 5 and time.time() < timeout:
+            time.sleep(0.01)
+        assert sorted(results) == [x*x for x in range(5)]
+
+        with pytest.raises(ValueError):
+            pool.process_chunk([])
+
+
+def test_shared_memory():
+    slab_size = 64*8*4 + 1024
+    with ProcessPool(create_array, n_jobs=2, shared_memory_size=slab_size, shared_memory_slabs=2) as pool:
+        # The slabs are recycled once the results are garbage collected
+        for i in range(10):
+            x, n = pool(64, value=i)
+            assert n == 64
+            assert x.shape == (64, 8)
+            assert x.dtype == np.float32
+            assert np.all(x == i)
+            # The result is a view into a shared memory slab, not a copy
+            assert _is_slab_view(x, slab_size)
+            del x
+            gc.collect()
+
+        # The chunk's results share a slab
+        results = pool.process_chunk([(8,), (16,)], value=3)
+        assert [r[0].shape for r in results] == [(8, 8), (16, 8)]
+        assert all(np.all(r[0] == 3) and _is_slab_view(r[0], slab_size) for r in results)
+        del results
+        gc.collect()
+
+        # Results that do not fit into a slab are pickled through the pipe
+        x, n = pool(128, value=7)
+        assert n == 128
+        assert np.all(x == 7)
+        assert not _is_slab_view(x, slab_size)
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/maps'), reason='Requires /proc/self/maps')
+def test_shared_memory_reuse_workers():
+    shutdown_idle_workers()
+    slab_size = 4096
+
+    pool = ProcessPool(count_mapped_slabs, n_jobs=1, shared_memory_size=slab_size, shared_memory_slabs=1, reuse_workers=True)
+    x, n_slabs = pool(16)
+    assert n_slabs == 0
+    del x
+    gc.collect()
+    # The subprocess mapped the pool's slab to return the previous result
+    x, n_slabs = pool(16)
+    assert n_slabs == 1
+    del x
+    gc.collect()
+    pool.shutdown()
+
+    # The subprocess unmapped the previous pool's slab when that pool was shutdown
+    pool = ProcessPool(count_mapped_slabs, n_jobs=1, shared_memory_size=slab_size, shared_memory_slabs=1, reuse_workers=True)
+    x, n_slabs = pool(16)
+    assert n_slabs == 0
+    del x
+    gc.collect()
+    pool.shutdown(terminate_workers=True)
+
+
+def test_error():
+    pool = ProcessPool(raise_error, n_jobs=1)
+    assert pool(1) == 1
+
+    # If the entry point raises an exception then the subprocess terminates and the pool is shutdown
+    with pytest.raises(RuntimeError):
+        pool(-1)
+    assert not pool.is_running
+
+    with pytest.raises(RuntimeError):
+        pool(1)
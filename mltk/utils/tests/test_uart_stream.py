@@ -0,0 +1,71 @@
+import os
+import time
+import threading
+import pytest
+
+from mltk.utils.uart_stream import UartStream
+from mltk.utils.logger import get_logger
+
+serial = pytest.importorskip('serial')
+
+
+# NOTE: pySerial's loop:// transport queues each byte individually
+# so its throughput is much lower than a real UART.
+# Also, the packet length is a 16-bit field, so the RX buffer must be less than 32KB
+LOOP_URL = 'loop://'
+RX_BUFFER_LENGTH = 2048
+
+
+def _create_loopback_stream() -> UartStream:
+    return UartStream(
+        LOOP_URL,
+        rx_buffer_length=RX_BUFFER_LENGTH,
+        open_synchronize_timeout=5
+    )
+
+
+def _loopback_transfer(stream:UartStream, data:bytes, timeout:float=60) -> bytes:
+    rx_data = bytearray()
+
+    def _reader():
+        while len(rx_data) < len(data):
+            rx_data.extend(stream.read_all(len(data) - len(rx_data), timeout=timeout))
+
+    reader = threading.Thread(target=_reader, daemon=True)
+    reader.start()
+    assert stream.write_all(data, timeout=timeout) == len(data)
+    reader.join(timeout)
+    return bytes(rx_data)
+
+
+def test_loopback_data():
+    with _create_loopback_stream() as stream:
+        assert stream.is_synchronized
+        data = os.urandom(32*1024)
+        assert _loopback_transfer(stream, data) == data
+
+
+def test_loopback_command():
+    with _create_loopback_stream() as stream:
+        assert stream.is_synchronized
+        stream.write_command(7, b'abc')
+        start_time = time.time()
+        cmd = None
+        while cmd is None and time.time() - start_time < 5:
+            stream.wait(0.100)
+            cmd = stream.read_command()
+        assert cmd is not None
+        assert cmd.code == 7
+        assert cmd.payload[:3] == b'abc'
+
+
+def test_loopback_throughput():
+    logger = get_logger()
+    with _create_loopback_stream() as stream:
+        assert stream.is_synchronized
+        data = os.urandom(256*1024)
+        start_time = time.time()
+        rx_data = _loopback_transfer(stream, data)
+        elapsed = time.time() - start_time
+        assert rx_data == data
+        logger.info(f'UartStream loop:// throughput: {len(data)/elapsed/1e3:.1f} kB/s')
@@ -32,7 +32,8 @@ class UartStream:
 
 
     Args:
-        port: Name of serial COM port, if starts with "regex:" then try to find a matching port by listing all ports
+        port: Name of serial COM port, if starts with "regex:" then try to find a matching port by listing all ports.
+            This may also be a pySerial URL, e.g. ``loop://`` (see `URL handlers <https://pyserial.readthedocs.io/en/latest/url_handlers.html>`_)
         baud: Baud rate
         rx_buffer_length: Size of the RX buffer in bytes
         open_synchronize_timeout: Number of seconds to wait for the link to synchronize with the device
@@ -53,6 +54,10 @@ class UartStream:
         self._rx_thread:threading.Thread = None
         self._rx_buffer = bytearray()
         self._rx_buffer_length = rx_buffer_length
+        # Bytes read from the serial port that have not been parsed yet.
+        # _rx_parse_offset is the index of the first unparsed byte
+        self._rx_parse_buffer = bytearray()
+        self._rx_parse_offset = 0
         self._rx_previous_data_packet_id = 0
         self._rx_cmd_code:int = None
         self._rx_cmd_payload:bytes = None
@@ -162,19 +167,24 @@ class UartStream:
             if self.is_open:
                 raise RuntimeError('Serial connection already opened')
 
-            port = UartStream.resolve_port(self._port)
+            if '://' in self._port:
+                port = self._port
+            else:
+                port = UartStream.resolve_port(self._port)
             if not port:
                 raise Exception('Invalid serial port')
 
             logger.debug(f'Opening {port}')
 
             try:
-                self._handle = serial.Serial(
-                    port=port,
+                self._handle = serial.serial_for_url(
+                    port,
                     baudrate=self._baud,
                     parity=serial.PARITY_NONE,
                     stopbits=serial.STOPBITS_ONE,
                     bytesize=serial.EIGHTBITS,
+                    # The RX thread blocks on the port for up to this amount of time
+                    timeout=RX_READ_TIMEOUT,
                     write_timeout=30.0,
                 )
             except Exception as e:
@@ -189,6 +199,8 @@ class UartStream:
 
             self._tx_active_packet_id = 0
             self._rx_buffer = bytearray()
+            self._rx_parse_buffer = bytearray()
+            self._rx_parse_offset = 0
             self._rx_thread_active.clear()
             self._rx_thread = threading.Thread(
                 name='UartStreamRx',
@@ -588,24 +600,28 @@ class UartStream:
 
 
     def _parse_packet_header(self) -> PacketHeader:
-        packet_buffer = bytearray()
+        buf = self._rx_parse_buffer
 
         while not self._rx_thread_active.is_set():
-            if self._handle.in_waiting == 0:
-                time.sleep(0.005)
-                continue
-            c = self._handle.read(1)[0]
-
-            packet_buffer.append(c)
-            if len(packet_buffer) < PACKET_HEADER_LENGTH:
+            # Search the unparsed bytes for the start of a packet
+            index = buf.find(PACKET_DELIMITER1, self._rx_parse_offset)
+            if index == -1:
+                # Keep the last byte as it may be the first byte of the delimiter
+                self._rx_parse_offset = max(len(buf) - 1, self._rx_parse_offset)
+
+            elif len(buf) - index >= PACKET_HEADER_LENGTH:
+                header = PacketHeader.deserialize(bytes(buf[index:index+PACKET_HEADER_LENGTH]))
+                if header:
+                    self._rx_parse_offset = index + PACKET_HEADER_LENGTH
+                    return header
+                self._rx_parse_offset = index + 1
                 continue
 
-            header = PacketHeader.deserialize(packet_buffer)
-            if header:
-                return header
+            else:
+                # Wait for the rest of the header
+                self._rx_parse_offset = index
 
-            packet_buffer = packet_buffer[1:]
-            continue
+            self._read_serial_port()
 
         return None
 
@@ -613,21 +629,22 @@ class UartStream:
     def _read_packet_data(self, packet_length:int):
         activity_timestamp = time.time()
         packet_data = bytearray()
+        buf = self._rx_parse_buffer
 
         while len(packet_data) < packet_length and not self._rx_thread_active.is_set():
-            max_read_length = self._handle.in_waiting
+            max_read_length = len(buf) - self._rx_parse_offset
             if max_read_length == 0:
-                time.sleep(0.005)
+                if (time.time() - activity_timestamp) > 10.0:
+                    logger.warning(f'Timed-out waiting for packet of length {packet_length}')
+                    return
+                self._read_serial_port()
                 continue
-            elif (time.time() - activity_timestamp) > 10.0:
-                logger.warning(f'Timed-out waiting for packet of length {packet_length}')
-                return
 
             chunk_length = min(max_read_length, packet_length - len(packet_data))
-            data = self._handle.read(chunk_length)
-            if data:
-                activity_timestamp = time.time()
-                packet_data.extend(data)
+            with memoryview(buf) as view:
+                packet_data += view[self._rx_parse_offset:self._rx_parse_offset+chunk_length]
+            self._rx_parse_offset += chunk_length
+            activity_timestamp = time.time()
 
         with self._lock:
             #logger.debug(binascii.hexlify(bytearray(packet_data)))
@@ -636,6 +653,24 @@ class UartStream:
             self._condition.notify_all()
 
 
+    def _read_serial_port(self):
+        """Read all the bytes available on the serial port into the parse buffer
+
+        This blocks for up to RX_READ_TIMEOUT if no bytes are available
+        """
+        buf = self._rx_parse_buffer
+
+        # Drop the parsed bytes from the front of the buffer.
+        # This is only done once they make up most of the buffer so that the cost is amortized
+        if self._rx_parse_offset > 0 and self._rx_parse_offset >= len(buf) // 2:
+            del buf[:self._rx_parse_offset]
+            self._rx_parse_offset = 0
+
+        data = self._handle.read(max(self._handle.in_waiting, 1))
+        if data:
+            buf.extend(data)
+
+
 class Command(NamedTuple):
     code:int = -1
     payload:bytes = None
@@ -645,6 +680,7 @@ class Command(NamedTuple):
 
 
 PACKET_HEADER_LENGTH = 12
+RX_READ_TIMEOUT:float = 0.100
 PACKET_DELIMITER1:bytes = b'\xDE\xAD'
 PACKET_DELIMITER2:bytes = b'\xBE\xEF'
 PACKET_REQUEST_SYNCHRONIZATION:int = -1